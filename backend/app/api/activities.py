@@ -1,22 +1,75 @@
 """
 作業活動管理 API 路由
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
-from app.schemas.activity import ActivityCreate, ActivityUpdate, ActivityResponse
+from app.schemas.activity import (
+    ActivityCreate,
+    ActivityUpdate,
+    ActivityResponse,
+    ActivityListItem,
+    ResourceDemand,
+    ResourceDemandResponse,
+    WBS_CODE_PATTERN
+)
 from app.utils.supabase_client import supabase
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    keyset_page,
+    search_pattern,
+    select_columns,
+    split_page
+)
+from app.utils.network_cache import invalidate_network
+from app.utils.precompute import schedule_precompute
 
 router = APIRouter()
 
 
-@router.get("/projects/{project_id}/activities", response_model=List[ActivityResponse])
-async def get_activities(project_id: UUID):
-    """取得專案的所有作業活動"""
+def _replace_resource_demands(activity_id: str, project_id: str, demands: List[ResourceDemand]) -> None:
+    """以新的清單取代作業的資源需求（資源必須屬於同一專案）"""
+    resource_ids = [str(demand.resource_id) for demand in demands]
+    if resource_ids:
+        known = supabase.table("project_resources").select("id").eq("project_id", project_id).in_("id", resource_ids).execute()
+        missing = set(resource_ids) - {row['id'] for row in known.data}
+        if missing:
+            raise HTTPException(status_code=400, detail=f"資源不存在或不屬於此專案：{', '.join(sorted(missing))}")
+    supabase.table("activity_resource_demands").delete().eq("activity_id", activity_id).execute()
+    if demands:
+        supabase.table("activity_resource_demands").insert([
+            {"activity_id": activity_id, "resource_id": str(demand.resource_id), "quantity": demand.quantity}
+            for demand in demands
+        ]).execute()
+
+
+@router.get("/projects/{project_id}/activities", response_model=List[ActivityListItem], response_model_exclude_unset=True)
+async def get_activities(
+    project_id: UUID,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="上一頁回應的 X-Next-Cursor 標頭"),
+    fields: Optional[str] = Query(None, description="只回傳的欄位（以逗號分隔，例如 name,normal_duration）"),
+    q: Optional[str] = Query(None, min_length=1, description="依作業名稱搜尋（部分符合、不分大小寫）"),
+    wbs: Optional[str] = Query(None, pattern=WBS_CODE_PATTERN, description="只列出此 WBS 編碼及其下層的作業")
+):
+    """取得專案的作業活動（依建立時間舊到新，以游標分頁）"""
+    columns = select_columns(fields, ActivityListItem.model_fields)
     try:
-        response = supabase.table("project_activities").select("*").eq("project_id", str(project_id)).order("created_at").execute()
-        return response.data
+        query = supabase.table("project_activities").select(columns).eq("project_id", str(project_id))
+        if q:
+            query = query.ilike("name", search_pattern(q))
+        if wbs:
+            query = query.or_(f'wbs_code.eq."{wbs}",wbs_code.like."{wbs}.*"')
+        rows, next_cursor = split_page(keyset_page(query, cursor, limit, desc=False).execute().data, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return rows
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"取得作業列表失敗：{str(e)}")
 
@@ -45,7 +98,7 @@ async def create_activity(project_id: UUID, activity: ActivityCreate):
             raise HTTPException(status_code=404, detail="專案不存在")
         
         # 建立作業活動
-        activity_data = activity.model_dump(exclude={'predecessor_ids'})
+        activity_data = activity.model_dump(exclude={'predecessor_ids', 'resource_demands'})
         # 將 Decimal 轉換為 float 以便序列化為 JSON
         for key in ['normal_cost', 'crash_cost']:
             if key in activity_data and isinstance(activity_data[key], Decimal):
@@ -63,6 +116,14 @@ async def create_activity(project_id: UUID, activity: ActivityCreate):
             ]
             supabase.table("activity_precedences").insert(precedences).execute()
         
+        # 建立資源需求
+        if activity.resource_demands:
+            _replace_resource_demands(str(activity_id), str(project_id), activity.resource_demands)
+        
+        # 作業網路已變動，清除專案的網路界限快取並於背景重新預先計算
+        invalidate_network(str(project_id))
+        schedule_precompute(str(project_id))
+        
         # 重新查詢以取得完整資料
         full_response = supabase.table("project_activities").select("*").eq("id", activity_id).execute()
         return full_response.data[0]
@@ -77,7 +138,7 @@ async def update_activity(activity_id: UUID, activity: ActivityUpdate):
     """更新作業活動"""
     try:
         # 只更新提供的欄位
-        update_data = activity.model_dump(exclude_unset=True, exclude={'predecessor_ids'})
+        update_data = activity.model_dump(exclude_unset=True, exclude={'predecessor_ids', 'resource_demands'})
         # 將 Decimal 轉換為 float 以便序列化為 JSON
         for key in ['normal_cost', 'crash_cost']:
             if key in update_data and isinstance(update_data[key], Decimal):
@@ -103,6 +164,16 @@ async def update_activity(activity_id: UUID, activity: ActivityUpdate):
         
         # 重新查詢以取得完整資料
         full_response = supabase.table("project_activities").select("*").eq("id", str(activity_id)).execute()
+        if not full_response.data:
+            raise HTTPException(status_code=404, detail="作業不存在")
+        
+        # 更新資源需求（不影響作業網路，不需清除快取）
+        if activity.resource_demands is not None:
+            _replace_resource_demands(str(activity_id), full_response.data[0]['project_id'], activity.resource_demands)
+        
+        # 作業網路已變動，清除專案的網路界限快取並於背景重新預先計算
+        invalidate_network(full_response.data[0]['project_id'])
+        schedule_precompute(full_response.data[0]['project_id'])
         return full_response.data[0]
     except HTTPException:
         raise
@@ -117,6 +188,8 @@ async def delete_activity(activity_id: UUID):
         response = supabase.table("project_activities").delete().eq("id", str(activity_id)).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="作業不存在")
+        invalidate_network(response.data[0]['project_id'])
+        schedule_precompute(response.data[0]['project_id'])
         return None
     except HTTPException:
         raise
@@ -141,3 +214,12 @@ async def get_predecessors(activity_id: UUID):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"取得前置作業失敗：{str(e)}")
 
+
+@router.get("/activities/{activity_id}/resource-demands", response_model=List[ResourceDemandResponse])
+async def get_resource_demands(activity_id: UUID):
+    """取得作業的資源需求列表"""
+    try:
+        response = supabase.table("activity_resource_demands").select("activity_id, resource_id, quantity").eq("activity_id", str(activity_id)).execute()
+        return response.data
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"取得資源需求失敗：{str(e)}")
@@ -0,0 +1,42 @@
+"""
+除錯 API 路由
+取得請求剖析結果（僅在設定 PROFILING_TOKEN 時註冊）
+"""
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import JSONResponse
+from typing import Optional
+from app.utils.profiling import token_valid, list_profiles, get_profile
+
+router = APIRouter()
+
+
+def _require_token(header_token: Optional[str], query_token: Optional[str]) -> None:
+    if not token_valid(header_token or query_token):
+        raise HTTPException(status_code=403, detail="剖析權杖不正確")
+
+
+@router.get("/debug/profiles")
+async def get_profiles(
+    x_profile: Optional[str] = Header(None),
+    profile: Optional[str] = Query(None)
+):
+    """列出本 worker 保存的請求剖析摘要（新到舊）"""
+    _require_token(x_profile, profile)
+    return list_profiles()
+
+
+@router.get("/debug/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    x_profile: Optional[str] = Header(None),
+    profile: Optional[str] = Query(None)
+):
+    """下載 speedscope 格式的剖析檔（可直接匯入 https://www.speedscope.app）"""
+    _require_token(x_profile, profile)
+    document = get_profile(profile_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="剖析結果不存在")
+    return JSONResponse(
+        document,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'}
+    )
@@ -0,0 +1,91 @@
+"""
+甘特圖 API 路由
+由儲存的作業排程回傳固定大小的甘特圖長條：WBS 彙總、要徑或指定時間窗內的作業
+"""
+from fastapi import APIRouter, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from typing import Literal, Optional
+from uuid import UUID
+from app.schemas.optimization import GanttResponse
+from app.utils.supabase_client import supabase
+from app.utils.schedule_store import load_schedules
+from app.utils.network_cache import network_generation
+from app.utils.metrics import increment
+from app.utils.gantt_index import GanttIndex, get_gantt_index, set_gantt_index
+from app.utils.money import amounts
+
+router = APIRouter()
+
+# 單次回傳的長條數上限
+GANTT_MAX_LIMIT = 2000
+
+
+def _load_gantt_index(scenario_id: UUID):
+    """取得（必要時建立）情境結果的甘特圖索引，回傳 (result_id, index)"""
+    scenario_response = supabase.table("bidding_scenarios").select("project_id").eq("id", str(scenario_id)).execute()
+    if not scenario_response.data:
+        raise HTTPException(status_code=404, detail="投標情境不存在")
+    project_id = scenario_response.data[0]['project_id']
+
+    result_response = supabase.table("optimization_results").select("id").eq("scenario_id", str(scenario_id)).execute()
+    if not result_response.data:
+        raise HTTPException(status_code=404, detail="優化結果不存在")
+    result_id = result_response.data[0]['id']
+
+    generation = network_generation(project_id)
+    index = get_gantt_index(result_id, generation)
+    if index is not None:
+        increment("gantt_index_hits")
+        return result_id, index
+
+    increment("gantt_index_builds")
+    activities_response = supabase.table("project_activities").select("id, name, wbs_code").eq("project_id", project_id).execute()
+    activities = {act['id']: act for act in activities_response.data}
+    precedences_response = supabase.table("activity_precedences").select("*").in_("activity_id", list(activities)).execute()
+    precedences = [(p['activity_id'], p['predecessor_id']) for p in precedences_response.data]
+
+    index = GanttIndex(load_schedules(result_id) or [], activities, precedences)
+    set_gantt_index(result_id, generation, index)
+    return result_id, index
+
+
+@router.get("/scenarios/{scenario_id}/gantt", response_model=GanttResponse)
+async def get_gantt(
+    scenario_id: UUID,
+    view: Literal["activities", "wbs", "critical"] = Query("wbs", description="activities：作業；wbs：WBS 彙總；critical：要徑作業"),
+    level: int = Query(1, ge=1, le=10, description="WBS 彙總層數（view=wbs 時使用）"),
+    start: Optional[int] = Query(None, ge=0, description="時間窗起點（天，含）"),
+    end: Optional[int] = Query(None, ge=0, description="時間窗終點（天，含）"),
+    limit: int = Query(500, ge=1, le=GANTT_MAX_LIMIT, description="最多回傳的長條數")
+):
+    """取得甘特圖長條
+
+    只回傳與時間窗相交的長條（依開始時間排序，超過 limit 時截斷並標示 truncated），
+    回應大小與專案作業數無關；同一結果的索引快取於 worker，捲動或縮放時不需重新讀取排程。
+    """
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="時間窗終點不得早於起點")
+    try:
+        result_id, index = await run_in_threadpool(_load_gantt_index, scenario_id)
+        if view == "wbs":
+            intervals = index.rollup(level)
+        elif view == "critical":
+            intervals = index.critical
+        else:
+            intervals = index.activities
+        bars, total = intervals.query(start, end, limit)
+        return GanttResponse(
+            result_id=result_id,
+            view=view,
+            level=level if view == "wbs" else None,
+            project_duration=index.project_duration,
+            window_start=start,
+            window_end=end,
+            total=total,
+            truncated=total > len(bars),
+            bars=[amounts(bar, ("cost",)) for bar in bars]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"取得甘特圖失敗：{str(e)}")
@@ -1,312 +1,855 @@
 """
 優化計算 API 路由
 """
-from fastapi import APIRouter, HTTPException
-from uuid import UUID
+from fastapi import APIRouter, HTTPException, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from pydantic_core import to_jsonable_python
+from typing import Optional
+from uuid import UUID, uuid4
+import asyncio
+import os
+import time
 from app.schemas.optimization import (
     OptimizationRequest, 
     OptimizationResult, 
     ActivitySchedule,
     ActivityInfo,
     PrecedenceInfo,
-    OptimizationData
+    OptimizationData,
+    ScenarioPinUpdate,
+    RetentionPolicy,
+    RetentionResult,
+    PortfolioRequest,
+    PortfolioResult,
+    SensitivityRequest,
+    SensitivityResult
 )
-from app.models.bidding_optimizer import BiddingOptimizer, Activity
+from app.models.bidding_optimizer import BiddingOptimizer, check_feasibility, FORMULATIONS
+from app.models.decomposition import DecomposedOptimizer
+from app.models.rolling_horizon import RollingHorizonOptimizer
+from app.models.portfolio import PortfolioOptimizer
+from app.models.robust import RobustOptimizer
+from app.models.sensitivity import SensitivitySweep
+from app.models.whatif import WhatIfSession
+from app.models.solve_time import model_features
 from app.utils.supabase_client import supabase
+from app.utils.network_cache import get_network_bounds, set_network_bounds, network_generation, NETWORK_BOUNDS_TTL
+from app.utils.project_network import load_project_network
+from app.utils.precompute import answers_from_curve, precomputed_optimizer
+from app.utils.artifact_store import network_digest, load_network, save_network, network_bounds, network_adjacency, load_curve
+from app.utils.singleflight import SingleFlight, request_key
+from app.utils.metrics import increment
+from app.utils.solver_scheduler import solver_scheduler, predict_solve_time
+from app.utils.profiling import current_profile, tag_profile
+from app.utils.whatif_sessions import (
+    WHATIF_IDLE_SECONDS,
+    acquire_session,
+    register_session,
+    release_session,
+    touch_session,
+    drop_session
+)
+from app.utils.schedule_store import save_schedule_pack, load_schedules
+from app.utils.result_format import build_result_payload, negotiate_format, arrow_available, render_result
+from app.utils.money import (
+    BOUNDS_MONEY_FIELDS,
+    RESULT_MONEY_FIELDS,
+    amounts,
+    from_minor,
+    minor_to_float,
+    optional_minor,
+    result_amounts,
+    to_minor
+)
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone
 
 router = APIRouter()
 
+# 結果快照不可變，允許瀏覽器快取但每次使用前須以 ETag 重新驗證
+RESULT_CACHE_CONTROL = "private, no-cache"
+
+# 情境保留政策預設值（可由環境變數調整）
+SCENARIO_COMPACT_AFTER_DAYS = int(os.getenv("SCENARIO_COMPACT_AFTER_DAYS", "7"))
+SCENARIO_DROP_AFTER_DAYS = int(os.getenv("SCENARIO_DROP_AFTER_DAYS", "90"))
+SCENARIO_KEEP_LATEST = int(os.getenv("SCENARIO_KEEP_LATEST", "20"))
+
+
+# 進行中的優化請求（每個 worker 一份）
+optimize_flight = SingleFlight("optimize")
+
+
+def optimize_flight_key(request: OptimizationRequest, generation: int) -> str:
+    """優化請求的合併鍵：專案 ID、本 worker 的網路版本號與正規化後的請求參數
+    
+    其他 worker 的網路異動不會反映在版本號上；合併只發生在請求同時進行的
+    數秒內，等同於該請求稍早抵達。
+    """
+    return request_key(request, request.project_id, generation)
+
+
+def _raise_if_infeasible(request: OptimizationRequest, bounds: dict, budget: Optional[int], indirect_cost: int) -> None:
+    """依網路界限預檢請求（預算與間接成本以分計），必定無可行解時直接回應 400 與建議值"""
+    infeasible = check_feasibility(
+        bounds,
+        request.mode,
+        budget=budget,
+        duration=request.duration_constraint,
+        indirect_cost=indirect_cost,
+    )
+    if infeasible is not None:
+        raise HTTPException(status_code=400, detail=infeasible['error_message'])
+
+
+def _summarize_alternatives(best: dict, alternatives: list) -> list:
+    """替代方案與最佳解的差異：工期、總成本（換算為元）與趕工作業的增減"""
+    def crashed(result):
+        return {s['activity_id']: s['activity_name'] for s in result['schedules'] if s['is_crashed']}
+    
+    best_crashed = crashed(best)
+    summaries = []
+    for rank, alternative in enumerate(alternatives, start=1):
+        alternative_crashed = crashed(alternative)
+        summaries.append({
+            "rank": rank,
+            "optimal_duration": alternative['optimal_duration'],
+            "optimal_cost": from_minor(alternative['optimal_cost']),
+            "penalty_amount": from_minor(alternative['penalty_amount']),
+            "bonus_amount": from_minor(alternative['bonus_amount']),
+            "total_cost": from_minor(alternative['total_cost']),
+            "duration_delta": alternative['optimal_duration'] - best['optimal_duration'],
+            "cost_delta": from_minor(alternative['total_cost'] - best['total_cost']),
+            "crashed_count": len(alternative_crashed),
+            "crashed_added": [
+                {"activity_id": aid, "activity_name": name}
+                for aid, name in alternative_crashed.items() if aid not in best_crashed
+            ],
+            "crashed_removed": [
+                {"activity_id": aid, "activity_name": name}
+                for aid, name in best_crashed.items() if aid not in alternative_crashed
+            ],
+            "calculation_time": alternative['calculation_time'],
+        })
+    return summaries
+
 
 @router.post("/optimize", response_model=OptimizationResult)
-async def optimize(request: OptimizationRequest):
-    """執行投標最佳化計算"""
+async def optimize(request: OptimizationRequest, accept: Optional[str] = Header(None)):
+    """執行投標最佳化計算
+    
+    Accept 為 application/x-ndjson 或 application/vnd.apache.arrow.stream 時，
+    以串流方式分批輸出排程。
+    
+    相同專案網路版本與相同（正規化後）參數的請求若已在計算中，
+    直接等待該次結果，不重複求解與寫入（剖析中的請求除外）。
+    """
     try:
-        # 1. 取得專案的所有作業活動
-        activities_response = supabase.table("project_activities").select("*").eq("project_id", str(request.project_id)).execute()
-        if not activities_response.data:
-            raise HTTPException(status_code=404, detail="專案沒有作業活動")
+        response_format = negotiate_format(accept)
+        if response_format == "arrow" and not arrow_available():
+            raise HTTPException(status_code=406, detail="伺服器未安裝 pyarrow，無法輸出 Arrow 格式")
         
-        activities_data = activities_response.data
+        increment("optimize_requests")
+        profile = current_profile()
+        try:
+            if profile is not None:
+                # 剖析中的請求不與其他請求合併，火焰圖才會涵蓋實際的建模與求解
+                payload = await run_in_threadpool(profile.bind(_run_optimization), request)
+            else:
+                key = optimize_flight_key(request, network_generation(str(request.project_id)))
+                payload, _ = await optimize_flight.do(key, _run_optimization, request)
+        except Exception:
+            increment("optimize_failed")
+            raise
         
-        # 2. 取得前置關係
-        activity_ids = [act['id'] for act in activities_data]
-        precedences_response = supabase.table("activity_precedences").select("*").in_("activity_id", activity_ids).execute()
-        precedences = [(p['activity_id'], p['predecessor_id']) for p in precedences_response.data]
+        # 13. 依 Accept 標頭返回最佳化結果（JSON 或串流格式）
+        return render_result(payload, response_format)
         
-        # 3. 建立 Activity 物件
-        activities = [
-            Activity(
-                activity_id=act['id'],
-                name=act['name'],
-                normal_duration=act['normal_duration'],
-                normal_cost=Decimal(str(act['normal_cost'])),
-                crash_duration=act['crash_duration'],
-                crash_cost=Decimal(str(act['crash_cost']))
-            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"優化計算失敗：{str(e)}")
+
+
+def _run_optimization(request: OptimizationRequest) -> dict:
+    """讀取網路、求解並寫入情境與結果（同步執行，由執行緒池呼叫）
+    
+    Returns:
+        與 OptimizationResult 相同結構的回應內容
+    """
+    # 0. 處理可選參數，將 None 轉換為預設值；金額換算為分，求解與結果皆以分計
+    indirect_cost = request.indirect_cost if request.indirect_cost is not None else Decimal('0.0')
+    contract_amount = request.contract_amount if request.contract_amount is not None else Decimal('0.0')
+    budget_cents = optional_minor(request.budget_constraint)
+    indirect_cents = to_minor(indirect_cost)
+    
+    # 以快取的網路界限進行可行性預檢，必定無解時不讀取資料也不建模
+    # 滾動式重新優化的界限取決於實際進度，不使用整個網路的快取界限
+    rolling = request.status_date is not None
+    bounds = None if rolling else get_network_bounds(str(request.project_id))
+    if bounds is not None:
+        _raise_if_infeasible(request, bounds, budget_cents, indirect_cents)
+
+    # 1 ~ 4. 取得作業活動與前置關係，並建立 Activity 物件
+    activities_data, activities, precedences = load_project_network(request.project_id)
+    
+    # 5. 建立優化器並求解
+    if rolling:
+        # 滾動式重新優化：凍結已完成作業、固定進行中作業，只對剩餘網路建模
+        progress = {
+            act['id']: {
+                "actual_start": act.get('actual_start'),
+                "actual_finish": act.get('actual_finish'),
+                "percent_complete": act.get('percent_complete'),
+            }
             for act in activities_data
-        ]
-        
-        # 4. 處理可選參數，將 None 轉換為預設值
-        indirect_cost = request.indirect_cost if request.indirect_cost is not None else Decimal('0.0')
-        contract_amount = request.contract_amount if request.contract_amount is not None else Decimal('0.0')
-        
-        # 5. 建立優化器並求解
-        optimizer = BiddingOptimizer(activities, precedences)
-        
+        }
+        optimizer = RollingHorizonOptimizer(
+            activities, precedences, progress, request.status_date, formulation=request.formulation
+        )
+        _raise_if_infeasible(request, optimizer.calculate_network_bounds(), budget_cents, indirect_cents)
+    else:
+        # 共用產物快取有相同網路時，沿用其拓撲排序與界限，不重新計算
+        digest = network_digest(activities, precedences)
+        artifact = load_network(digest)
+        if artifact is not None:
+            increment("artifact_network_hits")
+        optimizer = BiddingOptimizer(
+            activities, precedences, formulation=request.formulation,
+            network=network_adjacency(artifact) if artifact is not None else None
+        )
+    
+    # 快取未命中時計算並快取網路界限，再做一次可行性預檢
+    if bounds is None and not rolling:
+        bounds = network_bounds(artifact) if artifact is not None else optimizer.calculate_network_bounds()
+        set_network_bounds(str(request.project_id), bounds, digest)
+        _raise_if_infeasible(request, bounds, budget_cents, indirect_cents)
+    if not rolling and artifact is None:
+        save_network(digest, activities, precedences, bounds)
+    
+    # 穩健模式：依抽樣工期情境求解趕工決策（不使用分解求解）
+    robust = request.robust
+    if robust is not None:
+        optimizer = RobustOptimizer(
+            activities,
+            precedences,
+            scenario_count=robust.scenario_count,
+            risk_measure=robust.risk_measure,
+            cvar_alpha=robust.cvar_alpha,
+            optimistic=robust.optimistic,
+            pessimistic=robust.pessimistic,
+            seed=robust.seed,
+            time_limit=robust.time_limit
+        )
+    
+    # 滾動式、穩健模式與替代方案需要單一模型，不使用權衡曲線
+    alternatives = request.alternatives
+    curve_allowed = not rolling and robust is None and alternatives is None
+    
+    # 背景已預先計算此網路的權衡曲線時，強化模型的請求直接由曲線回答，不在請求路徑上求解
+    precomputed = None
+    if curve_allowed and answers_from_curve(request.formulation, request.solve_strategy):
+        precomputed = precomputed_optimizer(activities, precedences, digest)
+    
+    # 網路可在串聯里程碑處分解時，改以區塊權衡曲線求解
+    if precomputed is not None:
+        decomposed = precomputed[0]
+    else:
+        decomposed = None if not curve_allowed else DecomposedOptimizer.from_network(
+            activities, precedences, formulation=request.formulation, strategy=request.solve_strategy
+        )
+    if decomposed is not None:
+        optimizer = decomposed
+    
+    # 依模型特徵預測求解時間，排隊時短的求解優先取得求解名額
+    features = model_features(
+        activity_count=len(optimizer.activities),
+        precedence_count=len(optimizer.precedences),
+        crashable_count=sum(
+            1 for act in optimizer.activities.values() if act.crash_duration < act.normal_duration
+        ),
+        mode=request.mode,
+        penalty_active=request.target_duration is not None and bool(request.penalty_amount or request.penalty_rate),
+        formulation=request.formulation,
+        decomposed=decomposed is not None,
+        scenario_count=robust.scenario_count if robust is not None else 0
+    )
+    predicted_time = predict_solve_time(features)
+    if alternatives is not None:
+        # 每個替代方案各需一次求解
+        predicted_time *= 1 + alternatives.count
+    tag_profile(**features, predicted_time=round(predicted_time, 3))
+    
+    with solver_scheduler.slot(str(request.project_id), predicted_time):
         if request.mode == 'budget_to_duration':
-            if not request.budget_constraint:
-                raise HTTPException(status_code=400, detail="模式一需要提供預算約束")
             result = optimizer.solve_budget_to_duration(
-                budget=request.budget_constraint,
-                indirect_cost=indirect_cost,
+                budget=budget_cents,
+                indirect_cost=indirect_cents,
                 penalty_type=request.penalty_type,
-                penalty_amount=request.penalty_amount,
+                penalty_amount=optional_minor(request.penalty_amount),
                 penalty_rate=request.penalty_rate,
-                contract_amount=contract_amount,
+                contract_amount=to_minor(contract_amount),
                 contract_duration=request.contract_duration,
                 target_duration=request.target_duration
             )
         else:  # duration_to_cost
-            if not request.duration_constraint:
-                raise HTTPException(status_code=400, detail="模式二需要提供工期約束")
             result = optimizer.solve_duration_to_cost(
                 duration=request.duration_constraint,
-                indirect_cost=indirect_cost,
+                indirect_cost=indirect_cents,
                 penalty_type=request.penalty_type,
-                penalty_amount=request.penalty_amount,
+                penalty_amount=optional_minor(request.penalty_amount),
                 penalty_rate=request.penalty_rate,
-                contract_amount=contract_amount,
+                contract_amount=to_minor(contract_amount),
                 contract_duration=request.contract_duration,
                 target_duration=request.target_duration
             )
         
-        # 6. 檢查求解結果
-        if result['status'] != 'success':
-            raise HTTPException(
-                status_code=400,
-                detail=result.get('error_message', '優化計算失敗')
-            )
-        
-        # 7. 儲存投標情境
-        scenario_data = {
-            "project_id": str(request.project_id),
-            "mode": request.mode,
-            "budget_constraint": float(request.budget_constraint) if request.budget_constraint else None,
-            "duration_constraint": request.duration_constraint,
-            "indirect_cost": float(indirect_cost),
-            "penalty_type": request.penalty_type,
-            "penalty_amount": float(request.penalty_amount) if request.penalty_amount else None,
-            "penalty_rate": float(request.penalty_rate) if request.penalty_rate else None,
-            "contract_amount": float(contract_amount),
-            "contract_duration": request.contract_duration,
-            "target_duration": request.target_duration
-        }
-        scenario_response = supabase.table("bidding_scenarios").insert(scenario_data).execute()
-        scenario_id = scenario_response.data[0]['id']
-        
-        # 8. 儲存優化結果
-        result_data = {
-            "scenario_id": scenario_id,
-            "optimal_duration": result['optimal_duration'],
-            "optimal_cost": float(result['optimal_cost']),
-            "indirect_cost": float(result['indirect_cost']),
-            "penalty_amount": float(result['penalty_amount']),
-            "bonus_amount": float(result['bonus_amount']),
-            "total_cost": float(result['total_cost']),
-            "calculation_time": result['calculation_time'],
-            "status": result['status']
-        }
-        result_response = supabase.table("optimization_results").insert(result_data).execute()
-        result_id = result_response.data[0]['id']
-        
-        # 9. 儲存作業排程
-        schedules_data = [
-            {
-                "result_id": result_id,
-                "activity_id": s['activity_id'],
-                "start_time": s['start_time'],
-                "end_time": s['end_time'],
-                "is_crashed": s['is_crashed'],
-                "duration": s['duration'],
-                "cost": float(s['cost'])
-            }
-            for s in result['schedules']
-        ]
-        supabase.table("activity_schedules").insert(schedules_data).execute()
-        
-        # 10. 建立回應
-        schedules = [
-            ActivitySchedule(
-                activity_id=UUID(s['activity_id']),
-                activity_name=s['activity_name'],
-                start_time=s['start_time'],
-                end_time=s['end_time'],
-                duration=s['duration'],
-                is_crashed=s['is_crashed'],
-                cost=s['cost']
+        # 沿用同一模型加入 no-good cut，依序求出趕工組合不同的近似最佳方案
+        # （預算 → 工期時最佳解改為同一工期下總成本最低的字典序解）
+        if alternatives is not None and result['status'] == 'success':
+            result, alternative_results = optimizer.solve_alternatives(
+                result,
+                alternatives.count,
+                cost_tolerance=alternatives.cost_tolerance,
+                duration_tolerance=alternatives.duration_tolerance
             )
-            for s in result['schedules']
-        ]
-        
-        # 11. 準備優化輸入參數
-        optimization_data = OptimizationData(
-            mode=request.mode,
-            budget_constraint=request.budget_constraint,
-            duration_constraint=request.duration_constraint,
-            indirect_cost=indirect_cost,
-            penalty_type=request.penalty_type,
-            penalty_amount=request.penalty_amount,
-            penalty_rate=request.penalty_rate,
-            contract_amount=contract_amount,
-            contract_duration=request.contract_duration,
-            target_duration=request.target_duration
+            result['alternatives'] = _summarize_alternatives(result, alternative_results)
+    
+    # 6. 檢查求解結果
+    if result['status'] != 'success':
+        raise HTTPException(
+            status_code=400,
+            detail=result.get('error_message', '優化計算失敗')
         )
-        
-        # 12. 準備作業資訊
-        activities_info = [
-            ActivityInfo(
-                id=act['id'],
-                name=act['name'],
-                normal_duration=act['normal_duration'],
-                normal_cost=Decimal(str(act['normal_cost'])),
-                crash_duration=act['crash_duration'],
-                crash_cost=Decimal(str(act['crash_cost']))
-            )
-            for act in activities_data
-        ]
-        
-        # 13. 準備前置關係資訊
-        precedences_info = [
-            PrecedenceInfo(successor=p[0], predecessor=p[1])
-            for p in precedences
-        ]
-        
-        # 14. 返回最佳化結果
-        return OptimizationResult(
-            scenario_id=UUID(scenario_id),
-            result_id=UUID(result_id),
-            optimal_duration=result['optimal_duration'],
-            optimal_cost=result['optimal_cost'],
-            indirect_cost=result['indirect_cost'],
-            penalty_amount=result['penalty_amount'],
-            bonus_amount=result['bonus_amount'],
-            total_cost=result['total_cost'],
-            calculation_time=result['calculation_time'],
-            status=result['status'],
-            error_message=None,
-            schedules=schedules,
-            created_at=datetime.now(),
-            optimization_data=optimization_data,
-            activities=activities_info,
-            precedences=precedences_info
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"優化計算失敗：{str(e)}")
+    if precomputed is not None:
+        result['precomputed'] = precomputed[1]
+    
+    # 7. 預先產生情境與結果 ID，讓回應快照能在同一次寫入時一併儲存
+    scenario_id = uuid4()
+    result_id = uuid4()
+    
+    # 8. 準備優化輸入參數
+    optimization_data = {
+        "mode": request.mode,
+        "budget_constraint": request.budget_constraint,
+        "duration_constraint": request.duration_constraint,
+        "indirect_cost": indirect_cost,
+        "penalty_type": request.penalty_type,
+        "penalty_amount": request.penalty_amount,
+        "penalty_rate": request.penalty_rate,
+        "contract_amount": contract_amount,
+        "contract_duration": request.contract_duration,
+        "target_duration": request.target_duration,
+        "formulation": request.formulation,
+        "status_date": request.status_date,
+        "robust": robust.model_dump() if robust is not None else None,
+        "alternatives": alternatives.model_dump() if alternatives is not None else None
+    }
+    
+    # 9. 建立回應內容（與 OptimizationResult 相同結構，不逐列建立 Pydantic 模型）
+    payload = build_result_payload(
+        scenario_id=scenario_id,
+        result_id=result_id,
+        result=result,
+        optimization_data=optimization_data,
+        activities=activities,
+        precedences=precedences,
+        created_at=datetime.now(timezone.utc)
+    )
+    
+    # 10. 儲存投標情境
+    scenario_data = {
+        "id": str(scenario_id),
+        "project_id": str(request.project_id),
+        "mode": request.mode,
+        "budget_constraint": float(request.budget_constraint) if request.budget_constraint else None,
+        "duration_constraint": request.duration_constraint,
+        "indirect_cost": float(indirect_cost),
+        "penalty_type": request.penalty_type,
+        "penalty_amount": float(request.penalty_amount) if request.penalty_amount else None,
+        "penalty_rate": float(request.penalty_rate) if request.penalty_rate else None,
+        "contract_amount": float(contract_amount),
+        "contract_duration": request.contract_duration,
+        "target_duration": request.target_duration,
+        "formulation": request.formulation,
+        "status_date": request.status_date,
+        "robust_options": robust.model_dump() if robust is not None else None
+    }
+    supabase.table("bidding_scenarios").insert(scenario_data).execute()
+    
+    # 11. 儲存優化結果（含完整回應快照，取得結果時只需讀取一次）
+    result_data = {
+        "id": str(result_id),
+        "scenario_id": str(scenario_id),
+        "optimal_duration": result['optimal_duration'],
+        **{key: minor_to_float(result[key]) for key in RESULT_MONEY_FIELDS},
+        "calculation_time": result['calculation_time'],
+        "status": result['status'],
+        "result_snapshot": payload,
+        "model_features": {**features, "predicted_time": round(predicted_time, 3)},
+        "robust_summary": result.get('robust')
+    }
+    supabase.table("optimization_results").insert(result_data).execute()
+    
+    # 12. 儲存作業排程（整個結果打包為一列）
+    save_schedule_pack(result_id, result['schedules'])
+    
+    return payload
+
+
+def _result_etag(result_id: str, response_format: str = "json") -> str:
+    """快照結果寫入後不再變動，以結果 ID（加上輸出格式）作為 ETag"""
+    if response_format == "json":
+        return f'"{result_id}"'
+    return f'"{result_id}-{response_format}"'
 
 
 @router.get("/scenarios/{scenario_id}/results", response_model=OptimizationResult)
-async def get_optimization_result(scenario_id: UUID):
-    """取得優化結果"""
+async def get_optimization_result(
+    scenario_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None)
+):
+    """取得優化結果
+    
+    新資料直接回傳寫入時儲存的回應快照（單次查詢），並支援 ETag / If-None-Match；
+    沒有快照的舊資料則由各關聯資料表重組。Accept 可指定 NDJSON 或 Arrow 串流格式。
+    """
     try:
-        # 取得投標情境（包含優化輸入參數）
-        scenario_response = supabase.table("bidding_scenarios").select("*").eq("id", str(scenario_id)).execute()
-        if not scenario_response.data:
-            raise HTTPException(status_code=404, detail="投標情境不存在")
+        response_format = negotiate_format(accept)
+        if response_format == "arrow" and not arrow_available():
+            raise HTTPException(status_code=406, detail="伺服器未安裝 pyarrow，無法輸出 Arrow 格式")
         
-        scenario_data = scenario_response.data[0]
-        project_id = scenario_data['project_id']
+        # 條件式請求：只查詢結果 ID 比對 ETag，未變動時回應 304
+        if if_none_match:
+            head_response = supabase.table("optimization_results").select("id").eq("scenario_id", str(scenario_id)).execute()
+            if head_response.data and if_none_match == _result_etag(head_response.data[0]['id'], response_format):
+                return Response(
+                    status_code=304,
+                    headers={"ETag": if_none_match, "Cache-Control": RESULT_CACHE_CONTROL, "Vary": "Accept"}
+                )
         
         # 取得優化結果
         result_response = supabase.table("optimization_results").select("*").eq("scenario_id", str(scenario_id)).execute()
         if not result_response.data:
+            # 區分情境不存在與結果不存在
+            scenario_check = supabase.table("bidding_scenarios").select("id").eq("id", str(scenario_id)).execute()
+            if not scenario_check.data:
+                raise HTTPException(status_code=404, detail="投標情境不存在")
             raise HTTPException(status_code=404, detail="優化結果不存在")
         
         result_data = result_response.data[0]
-        result_id = result_data['id']
-        
-        # 取得作業排程
-        schedules_response = supabase.table("activity_schedules").select(
-            "*, project_activities(name)"
-        ).eq("result_id", str(result_id)).execute()
-        
-        schedules = [
-            ActivitySchedule(
-                activity_id=UUID(s['activity_id']),
-                activity_name=s['project_activities']['name'],
-                start_time=s['start_time'],
-                end_time=s['end_time'],
-                duration=s['duration'],
-                is_crashed=s['is_crashed'],
-                cost=Decimal(str(s['cost']))
-            )
-            for s in schedules_response.data
-        ]
-        
-        # 取得專案的所有作業活動
-        activities_response = supabase.table("project_activities").select("*").eq("project_id", project_id).execute()
-        activities_info = [
-            ActivityInfo(
-                id=act['id'],
-                name=act['name'],
-                normal_duration=act['normal_duration'],
-                normal_cost=Decimal(str(act['normal_cost'])),
-                crash_duration=act['crash_duration'],
-                crash_cost=Decimal(str(act['crash_cost']))
+        if result_data.get('result_snapshot'):
+            return render_result(
+                result_data['result_snapshot'],
+                response_format,
+                headers={"ETag": _result_etag(result_data['id'], response_format), "Cache-Control": RESULT_CACHE_CONTROL}
             )
-            for act in activities_response.data
-        ]
         
-        # 取得前置關係
-        activity_ids = [act['id'] for act in activities_response.data]
-        precedences_response = supabase.table("activity_precedences").select("*").in_("activity_id", activity_ids).execute()
-        precedences_info = [
-            PrecedenceInfo(
-                successor=p['activity_id'], 
-                predecessor=p['predecessor_id']
-            )
-            for p in precedences_response.data
-        ]
+        legacy_result = _build_result_from_tables(scenario_id, result_data)
+        if response_format == "json":
+            return legacy_result
+        return render_result(legacy_result.model_dump(mode="json"), response_format)
         
-        # 建立優化輸入參數
-        optimization_data = OptimizationData(
-            mode=scenario_data['mode'],
-            budget_constraint=Decimal(str(scenario_data['budget_constraint'])) if scenario_data.get('budget_constraint') else None,
-            duration_constraint=scenario_data.get('duration_constraint'),
-            indirect_cost=Decimal(str(scenario_data.get('indirect_cost', 0))),
-            penalty_type=scenario_data.get('penalty_type', 'rate'),
-            penalty_amount=Decimal(str(scenario_data['penalty_amount'])) if scenario_data.get('penalty_amount') else None,
-            penalty_rate=Decimal(str(scenario_data['penalty_rate'])) if scenario_data.get('penalty_rate') else None,
-            contract_amount=Decimal(str(scenario_data.get('contract_amount', 0))),
-            contract_duration=scenario_data.get('contract_duration'),
-            target_duration=scenario_data.get('target_duration')
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"取得優化結果失敗：{str(e)}")
+
+
+def _amount(value) -> Decimal:
+    """資料庫金額欄位（浮點數）轉為兩位小數的 Decimal，與快照中的金額格式相同"""
+    return from_minor(to_minor(value))
+
+
+def _build_result_from_tables(scenario_id: UUID, result_data: dict) -> OptimizationResult:
+    """由關聯資料表重組優化結果（供沒有快照的舊資料使用）"""
+    # 取得投標情境（包含優化輸入參數）
+    scenario_response = supabase.table("bidding_scenarios").select("*").eq("id", str(scenario_id)).execute()
+    if not scenario_response.data:
+        raise HTTPException(status_code=404, detail="投標情境不存在")
+    
+    scenario_data = scenario_response.data[0]
+    project_id = scenario_data['project_id']
+    result_id = result_data['id']
+    
+    # 取得專案的所有作業活動
+    activities_response = supabase.table("project_activities").select("*").eq("project_id", project_id).execute()
+    activity_names = {act['id']: act['name'] for act in activities_response.data}
+    
+    # 取得作業排程（打包或逐列），已刪除的作業不列出
+    schedules = [
+        ActivitySchedule(
+            activity_id=UUID(s['activity_id']),
+            activity_name=activity_names[s['activity_id']],
+            start_time=s['start_time'],
+            end_time=s['end_time'],
+            duration=s['duration'],
+            is_crashed=s['is_crashed'],
+            cost=_amount(s['cost'])
         )
-        
-        return OptimizationResult(
-            scenario_id=UUID(result_data['scenario_id']),
-            result_id=UUID(result_id),
-            optimal_duration=result_data['optimal_duration'],
-            optimal_cost=Decimal(str(result_data['optimal_cost'])),
-            indirect_cost=Decimal(str(result_data.get('indirect_cost', 0))),
-            penalty_amount=Decimal(str(result_data['penalty_amount'])),
-            bonus_amount=Decimal(str(result_data['bonus_amount'])),
-            total_cost=Decimal(str(result_data['total_cost'])),
-            calculation_time=result_data.get('calculation_time'),
-            status=result_data['status'],
-            error_message=result_data.get('error_message'),
-            schedules=schedules,
-            created_at=datetime.fromisoformat(result_data['created_at'].replace('Z', '+00:00')),
-            optimization_data=optimization_data,
-            activities=activities_info,
-            precedences=precedences_info
+        for s in load_schedules(result_id) or []
+        if s['activity_id'] in activity_names
+    ]
+    
+    activities_info = [
+        ActivityInfo(
+            id=act['id'],
+            name=act['name'],
+            normal_duration=act['normal_duration'],
+            normal_cost=_amount(act['normal_cost']),
+            crash_duration=act['crash_duration'],
+            crash_cost=_amount(act['crash_cost'])
         )
-        
+        for act in activities_response.data
+    ]
+    
+    # 取得前置關係
+    activity_ids = [act['id'] for act in activities_response.data]
+    precedences_response = supabase.table("activity_precedences").select("*").in_("activity_id", activity_ids).execute()
+    precedences_info = [
+        PrecedenceInfo(
+            successor=p['activity_id'], 
+            predecessor=p['predecessor_id']
+        )
+        for p in precedences_response.data
+    ]
+    
+    # 建立優化輸入參數
+    optimization_data = OptimizationData(
+        mode=scenario_data['mode'],
+        budget_constraint=Decimal(str(scenario_data['budget_constraint'])) if scenario_data.get('budget_constraint') else None,
+        duration_constraint=scenario_data.get('duration_constraint'),
+        indirect_cost=Decimal(str(scenario_data.get('indirect_cost', 0))),
+        penalty_type=scenario_data.get('penalty_type', 'rate'),
+        penalty_amount=Decimal(str(scenario_data['penalty_amount'])) if scenario_data.get('penalty_amount') else None,
+        penalty_rate=Decimal(str(scenario_data['penalty_rate'])) if scenario_data.get('penalty_rate') else None,
+        contract_amount=Decimal(str(scenario_data.get('contract_amount', 0))),
+        contract_duration=scenario_data.get('contract_duration'),
+        target_duration=scenario_data.get('target_duration'),
+        formulation=scenario_data.get('formulation') or 'standard',
+        status_date=scenario_data.get('status_date'),
+        robust=scenario_data.get('robust_options')
+    )
+    
+    return OptimizationResult(
+        scenario_id=UUID(result_data['scenario_id']),
+        result_id=UUID(result_id),
+        optimal_duration=result_data['optimal_duration'],
+        optimal_cost=_amount(result_data['optimal_cost']),
+        indirect_cost=_amount(result_data.get('indirect_cost', 0)),
+        penalty_amount=_amount(result_data['penalty_amount']),
+        bonus_amount=_amount(result_data['bonus_amount']),
+        total_cost=_amount(result_data['total_cost']),
+        calculation_time=result_data.get('calculation_time'),
+        status=result_data['status'],
+        error_message=result_data.get('error_message'),
+        schedules=schedules,
+        created_at=datetime.fromisoformat(result_data['created_at'].replace('Z', '+00:00')),
+        optimization_data=optimization_data,
+        activities=activities_info,
+        precedences=precedences_info,
+        robust=result_data.get('robust_summary')
+    )
+
+
+@router.put("/scenarios/{scenario_id}/pin")
+async def pin_scenario(scenario_id: UUID, pin: ScenarioPinUpdate):
+    """釘選或取消釘選投標情境（釘選的情境不受保留政策壓縮或刪除）"""
+    try:
+        response = supabase.table("bidding_scenarios").update({"is_pinned": pin.is_pinned}).eq("id", str(scenario_id)).execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="投標情境不存在")
+        return {"scenario_id": str(scenario_id), "is_pinned": pin.is_pinned}
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"取得優化結果失敗：{str(e)}")
+        raise HTTPException(status_code=500, detail=f"更新情境釘選狀態失敗：{str(e)}")
 
+
+@router.post("/maintenance/retention", response_model=RetentionResult)
+async def apply_retention(policy: Optional[RetentionPolicy] = None):
+    """執行情境保留政策：壓縮或刪除未釘選的舊探索性情境"""
+    try:
+        policy = policy or RetentionPolicy(
+            compact_after_days=SCENARIO_COMPACT_AFTER_DAYS,
+            drop_after_days=SCENARIO_DROP_AFTER_DAYS,
+            keep_latest=SCENARIO_KEEP_LATEST
+        )
+        response = supabase.rpc("apply_scenario_retention", policy.model_dump()).execute()
+        counts = response.data[0] if response.data else {"compacted_count": 0, "dropped_count": 0}
+        return RetentionResult(**counts)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"執行保留政策失敗：{str(e)}")
+
+
+@router.post("/portfolio/optimize", response_model=PortfolioResult)
+async def optimize_portfolio(request: PortfolioRequest):
+    """多專案投資組合優化：在共同預算下分配各專案的工期與趕工
+    
+    各專案的權衡曲線平行計算後，以多選背包模型為每個專案挑選一個方案。
+    """
+    try:
+        return await run_in_threadpool(_run_portfolio, request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"投資組合優化失敗：{str(e)}")
+
+
+def _run_portfolio(request: PortfolioRequest) -> dict:
+    """讀取各專案網路並求解投資組合（同步執行，由執行緒池呼叫）"""
+    projects = []
+    predicted_time = 0.0
+    for project in request.projects:
+        _, activities, precedences = load_project_network(project.project_id)
+        projects.append({
+            "project_id": project.project_id,
+            "activities": activities,
+            "precedences": precedences,
+            "weight": project.weight,
+            "indirect_cost": to_minor(project.indirect_cost or 0),
+            "target_duration": project.target_duration,
+            "penalty_type": project.penalty_type,
+            "penalty_amount": optional_minor(project.penalty_amount),
+            "penalty_rate": project.penalty_rate,
+            "contract_amount": to_minor(project.contract_amount or 0),
+        })
+        # 以各專案單次求解的預測時間合計作為排隊依據
+        predicted_time += predict_solve_time(model_features(
+            activity_count=len(activities),
+            precedence_count=len(precedences),
+            crashable_count=sum(1 for act in activities if act.crash_duration < act.normal_duration),
+            mode='duration_to_cost',
+            penalty_active=False,
+            formulation=request.formulation
+        ))
+    
+    # 排程器以專案計算公平性，投資組合以所含專案的組合為鍵；
+    # 只占用一個求解名額，因此名額內逐一計算各專案曲線，不再展開到整個行程池
+    portfolio_key = ",".join(sorted(str(project.project_id) for project in request.projects))
+    with solver_scheduler.slot(portfolio_key, predicted_time):
+        result = PortfolioOptimizer(projects, formulation=request.formulation, max_workers=1).solve(
+            to_minor(request.budget), objective=request.objective
+        )
+    if result['status'] != 'success':
+        raise HTTPException(status_code=400, detail=result.get('error_message', '投資組合優化失敗'))
+    
+    # 金額由分換算為元（penalty 目標的目標值為加權違約金）
+    money_fields = ("budget", "total_cost") + (("objective_value",) if request.objective == "penalty" else ())
+    return {
+        **amounts(result, money_fields),
+        "allocations": [
+            amounts(allocation, ("direct_cost", "indirect_cost", "penalty_amount", "total_cost"))
+            for allocation in result['allocations']
+        ]
+    }
+
+
+@router.post("/sensitivity", response_model=SensitivityResult)
+async def sensitivity_analysis(request: SensitivityRequest):
+    """參數敏感度分析：違約金率 × 每日間接成本 × 目標工期各格點的最優工期與總成本
+    
+    格點間共用同一條按需求補齊的權衡曲線，回應的 skipped_solves 為與逐格求解
+    相比省下的求解次數；共用產物快取已有此網路的曲線時不需任何求解。
+    """
+    try:
+        increment("sensitivity_requests")
+        result = await run_in_threadpool(_run_sensitivity, request)
+        increment("sensitivity_skipped_solves", result['skipped_solves'])
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"敏感度分析失敗：{str(e)}")
+
+
+def _run_sensitivity(request: SensitivityRequest) -> dict:
+    """讀取網路並計算敏感度格點（同步執行，由執行緒池呼叫）"""
+    if request.mode == 'budget_to_duration' and not request.budget_constraint:
+        raise HTTPException(status_code=400, detail="模式一需要提供預算約束")
+    if request.mode == 'duration_to_cost' and not request.duration_constraint:
+        raise HTTPException(status_code=400, detail="模式二需要提供工期約束")
+    _, activities, precedences = load_project_network(request.project_id)
+    digest = network_digest(activities, precedences)
+    artifact = load_network(digest)
+    optimizer = BiddingOptimizer(
+        activities, precedences, formulation=request.formulation,
+        network=network_adjacency(artifact) if artifact is not None else None
+    )
+    
+    # 任一模型建構方式的曲線轉折點都相同，背景預先計算或投資組合算過的曲線皆可沿用
+    curve = None
+    for formulation in FORMULATIONS:
+        curve = load_curve(digest, formulation)
+        if curve is not None:
+            break
+    sweep = SensitivitySweep(optimizer, curve=curve)
+    
+    # 工期 → 成本只需一次求解；預算 → 工期每個間接成本至多數次二分求解
+    features = model_features(
+        activity_count=len(activities),
+        precedence_count=len(precedences),
+        crashable_count=sum(1 for act in activities if act.crash_duration < act.normal_duration),
+        mode='duration_to_cost',
+        penalty_active=False,
+        formulation=request.formulation
+    )
+    solves = 1 if request.mode == 'duration_to_cost' else len(set(request.indirect_costs))
+    predicted_time = 0.0 if curve is not None else predict_solve_time(features) * solves
+    
+    with solver_scheduler.slot(str(request.project_id), predicted_time):
+        result = sweep.sweep(
+            request.mode,
+            request.penalty_rates,
+            [to_minor(indirect_cost) for indirect_cost in request.indirect_costs],
+            request.target_durations,
+            budget=optional_minor(request.budget_constraint),
+            duration=request.duration_constraint,
+            contract_amount=to_minor(request.contract_amount or 0),
+            contract_duration=request.contract_duration
+        )
+    
+    # 格點與趕工組合的金額由分換算為元
+    result['cells'] = [amounts(cell, RESULT_MONEY_FIELDS) for cell in result['cells']]
+    result['plans'] = [amounts(plan, ("direct_cost",)) for plan in result['plans']]
+    result['precomputed'] = curve is not None
+    return result
+
+
+@router.websocket("/ws/whatif/{project_id}")
+async def whatif_session(
+    websocket: WebSocket,
+    project_id: UUID,
+    session_id: Optional[str] = None,
+    formulation: str = "standard"
+):
+    """What-if 工作階段：網路只載入一次，之後依參數差異重新求解並推送結果
+    
+    用戶端訊息（JSON）：
+    - {"type": "update", "params": {...}, "overrides": {activity_id: {...} | null}}：套用差異並重新求解
+    - {"type": "solve"}：以目前參數重新求解
+    - {"type": "reset"}：清除參數與覆寫
+    - {"type": "close"}：結束並釋放工作階段
+    
+    求解進行中收到的多筆差異會合併後只求解一次（拖曳滑桿時只計算最後狀態）。
+    伺服器訊息的 type 為 ready / result / error，result 與 error 帶有對應的 seq。
+    以 session_id 重新連線可沿用仍常駐的工作階段。
+    """
+    await websocket.accept()
+    if formulation not in FORMULATIONS:
+        await websocket.send_json({"type": "error", "detail": f"不支援的模型建構方式：{formulation}"})
+        await websocket.close(code=1008)
+        return
+    
+    session = acquire_session(session_id) if session_id else None
+    if session is not None and session.project_id != str(project_id):
+        release_session(session_id)
+        session = None
+    if session is None:
+        try:
+            _, activities, precedences = await run_in_threadpool(load_project_network, project_id)
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "detail": e.detail})
+            await websocket.close(code=1008)
+            return
+        session_id = str(uuid4())
+        session = WhatIfSession(
+            str(project_id),
+            activities,
+            precedences,
+            formulation=formulation,
+            generation=network_generation(str(project_id))
+        )
+        if not register_session(session_id, session):
+            await websocket.send_json({"type": "error", "detail": "常駐工作階段已滿，請稍後再試"})
+            await websocket.close(code=1013)
+            return
+    
+    # 尚未套用的差異：(seq, 訊息)
+    pending = []
+    wakeup = asyncio.Event()
+    
+    def apply_and_solve(messages):
+        """於執行緒中依序套用差異後求解（網路已異動或逾時則先重新載入）"""
+        if (network_generation(session.project_id) != session.generation
+                or time.monotonic() - session.loaded_at > NETWORK_BOUNDS_TTL):
+            generation = network_generation(session.project_id)
+            _, activities, precedences = load_project_network(session.project_id)
+            session.reload(activities, precedences, generation)
+        for message in messages:
+            if message.get("type") == "reset":
+                session.reset()
+            elif message.get("type") == "update":
+                session.update(message.get("params"), message.get("overrides"))
+        if session.cached():
+            return session.solve()
+        # 與其他優化請求共用求解名額，依預測時間排隊
+        with solver_scheduler.slot(session.project_id, predict_solve_time(session.model_features())):
+            return session.solve()
+    
+    async def receive_loop():
+        seq = 0
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive_json(), timeout=WHATIF_IDLE_SECONDS)
+            except (WebSocketDisconnect, asyncio.TimeoutError):
+                # 用戶端斷線或閒置逾時
+                return
+            seq += 1
+            if not isinstance(message, dict) or message.get("type") not in ("update", "solve", "reset", "close"):
+                await websocket.send_json({"type": "error", "seq": seq, "detail": "不支援的訊息"})
+                continue
+            if message["type"] == "close":
+                drop_session(session_id)
+                return
+            pending.append((seq, message))
+            wakeup.set()
+    
+    async def solve_loop():
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            batch = pending[:]
+            pending.clear()
+            seq = batch[-1][0]
+            try:
+                result = await run_in_threadpool(apply_and_solve, [message for _, message in batch])
+                # 長時間連線中持續求解也算使用中，更新最後使用時間
+                touch_session(session_id)
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "seq": seq, "detail": e.detail})
+                continue
+            except ValueError as e:
+                # 參數或覆寫不合法
+                await websocket.send_json({"type": "error", "seq": seq, "detail": str(e)})
+                continue
+            except Exception as e:
+                await websocket.send_json({"type": "error", "seq": seq, "detail": f"優化計算失敗：{str(e)}"})
+                continue
+            if result['status'] != 'success':
+                await websocket.send_json({"type": "error", "seq": seq, "detail": result.get('error_message', '優化計算失敗')})
+                continue
+            await websocket.send_json({"type": "result", "seq": seq, "result": to_jsonable_python(result_amounts(result))})
+    
+    tasks = []
+    try:
+        await websocket.send_json({
+            "type": "ready",
+            "session_id": session_id,
+            "activity_count": len(session.base_activities),
+            "params": to_jsonable_python(session.params),
+            "overrides": session.overrides,
+            "bounds": to_jsonable_python(amounts(await run_in_threadpool(session.bounds), BOUNDS_MONEY_FIELDS))
+        })
+        tasks = [asyncio.create_task(receive_loop()), asyncio.create_task(solve_loop())]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        # 用戶端已斷線（送出訊息或關閉連線時）
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        release_session(session_id)
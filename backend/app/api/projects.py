@@ -1,21 +1,48 @@
 """
 專案管理 API 路由
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import List, Optional
 from uuid import UUID
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListItem
 from app.utils.supabase_client import supabase
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    keyset_page,
+    search_pattern,
+    select_columns,
+    split_page
+)
+from app.utils.network_cache import invalidate_network
 
 router = APIRouter()
 
 
-@router.get("/projects", response_model=List[ProjectResponse])
-async def get_projects():
-    """取得所有專案列表"""
+@router.get("/projects", response_model=List[ProjectListItem], response_model_exclude_unset=True)
+async def get_projects(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="上一頁回應的 X-Next-Cursor 標頭"),
+    fields: Optional[str] = Query(None, description="只回傳的欄位（以逗號分隔，例如 name,status）"),
+    status: Optional[str] = Query(None, description="依專案狀態篩選"),
+    q: Optional[str] = Query(None, min_length=1, description="依專案名稱搜尋（部分符合、不分大小寫）")
+):
+    """取得專案列表（依建立時間新到舊，以游標分頁）"""
+    columns = select_columns(fields, ProjectListItem.model_fields)
     try:
-        response = supabase.table("projects").select("*").order("created_at", desc=True).execute()
-        return response.data
+        query = supabase.table("projects").select(columns)
+        if status:
+            query = query.eq("status", status)
+        if q:
+            query = query.ilike("name", search_pattern(q))
+        rows, next_cursor = split_page(keyset_page(query, cursor, limit, desc=True).execute().data, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return rows
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"取得專案列表失敗：{str(e)}")
 
@@ -70,6 +97,7 @@ async def delete_project(project_id: UUID):
         response = supabase.table("projects").delete().eq("id", str(project_id)).execute()
         if not response.data:
             raise HTTPException(status_code=404, detail="專案不存在")
+        invalidate_network(str(project_id))
         return None
     except HTTPException:
         raise
@@ -0,0 +1,69 @@
+"""
+報告匯出 API 路由
+由儲存的優化結果產生 Excel / PDF 報告並以串流方式下載
+"""
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from uuid import UUID
+from datetime import datetime
+import os
+from app.utils.supabase_client import supabase
+from app.utils.schedule_store import iter_schedules
+from app.utils.metrics import increment
+from app.utils.report_export import REPORT_FORMATS, summary_items, schedule_rows, write_report
+
+router = APIRouter()
+
+# 讀取結果摘要的欄位（不讀取回應快照，避免大型專案整份快照載入記憶體）
+REPORT_RESULT_COLUMNS = (
+    "id, optimal_duration, optimal_cost, indirect_cost, penalty_amount, bonus_amount, "
+    "total_cost, calculation_time, created_at, robust_summary"
+)
+
+
+def _build_report(scenario_id: UUID, report_format: str) -> str:
+    """讀取結果摘要與作業名稱，逐筆讀取排程並寫出報告暫存檔（同步執行，由執行緒池呼叫）"""
+    scenario_response = supabase.table("bidding_scenarios").select("project_id").eq("id", str(scenario_id)).execute()
+    if not scenario_response.data:
+        raise HTTPException(status_code=404, detail="投標情境不存在")
+    project_id = scenario_response.data[0]['project_id']
+
+    result_response = supabase.table("optimization_results").select(REPORT_RESULT_COLUMNS).eq("scenario_id", str(scenario_id)).execute()
+    if not result_response.data:
+        raise HTTPException(status_code=404, detail="優化結果不存在")
+    result_data = result_response.data[0]
+
+    activities_response = supabase.table("project_activities").select("id, name").eq("project_id", project_id).execute()
+    activity_names = {act['id']: act['name'] for act in activities_response.data}
+
+    rows = schedule_rows(iter_schedules(result_data['id']), activity_names)
+    return write_report(report_format, summary_items(result_data), rows)
+
+
+@router.get("/scenarios/{scenario_id}/export/{report_format}")
+async def export_report(scenario_id: UUID, report_format: str):
+    """下載情境的優化結果報告（report_format 為 xlsx 或 pdf）
+
+    報告在執行緒池中寫入暫存檔（不佔用事件迴圈），回應以分塊串流送出，送出後刪除暫存檔。
+    """
+    if report_format not in REPORT_FORMATS:
+        raise HTTPException(status_code=404, detail="不支援的報告格式，請使用 xlsx 或 pdf")
+    try:
+        increment("report_exports")
+        path = await run_in_threadpool(_build_report, scenario_id, report_format)
+    except HTTPException:
+        raise
+    except Exception as e:
+        increment("report_export_failed")
+        raise HTTPException(status_code=500, detail=f"匯出報告失敗：{str(e)}")
+
+    media_type, extension = REPORT_FORMATS[report_format]
+    filename = f"進度成本最佳化報告_{datetime.now().strftime('%Y-%m-%d')}.{extension}"
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        background=BackgroundTask(os.remove, path)
+    )
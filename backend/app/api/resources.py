@@ -0,0 +1,237 @@
+"""
+資源管理與資源平準化 API 路由
+"""
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from uuid import UUID
+from app.schemas.resource import (
+    ResourceCreate,
+    ResourceUpdate,
+    ResourceResponse,
+    LevelingRequest,
+    LevelingResult
+)
+from app.models.resource_leveling import ResourceLeveler
+from app.utils.supabase_client import supabase
+from app.utils.schedule_store import load_schedules
+from app.utils.metrics import increment
+
+router = APIRouter()
+
+
+def _raise_if_name_taken(project_id: str, name: str, resource_id: Optional[str] = None) -> None:
+    """同一專案的資源名稱不可重複"""
+    query = supabase.table("project_resources").select("id").eq("project_id", project_id).eq("name", name)
+    if resource_id is not None:
+        query = query.neq("id", resource_id)
+    if query.execute().data:
+        raise HTTPException(status_code=409, detail=f"資源名稱已存在：{name}")
+
+
+@router.get("/projects/{project_id}/resources", response_model=List[ResourceResponse])
+async def get_resources(project_id: UUID):
+    """取得專案的資源列表"""
+    try:
+        response = supabase.table("project_resources").select("*").eq("project_id", str(project_id)).order("created_at").execute()
+        return response.data
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"取得資源列表失敗：{str(e)}")
+
+
+@router.post("/projects/{project_id}/resources", response_model=ResourceResponse, status_code=201)
+async def create_resource(project_id: UUID, resource: ResourceCreate):
+    """建立專案資源"""
+    try:
+        project_check = supabase.table("projects").select("id").eq("id", str(project_id)).execute()
+        if not project_check.data:
+            raise HTTPException(status_code=404, detail="專案不存在")
+        _raise_if_name_taken(str(project_id), resource.name)
+
+        resource_data = resource.model_dump()
+        resource_data['project_id'] = str(project_id)
+        response = supabase.table("project_resources").insert(resource_data).execute()
+        return response.data[0]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"建立資源失敗：{str(e)}")
+
+
+@router.put("/resources/{resource_id}", response_model=ResourceResponse)
+async def update_resource(resource_id: UUID, resource: ResourceUpdate):
+    """更新資源名稱、容量或單位"""
+    try:
+        update_data = resource.model_dump(exclude_unset=True)
+        if update_data.get('name') is not None:
+            current = supabase.table("project_resources").select("project_id").eq("id", str(resource_id)).execute()
+            if not current.data:
+                raise HTTPException(status_code=404, detail="資源不存在")
+            _raise_if_name_taken(current.data[0]['project_id'], update_data['name'], str(resource_id))
+        if update_data:
+            response = supabase.table("project_resources").update(update_data).eq("id", str(resource_id)).execute()
+        else:
+            response = supabase.table("project_resources").select("*").eq("id", str(resource_id)).execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="資源不存在")
+        return response.data[0]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"更新資源失敗：{str(e)}")
+
+
+@router.delete("/resources/{resource_id}", status_code=204)
+async def delete_resource(resource_id: UUID):
+    """刪除資源（會連帶刪除各作業對此資源的需求）"""
+    try:
+        response = supabase.table("project_resources").delete().eq("id", str(resource_id)).execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="資源不存在")
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"刪除資源失敗：{str(e)}")
+
+
+@router.post("/projects/{project_id}/resource-leveling", response_model=LevelingResult)
+async def level_resources(project_id: UUID, request: LevelingRequest):
+    """資源平準化：在資源容量限制下重新排定作業開始時間
+
+    提供 scenario_id 時沿用該情境優化結果的工期（含趕工決策），並以其排程作為
+    比較基準；否則使用正常工期與不考慮資源的最早開始排程。
+    情境為滾動式重新優化（有資料日期）時，已完成與進行中的作業固定於實際開始時間，
+    其餘作業不早於資料日期開始。
+    """
+    try:
+        increment("leveling_requests")
+        return await run_in_threadpool(_run_leveling, project_id, request)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"資源平準化失敗：{str(e)}")
+
+
+def _run_leveling(project_id: UUID, request: LevelingRequest) -> dict:
+    """讀取網路、資源與需求並執行平準化（同步執行，由執行緒池呼叫）"""
+    activities_response = supabase.table("project_activities").select("id, name, normal_duration, actual_start, actual_finish").eq("project_id", str(project_id)).execute()
+    if not activities_response.data:
+        raise HTTPException(status_code=404, detail="專案沒有作業活動")
+    activities = {act['id']: act for act in activities_response.data}
+
+    resources = supabase.table("project_resources").select("id, name, capacity").eq("project_id", str(project_id)).execute().data
+    if not resources:
+        raise HTTPException(status_code=400, detail="專案尚未設定資源")
+
+    activity_ids = list(activities)
+    precedences_response = supabase.table("activity_precedences").select("*").in_("activity_id", activity_ids).execute()
+    precedences = [(p['activity_id'], p['predecessor_id']) for p in precedences_response.data]
+    demands_response = supabase.table("activity_resource_demands").select("activity_id, resource_id, quantity").in_("activity_id", activity_ids).execute()
+    demands = {}
+    for row in demands_response.data:
+        demands.setdefault(row['activity_id'], {})[row['resource_id']] = row['quantity']
+
+    # 工期：情境結果的實際工期（含趕工），結果之後新增的作業使用正常工期
+    durations = {aid: act['normal_duration'] for aid, act in activities.items()}
+    baseline_starts = None
+    fixed_starts = {}
+    release = 0
+    if request.scenario_id is not None:
+        scenario_response = supabase.table("bidding_scenarios").select("project_id, status_date").eq("id", str(request.scenario_id)).execute()
+        if not scenario_response.data or scenario_response.data[0]['project_id'] != str(project_id):
+            raise HTTPException(status_code=404, detail="投標情境不存在")
+        result_response = supabase.table("optimization_results").select("id, status").eq("scenario_id", str(request.scenario_id)).execute()
+        if not result_response.data or result_response.data[0]['status'] != 'success':
+            raise HTTPException(status_code=404, detail="優化結果不存在")
+        baseline_starts = {}
+        for schedule in load_schedules(result_response.data[0]['id']) or []:
+            if schedule['activity_id'] in durations:
+                durations[schedule['activity_id']] = schedule['duration']
+                baseline_starts[schedule['activity_id']] = schedule['start_time']
+
+        # 資料日期前已完成或已開工的作業不可重新排定（判斷方式同 frozen_schedule）
+        status_date = scenario_response.data[0].get('status_date')
+        if status_date is not None:
+            release = status_date
+            for aid, act in activities.items():
+                actual_start, actual_finish = act.get('actual_start'), act.get('actual_finish')
+                started = (actual_finish is not None and actual_finish <= status_date) or (
+                    actual_start is not None and actual_start <= status_date
+                )
+                if started and aid in baseline_starts:
+                    fixed_starts[aid] = actual_start if actual_start is not None else baseline_starts[aid]
+
+    labels = {aid: act['name'] for aid, act in activities.items()}
+    labels.update({res['id']: res['name'] for res in resources})
+    leveler = ResourceLeveler(
+        activity_ids,
+        durations,
+        precedences,
+        {res['id']: res['capacity'] for res in resources},
+        demands,
+        labels=labels,
+        fixed_starts=fixed_starts,
+        release=release
+    )
+    result = leveler.level(
+        methods=tuple(request.methods),
+        rule=request.priority_rule,
+        starts=request.starts,
+        seed=request.seed
+    )
+
+    # 比較基準：情境結果的排程，或不考慮資源的最早開始排程
+    baseline = dict(zip(leveler.ids, leveler.earliest_start.tolist()))
+    if baseline_starts:
+        baseline.update(baseline_starts)
+    baseline_usage = leveler.profile_of(baseline)
+    usage = result['usage']
+
+    start_times = result['start_times']
+    schedules = [
+        {
+            "activity_id": aid,
+            "activity_name": activities[aid]['name'],
+            "start_time": start_times[aid],
+            "end_time": start_times[aid] + durations[aid],
+            "duration": durations[aid],
+            "shift": start_times[aid] - baseline[aid],
+            "fixed": aid in fixed_starts,
+        }
+        for aid in leveler.ids
+    ]
+    schedules.sort(key=lambda item: (item['start_time'], item['activity_name']))
+
+    resource_usage = []
+    for q, res in enumerate(resources):
+        column = usage[:, q]
+        baseline_column = baseline_usage[:, q]
+        resource_usage.append({
+            "resource_id": res['id'],
+            "name": res['name'],
+            "capacity": res['capacity'],
+            "peak": int(column.max()) if column.size else 0,
+            "average_usage": round(float(column.mean()), 3) if column.size else 0.0,
+            "baseline_peak": int(baseline_column.max()) if baseline_column.size else 0,
+            "baseline_overloaded_days": int((baseline_column > res['capacity']).sum()),
+            "profile": column.tolist(),
+        })
+
+    return {
+        "project_id": project_id,
+        "scenario_id": request.scenario_id,
+        "makespan": result['makespan'],
+        "baseline_duration": result['baseline_duration'],
+        "delay": result['makespan'] - result['baseline_duration'],
+        "method": result['method'],
+        "priority_rule": request.priority_rule,
+        "seed": result['seed'],
+        "runs": result['runs'],
+        "workers": result['workers'],
+        "calculation_time": result['calculation_time'],
+        "schedules": schedules,
+        "resources": resource_usage,
+    }
@@ -0,0 +1,139 @@
+"""
+情境歷史 API 路由
+由觸發器維護的 scenario_summaries 列出專案的投標情境，並比較兩個情境的結果與趕工決策
+"""
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
+from uuid import UUID
+from decimal import Decimal
+from app.schemas.optimization import ScenarioSummary, ScenarioComparison
+from app.utils.supabase_client import supabase
+from app.utils.money import from_minor, to_minor
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    keyset_page,
+    select_columns,
+    split_page
+)
+
+router = APIRouter()
+
+# 比較時計算差值的結果欄位
+COMPARED_COLUMNS = (
+    "optimal_duration",
+    "optimal_cost",
+    "penalty_amount",
+    "bonus_amount",
+    "total_cost",
+    "calculation_time",
+)
+
+# 摘要中的金額欄位（資料庫數值統一為兩位小數，與優化結果回應的格式相同）
+MONEY_COLUMNS = (
+    "budget_constraint",
+    "indirect_cost",
+    "penalty_fixed_amount",
+    "contract_amount",
+    "optimal_cost",
+    "penalty_amount",
+    "bonus_amount",
+    "total_cost",
+)
+
+
+def _with_amounts(row: dict) -> dict:
+    """摘要列的金額欄位轉為兩位小數的 Decimal"""
+    return {
+        key: from_minor(to_minor(value)) if key in MONEY_COLUMNS and value is not None else value
+        for key, value in row.items()
+    }
+
+
+@router.get(
+    "/projects/{project_id}/scenarios",
+    response_model=List[ScenarioSummary],
+    response_model_exclude_unset=True
+)
+async def get_scenarios(
+    project_id: UUID,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="每頁筆數"),
+    cursor: Optional[str] = Query(None, description="上一頁回應的 X-Next-Cursor 標頭"),
+    fields: Optional[str] = Query(None, description="只回傳的欄位（以逗號分隔，例如 mode,total_cost）"),
+    mode: Optional[str] = Query(None, description="依優化模式篩選"),
+    pinned: Optional[bool] = Query(None, description="只列出釘選（true）或未釘選（false）的情境"),
+    status: Optional[str] = Query(None, description="依結果狀態篩選")
+):
+    """取得專案的投標情境摘要（依建立時間新到舊，以游標分頁）"""
+    columns = select_columns(fields, ScenarioSummary.model_fields, key="scenario_id")
+    try:
+        query = supabase.table("scenario_summaries").select(columns).eq("project_id", str(project_id))
+        if mode:
+            query = query.eq("mode", mode)
+        if pinned is not None:
+            query = query.eq("is_pinned", pinned)
+        if status:
+            query = query.eq("status", status)
+        rows = keyset_page(query, cursor, limit, desc=True, key="scenario_id").execute().data
+        rows, next_cursor = split_page(rows, limit, key="scenario_id")
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return [_with_amounts(row) for row in rows]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"取得情境列表失敗：{str(e)}")
+
+
+def _delta(base, other) -> Optional[Decimal]:
+    if base is None or other is None:
+        return None
+    return Decimal(str(other)) - Decimal(str(base))
+
+
+@router.get("/scenarios/compare", response_model=ScenarioComparison)
+async def compare_scenarios(
+    base: UUID = Query(..., description="比較基準情境 ID"),
+    other: UUID = Query(..., description="比較對象情境 ID")
+):
+    """比較兩個情境的結果摘要與趕工決策
+
+    只讀取兩列摘要與差異作業的名稱，不讀取回應快照或排程。
+    """
+    try:
+        response = supabase.table("scenario_summaries").select("*").in_("scenario_id", [str(base), str(other)]).execute()
+        summaries = {row['scenario_id']: row for row in response.data}
+        missing = [str(sid) for sid in (base, other) if str(sid) not in summaries]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"投標情境不存在：{', '.join(missing)}")
+        base_row, other_row = _with_amounts(summaries[str(base)]), _with_amounts(summaries[str(other)])
+        if base_row['project_id'] != other_row['project_id']:
+            raise HTTPException(status_code=400, detail="只能比較同一專案的情境")
+
+        base_crashed = set(base_row['crashed_activity_ids'] or [])
+        other_crashed = set(other_row['crashed_activity_ids'] or [])
+        only_base = sorted(base_crashed - other_crashed)
+        only_other = sorted(other_crashed - base_crashed)
+
+        names = {}
+        if only_base or only_other:
+            names_response = supabase.table("project_activities").select("id, name").in_("id", only_base + only_other).execute()
+            names = {act['id']: act['name'] for act in names_response.data}
+
+        def crashed_list(ids):
+            return [{"activity_id": aid, "activity_name": names.get(aid, "（已刪除）")} for aid in ids]
+
+        return ScenarioComparison(
+            base=base_row,
+            other=other_row,
+            deltas={column: _delta(base_row.get(column), other_row.get(column)) for column in COMPARED_COLUMNS},
+            crashed_only_in_base=crashed_list(only_base),
+            crashed_only_in_other=crashed_list(only_other),
+            crashed_in_both_count=len(base_crashed & other_crashed)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"比較情境失敗：{str(e)}")
@@ -9,20 +9,37 @@ from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 import time
 
-import pulp
+from app.models.network import (
+    build_adjacency,
+    critical_path_length,
+    topological_order,
+    transitive_reduction,
+)
+from app.utils.lazy_import import lazy_module
+from app.utils.money import MINOR_UNITS, from_minor, round_minor
+
+# PuLP 在第一次建模時才匯入，縮短冷啟動時間
+pulp = lazy_module("pulp")
+
+# 可選用的模型建構方式：
+#   standard：原始模型，時間變數皆為整數
+#   tight：強化模型，時間變數為連續、獎懲拆解並加上上限、移除多餘約束
+FORMULATIONS = ("standard", "tight")
 
 
 class Activity:
     """作業活動類別
 
+    成本皆以分為單位的整數表示（見 app.utils.money），建立前由呼叫端換算。
+
     Attributes:
         id: 作業 ID（資料表主鍵）
         name: 作業名稱
         normal_duration: 正常工期（天）
-        normal_cost: 正常施工成本
+        normal_cost: 正常施工成本（分）
         crash_duration: 趕工工期（天）
-        crash_cost: 趕工成本
-        crash_slope: 單位縮短 1 天的趕工追加成本
+        crash_cost: 趕工成本（分）
+        crash_slope: 單位縮短 1 天的趕工追加成本（分）
     """
 
     def __init__(
@@ -30,20 +47,20 @@ class Activity:
         activity_id: str,
         name: str,
         normal_duration: int,
-        normal_cost: Decimal,
+        normal_cost: int,
         crash_duration: int,
-        crash_cost: Decimal,
+        crash_cost: int,
     ) -> None:
         self.id = activity_id
         self.name = name
         self.normal_duration = int(normal_duration)
-        self.normal_cost = float(normal_cost)
+        self.normal_cost = int(normal_cost)
         self.crash_duration = int(crash_duration)
-        self.crash_cost = float(crash_cost)
+        self.crash_cost = int(crash_cost)
 
         # 計算趕工成本斜率（若沒有縮短空間則為 0）
         if self.normal_duration > self.crash_duration:
-            self.crash_slope = float(crash_cost - normal_cost) / float(
+            self.crash_slope = (self.crash_cost - self.normal_cost) / (
                 self.normal_duration - self.crash_duration
             )
         else:
@@ -56,206 +73,508 @@ class BiddingOptimizer:
     以 MILP 形式建模兩種模式：
     1. 給定預算，求最短工期（Budget → Duration）
     2. 給定工期，求最低成本（Duration → Cost）
+
+    金額參數（預算、每日間接成本、每日違約金、契約價金）與結果中的金額皆為
+    分為單位的整數；違約金率為比率，仍以 Decimal 傳入。
     """
 
-    def __init__(self, activities: List[Activity], precedences: List[Tuple[str, str]]):
+    def __init__(
+        self,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        formulation: str = "standard",
+        solver: Optional[pulp.LpSolver] = None,
+        network: Optional[Tuple[Dict[str, List[str]], List[str]]] = None,
+    ):
         """
         初始化優化器
 
         Args:
             activities: 作業活動列表
             precedences: 前置關係列表，格式為 [(後續作業ID, 前置作業ID), ...]
+            formulation: 模型建構方式，"standard" 或 "tight"
+            solver: PuLP 求解器（預設為靜默模式的 CBC）
+            network: 已算好的 (前置鄰接表, 拓撲排序)，例如共用產物快取還原的結果
         """
+        if formulation not in FORMULATIONS:
+            raise ValueError(f"不支援的模型建構方式：{formulation}")
+
         self.activities: Dict[str, Activity] = {act.id: act for act in activities}
         self.precedences = precedences
+        self.formulation = formulation
+        self.solver = solver if solver is not None else pulp.PULP_CBC_CMD(msg=0)
         self.problem: Optional[pulp.LpProblem] = None
+        self._network_cache: Optional[Tuple[Dict[str, List[str]], List[str]]] = network
+        self._constraint_cache: Optional[Tuple[List[Tuple[str, str]], List[str]]] = None
+        # 最近一次成功求解的模型狀態（變數、成本與獎懲項、結果參數），供求解替代方案
+        self._solved: Optional[Dict] = None
 
     # ------------------------------------------------------------------
     # 一些輔助：用關鍵路徑法估算正常工期與最短工期（全部趕工）
     # ------------------------------------------------------------------
 
+    def _network(self) -> Tuple[Dict[str, List[str]], List[str]]:
+        """取得（並快取）前置鄰接表與拓撲排序"""
+        if self._network_cache is None:
+            predecessors, successors = build_adjacency(
+                self.activities.keys(), self.precedences
+            )
+            order, _ = topological_order(predecessors, successors)
+            self._network_cache = (predecessors, order)
+        return self._network_cache
+
     def _calculate_normal_duration(self) -> int:
         """計算正常工期（全部使用正常工期）"""
-        earliest_start: Dict[str, int] = {}
-        visited: set[str] = set()
-
-        def get_earliest_start(act_id: str) -> int:
-            if act_id in earliest_start:
-                return earliest_start[act_id]
-            if act_id in visited:
-                # 有循環時直接回 0，避免無窮遞迴
-                return 0
-            visited.add(act_id)
-
-            if act_id not in self.activities:
-                return 0
-
-            act = self.activities[act_id]
-            min_start = 0
-
-            # 找出所有前置作業
-            for successor_id, predecessor_id in self.precedences:
-                if successor_id == act_id and predecessor_id in self.activities:
-                    pred_start = get_earliest_start(predecessor_id)
-                    pred_act = self.activities[predecessor_id]
-                    pred_end = pred_start + pred_act.normal_duration
-                    min_start = max(min_start, pred_end)
-
-            earliest_start[act_id] = min_start
-            return min_start
-
-        for aid in self.activities.keys():
-            get_earliest_start(aid)
-
-        normal_duration = 0
-        for aid, act in self.activities.items():
-            start_time = earliest_start.get(aid, 0)
-            end_time = start_time + act.normal_duration
-            normal_duration = max(normal_duration, end_time)
+        predecessors, order = self._network()
+        durations = {aid: act.normal_duration for aid, act in self.activities.items()}
+        normal_duration, _ = critical_path_length(durations, predecessors, order)
         return normal_duration
 
     def _calculate_min_duration(self) -> int:
         """計算最短可能工期（全部作業皆趕工）"""
-        earliest_start: Dict[str, int] = {}
-        visited: set[str] = set()
-
-        def get_earliest_start(act_id: str) -> int:
-            if act_id in earliest_start:
-                return earliest_start[act_id]
-            if act_id in visited:
-                return 0
-            visited.add(act_id)
-
-            if act_id not in self.activities:
-                return 0
-
-            act = self.activities[act_id]
-            min_start = 0
-
-            for successor_id, predecessor_id in self.precedences:
-                if successor_id == act_id and predecessor_id in self.activities:
-                    pred_start = get_earliest_start(predecessor_id)
-                    pred_act = self.activities[predecessor_id]
-                    pred_end = pred_start + pred_act.crash_duration
-                    min_start = max(min_start, pred_end)
-
-            earliest_start[act_id] = min_start
-            return min_start
-
-        for aid in self.activities.keys():
-            get_earliest_start(aid)
-
-        min_duration = 0
-        for aid, act in self.activities.items():
-            start_time = earliest_start.get(aid, 0)
-            end_time = start_time + act.crash_duration
-            min_duration = max(min_duration, end_time)
+        predecessors, order = self._network()
+        durations = {aid: act.crash_duration for aid, act in self.activities.items()}
+        min_duration, _ = critical_path_length(durations, predecessors, order)
         return min_duration
 
-    def _calculate_min_cost(self, indirect_cost: Decimal = Decimal("0")) -> Decimal:
+    def _calculate_min_cost(self, indirect_cost: int = 0) -> int:
         """計算在不趕工情況下的最小可能成本（正常直接成本 + 間接成本）"""
         min_direct_cost = sum(act.normal_cost for act in self.activities.values())
         normal_duration = self._calculate_normal_duration()
-        min_total_cost = Decimal(str(min_direct_cost)) + indirect_cost * normal_duration
-        return min_total_cost
+        return min_direct_cost + indirect_cost * normal_duration
+
+    def calculate_network_bounds(self) -> Dict:
+        """計算與求解參數無關的網路界限，供求解前的可行性檢查使用
+
+        Returns:
+            包含 normal_duration（全部正常工期）、crash_duration（全部趕工工期）、
+            min_direct_cost（最小直接成本）、max_crash_cost（所有可縮短作業的
+            趕工追加成本總和，兩者皆為分）與 activity_count 的字典
+        """
+        return {
+            "normal_duration": self._calculate_normal_duration(),
+            "crash_duration": self._calculate_min_duration(),
+            "min_direct_cost": sum(act.normal_cost for act in self.activities.values()),
+            "max_crash_cost": sum(
+                act.crash_cost - act.normal_cost
+                for act in self.activities.values()
+                if act.normal_duration > act.crash_duration
+            ),
+            "activity_count": len(self.activities),
+        }
 
     # ------------------------------------------------------------------
-    # 模式一：預算 → 工期
+    # 時間—成本權衡曲線
     # ------------------------------------------------------------------
 
-    def solve_budget_to_duration(
-        self,
-        budget: Decimal,
-        indirect_cost: Decimal = Decimal("0.0"),
-        penalty_type: str = "rate",
-        penalty_amount: Optional[Decimal] = None,
-        penalty_rate: Optional[Decimal] = None,
-        contract_amount: Decimal = Decimal("0.0"),
-        contract_duration: Optional[int] = None,
-        target_duration: Optional[int] = None,
-    ) -> Dict:
-        """
-        模式一：給定預算，求最短工期（同時考慮獎懲）
+    def _earliest_schedule(self, crashed: set) -> Tuple[int, Dict[str, int]]:
+        """依趕工決策以 CPM 前推取得最早開始時間與完工工期"""
+        predecessors, order = self._network()
+        durations = {
+            aid: act.crash_duration if aid in crashed else act.normal_duration
+            for aid, act in self.activities.items()
+        }
+        return critical_path_length(durations, predecessors, order)
+
+    def compute_tradeoff_curve(self) -> List[Dict]:
+        """計算直接成本對工期的權衡曲線（只保留轉折點）
+
+        從全部正常工期開始逐步收緊工期上限求最低直接成本。某次求得的趕工組合
+        實際完工時間為 L 時，同一組合對 [L, 上限] 內所有工期都是最優解，
+        下一次直接從 L - 1 開始，因此求解次數等於轉折點數而非工期範圍。
+
+        Returns:
+            依工期遞增排列的轉折點，每點包含 duration（實際完工工期）、
+            direct_cost（分）、crashed（趕工作業 ID 列表）與 start_times（最早開始時間）；
+            任一工期 D 的最低直接成本即為 duration <= D 的最後一點
         """
-        start_time = time.time()
+        points: List[Dict] = []
+        crash_duration = self._calculate_min_duration()
+        horizon = self._calculate_normal_duration()
+
+        while horizon >= crash_duration:
+            result = self.solve_duration_to_cost(horizon)
+            if result["status"] != "success":
+                raise RuntimeError(result.get("error_message", "權衡曲線求解失敗"))
+
+            crashed = {s["activity_id"] for s in result["schedules"] if s["is_crashed"]}
+            makespan, start_times = self._earliest_schedule(crashed)
+            points.append(
+                {
+                    "duration": makespan,
+                    "direct_cost": result["optimal_cost"],
+                    "crashed": sorted(crashed),
+                    "start_times": start_times,
+                }
+            )
+            horizon = makespan - 1
 
-        self.problem = pulp.LpProblem("Budget_To_Duration", pulp.LpMinimize)
+        points.reverse()
+        return points
 
-        # 決策變數
+    # ------------------------------------------------------------------
+    # 模型建構輔助
+    # ------------------------------------------------------------------
+
+    def _create_variables(
+        self, t_low: int = 0, t_up: Optional[int] = None
+    ) -> Tuple[Dict[str, pulp.LpVariable], Dict[str, pulp.LpVariable], pulp.LpVariable]:
+        """建立決策變數 x（開始時間）、y（是否趕工）與 T（總工期）
+
+        強化模型中，給定 y 之後前置約束矩陣為全單模（totally unimodular），
+        且工期皆為整數，因此 x 與 T 可放寬為連續變數而不影響最優解的整數性。
+        """
+        time_cat = "Continuous" if self.formulation == "tight" else "Integer"
         x = {
-            act_id: pulp.LpVariable(f"x_{act_id}", lowBound=0, cat="Integer")
+            act_id: pulp.LpVariable(f"x_{act_id}", lowBound=0, cat=time_cat)
             for act_id in self.activities.keys()
         }
         y = {
             act_id: pulp.LpVariable(f"y_{act_id}", cat="Binary")
             for act_id in self.activities.keys()
         }
-        T = pulp.LpVariable("T", lowBound=0, cat="Integer")
+        T = pulp.LpVariable("T", lowBound=t_low, upBound=t_up, cat=time_cat)
+        return x, y, T
 
-        # 目標函數：最小化工期 + 違約金 - 趕工獎金
-        penalty_term = 0
-        bonus_term = 0
+    @staticmethod
+    def _duration_expr(act: Activity, y_var: pulp.LpVariable):
+        """作業實際工期：正常工期 × (1 - y) + 趕工工期 × y"""
+        return act.normal_duration * (1 - y_var) + act.crash_duration * y_var
 
-        if target_duration:
-            # penalty_days >= max(T - target_duration, 0)
-            penalty_days = pulp.LpVariable("penalty_days", lowBound=0, cat="Integer")
-            self.problem += penalty_days >= T - target_duration
-            self.problem += penalty_days >= 0
-
-            if penalty_type == "fixed" and penalty_amount:
-                penalty_term = float(penalty_amount) * penalty_days
-            elif penalty_type == "rate" and penalty_rate and contract_amount:
-                daily_penalty = float(penalty_rate) * float(contract_amount)
-                penalty_term = daily_penalty * penalty_days
-
-            # 趕工獎金：若提前完成
-            if contract_amount and contract_duration and contract_duration > 0:
-                # 單日獎金率：(契約決標總價 / 契約工期) × 5%
-                daily_bonus = (float(contract_amount) / contract_duration) * 0.05
-                bonus_days = pulp.LpVariable("bonus_days", lowBound=0, cat="Integer")
-                self.problem += bonus_days >= target_duration - T
-                self.problem += bonus_days >= 0
-                bonus_term = daily_bonus * bonus_days
-
-                # 趕工獎金上限：契約決標總價的 1%
-                bonus_limit = float(contract_amount) * 0.01
-                self.problem += bonus_term <= bonus_limit
-
-        # 目標：最小化 T + penalty_term - bonus_term
-        self.problem += T + penalty_term - bonus_term
+    def _direct_cost_expr(self, y: Dict[str, pulp.LpVariable]):
+        """直接成本：各作業依是否趕工取正常成本或趕工成本"""
+        return pulp.lpSum(
+            (
+                act.normal_cost * (1 - y[act_id]) + act.crash_cost * y[act_id]
+                for act_id, act in self.activities.items()
+            )
+        )
+
+    def _constraint_network(self) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """取得（並快取）建模使用的前置關係與需加入 T 約束的作業
+
+        只與網路結構有關，作業工期或成本改變時仍可沿用。
+        """
+        if self._constraint_cache is None:
+            if self.formulation == "tight":
+                precedences = transitive_reduction(self.activities.keys(), self.precedences)
+                _, successors = build_adjacency(self.activities.keys(), self.precedences)
+                end_ids = [act_id for act_id, succ in successors.items() if not succ]
+            else:
+                precedences = self.precedences
+                end_ids = list(self.activities.keys())
+            self._constraint_cache = (precedences, end_ids)
+        return self._constraint_cache
+
+    def _add_network_constraints(
+        self,
+        x: Dict[str, pulp.LpVariable],
+        y: Dict[str, pulp.LpVariable],
+        T: pulp.LpVariable,
+    ) -> None:
+        """加入前置約束與工期定義約束
+
+        強化模型只保留遞移化簡後的前置關係，並且只對沒有後續作業的
+        結束作業加入 T >= x + d（其餘作業可由後續作業的約束推得）。
+        """
+        precedences, end_ids = self._constraint_network()
 
         # 約束 1：前置作業
-        for successor_id, predecessor_id in self.precedences:
+        for successor_id, predecessor_id in precedences:
             if successor_id in self.activities and predecessor_id in self.activities:
-                pred_act = self.activities[predecessor_id]
-                pred_duration = (
-                    pred_act.normal_duration * (1 - y[predecessor_id])
-                    + pred_act.crash_duration * y[predecessor_id]
+                pred_duration = self._duration_expr(
+                    self.activities[predecessor_id], y[predecessor_id]
                 )
                 self.problem += x[successor_id] >= x[predecessor_id] + pred_duration
 
         # 約束 2：工期定義
-        for act_id, act in self.activities.items():
-            duration_expr = (
-                act.normal_duration * (1 - y[act_id])
-                + act.crash_duration * y[act_id]
-            )
+        for act_id in end_ids:
+            duration_expr = self._duration_expr(self.activities[act_id], y[act_id])
             self.problem += T >= x[act_id] + duration_expr
 
-        # 約束 3：預算約束（直接成本 + 間接成本 <= budget）
-        direct_cost_expr = pulp.lpSum(
-            (
-                act.normal_cost * (1 - y[act_id])
-                + act.crash_cost * y[act_id]
-                for act_id, act in self.activities.items()
+    def _add_reward_terms(
+        self,
+        T: pulp.LpVariable,
+        horizon: Optional[int],
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: Optional[int],
+    ) -> Tuple:
+        """建立違約金與趕工獎金的目標函數項（係數單位為分）
+
+        horizon 為 T 的上界（大 M 係數與強化模型的變數上界使用），未提供時以全部正常工期計。
+
+        Returns:
+            (penalty_term, bonus_term)
+        """
+        penalty_term = 0
+        bonus_term = 0
+        if not target_duration:
+            return penalty_term, bonus_term
+
+        if self.formulation == "tight":
+            return self._add_tight_reward_terms(
+                T,
+                horizon,
+                penalty_type,
+                penalty_amount,
+                penalty_rate,
+                contract_amount,
+                contract_duration,
+                target_duration,
             )
+
+        # 大 M 係數使用的 T 上界：最優解的 T 不超過全部正常工期（工期 → 成本時為約束工期）
+        if horizon is None:
+            horizon = self._calculate_normal_duration()
+        late_cap = max(horizon - target_duration, 0)
+
+        # penalty_days >= max(T - target_duration, 0)
+        penalty_days = pulp.LpVariable("penalty_days", lowBound=0, cat="Integer")
+        self.problem += penalty_days >= T - target_duration
+        self.problem += penalty_days >= 0
+
+        daily_penalty = 0.0
+        if penalty_type == "fixed" and penalty_amount:
+            daily_penalty = float(penalty_amount)
+        elif penalty_type == "rate" and penalty_rate and contract_amount:
+            daily_penalty = float(penalty_rate) * contract_amount
+
+        if daily_penalty > 0:
+            penalty_term = daily_penalty * penalty_days
+            # 違約金上限：契約價金總額的 20%（capped = 1 時改以上限計罰）
+            penalty_limit = contract_amount * 0.2 if contract_amount > 0 else None
+            if penalty_limit is not None and daily_penalty * late_cap > penalty_limit:
+                penalty_paid = pulp.LpVariable("penalty_paid", lowBound=0)
+                capped = pulp.LpVariable("penalty_capped", cat="Binary")
+                self.problem += penalty_paid >= penalty_term - (daily_penalty * late_cap - penalty_limit) * capped
+                self.problem += penalty_paid >= penalty_limit * capped
+                penalty_term = penalty_paid
+
+        # 趕工獎金：若提前完成
+        if contract_amount and contract_duration and contract_duration > 0:
+            # 單日獎金率：(契約決標總價 / 契約工期) × 5%
+            daily_bonus = (contract_amount / contract_duration) * 0.05
+            # 趕工獎金上限：契約決標總價的 1%（以計獎天數的上界表示，超過上限的提前天數不再計獎）
+            bonus_limit = contract_amount * 0.01
+            bonus_days = pulp.LpVariable("bonus_days", lowBound=0, upBound=bonus_limit / daily_bonus)
+            # bonus_days <= max(target_duration - T, 0)：ahead = 0 時不計獎
+            ahead = pulp.LpVariable("ahead_of_target", cat="Binary")
+            self.problem += bonus_days <= target_duration - T + late_cap * (1 - ahead)
+            self.problem += bonus_days <= (bonus_limit / daily_bonus) * ahead
+            bonus_term = daily_bonus * bonus_days
+
+        return penalty_term, bonus_term
+
+    def _add_tight_reward_terms(
+        self,
+        T: pulp.LpVariable,
+        horizon: int,
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: int,
+    ) -> Tuple:
+        """強化模型的獎懲項：以 T - 目標工期 = 逾期天數 - 提前天數 拆解偏差
+
+        - 逾期與提前天數皆以變數上下界表示可能範圍，不另加約束列
+        - 違約金上限（契約價金 20%）只在可能觸頂時才拆成計罰 / 超額兩段
+        - 獎金上限（契約價金 1%）直接作為計獎天數的上界
+        - 只有在「同時放大逾期與提前天數」可能有利時，才加入互斥的二元變數
+        """
+        penalty_term = 0
+        bonus_term = 0
+
+        late_cap = max(horizon - target_duration, 0)
+        late_days = pulp.LpVariable("late_days", lowBound=0, upBound=late_cap)
+        early_days = pulp.LpVariable("early_days", lowBound=0, upBound=target_duration)
+        self.problem += T - late_days + early_days == target_duration
+
+        daily_penalty = 0.0
+        if penalty_type == "fixed" and penalty_amount:
+            daily_penalty = float(penalty_amount)
+        elif penalty_type == "rate" and penalty_rate and contract_amount:
+            daily_penalty = float(penalty_rate) * contract_amount
+
+        penalty_may_cap = False
+        if daily_penalty > 0:
+            penalty_limit = contract_amount * 0.2 if contract_amount > 0 else None
+            if penalty_limit is not None and daily_penalty * late_cap > penalty_limit:
+                # 違約金可能達上限：超過上限的逾期天數不再計罰
+                penalty_may_cap = True
+                cap_days = penalty_limit / daily_penalty
+                late_paid = pulp.LpVariable("late_paid_days", lowBound=0, upBound=cap_days)
+                late_over = pulp.LpVariable(
+                    "late_over_days", lowBound=0, upBound=late_cap - cap_days
+                )
+                capped = pulp.LpVariable("penalty_capped", cat="Binary")
+                self.problem += late_days == late_paid + late_over
+                self.problem += late_paid >= cap_days * capped
+                self.problem += late_over <= (late_cap - cap_days) * capped
+                penalty_term = daily_penalty * late_paid
+            else:
+                penalty_term = daily_penalty * late_days
+
+        if contract_amount and contract_duration and contract_duration > 0:
+            daily_bonus = (contract_amount / contract_duration) * 0.05
+            bonus_limit = contract_amount * 0.01
+            bonus_days = pulp.LpVariable(
+                "bonus_days",
+                lowBound=0,
+                upBound=min(bonus_limit / daily_bonus, target_duration),
+            )
+            self.problem += bonus_days <= early_days
+            bonus_term = daily_bonus * bonus_days
+
+            if late_cap > 0 and (penalty_may_cap or daily_penalty <= daily_bonus):
+                ahead = pulp.LpVariable("ahead_of_target", cat="Binary")
+                self.problem += early_days <= target_duration * ahead
+                self.problem += late_days <= late_cap * (1 - ahead)
+
+        return penalty_term, bonus_term
+
+    # ------------------------------------------------------------------
+    # 結果整理輔助
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _calculate_rewards(
+        optimal_duration: int,
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: Optional[int],
+    ) -> Tuple[int, int]:
+        """依最優工期計算實際違約金與趕工獎金（含上限，四捨五入到分）
+
+        Returns:
+            (penalty_amount, bonus_amount)
+        """
+        calculated_penalty = 0
+        bonus_amount = 0
+
+        if target_duration:
+            if optimal_duration > target_duration:
+                overdue_days = optimal_duration - target_duration
+                penalty = Decimal(0)
+                if penalty_type == "fixed" and penalty_amount:
+                    penalty = Decimal(penalty_amount * overdue_days)
+                elif penalty_type == "rate" and penalty_rate and contract_amount:
+                    penalty = penalty_rate * contract_amount * overdue_days
+
+                # 違約金上限：契約價金總額的 20%
+                if contract_amount > 0:
+                    penalty = min(penalty, contract_amount * Decimal("0.2"))
+                calculated_penalty = round_minor(penalty)
+            elif optimal_duration < target_duration:
+                if contract_amount and contract_duration and contract_duration > 0:
+                    early_days = target_duration - optimal_duration
+                    bonus = Decimal(contract_amount * early_days) / contract_duration * Decimal("0.05")
+                    bonus_limit = contract_amount * Decimal("0.01")
+                    bonus_amount = round_minor(min(bonus, bonus_limit))
+
+        return calculated_penalty, bonus_amount
+
+    def _build_success_result(
+        self,
+        x: Dict[str, pulp.LpVariable],
+        y: Dict[str, pulp.LpVariable],
+        T: pulp.LpVariable,
+        indirect_cost: int,
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: Optional[int],
+        calculation_time: float,
+    ) -> Dict:
+        """由求解後的變數值整理出回傳結果"""
+        # 連續變數可能帶有微小浮點誤差，一律四捨五入取整
+        optimal_duration = int(round(pulp.value(T)))
+        crashed = {act_id for act_id in self.activities if y[act_id].varValue > 0.5}
+        start_times = {act_id: int(round(x[act_id].varValue)) for act_id in self.activities}
+        return build_plan_result(
+            self.activities,
+            crashed,
+            start_times,
+            optimal_duration,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
         )
-        indirect_cost_term = float(indirect_cost) * T
+
+    # ------------------------------------------------------------------
+    # 模式一：預算 → 工期
+    # ------------------------------------------------------------------
+
+    def solve_budget_to_duration(
+        self,
+        budget: int,
+        indirect_cost: int = 0,
+        penalty_type: str = "rate",
+        penalty_amount: Optional[int] = None,
+        penalty_rate: Optional[Decimal] = None,
+        contract_amount: int = 0,
+        contract_duration: Optional[int] = None,
+        target_duration: Optional[int] = None,
+    ) -> Dict:
+        """
+        模式一：給定預算，求最短工期（同時考慮獎懲）
+        """
+        start_time = time.time()
+
+        self.problem = pulp.LpProblem("Budget_To_Duration", pulp.LpMinimize)
+
+        # 決策變數
+        # 強化模型：最優解的 T 必等於某條路徑長度，
+        # 因此介於全部趕工與全部正常的關鍵路徑工期之間
+        t_low = 0
+        horizon: Optional[int] = None
+        if self.formulation == "tight":
+            t_low = self._calculate_min_duration()
+            horizon = self._calculate_normal_duration()
+        x, y, T = self._create_variables(t_low=t_low, t_up=horizon)
+
+        # 目標函數：最小化工期 + 違約金 - 趕工獎金
+        penalty_term, bonus_term = self._add_reward_terms(
+            T,
+            horizon,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+        )
+
+        # 目標：最小化 T + penalty_term - bonus_term；獎懲項以分計，
+        # 工期乘上 MINOR_UNITS，目標值等同以元計的「工期 + 違約金 - 獎金」
+        self.problem += MINOR_UNITS * T + penalty_term - bonus_term
+
+        # 約束 1、2：前置作業與工期定義
+        self._add_network_constraints(x, y, T)
+
+        # 約束 3：預算約束（直接成本 + 間接成本 <= budget）
+        direct_cost_expr = self._direct_cost_expr(y)
+        indirect_cost_term = indirect_cost * T
         total_cost_expr = direct_cost_expr + indirect_cost_term
-        self.problem += total_cost_expr <= float(budget)
+        self.problem += total_cost_expr <= budget
 
         # 求解
-        self.problem.solve(pulp.PULP_CBC_CMD(msg=0))
+        self.problem.solve(self.solver)
         calculation_time = time.time() - start_time
 
         if self.problem.status != pulp.LpStatusOptimal:
@@ -266,8 +585,8 @@ class BiddingOptimizer:
                 reasons: List[str] = []
                 if min_cost > budget:
                     reasons.append(
-                        f"預算不足：即使所有作業都不趕工，最小成本也需要 {min_cost:.2f}，"
-                        f"但預算只有 {budget:.2f}（差距：{min_cost - budget:.2f}）"
+                        f"預算不足：即使所有作業都不趕工，最小成本也需要 {from_minor(min_cost)}，"
+                        f"但預算只有 {from_minor(budget)}（差距：{from_minor(min_cost - budget)}）"
                     )
                 else:
                     reasons.append("預算約束與其他約束條件衝突，無法找到可行解")
@@ -284,75 +603,24 @@ class BiddingOptimizer:
                 "calculation_time": calculation_time,
             }
 
-        # 取得最優解
-        optimal_duration = int(pulp.value(T))
-
-        direct_cost_val = sum(
-            act.normal_cost if y[act_id].varValue == 0 else act.crash_cost
-            for act_id, act in self.activities.items()
+        self._remember_solve(
+            "budget_to_duration", x, y, T, total_cost_expr + penalty_term - bonus_term,
+            (indirect_cost, penalty_type, penalty_amount, penalty_rate,
+             contract_amount, contract_duration, target_duration),
+        )
+        return self._build_success_result(
+            x,
+            y,
+            T,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
         )
-        indirect_cost_amount = indirect_cost * optimal_duration
-
-        calculated_penalty = Decimal("0.0")
-        bonus_amount = Decimal("0.0")
-
-        if target_duration:
-            if optimal_duration > target_duration:
-                overdue_days = optimal_duration - target_duration
-                if penalty_type == "fixed" and penalty_amount:
-                    calculated_penalty = penalty_amount * overdue_days
-                elif penalty_type == "rate" and penalty_rate and contract_amount:
-                    daily_penalty = penalty_rate * contract_amount
-                    calculated_penalty = daily_penalty * overdue_days
-
-                # 違約金上限：契約價金總額的 20%
-                if contract_amount > 0:
-                    penalty_limit = contract_amount * Decimal("0.2")
-                    calculated_penalty = min(calculated_penalty, penalty_limit)
-            elif optimal_duration < target_duration:
-                if contract_amount and contract_duration and contract_duration > 0:
-                    early_days = target_duration - optimal_duration
-                    bonus_amount = (
-                        contract_amount
-                        * Decimal(str(early_days))
-                        / Decimal(str(contract_duration))
-                        * Decimal("0.05")
-                    )
-                    bonus_limit = contract_amount * Decimal("0.01")
-                    bonus_amount = min(bonus_amount, bonus_limit)
-
-        optimal_cost = Decimal(str(direct_cost_val)) + indirect_cost_amount
-        total_cost = optimal_cost + calculated_penalty - bonus_amount
-
-        schedules: List[Dict] = []
-        for act_id, act in self.activities.items():
-            start_time_val = int(x[act_id].varValue)
-            is_crashed = bool(y[act_id].varValue)
-            duration_val = act.crash_duration if is_crashed else act.normal_duration
-            cost_val = act.crash_cost if is_crashed else act.normal_cost
-            schedules.append(
-                {
-                    "activity_id": act_id,
-                    "activity_name": act.name,
-                    "start_time": start_time_val,
-                    "end_time": start_time_val + duration_val,
-                    "duration": duration_val,
-                    "is_crashed": is_crashed,
-                    "cost": Decimal(str(cost_val)),
-                }
-            )
-
-        return {
-            "status": "success",
-            "optimal_duration": optimal_duration,
-            "optimal_cost": Decimal(str(direct_cost_val)),
-            "indirect_cost": indirect_cost_amount,
-            "penalty_amount": calculated_penalty,
-            "bonus_amount": bonus_amount,
-            "total_cost": total_cost,
-            "calculation_time": calculation_time,
-            "schedules": schedules,
-        }
 
     # ------------------------------------------------------------------
     # 模式二：工期 → 成本
@@ -361,11 +629,11 @@ class BiddingOptimizer:
     def solve_duration_to_cost(
         self,
         duration: int,
-        indirect_cost: Decimal = Decimal("0.0"),
+        indirect_cost: int = 0,
         penalty_type: str = "rate",
-        penalty_amount: Optional[Decimal] = None,
+        penalty_amount: Optional[int] = None,
         penalty_rate: Optional[Decimal] = None,
-        contract_amount: Decimal = Decimal("0.0"),
+        contract_amount: int = 0,
         contract_duration: Optional[int] = None,
         target_duration: Optional[int] = None,
     ) -> Dict:
@@ -377,81 +645,33 @@ class BiddingOptimizer:
         self.problem = pulp.LpProblem("Duration_To_Cost", pulp.LpMinimize)
 
         # 決策變數
-        x = {
-            act_id: pulp.LpVariable(f"x_{act_id}", lowBound=0, cat="Integer")
-            for act_id in self.activities.keys()
-        }
-        y = {
-            act_id: pulp.LpVariable(f"y_{act_id}", cat="Binary")
-            for act_id in self.activities.keys()
-        }
-
         # 專案總工期 T：在工期固定模式中，T 會被嚴格固定為使用者輸入的工期
         # 透過將上下界都設為 duration，確保 T = duration
-        T = pulp.LpVariable(
-            "T",
-            lowBound=int(duration),
-            upBound=int(duration),
-            cat="Integer",
-        )
+        x, y, T = self._create_variables(t_low=int(duration), t_up=int(duration))
 
         # 目標：最小化 總成本（直接 + 間接）+ 違約金 - 獎金
-        direct_cost_expr = pulp.lpSum(
-            (
-                act.normal_cost * (1 - y[act_id])
-                + act.crash_cost * y[act_id]
-                for act_id, act in self.activities.items()
-            )
-        )
-        indirect_cost_term = float(indirect_cost) * T
+        direct_cost_expr = self._direct_cost_expr(y)
+        indirect_cost_term = indirect_cost * T
         total_cost_expr = direct_cost_expr + indirect_cost_term
 
-        penalty_term = 0
-        bonus_term = 0
-
-        if target_duration:
-            penalty_days = pulp.LpVariable("penalty_days", lowBound=0, cat="Integer")
-            self.problem += penalty_days >= T - target_duration
-            self.problem += penalty_days >= 0
-
-            if penalty_type == "fixed" and penalty_amount:
-                penalty_term = float(penalty_amount) * penalty_days
-            elif penalty_type == "rate" and penalty_rate and contract_amount:
-                daily_penalty = float(penalty_rate) * float(contract_amount)
-                penalty_term = daily_penalty * penalty_days
-
-            if contract_amount and contract_duration and contract_duration > 0:
-                daily_bonus = (float(contract_amount) / contract_duration) * 0.05
-                bonus_days = pulp.LpVariable("bonus_days", lowBound=0, cat="Integer")
-                self.problem += bonus_days >= target_duration - T
-                self.problem += bonus_days >= 0
-                bonus_term = daily_bonus * bonus_days
-
-                bonus_limit = float(contract_amount) * 0.01
-                self.problem += bonus_term <= bonus_limit
+        penalty_term, bonus_term = self._add_reward_terms(
+            T,
+            int(duration),
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+        )
 
         self.problem += total_cost_expr + penalty_term - bonus_term
 
-        # 約束 1：前置作業
-        for successor_id, predecessor_id in self.precedences:
-            if successor_id in self.activities and predecessor_id in self.activities:
-                pred_act = self.activities[predecessor_id]
-                pred_duration = (
-                    pred_act.normal_duration * (1 - y[predecessor_id])
-                    + pred_act.crash_duration * y[predecessor_id]
-                )
-                self.problem += x[successor_id] >= x[predecessor_id] + pred_duration
-
-        # 約束 2：工期定義
-        for act_id, act in self.activities.items():
-            duration_expr = (
-                act.normal_duration * (1 - y[act_id])
-                + act.crash_duration * y[act_id]
-            )
-            self.problem += T >= x[act_id] + duration_expr
+        # 約束 1、2：前置作業與工期定義
+        self._add_network_constraints(x, y, T)
 
         # 求解
-        self.problem.solve(pulp.PULP_CBC_CMD(msg=0))
+        self.problem.solve(self.solver)
         calculation_time = time.time() - start_time
 
         if self.problem.status != pulp.LpStatusOptimal:
@@ -481,72 +701,221 @@ class BiddingOptimizer:
                 "calculation_time": calculation_time,
             }
 
-        optimal_duration = int(pulp.value(T))
-
-        direct_cost_val = sum(
-            act.normal_cost if y[act_id].varValue == 0 else act.crash_cost
-            for act_id, act in self.activities.items()
+        self._remember_solve(
+            "duration_to_cost", x, y, T, total_cost_expr + penalty_term - bonus_term,
+            (indirect_cost, penalty_type, penalty_amount, penalty_rate,
+             contract_amount, contract_duration, target_duration),
+        )
+        return self._build_success_result(
+            x,
+            y,
+            T,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
         )
-        indirect_cost_amount = indirect_cost * optimal_duration
-
-        calculated_penalty = Decimal("0.0")
-        bonus_amount = Decimal("0.0")
 
-        if target_duration:
-            if optimal_duration > target_duration:
-                overdue_days = optimal_duration - target_duration
-                if penalty_type == "fixed" and penalty_amount:
-                    calculated_penalty = penalty_amount * overdue_days
-                elif penalty_type == "rate" and penalty_rate and contract_amount:
-                    daily_penalty = penalty_rate * contract_amount
-                    calculated_penalty = daily_penalty * overdue_days
+    # ------------------------------------------------------------------
+    # 近似最佳的替代趕工方案
+    # ------------------------------------------------------------------
 
-                if contract_amount > 0:
-                    penalty_limit = contract_amount * Decimal("0.2")
-                    calculated_penalty = min(calculated_penalty, penalty_limit)
-            elif optimal_duration < target_duration:
-                if contract_amount and contract_duration and contract_duration > 0:
-                    early_days = target_duration - optimal_duration
-                    bonus_amount = (
-                        contract_amount
-                        * Decimal(str(early_days))
-                        / Decimal(str(contract_duration))
-                        * Decimal("0.05")
-                    )
-                    bonus_limit = contract_amount * Decimal("0.01")
-                    bonus_amount = min(bonus_amount, bonus_limit)
+    def _remember_solve(self, mode: str, x, y, T, cost_expr, params: Tuple) -> None:
+        self._solved = {"mode": mode, "x": x, "y": y, "T": T, "cost_expr": cost_expr, "params": params}
 
-        optimal_cost = Decimal(str(direct_cost_val)) + indirect_cost_amount
-        total_cost_value = optimal_cost + calculated_penalty - bonus_amount
+    def _add_no_good_cut(self, y: Dict[str, pulp.LpVariable], crashable: List[str]) -> None:
+        """排除目前的趕工組合：至少一個可趕工作業的趕工決策必須改變"""
+        crashed = [act_id for act_id in crashable if y[act_id].varValue > 0.5]
+        kept = [act_id for act_id in crashable if y[act_id].varValue <= 0.5]
+        self.problem += (
+            pulp.lpSum(1 - y[act_id] for act_id in crashed) + pulp.lpSum(y[act_id] for act_id in kept) >= 1
+        )
 
-        schedules: List[Dict] = []
+    def solve_alternatives(
+        self,
+        base: Dict,
+        count: int,
+        cost_tolerance: float = 0.05,
+        duration_tolerance: int = 0,
+    ) -> Tuple[Dict, List[Dict]]:
+        """在最近一次求解的模型上，依序求出最多 count 個趕工組合不同的近似最佳方案
+
+        須緊接在 solve_budget_to_duration / solve_duration_to_cost 成功之後呼叫（base 為其結果）。
+        沿用已建立的模型，每找到一個方案就加入一條 y 的 no-good cut 後重新求解，
+        不需重新建模：
+
+        - 工期 → 成本：目標值（總成本含獎懲）不超過最佳值 + cost_tolerance × 最佳總成本
+        - 預算 → 工期：工期不超過最佳工期 + duration_tolerance 天且仍在預算內，
+          改以總成本（含獎懲）排序，避免列出只多趕工非要徑作業的方案。
+          最佳解的目標函數不含成本，先固定最佳工期、以總成本重新求解一次
+          （字典序）作為比較基準，替代方案才不會在同一工期下比最佳解便宜
+
+        Returns:
+            (最佳解, 替代方案列表)：最佳解於預算 → 工期時為字典序重新求解的結果，
+            否則即為 base；替代方案與求解結果格式相同、依目標值遞增，
+            容許範圍內的方案不足時少於 count 個
+        """
+        if self._solved is None:
+            raise RuntimeError("尚未求解，無法計算替代方案")
+        x, y, T = self._solved["x"], self._solved["y"], self._solved["T"]
+        params = self._solved["params"]
+
+        # 無法縮短工期的作業「趕工」不改變排程，固定為不趕工，不列為不同的方案
+        crashable = [
+            act_id for act_id, act in self.activities.items() if act.crash_duration < act.normal_duration
+        ]
         for act_id, act in self.activities.items():
-            start_time_val = int(x[act_id].varValue)
-            is_crashed = bool(y[act_id].varValue)
-            duration_val = act.crash_duration if is_crashed else act.normal_duration
-            cost_val = act.crash_cost if is_crashed else act.normal_cost
-            schedules.append(
-                {
-                    "activity_id": act_id,
-                    "activity_name": act.name,
-                    "start_time": start_time_val,
-                    "end_time": start_time_val + duration_val,
-                    "duration": duration_val,
-                    "is_crashed": is_crashed,
-                    "cost": Decimal(str(cost_val)),
-                }
-            )
+            if act.crash_duration >= act.normal_duration:
+                self.problem += y[act_id] == 0
+        if not crashable:
+            self._solved = None
+            return base, []
+
+        if self._solved["mode"] == "duration_to_cost":
+            bound = pulp.value(self.problem.objective) + cost_tolerance * abs(base["total_cost"])
+            self.problem += self.problem.objective <= bound
+        else:
+            self.problem += T <= base["optimal_duration"] + duration_tolerance
+            self.problem.setObjective(self._solved["cost_expr"])
+            # 字典序第二階段：最佳工期下總成本最低的趕工組合
+            self.problem += T <= base["optimal_duration"], "base_duration"
+            start_time = time.time()
+            self.problem.solve(self.solver)
+            if self.problem.status == pulp.LpStatusOptimal:
+                base = self._build_success_result(
+                    x, y, T, *params, base["calculation_time"] + time.time() - start_time
+                )
+            del self.problem.constraints["base_duration"]
+        self._add_no_good_cut(y, crashable)
+
+        alternatives: List[Dict] = []
+        for _ in range(count):
+            start_time = time.time()
+            self.problem.solve(self.solver)
+            if self.problem.status != pulp.LpStatusOptimal:
+                break
+            alternatives.append(self._build_success_result(x, y, T, *params, time.time() - start_time))
+            self._add_no_good_cut(y, crashable)
+        # 模型已加入替代方案的約束，不能再用於其他替代方案的計算
+        self._solved = None
+        return base, alternatives
+
+
+def build_plan_result(
+    activities: Dict[str, Activity],
+    crashed: set,
+    start_times: Dict[str, int],
+    optimal_duration: int,
+    indirect_cost: int,
+    penalty_type: str,
+    penalty_amount: Optional[int],
+    penalty_rate: Optional[Decimal],
+    contract_amount: int,
+    contract_duration: Optional[int],
+    target_duration: Optional[int],
+    calculation_time: float,
+) -> Dict:
+    """依趕工組合與各作業開始時間整理求解結果（單一模型、分解與穩健模式共用）
+
+    金額皆為分為單位的整數：optimal_cost 為各作業排程成本的合計（直接成本），
+    total_cost 另加間接成本與違約金、扣除獎金，加總沒有捨入誤差。
+    """
+    schedules: List[Dict] = []
+    direct_cost = 0
+    for act_id, act in activities.items():
+        is_crashed = act_id in crashed
+        if is_crashed:
+            duration_val, cost_val = act.crash_duration, act.crash_cost
+        else:
+            duration_val, cost_val = act.normal_duration, act.normal_cost
+        start_time_val = start_times[act_id]
+        direct_cost += cost_val
+        schedules.append(
+            {
+                "activity_id": act_id,
+                "activity_name": act.name,
+                "start_time": start_time_val,
+                "end_time": start_time_val + duration_val,
+                "duration": duration_val,
+                "is_crashed": is_crashed,
+                "cost": cost_val,
+            }
+        )
 
-        return {
-            "status": "success",
-            "optimal_duration": optimal_duration,
-            "optimal_cost": Decimal(str(direct_cost_val)),
-            "indirect_cost": indirect_cost_amount,
-            "penalty_amount": calculated_penalty,
-            "bonus_amount": bonus_amount,
-            "total_cost": total_cost_value,
-            "calculation_time": calculation_time,
-            "schedules": schedules,
-        }
+    indirect_cost_amount = indirect_cost * optimal_duration
+    calculated_penalty, bonus_amount = BiddingOptimizer._calculate_rewards(
+        optimal_duration,
+        penalty_type,
+        penalty_amount,
+        penalty_rate,
+        contract_amount,
+        contract_duration,
+        target_duration,
+    )
+    return {
+        "status": "success",
+        "optimal_duration": optimal_duration,
+        "optimal_cost": direct_cost,
+        "indirect_cost": indirect_cost_amount,
+        "penalty_amount": calculated_penalty,
+        "bonus_amount": bonus_amount,
+        "total_cost": direct_cost + indirect_cost_amount + calculated_penalty - bonus_amount,
+        "calculation_time": calculation_time,
+        "schedules": schedules,
+    }
+
+
+def check_feasibility(
+    bounds: Dict,
+    mode: str,
+    budget: Optional[int] = None,
+    duration: Optional[int] = None,
+    indirect_cost: int = 0,
+) -> Optional[Dict]:
+    """以網路界限在求解前判斷是否必定無可行解
+
+    - 模式一：總成本至少為「最小直接成本 + 間接成本 × 全部趕工工期」，
+      預算低於此下界必定不可行；「全部正常施工」的成本一定可行，作為建議預算
+    - 模式二：工期低於全部趕工的關鍵路徑工期必定不可行，該工期即為最接近的可行值
+
+    Returns:
+        必定不可行時回傳與求解結果相同格式的 infeasible 字典（另含建議值，
+        預算以分表示），否則回傳 None（交由求解器判斷）
+    """
+    if mode == "budget_to_duration" and budget is not None:
+        lower_bound = bounds["min_direct_cost"] + indirect_cost * bounds["crash_duration"]
+        if budget < lower_bound:
+            feasible_budget = (
+                bounds["min_direct_cost"] + indirect_cost * bounds["normal_duration"]
+            )
+            return {
+                "status": "infeasible",
+                "error_message": (
+                    "無可行解（Infeasible）。原因：預算不足：任何趕工組合的成本都至少需要 "
+                    f"{from_minor(lower_bound)}，但預算只有 {from_minor(budget)}"
+                    f"（差距：{from_minor(lower_bound - budget)}）。"
+                    f"建議：將預算提高至 {from_minor(feasible_budget)}（全部作業正常施工的成本）以上。"
+                ),
+                "calculation_time": 0.0,
+                "suggested_budget": feasible_budget,
+            }
 
+    if mode == "duration_to_cost" and duration is not None:
+        if duration < bounds["crash_duration"]:
+            return {
+                "status": "infeasible",
+                "error_message": (
+                    "無可行解（Infeasible）。原因：工期約束過緊：即使所有作業都趕工，"
+                    f"最短工期也需要 {bounds['crash_duration']} 天，"
+                    f"但約束工期只有 {duration} 天（差距：{bounds['crash_duration'] - duration} 天）。"
+                    f"建議：將工期約束放寬至 {bounds['crash_duration']} 天以上。"
+                ),
+                "calculation_time": 0.0,
+                "suggested_duration": bounds["crash_duration"],
+            }
 
+    return None
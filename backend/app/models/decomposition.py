@@ -0,0 +1,516 @@
+"""
+網路分解求解
+以串聯里程碑將網路切成首尾相接的區塊，各區塊獨立計算時間—成本權衡曲線
+（以行程池平行求解），再以 min-plus 卷積合併曲線，回答預算 → 工期與
+工期 → 成本兩種查詢。網路無法分解時由呼叫端改用單一 MILP 模型。
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+import multiprocessing
+import os
+import threading
+import time
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer, build_plan_result
+from app.models.network import series_blocks
+from app.utils.artifact_store import load_curve, network_digest, save_curve
+from app.utils.money import MINOR_UNITS, from_minor
+
+# 求解策略：
+#   auto：強化模型的請求在網路可分解且作業數達門檻時使用分解求解，否則使用單一模型
+#   monolithic：一律使用單一 MILP 模型
+#   decomposition：只要網路可分解就使用分解求解
+SOLVE_STRATEGIES = ("auto", "monolithic", "decomposition")
+
+# auto 策略啟用分解的最少作業數（小型網路單一模型已足夠快）
+DECOMPOSITION_MIN_ACTIVITIES = int(os.getenv("DECOMPOSITION_MIN_ACTIVITIES", "100"))
+
+# 平行計算區塊曲線的行程數上限（0 表示使用 CPU 核心數），亦為共用行程池的大小
+DECOMPOSITION_WORKERS = int(os.getenv("DECOMPOSITION_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# 子行程的啟動方式：伺服器行程有多個執行緒，fork 會複製其他執行緒持有中的鎖
+# （連線池、logging 等）而可能使子行程卡死，因此預設使用 forkserver（不支援時用 spawn）
+POOL_START_METHOD = os.getenv("POOL_START_METHOD") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# 常駐行程池（分解求解、投資組合與資源平準化共用），於啟動時建立
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def pool_context():
+    """建立子行程使用的 multiprocessing context"""
+    return multiprocessing.get_context(POOL_START_METHOD)
+
+
+def start_pool() -> Optional[ProcessPoolExecutor]:
+    """建立（或取得已建立的）常駐行程池；行程數上限為 1 或無法建立時回傳 None"""
+    global _pool
+    with _pool_lock:
+        if _pool is None and DECOMPOSITION_WORKERS > 1:
+            try:
+                _pool = ProcessPoolExecutor(max_workers=DECOMPOSITION_WORKERS, mp_context=pool_context())
+            except OSError:
+                _pool = None
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """關閉常駐行程池（應用程式結束時呼叫）"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """行程池已損壞（子行程異常結束）：移除後由下次使用時重新建立"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _single_activity_curve(act: Activity) -> List[Dict]:
+    """單一作業區塊的權衡曲線：趕工與正常兩點（無法縮短時只有一點）"""
+    normal = {
+        "duration": act.normal_duration,
+        "direct_cost": act.normal_cost,
+        "crashed": [],
+        "start_times": {act.id: 0},
+    }
+    if act.crash_duration >= act.normal_duration:
+        return [normal]
+    crash = {
+        "duration": act.crash_duration,
+        "direct_cost": act.crash_cost,
+        "crashed": [act.id],
+        "start_times": {act.id: 0},
+    }
+    # 趕工不比較便宜時，正常點仍須保留（工期較長但成本較低）
+    if crash["direct_cost"] <= normal["direct_cost"]:
+        return [crash]
+    return [crash, normal]
+
+
+def _block_curve(
+    activities: List[Activity],
+    precedences: List[Tuple[str, str]],
+    formulation: str,
+    solver=None,
+) -> List[Dict]:
+    """計算單一區塊的權衡曲線（行程池工作函式，須為模組層級才能序列化）"""
+    if len(activities) == 1:
+        return _single_activity_curve(activities[0])
+    return BiddingOptimizer(
+        activities, precedences, formulation=formulation, solver=solver
+    ).compute_tradeoff_curve()
+
+
+def run_parallel(func: Callable, tasks: List[Tuple], max_workers: int) -> List:
+    """以常駐行程池平行執行 func(*task)，結果依 tasks 順序回傳
+
+    只有一個工作或行程數上限為 1 時直接逐一執行；行程池無法使用時
+    （例如執行環境不允許建立子行程，或子行程異常結束）退回逐一執行尚未完成的工作。
+    工作本身拋出的例外直接向上傳遞，不會重新執行。
+    """
+    results: List = [None] * len(tasks)
+    done = [False] * len(tasks)
+    workers = min(max_workers, len(tasks))
+    pool = start_pool() if workers > 1 else None
+    if pool is not None:
+        futures = []
+        try:
+            futures = [pool.submit(func, *task) for task in tasks]
+        except (OSError, BrokenProcessPool):
+            # 無法啟動子行程
+            _discard_pool(pool)
+        else:
+            try:
+                for index, future in enumerate(futures):
+                    results[index] = future.result()
+                    done[index] = True
+            except BrokenProcessPool:
+                _discard_pool(pool)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    for index, task in enumerate(tasks):
+        if not done[index]:
+            results[index] = func(*task)
+    return results
+
+
+def combine_series_curves(curves: List[List[Dict]]) -> List[Tuple[int, int, List[int]]]:
+    """以 min-plus 卷積合併串聯區塊的權衡曲線
+
+    每合併一個區塊後只保留柏拉圖前緣（工期遞增、成本嚴格遞減），
+    並記錄回溯指標以還原各區塊選用的轉折點。
+
+    Returns:
+        柏拉圖前緣 [(總工期, 總直接成本（分）, 各區塊選用的轉折點索引), ...]，依工期遞增
+    """
+    # 每層前緣的項目：(工期, 成本, 上一層索引, 本區塊轉折點索引)
+    layers: List[List[Tuple[int, int, int, int]]] = []
+    frontier: List[Tuple[int, int]] = [(0, 0)]
+
+    for curve in curves:
+        candidates: Dict[int, Tuple[int, int, int]] = {}
+        for prev_index, (duration, cost) in enumerate(frontier):
+            for point_index, point in enumerate(curve):
+                total_duration = duration + point["duration"]
+                total_cost = cost + point["direct_cost"]
+                best = candidates.get(total_duration)
+                if best is None or total_cost < best[0]:
+                    candidates[total_duration] = (total_cost, prev_index, point_index)
+
+        layer: List[Tuple[int, int, int, int]] = []
+        for total_duration in sorted(candidates):
+            total_cost, prev_index, point_index = candidates[total_duration]
+            if layer and total_cost >= layer[-1][1]:
+                continue
+            layer.append((total_duration, total_cost, prev_index, point_index))
+        layers.append(layer)
+        frontier = [(duration, cost) for duration, cost, _, _ in layer]
+
+    result: List[Tuple[int, int, List[int]]] = []
+    if not layers:
+        return result
+    for index, (duration, cost, _, _) in enumerate(layers[-1]):
+        choice: List[int] = []
+        for layer in reversed(layers):
+            _, _, prev_index, point_index = layer[index]
+            choice.append(point_index)
+            index = prev_index
+        choice.reverse()
+        result.append((duration, cost, choice))
+    return result
+
+
+class DecomposedOptimizer:
+    """以區塊權衡曲線求解的優化器，回傳格式與 BiddingOptimizer 相同
+
+    預算 → 工期模式的獎懲以實際獎懲金額（含 20% 違約金與 1% 獎金上限）評估，
+    最優工期與目標值和單一模型相同；同一工期下的趕工組合可能不同。
+    """
+
+    def __init__(
+        self,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        blocks: List[List[str]],
+        formulation: str = "standard",
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            activities: 作業活動列表
+            precedences: 前置關係列表，格式為 [(後續作業ID, 前置作業ID), ...]
+            blocks: series_blocks 切出的串聯區塊
+            formulation: 各區塊求解使用的模型建構方式
+            max_workers: 平行計算區塊曲線的行程數上限
+        """
+        self.activities: Dict[str, Activity] = {act.id: act for act in activities}
+        self.precedences = precedences
+        self.blocks = blocks
+        self.formulation = formulation
+        self.max_workers = max_workers or DECOMPOSITION_WORKERS
+        # 區塊求解使用的 PuLP 求解器（None 為預設 CBC；自訂求解器須搭配 max_workers = 1）
+        self.solver = None
+        self._curves: Optional[List[List[Dict]]] = None
+        self._frontier: Optional[List[Tuple[int, int, List[int]]]] = None
+
+    @classmethod
+    def from_network(
+        cls,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        formulation: str = "standard",
+        strategy: str = "auto",
+    ) -> Optional["DecomposedOptimizer"]:
+        """依求解策略嘗試建立分解優化器
+
+        Returns:
+            網路可分解（至少兩個區塊）且符合策略時回傳 DecomposedOptimizer，
+            否則回傳 None，由呼叫端改用 BiddingOptimizer
+        """
+        if strategy not in SOLVE_STRATEGIES:
+            raise ValueError(f"不支援的求解策略：{strategy}")
+        if strategy == "monolithic":
+            return None
+        # auto 只分解強化模型的請求：標準模型的回應（排程與同工期下的取捨）
+        # 不因網路規模跨過門檻而改變
+        if strategy == "auto" and (formulation != "tight" or len(activities) < DECOMPOSITION_MIN_ACTIVITIES):
+            return None
+
+        blocks = series_blocks((act.id for act in activities), precedences)
+        if len(blocks) < 2:
+            return None
+        return cls(activities, precedences, blocks, formulation=formulation)
+
+    @classmethod
+    def from_curve(
+        cls,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        curve: List[Dict],
+        formulation: str = "standard",
+    ) -> "DecomposedOptimizer":
+        """以已算好的整體權衡曲線建立（整個網路視為單一區塊，不需求解）"""
+        optimizer = cls(activities, precedences, [[act.id for act in activities]], formulation=formulation)
+        optimizer._curves = [curve]
+        return optimizer
+
+    # ------------------------------------------------------------------
+    # 區塊曲線
+    # ------------------------------------------------------------------
+
+    def _block_networks(self) -> List[Tuple[List[Activity], List[Tuple[str, str]]]]:
+        """切出各區塊的作業與區塊內部前置關係（跨區塊的關係由串聯順序隱含）"""
+        block_of = {aid: index for index, block in enumerate(self.blocks) for aid in block}
+        internal: List[List[Tuple[str, str]]] = [[] for _ in self.blocks]
+        for successor_id, predecessor_id in self.precedences:
+            index = block_of.get(successor_id)
+            if index is not None and block_of.get(predecessor_id) == index:
+                internal[index].append((successor_id, predecessor_id))
+        return [
+            ([self.activities[aid] for aid in block], internal[index])
+            for index, block in enumerate(self.blocks)
+        ]
+
+    def block_curves(self) -> List[List[Dict]]:
+        """計算（並快取）各區塊的權衡曲線
+
+        單一作業的區塊直接計算；需要求解 MILP 的區塊先查共用產物快取（以區塊網路
+        雜湊為鍵，參數不同的請求可共用），未命中者以 run_parallel 平行求解後寫回。
+        """
+        if self._curves is not None:
+            return self._curves
+
+        networks = self._block_networks()
+        curves: List[Optional[List[Dict]]] = [None] * len(networks)
+        pending: List[int] = []
+        digests: Dict[int, str] = {}
+        for index, (activities, precedences) in enumerate(networks):
+            if len(activities) == 1:
+                curves[index] = _single_activity_curve(activities[0])
+                continue
+            digests[index] = network_digest(activities, precedences)
+            curves[index] = load_curve(digests[index], self.formulation)
+            if curves[index] is None:
+                pending.append(index)
+
+        solved = run_parallel(
+            _block_curve,
+            [(*networks[index], self.formulation, self.solver) for index in pending],
+            self.max_workers,
+        )
+        for index, curve in zip(pending, solved):
+            curves[index] = curve
+            save_curve(digests[index], self.formulation, curve)
+
+        self._curves = curves
+        return self._curves
+
+    def tradeoff_frontier(self) -> List[Tuple[int, int, List[int]]]:
+        """整個專案的直接成本—工期柏拉圖前緣（見 combine_series_curves）"""
+        if self._frontier is None:
+            self._frontier = combine_series_curves(self.block_curves())
+        return self._frontier
+
+    def compute_tradeoff_curve(self) -> List[Dict]:
+        """與 BiddingOptimizer.compute_tradeoff_curve 相同格式的整體權衡曲線"""
+        curve: List[Dict] = []
+        for duration, cost, choice in self.tradeoff_frontier():
+            crashed, start_times = self._assemble(choice)
+            curve.append(
+                {
+                    "duration": duration,
+                    "direct_cost": cost,
+                    "crashed": sorted(crashed),
+                    "start_times": start_times,
+                }
+            )
+        return curve
+
+    def _assemble(self, choice: List[int]) -> Tuple[set, Dict[str, int]]:
+        """依各區塊選用的轉折點，將區塊排程依序接起來"""
+        crashed: set = set()
+        start_times: Dict[str, int] = {}
+        offset = 0
+        for curve, point_index in zip(self.block_curves(), choice):
+            point = curve[point_index]
+            crashed.update(point["crashed"])
+            for aid, start in point["start_times"].items():
+                start_times[aid] = offset + start
+            offset += point["duration"]
+        return crashed, start_times
+
+    # ------------------------------------------------------------------
+    # 結果整理
+    # ------------------------------------------------------------------
+
+    def _build_result(
+        self,
+        choice: List[int],
+        optimal_duration: int,
+        indirect_cost: int,
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: Optional[int],
+        calculation_time: float,
+    ) -> Dict:
+        crashed, start_times = self._assemble(choice)
+        return build_plan_result(
+            self.activities,
+            crashed,
+            start_times,
+            optimal_duration,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
+        )
+
+    # ------------------------------------------------------------------
+    # 模式一：預算 → 工期
+    # ------------------------------------------------------------------
+
+    def solve_budget_to_duration(
+        self,
+        budget: int,
+        indirect_cost: int = 0,
+        penalty_type: str = "rate",
+        penalty_amount: Optional[int] = None,
+        penalty_rate: Optional[Decimal] = None,
+        contract_amount: int = 0,
+        contract_duration: Optional[int] = None,
+        target_duration: Optional[int] = None,
+    ) -> Dict:
+        """
+        模式一：給定預算，求最短工期（同時考慮獎懲）
+
+        目標值隨工期遞增，因此只需在柏拉圖前緣的轉折點中挑選；
+        目標值相同時取總成本較低者。
+        """
+        start_time = time.time()
+
+        best = None
+        for duration, cost, choice in self.tradeoff_frontier():
+            total = cost + indirect_cost * duration
+            if total > budget:
+                continue
+            penalty, bonus = BiddingOptimizer._calculate_rewards(
+                duration,
+                penalty_type,
+                penalty_amount,
+                penalty_rate,
+                contract_amount,
+                contract_duration,
+                target_duration,
+            )
+            # 與單一模型的目標相同：工期以 MINOR_UNITS 加權，與以分計的獎懲相加
+            key = (MINOR_UNITS * duration + penalty - bonus, total)
+            if best is None or key < best[0]:
+                best = (key, duration, choice)
+
+        calculation_time = time.time() - start_time
+        if best is None:
+            frontier = self.tradeoff_frontier()
+            min_cost = min(cost + indirect_cost * duration for duration, cost, _ in frontier)
+            return {
+                "status": "infeasible",
+                "error_message": (
+                    "無可行解（Infeasible）。原因：預算不足：任何工期下的最小成本至少需要 "
+                    f"{from_minor(min_cost)}，但預算只有 {from_minor(budget)}（差距：{from_minor(min_cost - budget)}）。"
+                    "建議：增加預算或調整作業參數。"
+                ),
+                "calculation_time": calculation_time,
+            }
+
+        _, duration, choice = best
+        return self._build_result(
+            choice,
+            duration,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
+        )
+
+    # ------------------------------------------------------------------
+    # 模式二：工期 → 成本
+    # ------------------------------------------------------------------
+
+    def solve_duration_to_cost(
+        self,
+        duration: int,
+        indirect_cost: int = 0,
+        penalty_type: str = "rate",
+        penalty_amount: Optional[int] = None,
+        penalty_rate: Optional[Decimal] = None,
+        contract_amount: int = 0,
+        contract_duration: Optional[int] = None,
+        target_duration: Optional[int] = None,
+    ) -> Dict:
+        """
+        模式二：給定工期，求最低成本
+
+        工期固定時間接成本與獎懲皆為常數，只需取工期不超過 duration 的
+        最後一個轉折點（直接成本最低）。
+        """
+        start_time = time.time()
+        duration = int(duration)
+
+        chosen = None
+        for point_duration, _, choice in self.tradeoff_frontier():
+            if point_duration > duration:
+                break
+            chosen = choice
+
+        calculation_time = time.time() - start_time
+        if chosen is None:
+            min_duration = self.tradeoff_frontier()[0][0]
+            return {
+                "status": "infeasible",
+                "error_message": (
+                    "無可行解（Infeasible）。原因：工期約束過緊：即使所有作業都趕工，"
+                    f"最短工期也需要 {min_duration} 天，"
+                    f"但約束工期只有 {duration} 天（差距：{min_duration - duration} 天）。"
+                    "建議：放寬工期約束或調整作業參數。"
+                ),
+                "calculation_time": calculation_time,
+            }
+
+        return self._build_result(
+            chosen,
+            duration,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
+        )
@@ -0,0 +1,196 @@
+"""
+作業網路圖工具
+提供拓撲排序、遞移化簡（移除多餘前置關係）等與求解器無關的圖論運算
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def build_adjacency(
+    activity_ids: Iterable[str], precedences: Iterable[Tuple[str, str]]
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """建立前置 / 後續鄰接表
+
+    只保留兩端作業皆存在的前置關係，並去除重複邊。
+
+    Args:
+        activity_ids: 作業 ID 集合
+        precedences: 前置關係列表，格式為 [(後續作業ID, 前置作業ID), ...]
+
+    Returns:
+        (predecessors, successors)：各作業的前置作業清單與後續作業清單
+    """
+    ids = list(activity_ids)
+    known = set(ids)
+    predecessors: Dict[str, List[str]] = {aid: [] for aid in ids}
+    successors: Dict[str, List[str]] = {aid: [] for aid in ids}
+    seen: Set[Tuple[str, str]] = set()
+
+    for successor_id, predecessor_id in precedences:
+        if successor_id not in known or predecessor_id not in known:
+            continue
+        if (successor_id, predecessor_id) in seen:
+            continue
+        seen.add((successor_id, predecessor_id))
+        predecessors[successor_id].append(predecessor_id)
+        successors[predecessor_id].append(successor_id)
+
+    return predecessors, successors
+
+
+def topological_order(
+    predecessors: Dict[str, List[str]], successors: Dict[str, List[str]]
+) -> Tuple[List[str], bool]:
+    """以 Kahn 演算法計算拓撲排序
+
+    Returns:
+        (order, is_acyclic)：若網路有循環，循環內的作業會依原順序附加在最後，
+        並回傳 is_acyclic=False
+    """
+    in_degree = {aid: len(preds) for aid, preds in predecessors.items()}
+    queue = [aid for aid, deg in in_degree.items() if deg == 0]
+    order: List[str] = []
+
+    head = 0
+    while head < len(queue):
+        aid = queue[head]
+        head += 1
+        order.append(aid)
+        for succ in successors[aid]:
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                queue.append(succ)
+
+    if len(order) == len(predecessors):
+        return order, True
+
+    placed = set(order)
+    order.extend(aid for aid in predecessors if aid not in placed)
+    return order, False
+
+
+def transitive_reduction(
+    activity_ids: Iterable[str], precedences: Iterable[Tuple[str, str]]
+) -> List[Tuple[str, str]]:
+    """移除可由其他路徑推得的前置關係（遞移化簡）
+
+    在所有工期皆為正數的前提下，若 B 經由其他作業間接在 A 之後，
+    則直接的 (B, A) 約束是多餘的。以整數位元集合記錄每個作業的所有祖先，
+    複雜度約為 O(n·m / 字長)。網路有循環時不化簡，原樣回傳（去重後）。
+
+    Returns:
+        化簡後的前置關係列表，格式為 [(後續作業ID, 前置作業ID), ...]
+    """
+    predecessors, successors = build_adjacency(activity_ids, precedences)
+    order, is_acyclic = topological_order(predecessors, successors)
+    if not is_acyclic:
+        return [(succ, pred) for succ, preds in predecessors.items() for pred in preds]
+
+    bit = {aid: 1 << index for index, aid in enumerate(order)}
+    ancestors: Dict[str, int] = {}
+    reduced: List[Tuple[str, str]] = []
+
+    for aid in order:
+        preds = predecessors[aid]
+        # 所有前置作業「自己的祖先」聯集：出現在其中的直接前置即為多餘
+        indirect = 0
+        for pred in preds:
+            indirect |= ancestors[pred]
+        own = indirect
+        for pred in preds:
+            own |= bit[pred]
+            if not indirect & bit[pred]:
+                reduced.append((aid, pred))
+        ancestors[aid] = own
+
+    return reduced
+
+
+def critical_path_length(
+    durations: Dict[str, int],
+    predecessors: Dict[str, List[str]],
+    order: List[str],
+    release_times: Optional[Dict[str, int]] = None,
+) -> Tuple[int, Dict[str, int]]:
+    """以拓撲順序進行 CPM 前推，計算最早開始時間與專案工期
+
+    Args:
+        durations: 各作業工期
+        predecessors: 各作業的前置作業清單
+        order: 拓撲排序（循環內的作業其前置尚未計算時視為 0）
+        release_times: 各作業的最早可開始時間（未列出者為 0）
+
+    Returns:
+        (project_duration, earliest_start)
+    """
+    earliest_start: Dict[str, int] = {}
+    project_duration = 0
+    for aid in order:
+        start = release_times.get(aid, 0) if release_times else 0
+        for pred in predecessors[aid]:
+            if pred in earliest_start:
+                start = max(start, earliest_start[pred] + durations[pred])
+        earliest_start[aid] = start
+        project_duration = max(project_duration, start + durations[aid])
+    return project_duration, earliest_start
+
+
+def series_blocks(
+    activity_ids: Iterable[str], precedences: Iterable[Tuple[str, str]]
+) -> List[List[str]]:
+    """以「串聯里程碑」將網路切成首尾相接的區塊
+
+    若某作業與其他所有作業皆有先後關係（不是祖先就是後代），則它是整個網路的
+    串聯切點：之前的作業必在它開始前完成、之後的作業必在它完成後才開始。
+    這比無向圖的切點（articulation point）更嚴格，但能保證專案工期等於各區塊
+    工期之和，使各區塊可以獨立求解。
+
+    Returns:
+        依先後順序排列的區塊，每個區塊為依拓撲順序排列的作業 ID 列表；
+        切點本身自成一個區塊。網路有循環時回傳單一區塊（不分解）
+    """
+    predecessors, successors = build_adjacency(activity_ids, precedences)
+    order, is_acyclic = topological_order(predecessors, successors)
+    if not is_acyclic or len(order) < 2:
+        return [order] if order else []
+
+    bit = {aid: 1 << index for index, aid in enumerate(order)}
+    ancestors: Dict[str, int] = {}
+    for aid in order:
+        mask = 0
+        for pred in predecessors[aid]:
+            mask |= ancestors[pred] | bit[pred]
+        ancestors[aid] = mask
+    descendants: Dict[str, int] = {}
+    for aid in reversed(order):
+        mask = 0
+        for succ in successors[aid]:
+            mask |= descendants[succ] | bit[succ]
+        descendants[aid] = mask
+
+    full = (1 << len(order)) - 1
+    cuts = [aid for aid in order if ancestors[aid] | descendants[aid] | bit[aid] == full]
+    if not cuts:
+        return [order]
+
+    cut_mask = 0
+    for aid in cuts:
+        cut_mask |= bit[aid]
+
+    # 切點之間全序：第 i 個切點之前恰有 i 個切點；
+    # 非切點作業依其祖先中的切點數歸入對應的區段
+    segments: List[List[str]] = [[] for _ in range(len(cuts) + 1)]
+    for aid in order:
+        if not bit[aid] & cut_mask:
+            segments[bin(ancestors[aid] & cut_mask).count("1")].append(aid)
+
+    blocks: List[List[str]] = []
+    for index, cut in enumerate(cuts):
+        if segments[index]:
+            blocks.append(segments[index])
+        blocks.append([cut])
+    if segments[-1]:
+        blocks.append(segments[-1])
+    return blocks
@@ -0,0 +1,232 @@
+"""
+多專案投資組合優化
+各專案先獨立計算時間—成本權衡曲線（以行程池平行計算），再以小型
+多選背包 MILP 在共同預算下為每個專案挑選一個曲線轉折點，
+模型大小只隨專案數與轉折點數成長，不需把所有專案合成一個大型 MILP。
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import time
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer
+from app.models.decomposition import DECOMPOSITION_WORKERS, DecomposedOptimizer, run_parallel
+from app.utils.artifact_store import load_curve, network_digest, save_curve
+from app.utils.lazy_import import lazy_module
+from app.utils.money import MINOR_UNITS, from_minor
+
+pulp = lazy_module("pulp")
+
+# 投資組合目標：
+#   weighted_duration：最小化加權總工期
+#   penalty：最小化加權違約金曝險（違約金相同時再取加權工期較短者）
+PORTFOLIO_OBJECTIVES = ("weighted_duration", "penalty")
+
+
+def project_curve(
+    activities: List[Activity],
+    precedences: List[Tuple[str, str]],
+    formulation: str,
+    solver=None,
+) -> List[Dict]:
+    """計算單一專案的權衡曲線（行程池工作函式）
+
+    專案可串聯分解時在同一行程內逐一求解區塊，避免巢狀行程池。
+    solver 為選用的 PuLP 求解器（例如背景預先計算使用的排程求解器）。
+    """
+    decomposed = DecomposedOptimizer.from_network(activities, precedences, formulation=formulation)
+    if decomposed is not None:
+        decomposed.max_workers = 1
+        decomposed.solver = solver
+        return decomposed.compute_tradeoff_curve()
+    return BiddingOptimizer(
+        activities, precedences, formulation=formulation, solver=solver
+    ).compute_tradeoff_curve()
+
+
+class PortfolioOptimizer:
+    """在共同預算下分配多個專案的工期與趕工
+
+    每個專案的參數字典包含 project_id、activities、precedences、weight、
+    indirect_cost，以及計算違約金用的 penalty_type、penalty_amount、
+    penalty_rate、contract_amount、target_duration；金額皆以分計。
+    """
+
+    def __init__(
+        self,
+        projects: List[Dict],
+        formulation: str = "standard",
+        max_workers: Optional[int] = None,
+    ):
+        self.projects = projects
+        self.formulation = formulation
+        self.max_workers = max_workers or DECOMPOSITION_WORKERS
+        self._curves: Optional[List[List[Dict]]] = None
+
+    def curves(self) -> List[List[Dict]]:
+        """計算（並快取）各專案的權衡曲線
+
+        先以專案網路雜湊查共用產物快取，只平行計算未命中的專案並寫回。
+        """
+        if self._curves is None:
+            digests = [network_digest(p["activities"], p["precedences"]) for p in self.projects]
+            curves = [load_curve(digest, self.formulation) for digest in digests]
+            pending = [index for index, curve in enumerate(curves) if curve is None]
+            solved = run_parallel(
+                project_curve,
+                [
+                    (self.projects[index]["activities"], self.projects[index]["precedences"], self.formulation)
+                    for index in pending
+                ],
+                self.max_workers,
+            )
+            for index, curve in zip(pending, solved):
+                curves[index] = curve
+                save_curve(digests[index], self.formulation, curve)
+            self._curves = curves
+        return self._curves
+
+    def _options(self, project: Dict, curve: List[Dict]) -> List[Dict]:
+        """專案的候選方案：每個轉折點的總成本（直接 + 間接）與違約金"""
+        indirect_cost = project.get("indirect_cost") or 0
+        options = []
+        for point in curve:
+            duration = point["duration"]
+            direct_cost = point["direct_cost"]
+            indirect_amount = indirect_cost * duration
+            penalty, _ = BiddingOptimizer._calculate_rewards(
+                duration,
+                project.get("penalty_type", "rate"),
+                project.get("penalty_amount"),
+                project.get("penalty_rate"),
+                project.get("contract_amount") or 0,
+                None,
+                project.get("target_duration"),
+            )
+            options.append(
+                {
+                    "duration": duration,
+                    "direct_cost": direct_cost,
+                    "indirect_cost": indirect_amount,
+                    "penalty_amount": penalty,
+                    "total_cost": direct_cost + indirect_amount,
+                    "crashed": point["crashed"],
+                }
+            )
+        return options
+
+    def solve(self, budget: int, objective: str = "weighted_duration") -> Dict:
+        """在共同預算（直接 + 間接成本總和，以分計）下求解
+
+        先最小化目標值，再於目標值不變的前提下最小化總成本。
+
+        Returns:
+            status、objective_value、total_cost、calculation_time 與
+            各專案選用方案（allocations）的字典，金額皆以分計（penalty 目標的
+            objective_value 亦同）；無可行解時含 error_message
+        """
+        if objective not in PORTFOLIO_OBJECTIVES:
+            raise ValueError(f"不支援的投資組合目標：{objective}")
+
+        start_time = time.time()
+        curves = self.curves()
+        curve_time = time.time() - start_time
+        options = [self._options(project, curve) for project, curve in zip(self.projects, curves)]
+
+        min_total = sum(min(opt["total_cost"] for opt in opts) for opts in options)
+        if min_total > budget:
+            return {
+                "status": "infeasible",
+                "error_message": (
+                    "無可行解（Infeasible）。原因：預算不足：各專案最低成本合計需要 "
+                    f"{from_minor(min_total)}，但共同預算只有 {from_minor(budget)}"
+                    f"（差距：{from_minor(min_total - budget)}）。"
+                    "建議：增加預算或減少專案。"
+                ),
+                "calculation_time": time.time() - start_time,
+            }
+
+        def score(project: Dict, opt: Dict) -> float:
+            weight = float(project.get("weight") or 1)
+            if objective == "penalty":
+                # 違約金為主；工期項只用來在違約金相同時偏好較短工期
+                return weight * (opt["penalty_amount"] / MINOR_UNITS + 1e-6 * opt["duration"])
+            return weight * opt["duration"]
+
+        problem = pulp.LpProblem("Portfolio", pulp.LpMinimize)
+        z = {
+            (i, k): pulp.LpVariable(f"z_{i}_{k}", cat="Binary")
+            for i, opts in enumerate(options)
+            for k in range(len(opts))
+        }
+        for i, opts in enumerate(options):
+            problem += pulp.lpSum(z[i, k] for k in range(len(opts))) == 1
+        cost_expr = pulp.lpSum(
+            opt["total_cost"] * z[i, k]
+            for i, opts in enumerate(options)
+            for k, opt in enumerate(opts)
+        )
+        score_expr = pulp.lpSum(
+            score(self.projects[i], opt) * z[i, k]
+            for i, opts in enumerate(options)
+            for k, opt in enumerate(opts)
+        )
+        problem += cost_expr <= budget
+
+        problem += score_expr
+        problem.solve(pulp.PULP_CBC_CMD(msg=0))
+        if problem.status != pulp.LpStatusOptimal:
+            return {
+                "status": "error",
+                "error_message": f"求解失敗：{pulp.LpStatus[problem.status]}",
+                "calculation_time": time.time() - start_time,
+            }
+
+        def chosen_options() -> List[int]:
+            return [next(k for k in range(len(opts)) if z[i, k].varValue > 0.5) for i, opts in enumerate(options)]
+
+        # 第二階段：目標值不變下取總成本最低的分配；求解失敗時沿用第一階段的分配
+        chosen = chosen_options()
+        best_score = pulp.value(score_expr)
+        problem += score_expr <= best_score + max(1e-6, abs(best_score) * 1e-9)
+        problem.setObjective(cost_expr)
+        problem.solve(pulp.PULP_CBC_CMD(msg=0))
+        if problem.status == pulp.LpStatusOptimal:
+            chosen = chosen_options()
+
+        allocations = []
+        for i, opts in enumerate(options):
+            opt = opts[chosen[i]]
+            project = self.projects[i]
+            allocations.append(
+                {
+                    "project_id": project["project_id"],
+                    "weight": project.get("weight") or 1,
+                    "duration": opt["duration"],
+                    "direct_cost": opt["direct_cost"],
+                    "indirect_cost": opt["indirect_cost"],
+                    "penalty_amount": opt["penalty_amount"],
+                    "total_cost": opt["total_cost"],
+                    "crashed_activity_ids": opt["crashed"],
+                    "curve_points": len(opts),
+                }
+            )
+
+        weights = [Decimal(str(a["weight"])) for a in allocations]
+        if objective == "penalty":
+            objective_value = sum(w * a["penalty_amount"] for w, a in zip(weights, allocations))
+        else:
+            objective_value = sum(w * a["duration"] for w, a in zip(weights, allocations))
+
+        return {
+            "status": "success",
+            "objective": objective,
+            "objective_value": objective_value,
+            "budget": budget,
+            "total_cost": sum(a["total_cost"] for a in allocations),
+            "curve_time": curve_time,
+            "calculation_time": time.time() - start_time,
+            "allocations": allocations,
+        }
@@ -0,0 +1,404 @@
+"""
+資源平準化（資源受限排程）
+優化模型的排程不考慮班組與機具數量；此模組在既有前置關係與各作業工期之上，
+以優先規則的排程產生法（schedule generation scheme, SGS）排出不超過資源容量的排程：
+
+- 序列式（serial）：依優先序逐一排入作業，放在前置完成後第一個資源足夠的時段
+- 平行式（parallel）：時間逐步推進，每個決策時點依優先序啟動資源足夠的可開工作業
+
+施工中專案（資料日期情境）的已開工作業固定於實際開始時間並照常占用資源，
+其餘作業不早於資料日期開始。
+
+資源使用量以 NumPy 的「時間 × 資源」陣列記錄，序列式找可行時段時以累加和
+一次檢查整段時間窗。多起點：第一輪使用優先規則本身，其餘各輪以隨機擾動的
+優先值（偏誤隨機抽樣）重排，分批交由行程池平行執行，取工期最短者；
+工期相同時取資源使用量平方和較小（較平順）者。
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.models.decomposition import run_parallel
+from app.models.network import build_adjacency, topological_order
+from app.utils.lazy_import import lazy_module
+
+# NumPy 在第一次平準化時才匯入，縮短冷啟動時間
+np = lazy_module("numpy")
+
+# 優先規則（值越小越優先）：
+#   lft：最晚完成時間
+#   slack：總浮時（相同時取最晚完成時間較早者）
+#   successors：所有後續作業數較多者
+#   grpw：作業工期加上直接後續作業工期總和較大者（greatest rank positional weight）
+PRIORITY_RULES = ("lft", "slack", "successors", "grpw")
+SGS_METHODS = ("serial", "parallel")
+
+# 平行執行多起點的行程數上限
+LEVELING_WORKERS = int(os.getenv("LEVELING_WORKERS", str(os.cpu_count() or 1)))
+# 每個行程至少分到的起點數（起點太少時行程池的啟動成本大於節省的時間）
+MIN_STARTS_PER_WORKER = 8
+# 隨機起點的優先值擾動幅度（名次位置數）：只在相近名次間交換順序，
+# 擾動過大時接近隨機排序，工期反而比優先規則本身差
+RANDOM_SHIFT_POSITIONS = 5
+
+
+class ResourceLeveler:
+    """單一專案的資源受限排程
+
+    Args:
+        activity_ids: 作業 ID
+        durations: 各作業工期（天）
+        precedences: 前置關係 [(後續作業ID, 前置作業ID), ...]
+        capacities: 各資源每日可用數量
+        demands: activity_id → {resource_id: 每日需求量}
+        labels: 作業與資源 ID → 名稱（錯誤訊息使用）
+        fixed_starts: 固定開始時間的作業（已完成或進行中）activity_id → 開始時間，
+            不重新排定也不檢查容量
+        release: 其餘作業的最早開始時間（資料日期），不早於任何固定開始時間
+
+    Raises:
+        ValueError: 網路有循環，或單一作業的需求量超過資源容量
+    """
+
+    def __init__(
+        self,
+        activity_ids: List[str],
+        durations: Dict[str, int],
+        precedences: List[Tuple[str, str]],
+        capacities: Dict[str, int],
+        demands: Dict[str, Dict[str, int]],
+        labels: Optional[Dict[str, str]] = None,
+        fixed_starts: Optional[Dict[str, int]] = None,
+        release: int = 0,
+    ):
+        predecessors, successors = build_adjacency(activity_ids, precedences)
+        order, is_acyclic = topological_order(predecessors, successors)
+        if not is_acyclic:
+            raise ValueError("作業網路有循環，無法排程")
+
+        # 以拓撲順序編號，前置作業的編號必定較小
+        self.ids = order
+        self.resource_ids = list(capacities)
+        index = {aid: i for i, aid in enumerate(order)}
+        resource_index = {rid: q for q, rid in enumerate(self.resource_ids)}
+        self.n = len(order)
+
+        self.durations = np.array([int(durations[aid]) for aid in order], dtype=np.int64)
+        self.capacity = np.array([int(capacities[rid]) for rid in self.resource_ids], dtype=np.int64)
+        self.demand = np.zeros((self.n, len(self.resource_ids)), dtype=np.int64)
+        for aid, needs in demands.items():
+            if aid not in index:
+                continue
+            for rid, quantity in needs.items():
+                if rid in resource_index:
+                    self.demand[index[aid], resource_index[rid]] = int(quantity)
+        over = np.argwhere(self.demand > self.capacity)
+        if over.size:
+            i, q = over[0]
+            labels = labels or {}
+            activity_id, resource_id = self.ids[i], self.resource_ids[q]
+            raise ValueError(
+                f"作業 {labels.get(activity_id, activity_id)} 對資源 {labels.get(resource_id, resource_id)} "
+                f"的每日需求量 {self.demand[i, q]} 超過容量 {self.capacity[q]}"
+            )
+
+        self.predecessors = [[index[p] for p in predecessors[aid]] for aid in order]
+        self.successors = [[index[s] for s in successors[aid]] for aid in order]
+        self.fixed = {index[aid]: int(start) for aid, start in (fixed_starts or {}).items() if aid in index}
+        self.release = max([int(release), *self.fixed.values()])
+        # 各作業實際使用的資源欄位，找可行時段時只檢查這些欄位
+        self.used = [np.flatnonzero(row) for row in self.demand]
+
+        self._cpm()
+        self._priorities: Dict[str, object] = {}
+
+    # ------------------------------------------------------------------
+    # 不考慮資源的 CPM 與優先值
+    # ------------------------------------------------------------------
+
+    def _cpm(self) -> None:
+        durations = self.durations.tolist()
+        es = [self.fixed.get(i, self.release) for i in range(self.n)]
+        for i in range(self.n):
+            if i in self.fixed:
+                continue
+            for p in self.predecessors[i]:
+                es[i] = max(es[i], es[p] + durations[p])
+        self.baseline_duration = max((es[i] + durations[i] for i in range(self.n)), default=0)
+        lf = [self.baseline_duration] * self.n
+        for i in reversed(range(self.n)):
+            for s in self.successors[i]:
+                lf[i] = min(lf[i], lf[s] - durations[s])
+        self.earliest_start = np.array(es, dtype=np.int64)
+        self.latest_finish = np.array(lf, dtype=np.int64)
+
+    def priority(self, rule: str):
+        """各作業的優先序名次（0 ~ 1，越小越優先），同值時以 LFT 與編號決定順序"""
+        if rule not in self._priorities:
+            self._priorities[rule] = self._rank(rule)
+        return self._priorities[rule]
+
+    def _rank(self, rule: str):
+        if rule == "lft":
+            value = self.latest_finish.astype(float)
+        elif rule == "slack":
+            slack = self.latest_finish - self.durations - self.earliest_start
+            value = slack * (self.baseline_duration + 1.0) + self.latest_finish
+        elif rule == "successors":
+            # 以整數位元集合由後往前累計所有後續作業
+            descendants = [0] * self.n
+            for i in reversed(range(self.n)):
+                bits = 0
+                for s in self.successors[i]:
+                    bits |= descendants[s] | (1 << s)
+                descendants[i] = bits
+            value = -np.array([bin(bits).count("1") for bits in descendants], dtype=float)
+        elif rule == "grpw":
+            durations = self.durations.tolist()
+            value = -np.array(
+                [durations[i] + sum(durations[s] for s in self.successors[i]) for i in range(self.n)],
+                dtype=float,
+            )
+        else:
+            raise ValueError(f"不支援的優先規則：{rule}")
+        # 轉為名次（0 ~ 1），隨機擾動的幅度才與規則的數值尺度無關
+        order = np.lexsort((np.arange(self.n), self.latest_finish, value))
+        rank = np.empty(self.n, dtype=float)
+        rank[order] = np.arange(self.n) / max(self.n, 1)
+        return rank
+
+    # ------------------------------------------------------------------
+    # 排程產生法
+    # ------------------------------------------------------------------
+
+    def _sequence(self, key) -> List[int]:
+        """符合前置關係、優先值小者先排的作業序列"""
+        key = key.tolist()
+        remaining = [len(preds) for preds in self.predecessors]
+        ready = [(key[i], i) for i in range(self.n) if remaining[i] == 0]
+        heapq.heapify(ready)
+        sequence: List[int] = []
+        while ready:
+            _, i = heapq.heappop(ready)
+            sequence.append(i)
+            for s in self.successors[i]:
+                remaining[s] -= 1
+                if remaining[s] == 0:
+                    heapq.heappush(ready, (key[s], s))
+        return sequence
+
+    def serial(self, key):
+        """序列式排程，回傳各作業開始時間"""
+        durations = self.durations.tolist()
+        # 序列式排程的完工時間不會超過最早開始時間加上工期總和
+        horizon = self.release + int(self.durations.sum()) + 1
+        usage = np.zeros((horizon, len(self.resource_ids)), dtype=np.int64)
+        limit = self.capacity - self.demand
+        start = [0] * self.n
+        finish = [0] * self.n
+
+        # 固定作業先排入
+        for i, t in self.fixed.items():
+            columns = self.used[i]
+            usage[t:t + durations[i], columns] += self.demand[i, columns]
+            start[i] = t
+            finish[i] = t + durations[i]
+
+        for i in self._sequence(key):
+            if i in self.fixed:
+                continue
+            earliest = max([self.release] + [finish[p] for p in self.predecessors[i]])
+            duration = durations[i]
+            columns = self.used[i]
+            t = earliest if columns.size == 0 else self._first_fit(usage, limit[i], columns, earliest, duration)
+            if columns.size:
+                usage[t:t + duration, columns] += self.demand[i, columns]
+            start[i] = t
+            finish[i] = t + duration
+        return np.array(start, dtype=np.int64)
+
+    @staticmethod
+    def _first_fit(usage, limit, columns, earliest: int, duration: int) -> int:
+        """earliest 之後第一個連續 duration 天資源都足夠的開始時間
+
+        逐段檢查時間窗：以超量天數的累加和一次找出窗內所有可行開始時間，
+        窗內沒有時向後移動並加倍窗長。
+        """
+        if duration == 0:
+            # 里程碑與已完成的零工期作業不占用任何時段
+            return earliest
+        window = max(4 * duration, 64)
+        t = earliest
+        horizon = usage.shape[0]
+        while True:
+            end = min(t + window + duration, horizon)
+            blocked = (usage[t:end, columns] > limit[columns]).any(axis=1)
+            counts = np.concatenate(([0], np.cumsum(blocked)))
+            fits = np.flatnonzero(counts[duration:] == counts[:-duration])
+            if fits.size:
+                return t + int(fits[0])
+            if end >= horizon:
+                # 排程範圍之後完全沒有使用量
+                return max(t, horizon - duration)
+            t = end - duration + 1
+            window *= 2
+
+    def parallel(self, key):
+        """平行式排程，回傳各作業開始時間"""
+        key = key.tolist()
+        durations = self.durations.tolist()
+        demand = self.demand.tolist()
+        available = self.capacity.tolist()
+        resources = range(len(available))
+        remaining = [len(preds) for preds in self.predecessors]
+        eligible = [(key[i], i) for i in range(self.n) if remaining[i] == 0 and i not in self.fixed]
+        heapq.heapify(eligible)
+        fixed = [(t, i) for i, t in self.fixed.items()]
+        heapq.heapify(fixed)
+        running: List[Tuple[int, int]] = []
+        start = [0] * self.n
+        t = 0
+        scheduled = 0
+
+        while scheduled < self.n:
+            # 固定作業於其開始時間啟動，不檢查容量
+            while fixed and fixed[0][0] <= t:
+                _, i = heapq.heappop(fixed)
+                for q in resources:
+                    available[q] -= demand[i][q]
+                start[i] = t
+                heapq.heappush(running, (t + durations[i], i))
+                scheduled += 1
+
+            # 依優先序啟動資源足夠的可開工作業（已啟動者都在 t 以前開始，只需檢查時點 t；
+            # 固定作業都不晚於 release 開始，之後不會再占用資源）
+            deferred = []
+            while eligible and t >= self.release:
+                item = heapq.heappop(eligible)
+                i = item[1]
+                need = demand[i]
+                if all(need[q] <= available[q] for q in resources):
+                    for q in resources:
+                        available[q] -= need[q]
+                    start[i] = t
+                    heapq.heappush(running, (t + durations[i], i))
+                    scheduled += 1
+                else:
+                    deferred.append(item)
+            for item in deferred:
+                heapq.heappush(eligible, item)
+
+            # 推進到下一個完工、固定作業開始或 release 時點，釋放資源並加入新的可開工作業
+            events = [running[0][0]] if running else []
+            if fixed:
+                events.append(fixed[0][0])
+            if eligible and t < self.release:
+                events.append(self.release)
+            if not events:
+                break
+            t = min(events)
+            while running and running[0][0] == t:
+                _, i = heapq.heappop(running)
+                for q in resources:
+                    available[q] += demand[i][q]
+                for s in self.successors[i]:
+                    remaining[s] -= 1
+                    if remaining[s] == 0 and s not in self.fixed:
+                        heapq.heappush(eligible, (key[s], s))
+        return np.array(start, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # 評估與多起點
+    # ------------------------------------------------------------------
+
+    def profile(self, start):
+        """各資源的每日使用量（makespan × 資源數）"""
+        finish = start + self.durations
+        makespan = int(finish.max()) if self.n else 0
+        delta = np.zeros((makespan + 1, len(self.resource_ids)), dtype=np.int64)
+        np.add.at(delta, start, self.demand)
+        np.subtract.at(delta, finish, self.demand)
+        return np.cumsum(delta, axis=0)[:makespan]
+
+    def profile_of(self, start_times: Dict[str, int]):
+        """依 activity_id → 開始時間計算每日使用量（未列出的作業使用最早開始時間）"""
+        start = self.earliest_start.copy()
+        for i, aid in enumerate(self.ids):
+            if aid in start_times:
+                start[i] = start_times[aid]
+        return self.profile(start)
+
+    def evaluate(self, start) -> Tuple[int, int]:
+        """(工期, 資源使用量平方和)：工期相同時平方和越小使用量越平順"""
+        makespan = int((start + self.durations).max()) if self.n else 0
+        usage = self.profile(start)
+        return makespan, int((usage * usage).sum())
+
+    def run(self, method: str, rule: str, seed: int):
+        """執行一次排程；seed 為 0 時使用優先規則本身，否則加上隨機擾動"""
+        key = self.priority(rule)
+        if seed:
+            shift = RANDOM_SHIFT_POSITIONS / max(self.n, 1)
+            key = key + np.random.default_rng(seed).uniform(0.0, shift, self.n)
+        if method == "serial":
+            return self.serial(key)
+        if method == "parallel":
+            return self.parallel(key)
+        raise ValueError(f"不支援的排程產生法：{method}")
+
+    def level(
+        self,
+        methods: Tuple[str, ...] = SGS_METHODS,
+        rule: str = "lft",
+        starts: int = 1,
+        seed: int = 0,
+        max_workers: Optional[int] = None,
+    ) -> Dict:
+        """多起點資源平準化，回傳最佳排程
+
+        每種排程產生法各執行 starts 次（第一次不擾動），分批交由行程池平行執行。
+
+        Returns:
+            makespan、baseline_duration（不考慮資源的 CPM 工期）、method、seed、
+            runs、workers、start_times（activity_id → 開始時間）、usage（最佳排程的
+            使用量陣列）與 calculation_time
+        """
+        start_time = time.time()
+        runs = [
+            (method, rule, 0 if k == 0 else seed * 100003 + k)
+            for method in methods
+            for k in range(max(1, starts))
+        ]
+        workers = max(1, min(max_workers or LEVELING_WORKERS, len(runs) // MIN_STARTS_PER_WORKER))
+        size = math.ceil(len(runs) / workers)
+        batches = [(self, runs[b:b + size]) for b in range(0, len(runs), size)]
+        best = min(run_parallel(_run_batch, batches, workers), key=lambda item: item[0])
+
+        (makespan, _), method, run_seed, start = best
+        return {
+            "makespan": makespan,
+            "baseline_duration": self.baseline_duration,
+            "method": method,
+            "seed": run_seed,
+            "runs": len(runs),
+            "workers": min(workers, len(batches)),
+            "start_times": dict(zip(self.ids, start.tolist())),
+            "usage": self.profile(start),
+            "calculation_time": time.time() - start_time,
+        }
+
+
+def _run_batch(leveler: ResourceLeveler, runs: List[Tuple[str, str, int]]):
+    """執行一批起點並回傳其中最佳者（行程池工作函式，須為模組層級才能序列化）"""
+    best = None
+    for method, rule, seed in runs:
+        start = leveler.run(method, rule, seed)
+        score = leveler.evaluate(start)
+        if best is None or score < best[0]:
+            best = (score, method, seed, start)
+    return best
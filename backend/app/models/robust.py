@@ -0,0 +1,745 @@
+"""
+工期不確定下的穩健投標模式（樣本平均近似，SAA）
+以三角分配抽樣各作業工期的多個情境，第一階段決定趕工組合（二元變數 y），
+第二階段為各情境的完工工期與獎懲，目標為期望值或 CVaR（條件風險值）。
+
+求解採 Benders 切平面法（L-shaped）：
+- 給定 y 時，情境 s 的完工工期為各路徑長度的最大值，對 y 為凸的分段線性函數；
+  其次梯度即目前的要徑，故每個情境只需以 CPM 找出要徑即可產生最佳性切平面
+  T_s >= Σ_{i∈P} (正常工期_is - 可縮短天數_is × y_i)
+- 工期 → 成本模式要求標稱（未抽樣）排程不超過工期約束，違反時加入要徑可行性切平面
+- 主問題只含 y、各情境工期與獎懲變數及已產生的切平面；各情境的 CPM 以共用行程池分段平行計算
+- 每輪以真實工期評估主問題的解作為上界，主問題目標值為下界，兩者差距低於容許值或
+  達時間上限時停止，回傳最佳的可行解
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import os
+import random
+import time
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer, build_plan_result
+from app.models.decomposition import run_parallel
+from app.utils.lazy_import import lazy_module
+from app.utils.money import MINOR_UNITS, from_minor
+
+pulp = lazy_module("pulp")
+
+# 風險衡量方式：
+#   expected：各情境損失的平均值
+#   cvar：最差 (1 - alpha) 比例情境的平均損失
+RISK_MEASURES = ("expected", "cvar")
+
+# 情境 CPM 的分段數上限（0 表示使用 CPU 核心數）；實際平行度受共用行程池大小限制
+ROBUST_WORKERS = int(os.getenv("ROBUST_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# 每輪 CPM 計算量（情境數 ×（作業數 + 前置關係數））達此值才啟用行程池，
+# 小型問題的行程間傳輸成本高於計算本身
+ROBUST_PARALLEL_MIN_WORK = int(os.getenv("ROBUST_PARALLEL_MIN_WORK", "200000"))
+
+# 上下界相對差距低於此值即視為收斂
+ROBUST_GAP_TOLERANCE = 1e-4
+
+# 情境取樣結果：每個情境為 (正常工期列表, 趕工工期列表)，依作業索引排列
+Samples = List[Tuple[List[int], List[int]]]
+# 單一情境的評估結果：(完工工期, 要徑上的作業索引)
+PathResult = Tuple[int, Tuple[int, ...]]
+
+
+def sample_durations(
+    activities: Sequence[Activity],
+    scenario_count: int,
+    optimistic: float,
+    pessimistic: float,
+    seed: int = 0,
+) -> Samples:
+    """以三角分配抽樣各情境的作業工期
+
+    每個作業在每個情境抽一個工期倍率，範圍為 [1 - optimistic, 1 + pessimistic]，
+    眾數為 1（即估計工期）；同一倍率同時套用於正常與趕工工期（共同隨機數），
+    趕工與否的差異只來自決策本身。工期四捨五入為整數天。
+    """
+    rng = random.Random(seed)
+    low, high = 1.0 - optimistic, 1.0 + pessimistic
+    samples: Samples = []
+    for _ in range(scenario_count):
+        normal: List[int] = []
+        crash: List[int] = []
+        for act in activities:
+            factor = rng.triangular(low, high, 1.0)
+            normal_days = max(int(round(act.normal_duration * factor)), 0)
+            normal.append(normal_days)
+            crash.append(min(max(int(round(act.crash_duration * factor)), 0), normal_days))
+        samples.append((normal, crash))
+    return samples
+
+
+def evaluate_paths(
+    order: Sequence[int],
+    predecessors: Sequence[Sequence[int]],
+    samples: Samples,
+    crashed: Sequence[bool],
+    lo: int,
+    hi: int,
+) -> List[PathResult]:
+    """依趕工決策以 CPM 前推計算情境 lo ~ hi - 1 的完工工期與要徑"""
+    size = len(order)
+    results: List[PathResult] = []
+    for index in range(lo, hi):
+        normal, crash = samples[index]
+        finish = [0] * size
+        via = [-1] * size
+        makespan, last = 0, -1
+        for node in order:
+            start, previous = 0, -1
+            for pred in predecessors[node]:
+                if finish[pred] > start:
+                    start, previous = finish[pred], pred
+            end = start + (crash[node] if crashed[node] else normal[node])
+            finish[node] = end
+            via[node] = previous
+            if end > makespan:
+                makespan, last = end, node
+        path: List[int] = []
+        while last >= 0:
+            path.append(last)
+            last = via[last]
+        results.append((makespan, tuple(path)))
+    return results
+
+
+def _evaluate_chunk(
+    order: Sequence[int], predecessors: Sequence[Sequence[int]], chunk: Samples, crashed: Tuple[bool, ...]
+) -> List[PathResult]:
+    """計算一段情境的完工工期與要徑（行程池工作函式，須為模組層級才能序列化）"""
+    return evaluate_paths(order, predecessors, chunk, crashed, 0, len(chunk))
+
+
+class ScenarioEvaluator:
+    """計算所有情境的完工工期與要徑；計算量夠大時將情境分段，以共用行程池平行計算
+
+    每次評估只把各段情境送到一個工作，整輪傳送量等於全部情境一次；
+    共用行程池無法使用時由 run_parallel 退回逐一計算。
+    """
+
+    def __init__(
+        self,
+        order: List[int],
+        predecessors: List[List[int]],
+        samples: Samples,
+        max_workers: int = ROBUST_WORKERS,
+    ):
+        self.order = order
+        self.predecessors = predecessors
+        self.samples = samples
+        work = len(samples) * (len(order) + sum(len(preds) for preds in predecessors))
+        self.workers = min(max_workers, len(samples)) if work >= ROBUST_PARALLEL_MIN_WORK else 1
+
+    def evaluate(self, crashed: Sequence[bool]) -> List[PathResult]:
+        count = len(self.samples)
+        if self.workers <= 1:
+            return evaluate_paths(self.order, self.predecessors, self.samples, crashed, 0, count)
+        step = math.ceil(count / self.workers)
+        flags = tuple(crashed)
+        tasks = [
+            (self.order, self.predecessors, self.samples[lo:lo + step], flags)
+            for lo in range(0, count, step)
+        ]
+        chunks = run_parallel(_evaluate_chunk, tasks, self.workers)
+        return [item for chunk in chunks for item in chunk]
+
+
+class RobustOptimizer(BiddingOptimizer):
+    """以 SAA 與 Benders 切平面求解工期不確定下的趕工決策，回傳格式與 BiddingOptimizer 相同
+
+    回傳結果的工期、成本與排程為所選趕工組合在標稱工期下的值（與確定性模式可直接比較），
+    另以 robust 欄位提供各抽樣情境的工期分布與獎懲統計。
+
+    各情境的損失沿用確定性模式的目標函數：
+    - 預算 → 工期：工期 + 違約金 - 趕工獎金，預算約束改以期望總成本
+      （直接成本 + 間接成本 × 期望工期）計算
+    - 工期 → 成本：間接成本 + 違約金 - 趕工獎金（直接成本不受抽樣影響，另外加總），
+      並要求標稱排程不超過工期約束
+    """
+
+    def __init__(
+        self,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        scenario_count: int = 100,
+        risk_measure: str = "expected",
+        cvar_alpha: float = 0.9,
+        optimistic: float = 0.1,
+        pessimistic: float = 0.3,
+        seed: int = 0,
+        time_limit: float = 30.0,
+        max_workers: Optional[int] = None,
+        solver_threads: Optional[int] = None,
+    ):
+        """
+        Args:
+            activities: 作業活動列表
+            precedences: 前置關係列表，格式為 [(後續作業ID, 前置作業ID), ...]
+            scenario_count: 抽樣情境數
+            risk_measure: "expected" 或 "cvar"
+            cvar_alpha: CVaR 信心水準（只計入損失最高的 1 - alpha 比例情境）
+            optimistic: 工期最多縮短的比例（三角分配下限）
+            pessimistic: 工期最多延長的比例（三角分配上限）
+            seed: 抽樣亂數種子（相同種子得到相同情境，結果可重現）
+            time_limit: 求解時間上限（秒）
+            max_workers: 情境 CPM 的分段數上限
+            solver_threads: 主問題 CBC 使用的執行緒數
+        """
+        if risk_measure not in RISK_MEASURES:
+            raise ValueError(f"不支援的風險衡量方式：{risk_measure}")
+        super().__init__(activities, precedences)
+        self.scenario_count = int(scenario_count)
+        self.risk_measure = risk_measure
+        self.cvar_alpha = float(cvar_alpha)
+        self.optimistic = float(optimistic)
+        self.pessimistic = float(pessimistic)
+        self.seed = int(seed)
+        self.time_limit = float(time_limit)
+        self.max_workers = max_workers or ROBUST_WORKERS
+        self.solver_threads = solver_threads or self.max_workers
+
+        # 作業依索引排列，CPM 與切平面都以索引運算
+        self.ids: List[str] = list(self.activities.keys())
+        self.samples = sample_durations(
+            [self.activities[aid] for aid in self.ids],
+            self.scenario_count,
+            self.optimistic,
+            self.pessimistic,
+            self.seed,
+        )
+        self.nominal: Samples = [
+            (
+                [self.activities[aid].normal_duration for aid in self.ids],
+                [self.activities[aid].crash_duration for aid in self.ids],
+            )
+        ]
+
+    def _index_network(self) -> Tuple[List[int], List[List[int]]]:
+        """以作業索引表示的拓撲排序與前置清單"""
+        predecessors, order = self._network()
+        position = {aid: index for index, aid in enumerate(self.ids)}
+        return (
+            [position[aid] for aid in order],
+            [[position[pred] for pred in predecessors[aid]] for aid in self.ids],
+        )
+
+    # ------------------------------------------------------------------
+    # 損失
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _reward_rates(
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+    ) -> Tuple[float, Optional[float], float, float]:
+        """每日違約金、違約金上限、每日獎金與獎金上限（分，規則同 _calculate_rewards）"""
+        daily_penalty = 0.0
+        if penalty_type == "fixed" and penalty_amount:
+            daily_penalty = float(penalty_amount)
+        elif penalty_type == "rate" and penalty_rate and contract_amount:
+            daily_penalty = float(penalty_rate) * contract_amount
+        penalty_limit = contract_amount * 0.2 if contract_amount > 0 else None
+
+        daily_bonus, bonus_limit = 0.0, 0.0
+        if contract_amount and contract_duration and contract_duration > 0:
+            daily_bonus = contract_amount / contract_duration * 0.05
+            bonus_limit = contract_amount * 0.01
+        return daily_penalty, penalty_limit, daily_bonus, bonus_limit
+
+    @staticmethod
+    def _rewards(makespan: float, target: Optional[int], rates: Tuple) -> Tuple[float, float]:
+        """單一情境的違約金與趕工獎金"""
+        if not target:
+            return 0.0, 0.0
+        daily_penalty, penalty_limit, daily_bonus, bonus_limit = rates
+        penalty = daily_penalty * max(makespan - target, 0)
+        if penalty_limit is not None:
+            penalty = min(penalty, penalty_limit)
+        bonus = min(daily_bonus * max(target - makespan, 0), bonus_limit)
+        return penalty, bonus
+
+    def _risk(self, losses: Sequence[float]) -> float:
+        """依風險衡量方式彙總各情境損失"""
+        if self.risk_measure == "expected":
+            return sum(losses) / len(losses)
+        return cvar(losses, self.cvar_alpha)
+
+    # ------------------------------------------------------------------
+    # 主問題
+    # ------------------------------------------------------------------
+
+    def _add_scenario_terms(
+        self,
+        index: int,
+        T: pulp.LpVariable,
+        upper: int,
+        target: Optional[int],
+        rates: Tuple,
+    ):
+        """加入單一情境的獎懲變數（同強化模型的拆解方式），回傳違約金減獎金的運算式"""
+        if not target:
+            return 0
+        daily_penalty, penalty_limit, daily_bonus, bonus_limit = rates
+        late_cap = max(upper - target, 0)
+        late = pulp.LpVariable(f"late_{index}", lowBound=0, upBound=late_cap)
+        early = pulp.LpVariable(f"early_{index}", lowBound=0, upBound=target)
+        self.problem += T - late + early == target
+
+        term = 0
+        penalty_may_cap = False
+        if daily_penalty > 0:
+            if penalty_limit is not None and daily_penalty * late_cap > penalty_limit:
+                penalty_may_cap = True
+                cap_days = penalty_limit / daily_penalty
+                late_paid = pulp.LpVariable(f"late_paid_{index}", lowBound=0, upBound=cap_days)
+                late_over = pulp.LpVariable(
+                    f"late_over_{index}", lowBound=0, upBound=late_cap - cap_days
+                )
+                capped = pulp.LpVariable(f"penalty_capped_{index}", cat="Binary")
+                self.problem += late == late_paid + late_over
+                self.problem += late_paid >= cap_days * capped
+                self.problem += late_over <= (late_cap - cap_days) * capped
+                term = daily_penalty * late_paid
+            else:
+                term = daily_penalty * late
+
+        if daily_bonus > 0:
+            bonus_days = pulp.LpVariable(
+                f"bonus_days_{index}",
+                lowBound=0,
+                upBound=min(bonus_limit / daily_bonus, target),
+            )
+            self.problem += bonus_days <= early
+            term = term - daily_bonus * bonus_days
+            if late_cap > 0 and (penalty_may_cap or daily_penalty <= daily_bonus):
+                ahead = pulp.LpVariable(f"ahead_{index}", cat="Binary")
+                self.problem += early <= target * ahead
+                self.problem += late <= late_cap * (1 - ahead)
+        return term
+
+    def _path_expr(self, y: List, scenario: Tuple[List[int], List[int]], path: Tuple[int, ...]):
+        """路徑長度：Σ 正常工期 - 可縮短天數 × y"""
+        normal, crash = scenario
+        constant = sum(normal[i] for i in path)
+        return constant - pulp.lpSum(
+            (normal[i] - crash[i]) * y[i] for i in path if normal[i] > crash[i]
+        )
+
+    # ------------------------------------------------------------------
+    # 切平面法
+    # ------------------------------------------------------------------
+
+    def _solve(
+        self,
+        mode: str,
+        limit,
+        indirect_cost: int,
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: Optional[int],
+    ) -> Dict:
+        start_time = time.time()
+        deadline = start_time + self.time_limit
+        budget_mode = mode == "budget_to_duration"
+        indirect = float(indirect_cost)
+        rates = self._reward_rates(
+            penalty_type, penalty_amount, penalty_rate, contract_amount, contract_duration
+        )
+        acts = [self.activities[aid] for aid in self.ids]
+        count = self.scenario_count
+        order, predecessors = self._index_network()
+        all_normal = [False] * len(self.ids)
+        all_crashed = [act.crash_duration < act.normal_duration for act in acts]
+
+        def direct_cost(crashed: Sequence[bool]) -> float:
+            return sum(
+                act.crash_cost if flag else act.normal_cost for act, flag in zip(acts, crashed)
+            )
+
+        def scenario_losses(makespans: Sequence[int]) -> List[float]:
+            losses = []
+            for makespan in makespans:
+                penalty, bonus = self._rewards(makespan, target_duration, rates)
+                # 預算模式的損失為工期 + 獎懲（同單一模型，工期以 MINOR_UNITS 加權）
+                base = MINOR_UNITS * makespan if budget_mode else indirect * makespan
+                losses.append(base + penalty - bonus)
+            return losses
+
+        evaluator = ScenarioEvaluator(order, predecessors, self.samples, self.max_workers)
+        slowest = evaluator.evaluate(all_normal)
+        fastest = evaluator.evaluate(all_crashed)
+
+        # 主問題
+        self.problem = pulp.LpProblem(f"Robust_{mode}", pulp.LpMinimize)
+        y = [pulp.LpVariable(f"y_{index}", cat="Binary") for index in range(len(acts))]
+        for index, act in enumerate(acts):
+            if not all_crashed[index]:
+                y[index].upBound = 0
+        T = [
+            pulp.LpVariable(f"T_{s}", lowBound=fastest[s][0], upBound=slowest[s][0])
+            for s in range(count)
+        ]
+        losses = []
+        for s in range(count):
+            term = self._add_scenario_terms(s, T[s], slowest[s][0], target_duration, rates)
+            base = MINOR_UNITS * T[s] if budget_mode else indirect * T[s]
+            losses.append(base + term)
+
+        if self.risk_measure == "expected":
+            risk_expr = pulp.lpSum(losses) * (1.0 / count)
+        else:
+            eta = pulp.LpVariable("cvar_eta")
+            excess = [pulp.LpVariable(f"cvar_excess_{s}", lowBound=0) for s in range(count)]
+            for s in range(count):
+                self.problem += excess[s] >= losses[s] - eta
+            risk_expr = eta + pulp.lpSum(excess) * (1.0 / ((1 - self.cvar_alpha) * count))
+
+        direct_expr = pulp.lpSum(
+            act.normal_cost + (act.crash_cost - act.normal_cost) * y[index]
+            for index, act in enumerate(acts)
+        )
+        if budget_mode:
+            self.problem += risk_expr
+            self.problem += (
+                direct_expr + pulp.lpSum(T) * (indirect / count) <= float(limit),
+                "budget",
+            )
+        else:
+            self.problem += direct_expr + risk_expr
+
+        cuts = set()
+
+        def add_cuts(results: List[PathResult], makespans=None) -> int:
+            added = 0
+            for s, (makespan, path) in enumerate(results):
+                if makespans is not None and makespan <= makespans[s] + 1e-6:
+                    continue
+                if (s, path) in cuts or not path:
+                    continue
+                cuts.add((s, path))
+                self.problem += T[s] >= self._path_expr(y, self.samples[s], path)
+                added += 1
+            return added
+
+        nominal_cuts = set()
+
+        def add_nominal_cut(crashed: Sequence[bool]) -> bool:
+            """標稱排程超過工期約束時加入可行性切平面，回傳是否可行"""
+            makespan, path = evaluate_paths(
+                order, predecessors, self.nominal, crashed, 0, 1
+            )[0]
+            if makespan <= limit:
+                return True
+            if path not in nominal_cuts:
+                nominal_cuts.add(path)
+                self.problem += self._path_expr(y, self.nominal[0], path) <= int(limit)
+            return False
+
+        add_cuts(slowest)
+        add_cuts(fastest)
+        if not budget_mode:
+            add_nominal_cut(all_normal)
+            add_nominal_cut(all_crashed)
+
+        best = None  # (上界, 趕工決策, 各情境工期)
+        lower_bound = -math.inf
+        iterations = 0
+        time_limit_reached = False
+        status = pulp.LpStatusOptimal
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                time_limit_reached = True
+                break
+            iterations += 1
+            solver = pulp.PULP_CBC_CMD(
+                msg=0,
+                timeLimit=max(remaining, 1),
+                threads=self.solver_threads,
+                warmStart=best is not None,
+            )
+            self.problem.solve(solver)
+            status = self.problem.status
+            if self.problem.sol_status not in (
+                pulp.LpSolutionOptimal,
+                pulp.LpSolutionIntegerFeasible,
+            ):
+                break
+            master_optimal = self.problem.sol_status == pulp.LpSolutionOptimal
+            if master_optimal:
+                lower_bound = max(lower_bound, pulp.value(self.problem.objective))
+
+            crashed = [var.varValue is not None and var.varValue > 0.5 for var in y]
+            results = evaluator.evaluate(crashed)
+            makespans = [makespan for makespan, _ in results]
+            direct = direct_cost(crashed)
+            nominal_count = len(nominal_cuts)
+            if budget_mode:
+                feasible = direct + indirect * sum(makespans) / count <= float(limit) + 1e-6
+            else:
+                feasible = add_nominal_cut(crashed)
+            if feasible:
+                objective = self._risk(scenario_losses(makespans))
+                if not budget_mode:
+                    objective += direct
+                if best is None or objective < best[0] - 1e-9:
+                    best = (objective, crashed, makespans)
+                    for var, flag in zip(y, crashed):
+                        var.setInitialValue(1 if flag else 0)
+
+            master_makespans = [var.varValue or 0.0 for var in T]
+            added = add_cuts(results, master_makespans) + len(nominal_cuts) - nominal_count
+            if not master_optimal:
+                time_limit_reached = True
+                break
+            if best is not None and best[0] - lower_bound <= ROBUST_GAP_TOLERANCE * max(
+                1.0, abs(best[0])
+            ):
+                break
+            if added == 0:
+                # 主問題的解已滿足所有情境，即為最優解
+                break
+
+        calculation_time = time.time() - start_time
+        if best is None:
+            if status == pulp.LpStatusInfeasible:
+                return self._infeasible_result(mode, limit, indirect_cost, calculation_time)
+            return {
+                "status": "error",
+                "error_message": (
+                    f"求解失敗：在 {self.time_limit:g} 秒內找不到可行的趕工組合。"
+                    "建議：延長時間上限或減少情境數。"
+                ),
+                "calculation_time": calculation_time,
+            }
+
+        objective, crashed, makespans = best
+        gap = None
+        if lower_bound > -math.inf:
+            gap = max(objective - lower_bound, 0.0) / max(1.0, abs(objective))
+        summary = self._summary(
+            makespans,
+            target_duration,
+            rates,
+            objective=objective,
+            lower_bound=None if lower_bound == -math.inf else lower_bound,
+            gap=gap,
+            iterations=iterations,
+            cut_count=len(cuts) + len(nominal_cuts),
+            time_limit_reached=time_limit_reached,
+        )
+        crashed_ids = {aid for aid, flag in zip(self.ids, crashed) if flag}
+        return self._build_plan_result(
+            crashed_ids,
+            None if budget_mode else int(limit),
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
+            summary,
+        )
+
+    def _infeasible_result(
+        self, mode: str, limit, indirect_cost: int, calculation_time: float
+    ) -> Dict:
+        if mode == "budget_to_duration":
+            reason = (
+                f"預算不足：在抽樣情境下，任何趕工組合的期望成本都超過預算 {from_minor(limit)}"
+            )
+            suggestion = "建議：增加預算或調整作業參數。"
+        else:
+            min_duration = self._calculate_min_duration()
+            reason = (
+                "工期約束過緊：即使所有作業都趕工，"
+                f"最短工期也需要 {min_duration} 天，但約束工期只有 {limit} 天"
+            )
+            suggestion = "建議：放寬工期約束或調整作業參數。"
+        return {
+            "status": "infeasible",
+            "error_message": f"無可行解（Infeasible）。原因：{reason}。{suggestion}",
+            "calculation_time": calculation_time,
+        }
+
+    # ------------------------------------------------------------------
+    # 結果整理
+    # ------------------------------------------------------------------
+
+    def _summary(
+        self,
+        makespans: List[int],
+        target_duration: Optional[int],
+        rates: Tuple,
+        **solve_info,
+    ) -> Dict:
+        """所選趕工組合在各抽樣情境下的工期分布與獎懲統計
+
+        獎懲與目標值在模型中以分計算，統計中換算為元。
+        """
+        count = len(makespans)
+        ordered = sorted(makespans)
+        penalties, bonuses = [], []
+        for makespan in makespans:
+            penalty, bonus = self._rewards(makespan, target_duration, rates)
+            penalties.append(penalty)
+            bonuses.append(bonus)
+        on_time = None
+        if target_duration:
+            on_time = sum(1 for makespan in makespans if makespan <= target_duration) / count
+        return {
+            "risk_measure": self.risk_measure,
+            "scenario_count": count,
+            "cvar_alpha": self.cvar_alpha if self.risk_measure == "cvar" else None,
+            "optimistic": self.optimistic,
+            "pessimistic": self.pessimistic,
+            "seed": self.seed,
+            "expected_duration": round(sum(makespans) / count, 3),
+            "duration_p50": percentile(ordered, 0.5),
+            "duration_p90": percentile(ordered, 0.9),
+            "duration_max": ordered[-1],
+            "on_time_probability": on_time,
+            "expected_penalty": round(sum(penalties) / count / MINOR_UNITS, 2),
+            "cvar_penalty": round(cvar(penalties, self.cvar_alpha) / MINOR_UNITS, 2),
+            "expected_bonus": round(sum(bonuses) / count / MINOR_UNITS, 2),
+            "objective_value": round(solve_info["objective"] / MINOR_UNITS, 6),
+            "lower_bound": None
+            if solve_info["lower_bound"] is None
+            else round(solve_info["lower_bound"] / MINOR_UNITS, 6),
+            "gap": None if solve_info["gap"] is None else round(solve_info["gap"], 6),
+            "iterations": solve_info["iterations"],
+            "cut_count": solve_info["cut_count"],
+            "time_limit_reached": solve_info["time_limit_reached"],
+        }
+
+    def _build_plan_result(
+        self,
+        crashed: set,
+        fixed_duration: Optional[int],
+        indirect_cost: int,
+        penalty_type: str,
+        penalty_amount: Optional[int],
+        penalty_rate: Optional[Decimal],
+        contract_amount: int,
+        contract_duration: Optional[int],
+        target_duration: Optional[int],
+        calculation_time: float,
+        summary: Dict,
+    ) -> Dict:
+        """依趕工組合的標稱排程整理回傳結果（工期 → 成本模式的工期為約束工期）"""
+        makespan, start_times = self._earliest_schedule(crashed)
+        result = build_plan_result(
+            self.activities,
+            crashed,
+            start_times,
+            makespan if fixed_duration is None else fixed_duration,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+            calculation_time,
+        )
+        result["robust"] = summary
+        return result
+
+    # ------------------------------------------------------------------
+    # 模式一：預算 → 工期
+    # ------------------------------------------------------------------
+
+    def solve_budget_to_duration(
+        self,
+        budget: int,
+        indirect_cost: int = 0,
+        penalty_type: str = "rate",
+        penalty_amount: Optional[int] = None,
+        penalty_rate: Optional[Decimal] = None,
+        contract_amount: int = 0,
+        contract_duration: Optional[int] = None,
+        target_duration: Optional[int] = None,
+    ) -> Dict:
+        """
+        模式一：給定預算（期望總成本上限），最小化各情境工期與獎懲的期望值或 CVaR
+        """
+        return self._solve(
+            "budget_to_duration",
+            budget,
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+        )
+
+    # ------------------------------------------------------------------
+    # 模式二：工期 → 成本
+    # ------------------------------------------------------------------
+
+    def solve_duration_to_cost(
+        self,
+        duration: int,
+        indirect_cost: int = 0,
+        penalty_type: str = "rate",
+        penalty_amount: Optional[int] = None,
+        penalty_rate: Optional[Decimal] = None,
+        contract_amount: int = 0,
+        contract_duration: Optional[int] = None,
+        target_duration: Optional[int] = None,
+    ) -> Dict:
+        """
+        模式二：標稱排程不超過給定工期，最小化直接成本加上各情境間接成本與獎懲的
+        期望值或 CVaR
+        """
+        return self._solve(
+            "duration_to_cost",
+            int(duration),
+            indirect_cost,
+            penalty_type,
+            penalty_amount,
+            penalty_rate,
+            contract_amount,
+            contract_duration,
+            target_duration,
+        )
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """已排序資料的百分位數（最近秩法）"""
+    index = min(max(math.ceil(fraction * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def cvar(values: Sequence[float], alpha: float) -> float:
+    """最差 (1 - alpha) 比例的平均值（Rockafellar–Uryasev 定義，非整數情境數時按比例計入）"""
+    ordered = sorted(values, reverse=True)
+    tail = (1 - alpha) * len(ordered)
+    total, taken = 0.0, 0.0
+    for value in ordered:
+        weight = min(1.0, tail - taken)
+        if weight <= 0:
+            break
+        total += weight * value
+        taken += weight
+    return total / tail if tail > 0 else ordered[0]
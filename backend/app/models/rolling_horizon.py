@@ -0,0 +1,193 @@
+"""
+滾動式重新優化（施工中專案）
+依資料日期與實際進度將作業分為三類：
+- 已完成：凍結實際開始 / 完成時間，成本視為已發生的固定成本（依縮短天數比例計趕工成本）
+- 進行中：固定實際開始時間，依完成百分比估算剩餘工期，不可再趕工
+- 未開始：最早只能於資料日期開始，且須在已凍結的前置作業完成後才開始
+MILP 只對未開始作業建立變數，已凍結部分以釋放時間與固定成本帶入模型。
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import math
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer
+from app.models.network import critical_path_length
+from app.utils.lazy_import import lazy_module
+from app.utils.money import round_minor
+
+pulp = lazy_module("pulp")
+
+
+def completed_cost(act: Activity, duration: int) -> int:
+    """已完成作業的成本（分）：依實際縮短的天數在正常與趕工成本之間線性內插
+
+    實際工期不短於正常工期時為正常成本，縮短到趕工工期（或更短）時為趕工成本。
+    """
+    saved = act.normal_duration - duration
+    span = act.normal_duration - act.crash_duration
+    if saved <= 0:
+        return act.normal_cost
+    if saved >= span:
+        return act.crash_cost
+    return act.normal_cost + round_minor(Decimal(act.crash_cost - act.normal_cost) * saved / span)
+
+
+def frozen_schedule(
+    act: Activity, progress: Dict, status_date: int
+) -> Optional[Dict]:
+    """依實際進度計算已凍結作業的排程；未開始的作業回傳 None
+
+    Args:
+        act: 作業
+        progress: 含 actual_start、actual_finish（開工後第幾天）與 percent_complete 的字典
+        status_date: 資料日期（開工後第幾天）
+    """
+    actual_start = progress.get("actual_start")
+    actual_finish = progress.get("actual_finish")
+
+    if actual_finish is not None and actual_finish <= status_date:
+        # 已完成：實際工期短於正常工期時視為已趕工，成本依縮短天數比例計算
+        if actual_start is None:
+            actual_start = max(actual_finish - act.normal_duration, 0)
+        duration = max(actual_finish - actual_start, 0)
+        return {
+            "activity_id": act.id,
+            "activity_name": act.name,
+            "start_time": actual_start,
+            "end_time": actual_finish,
+            "duration": duration,
+            "is_crashed": duration < act.normal_duration,
+            "cost": completed_cost(act, duration),
+        }
+
+    if actual_start is not None and actual_start <= status_date:
+        # 進行中：剩餘工期 = 正常工期 ×（1 - 完成百分比），自資料日期起算
+        percent = float(progress.get("percent_complete") or 0)
+        remaining = math.ceil(act.normal_duration * max(0.0, 100.0 - percent) / 100.0)
+        end_time = max(status_date + remaining, actual_start)
+        return {
+            "activity_id": act.id,
+            "activity_name": act.name,
+            "start_time": actual_start,
+            "end_time": end_time,
+            "duration": end_time - actual_start,
+            "is_crashed": False,
+            "cost": act.normal_cost,
+        }
+
+    return None
+
+
+class RollingHorizonOptimizer(BiddingOptimizer):
+    """只對剩餘網路建模的優化器，回傳結果包含凍結作業的排程
+
+    預算約束與回傳的直接成本皆包含已凍結作業的成本（整個專案的總額，以分計）；
+    工期 T 仍為整個專案自開工起算的總工期。
+    """
+
+    def __init__(
+        self,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        progress: Dict[str, Dict],
+        status_date: int,
+        formulation: str = "standard",
+        solver: Optional[pulp.LpSolver] = None,
+    ):
+        """
+        Args:
+            activities: 專案全部作業
+            precedences: 前置關係列表，格式為 [(後續作業ID, 前置作業ID), ...]
+            progress: 各作業的實際進度（activity_id → 進度欄位字典）
+            status_date: 資料日期（開工後第幾天）
+            formulation: 模型建構方式
+            solver: PuLP 求解器
+        """
+        self.status_date = int(status_date)
+        self.frozen_schedules: List[Dict] = []
+        frozen_end: Dict[str, int] = {}
+        remaining: List[Activity] = []
+        for act in activities:
+            schedule = frozen_schedule(act, progress.get(act.id) or {}, self.status_date)
+            if schedule is None:
+                remaining.append(act)
+            else:
+                self.frozen_schedules.append(schedule)
+                frozen_end[act.id] = schedule["end_time"]
+
+        remaining_ids = {act.id for act in remaining}
+        remaining_precedences: List[Tuple[str, str]] = []
+        # 未開始作業最早於資料日期開始，並須等已凍結的前置作業完成
+        self.release_times: Dict[str, int] = {aid: self.status_date for aid in remaining_ids}
+        for successor_id, predecessor_id in precedences:
+            if successor_id not in remaining_ids:
+                continue
+            if predecessor_id in remaining_ids:
+                remaining_precedences.append((successor_id, predecessor_id))
+            elif predecessor_id in frozen_end:
+                self.release_times[successor_id] = max(
+                    self.release_times[successor_id], frozen_end[predecessor_id]
+                )
+
+        self.fixed_cost = sum(schedule["cost"] for schedule in self.frozen_schedules)
+        self.fixed_finish = max(frozen_end.values(), default=0)
+
+        super().__init__(remaining, remaining_precedences, formulation=formulation, solver=solver)
+
+    # ------------------------------------------------------------------
+    # 網路界限：考慮釋放時間與已凍結作業
+    # ------------------------------------------------------------------
+
+    def _remaining_duration(self, crashed: bool) -> int:
+        predecessors, order = self._network()
+        durations = {
+            aid: act.crash_duration if crashed else act.normal_duration
+            for aid, act in self.activities.items()
+        }
+        duration, _ = critical_path_length(durations, predecessors, order, self.release_times)
+        return max(duration, self.fixed_finish)
+
+    def _calculate_normal_duration(self) -> int:
+        """計算剩餘作業全部正常施工時的專案工期"""
+        return self._remaining_duration(crashed=False)
+
+    def _calculate_min_duration(self) -> int:
+        """計算剩餘作業全部趕工時的專案工期"""
+        return self._remaining_duration(crashed=True)
+
+    def _calculate_min_cost(self, indirect_cost: int = 0) -> int:
+        """不趕工時的最小總成本（含已凍結作業成本）"""
+        return super()._calculate_min_cost(indirect_cost) + self.fixed_cost
+
+    def calculate_network_bounds(self) -> Dict:
+        bounds = super().calculate_network_bounds()
+        bounds["min_direct_cost"] += self.fixed_cost
+        return bounds
+
+    # ------------------------------------------------------------------
+    # 模型建構：釋放時間與固定成本
+    # ------------------------------------------------------------------
+
+    def _create_variables(self, t_low: int = 0, t_up: Optional[int] = None):
+        x, y, T = super()._create_variables(t_low=max(t_low, self.fixed_finish), t_up=t_up)
+        for act_id, release in self.release_times.items():
+            x[act_id].lowBound = release
+        return x, y, T
+
+    def _add_network_constraints(self, x, y, T) -> None:
+        super()._add_network_constraints(x, y, T)
+        # 專案須在所有已凍結作業完成後才結束（剩餘作業為空時也讓 T 出現在約束中）
+        self.problem += T >= self.fixed_finish
+
+    def _direct_cost_expr(self, y: Dict[str, pulp.LpVariable]):
+        return super()._direct_cost_expr(y) + self.fixed_cost
+
+    def _build_success_result(self, x, y, T, indirect_cost, *args) -> Dict:
+        result = super()._build_success_result(x, y, T, indirect_cost, *args)
+        result["optimal_cost"] += self.fixed_cost
+        result["total_cost"] += self.fixed_cost
+        result["schedules"] = self.frozen_schedules + result["schedules"]
+        return result
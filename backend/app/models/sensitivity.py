@@ -0,0 +1,236 @@
+"""
+參數敏感度分析
+違約金率 × 每日間接成本 × 目標工期的格點各自求解需要數百次 MILP；
+但兩種模式的答案都只取決於直接成本對工期的權衡曲線：
+
+- 工期 → 成本：工期固定時間接成本與獎懲皆為常數，所有格點共用同一個趕工組合
+- 預算 → 工期：目標（工期 + 違約金 - 獎金）隨工期遞增，最優解是預算內可行的
+  最短工期，與違約金率、目標工期無關；間接成本越高可行工期只會越長
+
+因此只需按需求補齊曲線的局部：每次以工期上限 h 求最低直接成本，求得的組合
+實際完工時間為 L 時，其成本對 [L, h] 內所有工期都成立。預算模式在未知區間內
+以二分法選擇求解點，並以「右側已知成本 + 間接成本 × 區間起點」作為下界，
+下界已超出預算的區間整段略過。金額（預算、間接成本、契約價金與各格點結果）皆以分計。
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import time
+
+from app.models.bidding_optimizer import BiddingOptimizer
+
+
+class _Segment:
+    """曲線上一段已知區間：工期在 [low, high] 內的最低直接成本皆為 cost
+
+    makespan 為趕工組合的實際完工工期（low 可能因與左側區間相接而大於 makespan）。
+    """
+
+    __slots__ = ("low", "high", "cost", "crashed", "makespan")
+
+    def __init__(self, low: int, high: float, cost: int, crashed: Tuple[str, ...], makespan: int):
+        self.low = low
+        self.high = high
+        self.cost = cost
+        self.crashed = crashed
+        self.makespan = makespan
+
+
+class SensitivitySweep:
+    """單一專案網路的敏感度分析
+
+    已求得的曲線區間在所有格點間共用；solve_count 為實際求解 MILP 的次數。
+    curve 為選用的完整權衡曲線（例如背景預先計算的結果），提供時不需任何求解。
+    """
+
+    def __init__(self, optimizer: BiddingOptimizer, curve: Optional[List[Dict]] = None):
+        self.optimizer = optimizer
+        self.solve_count = 0
+        self.min_duration = optimizer._calculate_min_duration()
+        self.normal_duration = optimizer._calculate_normal_duration()
+        self._segments: List[_Segment] = []
+        self._lows: List[int] = []
+
+        # 全部不趕工即為成本最低的組合，對正常工期以上的所有工期都成立
+        normal_cost = sum(act.normal_cost for act in optimizer.activities.values())
+        self._insert(_Segment(self.normal_duration, float("inf"), normal_cost, (), self.normal_duration))
+        if curve:
+            for index, point in enumerate(curve):
+                high = curve[index + 1]["duration"] - 1 if index + 1 < len(curve) else self.normal_duration - 1
+                if point["duration"] <= high:
+                    self._insert(
+                        _Segment(
+                            point["duration"], high, point["direct_cost"],
+                            tuple(point["crashed"]), point["duration"],
+                        )
+                    )
+
+    # ------------------------------------------------------------------
+    # 曲線區間
+    # ------------------------------------------------------------------
+
+    def _insert(self, segment: _Segment) -> None:
+        index = bisect_left(self._lows, segment.low)
+        self._segments.insert(index, segment)
+        self._lows.insert(index, segment.low)
+
+    def _segment_from(self, duration: int) -> _Segment:
+        """包含 duration 的區間；duration 落在未知區間時回傳其右側第一個已知區間"""
+        index = bisect_right(self._lows, duration) - 1
+        if index >= 0 and self._segments[index].high >= duration:
+            return self._segments[index]
+        return self._segments[index + 1]
+
+    def _solve_at(self, horizon: int, floor: int) -> _Segment:
+        """求工期上限 horizon 下的最低直接成本，記錄其成立的區間（不與左側已知區間重疊）"""
+        result = self.optimizer.solve_duration_to_cost(horizon)
+        self.solve_count += 1
+        if result["status"] != "success":
+            raise RuntimeError(result.get("error_message", "敏感度分析求解失敗"))
+        crashed = {s["activity_id"] for s in result["schedules"] if s["is_crashed"]}
+        makespan, _ = self.optimizer._earliest_schedule(crashed)
+        segment = _Segment(
+            max(makespan, floor), horizon, result["optimal_cost"], tuple(sorted(crashed)), makespan
+        )
+        self._insert(segment)
+        return segment
+
+    def cost_at(self, duration: int) -> Optional[_Segment]:
+        """工期上限 duration 下的最低直接成本區間；低於最短工期時回傳 None"""
+        if duration < self.min_duration:
+            return None
+        segment = self._segment_from(duration)
+        if segment.low <= duration:
+            return segment
+        index = bisect_left(self._lows, segment.low) - 1
+        floor = self._segments[index].high + 1 if index >= 0 else self.min_duration
+        return self._solve_at(duration, int(floor))
+
+    def shortest_within_budget(
+        self, budget: int, indirect_cost: int, start: Optional[int] = None
+    ) -> Optional[Tuple[int, _Segment]]:
+        """直接成本 + 間接成本 × 工期不超過預算的最短工期
+
+        start 為已知的工期下界（例如較低間接成本的答案），由此往右搜尋。
+        曲線非凸時可行工期不一定連續，因此由左而右逐段判斷：已知區間只需檢查
+        起點；未知區間先以下界剪枝，無法排除時在中點求解，把區間切成兩段。
+        """
+        lo = max(start or self.min_duration, self.min_duration)
+        while True:
+            segment = self._segment_from(lo)
+            if segment.low <= lo:
+                if segment.cost + indirect_cost * lo <= budget:
+                    return lo, segment
+                if segment.high == float("inf"):
+                    return None
+                lo = int(segment.high) + 1
+                continue
+            # 未知區間 [lo, segment.low - 1]：直接成本不低於右側已知區間
+            if segment.cost + indirect_cost * lo > budget:
+                lo = segment.low
+                continue
+            self._solve_at((lo + segment.low - 1) // 2, lo)
+
+    # ------------------------------------------------------------------
+    # 格點分析
+    # ------------------------------------------------------------------
+
+    def sweep(
+        self,
+        mode: str,
+        penalty_rates: List[Decimal],
+        indirect_costs: List[int],
+        target_durations: List[int],
+        budget: Optional[int] = None,
+        duration: Optional[int] = None,
+        contract_amount: int = 0,
+        contract_duration: Optional[int] = None,
+    ) -> Dict:
+        """計算違約金率 × 間接成本 × 目標工期各格點的最優工期與總成本
+
+        Returns:
+            cells（各格點結果，plan 為 plans 的索引）、plans（不重複的趕工組合）、
+            cell_count、solve_count、skipped_solves（與逐格求解相比省下的求解次數）
+            與 calculation_time
+        """
+        start_time = time.time()
+        solves_before = self.solve_count
+
+        # 每個間接成本對應的（工期, 曲線區間）；與違約金率、目標工期無關
+        answers: Dict[int, Optional[Tuple[int, _Segment]]] = {}
+        if mode == "duration_to_cost":
+            segment = self.cost_at(int(duration))
+            for indirect_cost in indirect_costs:
+                answers[indirect_cost] = (int(duration), segment) if segment is not None else None
+        else:
+            # 最短可行工期隨間接成本單調不減：依序以前一個答案為下界，不可行後全部不可行
+            previous: Optional[int] = None
+            feasible = True
+            for indirect_cost in sorted(set(indirect_costs)):
+                answer = self.shortest_within_budget(budget, indirect_cost, previous) if feasible else None
+                answers[indirect_cost] = answer
+                if answer is None:
+                    feasible = False
+                else:
+                    previous = answer[0]
+
+        plans: List[Dict] = []
+        plan_index: Dict[Tuple[str, ...], int] = {}
+        cells: List[Dict] = []
+        for penalty_rate in penalty_rates:
+            for indirect_cost in indirect_costs:
+                for target_duration in target_durations:
+                    cell = {
+                        "penalty_rate": penalty_rate,
+                        "indirect_cost": indirect_cost,
+                        "target_duration": target_duration,
+                    }
+                    answer = answers[indirect_cost]
+                    if answer is None:
+                        cells.append({**cell, "status": "infeasible"})
+                        continue
+                    optimal_duration, segment = answer
+                    if segment.crashed not in plan_index:
+                        plan_index[segment.crashed] = len(plans)
+                        plans.append(
+                            {
+                                "duration": segment.makespan,
+                                "direct_cost": segment.cost,
+                                "crashed_activity_ids": list(segment.crashed),
+                            }
+                        )
+                    penalty, bonus = BiddingOptimizer._calculate_rewards(
+                        optimal_duration,
+                        "rate",
+                        None,
+                        penalty_rate,
+                        contract_amount,
+                        contract_duration,
+                        target_duration,
+                    )
+                    cells.append(
+                        {
+                            **cell,
+                            "status": "success",
+                            "plan": plan_index[segment.crashed],
+                            "optimal_duration": optimal_duration,
+                            "optimal_cost": segment.cost,
+                            "penalty_amount": penalty,
+                            "bonus_amount": bonus,
+                            "total_cost": segment.cost + indirect_cost * optimal_duration + penalty - bonus,
+                        }
+                    )
+
+        solve_count = self.solve_count - solves_before
+        return {
+            "mode": mode,
+            "cells": cells,
+            "plans": plans,
+            "cell_count": len(cells),
+            "solve_count": solve_count,
+            "skipped_solves": len(cells) - solve_count,
+            "calculation_time": time.time() - start_time,
+        }
@@ -0,0 +1,143 @@
+"""
+求解時間預測
+以模型特徵（作業數、前置關係密度、可趕工作業數、決策模式、是否有獎懲、模型建構方式、
+是否分解求解、穩健模式的抽樣情境數）
+對歷史 calculation_time 做最小平方法迴歸，預測 log(求解秒數)。
+只使用標準庫；特徵數很少，正規方程式以高斯消去法求解即可。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 特徵向量各欄位名稱（第一欄為常數項）
+FEATURE_NAMES = (
+    "bias",
+    "log_activities",
+    "precedence_density",
+    "log_crashable",
+    "budget_mode",
+    "penalty_active",
+    "tight",
+    "decomposed",
+    "log_scenarios",
+)
+
+# 尚未有歷史資料時使用的預設係數（以 benchmarks/bench_solve_time 的隨機網路估計，
+# 求解時間約隨作業數 1.2 次方成長；穩健模式約隨情境數 0.8 次方成長）
+DEFAULT_COEFFICIENTS = (-6.9, 0.4, -0.4, 0.8, -0.4, 0.0, -0.3, 0.0, 0.8)
+
+# 迴歸至少需要的歷史筆數
+MIN_TRAINING_ROWS = 20
+
+# 嶺迴歸正則化係數，避免特徵共線時正規方程式奇異
+RIDGE = 1e-3
+
+
+def model_features(
+    activity_count: int,
+    precedence_count: int,
+    crashable_count: int,
+    mode: str,
+    penalty_active: bool,
+    formulation: str,
+    decomposed: bool = False,
+    scenario_count: int = 0,
+) -> Dict:
+    """整理寫入 model_features 欄位的特徵字典"""
+    return {
+        "activity_count": activity_count,
+        "precedence_count": precedence_count,
+        "crashable_count": crashable_count,
+        "mode": mode,
+        "penalty_active": bool(penalty_active),
+        "formulation": formulation,
+        "decomposed": bool(decomposed),
+        "scenario_count": int(scenario_count),
+    }
+
+
+def feature_vector(features: Dict) -> List[float]:
+    """將特徵字典轉為迴歸使用的數值向量（欄位順序同 FEATURE_NAMES）"""
+    activity_count = max(int(features.get("activity_count") or 0), 1)
+    return [
+        1.0,
+        math.log(activity_count),
+        float(features.get("precedence_count") or 0) / activity_count,
+        math.log1p(int(features.get("crashable_count") or 0)),
+        1.0 if features.get("mode") == "budget_to_duration" else 0.0,
+        1.0 if features.get("penalty_active") else 0.0,
+        1.0 if features.get("formulation") == "tight" else 0.0,
+        1.0 if features.get("decomposed") else 0.0,
+        math.log1p(int(features.get("scenario_count") or 0)),
+    ]
+
+
+def _solve_linear(matrix: List[List[float]], rhs: List[float]) -> Optional[List[float]]:
+    """以部分樞軸高斯消去法解 Ax = b；奇異時回傳 None"""
+    size = len(rhs)
+    augmented = [row[:] + [value] for row, value in zip(matrix, rhs)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(augmented[r][col]))
+        if abs(augmented[pivot][col]) < 1e-12:
+            return None
+        augmented[col], augmented[pivot] = augmented[pivot], augmented[col]
+        for row in range(col + 1, size):
+            factor = augmented[row][col] / augmented[col][col]
+            if factor:
+                for k in range(col, size + 1):
+                    augmented[row][k] -= factor * augmented[col][k]
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        total = augmented[row][size] - sum(
+            augmented[row][k] * solution[k] for k in range(row + 1, size)
+        )
+        solution[row] = total / augmented[row][row]
+    return solution
+
+
+class SolveTimePredictor:
+    """求解時間預測器（對數線性迴歸）"""
+
+    def __init__(self, coefficients: Sequence[float] = DEFAULT_COEFFICIENTS):
+        self.coefficients: Tuple[float, ...] = tuple(coefficients)
+        self.training_rows = 0
+
+    def fit(self, history: Iterable[Tuple[Dict, float]]) -> bool:
+        """以歷史 (特徵字典, calculation_time 秒數) 重新估計係數
+
+        Returns:
+            資料不足或無法求解時保留原係數並回傳 False
+        """
+        rows = [
+            (feature_vector(features), math.log(max(float(seconds), 1e-3)))
+            for features, seconds in history
+            if features and seconds is not None
+        ]
+        if len(rows) < MIN_TRAINING_ROWS:
+            return False
+
+        size = len(FEATURE_NAMES)
+        xtx = [[0.0] * size for _ in range(size)]
+        xty = [0.0] * size
+        for vector, target in rows:
+            for i in range(size):
+                xty[i] += vector[i] * target
+                for j in range(size):
+                    xtx[i][j] += vector[i] * vector[j]
+        for i in range(1, size):
+            xtx[i][i] += RIDGE * len(rows)
+
+        solution = _solve_linear(xtx, xty)
+        if solution is None:
+            return False
+        self.coefficients = tuple(solution)
+        self.training_rows = len(rows)
+        return True
+
+    def predict(self, features: Dict) -> float:
+        """預測求解秒數"""
+        vector = feature_vector(features)
+        log_seconds = sum(c * v for c, v in zip(self.coefficients, vector))
+        return math.exp(min(log_seconds, 20.0))
@@ -0,0 +1,250 @@
+"""
+What-if 工作階段
+常駐一個專案的作業網路與優化器，逐次套用參數差異與作業覆寫後重新求解。
+網路結構相關的計算（鄰接表、拓撲排序、遞移化簡）只做一次，
+作業覆寫只替換 Activity 物件；相同參數組合的結果直接由快取回傳。
+用戶端的參數與覆寫金額以元表示，求解時才換算為分。
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import threading
+import time
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer
+from app.models.solve_time import model_features
+from app.utils.money import optional_minor, to_minor
+
+# 可由用戶端調整的求解參數
+WHATIF_PARAMS = (
+    "mode",
+    "budget_constraint",
+    "duration_constraint",
+    "indirect_cost",
+    "penalty_type",
+    "penalty_amount",
+    "penalty_rate",
+    "contract_amount",
+    "contract_duration",
+    "target_duration",
+)
+
+DEFAULT_PARAMS = {"mode": "budget_to_duration", "penalty_type": "rate"}
+
+# 可覆寫的作業欄位
+OVERRIDE_FIELDS = ("normal_duration", "normal_cost", "crash_duration", "crash_cost")
+OVERRIDE_COST_FIELDS = ("normal_cost", "crash_cost")
+
+# 每個工作階段保留的結果快取筆數
+RESULT_MEMO_SIZE = 32
+
+
+class WhatIfSession:
+    """單一專案的 what-if 工作階段（同一時間只會有一個求解在執行）"""
+
+    def __init__(
+        self,
+        project_id: str,
+        activities: List[Activity],
+        precedences: List[Tuple[str, str]],
+        formulation: str = "standard",
+        generation: int = 0,
+    ):
+        self.project_id = project_id
+        self.formulation = formulation
+        self.generation = generation
+        self.params: Dict = dict(DEFAULT_PARAMS)
+        self.overrides: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._memo: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._load(activities, precedences)
+
+    def _load(self, activities: List[Activity], precedences: List[Tuple[str, str]]) -> None:
+        self.loaded_at = time.monotonic()
+        self.base_activities: Dict[str, Activity] = {act.id: act for act in activities}
+        self.optimizer = BiddingOptimizer(activities, precedences, formulation=self.formulation)
+        # 網路結構只計算一次，之後的覆寫與求解都沿用
+        self.optimizer._network()
+        self.optimizer._constraint_network()
+        self._memo.clear()
+        for activity_id in list(self.overrides):
+            if activity_id not in self.base_activities:
+                del self.overrides[activity_id]
+        self._apply_overrides()
+
+    def reload(
+        self, activities: List[Activity], precedences: List[Tuple[str, str]], generation: int
+    ) -> None:
+        """網路已異動時重新載入，保留仍存在之作業的覆寫"""
+        with self._lock:
+            self.generation = generation
+            self._load(activities, precedences)
+
+    def bounds(self) -> Dict:
+        """目前（含覆寫）的網路界限"""
+        with self._lock:
+            return self.optimizer.calculate_network_bounds()
+
+    # ------------------------------------------------------------------
+    # 差異套用
+    # ------------------------------------------------------------------
+
+    def update(self, params: Optional[Dict] = None, overrides: Optional[Dict[str, Optional[Dict]]] = None) -> None:
+        """套用參數差異與作業覆寫
+
+        Args:
+            params: 要變更的求解參數（值為 None 表示清除）
+            overrides: activity_id → 覆寫欄位；值為 None 表示移除該作業的覆寫
+
+        Raises:
+            ValueError: 參數名稱、作業或覆寫值不合法
+        """
+        with self._lock:
+            new_params = dict(self.params)
+            for key, value in (params or {}).items():
+                if key not in WHATIF_PARAMS:
+                    raise ValueError(f"不支援的參數：{key}")
+                if key == "mode" and value not in ("budget_to_duration", "duration_to_cost"):
+                    raise ValueError("決策模式必須是 budget_to_duration 或 duration_to_cost")
+                if key == "penalty_type" and value not in ("fixed", "rate"):
+                    raise ValueError("違約金計算方式必須是 fixed（定額）或 rate（比率）")
+                if value is None:
+                    new_params.pop(key, None)
+                else:
+                    new_params[key] = value
+
+            # 覆寫全部檢查通過後才與參數一起生效，任一錯誤都不會留下部分變更
+            if overrides:
+                merged = {aid: dict(fields) for aid, fields in self.overrides.items()}
+                for activity_id, fields in overrides.items():
+                    if activity_id not in self.base_activities:
+                        raise ValueError(f"作業不存在：{activity_id}")
+                    if fields is None:
+                        merged.pop(activity_id, None)
+                        continue
+                    unknown = set(fields) - set(OVERRIDE_FIELDS)
+                    if unknown:
+                        raise ValueError(f"不支援的覆寫欄位：{', '.join(sorted(unknown))}")
+                    merged.setdefault(activity_id, {}).update(fields)
+                for activity_id, fields in merged.items():
+                    self._overridden_activity(activity_id, fields)
+                self.overrides = merged
+                self._apply_overrides()
+            self.params = new_params
+
+    def reset(self) -> None:
+        """清除所有參數與作業覆寫"""
+        with self._lock:
+            self.params = dict(DEFAULT_PARAMS)
+            self.overrides = {}
+            self._apply_overrides()
+
+    def _overridden_activity(self, activity_id: str, fields: Dict) -> Activity:
+        """建立套用覆寫後的作業，並檢查與作業 schema 相同的限制"""
+        base = self.base_activities[activity_id]
+        values = {
+            "normal_duration": base.normal_duration,
+            "normal_cost": base.normal_cost,
+            "crash_duration": base.crash_duration,
+            "crash_cost": base.crash_cost,
+        }
+        for field, value in fields.items():
+            values[field] = to_minor(value) if field in OVERRIDE_COST_FIELDS else value
+        if int(values["crash_duration"]) <= 0 or int(values["normal_duration"]) <= 0:
+            raise ValueError(f"作業 {base.name} 的工期必須大於 0")
+        if int(values["crash_duration"]) > int(values["normal_duration"]):
+            raise ValueError(f"作業 {base.name} 的趕工工期必須小於等於正常工期")
+        if values["crash_cost"] < values["normal_cost"]:
+            raise ValueError(f"作業 {base.name} 的趕工成本必須大於等於正常成本")
+        return Activity(
+            base.id,
+            base.name,
+            int(values["normal_duration"]),
+            values["normal_cost"],
+            int(values["crash_duration"]),
+            values["crash_cost"],
+        )
+
+    def _apply_overrides(self) -> None:
+        """以覆寫後的作業替換優化器中的 Activity（網路結構快取不受影響）"""
+        activities = dict(self.base_activities)
+        for activity_id, fields in self.overrides.items():
+            activities[activity_id] = self._overridden_activity(activity_id, fields)
+        self.optimizer.activities = activities
+
+    # ------------------------------------------------------------------
+    # 求解
+    # ------------------------------------------------------------------
+
+    def _memo_key(self) -> Tuple:
+        return (
+            tuple(sorted((k, str(v)) for k, v in self.params.items())),
+            tuple(sorted((aid, tuple(sorted(f.items()))) for aid, f in self.overrides.items())),
+        )
+
+    def cached(self) -> bool:
+        """目前的參數與覆寫是否已有快取結果（不需求解）"""
+        with self._lock:
+            return self._memo_key() in self._memo
+
+    def model_features(self) -> Dict:
+        """目前（含覆寫）模型的特徵，供求解時間預測使用"""
+        with self._lock:
+            params = self.params
+            activities = self.optimizer.activities.values()
+            return model_features(
+                activity_count=len(self.optimizer.activities),
+                precedence_count=len(self.optimizer.precedences),
+                crashable_count=sum(1 for act in activities if act.crash_duration < act.normal_duration),
+                mode=params.get("mode", "budget_to_duration"),
+                penalty_active=params.get("target_duration") is not None
+                and bool(params.get("penalty_amount") or params.get("penalty_rate")),
+                formulation=self.formulation,
+            )
+
+    def solve(self) -> Dict:
+        """以目前的參數與覆寫求解；相同組合直接回傳快取結果
+
+        Returns:
+            BiddingOptimizer 的求解結果（金額以分計），另加 cached 欄位表示是否來自快取
+        """
+        with self._lock:
+            key = self._memo_key()
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return {**self._memo[key], "cached": True}
+
+            params = self.params
+            common = dict(
+                indirect_cost=to_minor(params.get("indirect_cost") or 0),
+                penalty_type=params.get("penalty_type", "rate"),
+                penalty_amount=optional_minor(params.get("penalty_amount")),
+                penalty_rate=_optional_decimal(params.get("penalty_rate")),
+                contract_amount=to_minor(params.get("contract_amount") or 0),
+                contract_duration=params.get("contract_duration"),
+                target_duration=params.get("target_duration"),
+            )
+            if params.get("mode") == "duration_to_cost":
+                if not params.get("duration_constraint"):
+                    raise ValueError("模式二需要提供工期約束")
+                result = self.optimizer.solve_duration_to_cost(
+                    duration=int(params["duration_constraint"]), **common
+                )
+            else:
+                if not params.get("budget_constraint"):
+                    raise ValueError("模式一需要提供預算約束")
+                result = self.optimizer.solve_budget_to_duration(
+                    budget=to_minor(params["budget_constraint"]), **common
+                )
+
+            self._memo[key] = result
+            if len(self._memo) > RESULT_MEMO_SIZE:
+                self._memo.popitem(last=False)
+            return {**result, "cached": False}
+
+
+def _optional_decimal(value) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
@@ -7,6 +7,21 @@ from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 
+# WBS 編碼：以點分隔的英數字段（例如 1.2.3、A.01）
+WBS_CODE_PATTERN = r"^[0-9A-Za-z]+(\.[0-9A-Za-z]+)*$"
+
+
+class ResourceDemand(BaseModel):
+    """作業的資源需求（作業進行期間每日占用的數量）"""
+    resource_id: UUID = Field(..., description="資源ID")
+    quantity: int = Field(..., description="每日需求量", gt=0)
+
+
+def _unique_resource_demands(demands: Optional[List[ResourceDemand]]) -> Optional[List[ResourceDemand]]:
+    if demands and len({d.resource_id for d in demands}) != len(demands):
+        raise ValueError('同一資源的需求只能列一次')
+    return demands
+
 
 class ActivityBase(BaseModel):
     """作業活動基礎模型"""
@@ -16,6 +31,12 @@ class ActivityBase(BaseModel):
     normal_cost: Decimal = Field(..., description="正常成本", gt=0)
     crash_duration: int = Field(..., description="趕工工期（天）", gt=0)
     crash_cost: Decimal = Field(..., description="趕工成本", gt=0)
+    # 實際進度（以開工後第幾天表示）
+    actual_start: Optional[int] = Field(None, description="實際開始（開工後第幾天）", ge=0)
+    actual_finish: Optional[int] = Field(None, description="實際完成（開工後第幾天）", ge=0)
+    percent_complete: float = Field(0, description="完成百分比", ge=0, le=100)
+    # 工作分解結構編碼（以點分隔的層級，例如 1.2.3），供甘特圖彙總
+    wbs_code: Optional[str] = Field(None, description="WBS 編碼", max_length=100, pattern=WBS_CODE_PATTERN)
 
     @field_validator('crash_duration')
     @classmethod
@@ -33,11 +54,27 @@ class ActivityBase(BaseModel):
             raise ValueError('趕工成本必須大於等於正常成本')
         return v
 
+    @field_validator('actual_finish')
+    @classmethod
+    def validate_actual_finish(cls, v, info):
+        """驗證實際完成不得早於實際開始"""
+        actual_start = info.data.get('actual_start')
+        if v is not None and actual_start is not None and v < actual_start:
+            raise ValueError('實際完成不得早於實際開始')
+        return v
+
 
 class ActivityCreate(ActivityBase):
     """建立作業活動請求模型"""
     # project_id 從 URL 路徑參數獲取，不需要在請求體中
     predecessor_ids: Optional[List[UUID]] = Field(default=[], description="前置作業ID列表")
+    resource_demands: Optional[List[ResourceDemand]] = Field(default=[], description="資源需求列表")
+
+    @field_validator('resource_demands')
+    @classmethod
+    def validate_resource_demands(cls, v):
+        """驗證同一資源只列一次"""
+        return _unique_resource_demands(v)
 
 
 class ActivityUpdate(BaseModel):
@@ -48,7 +85,27 @@ class ActivityUpdate(BaseModel):
     normal_cost: Optional[Decimal] = Field(None, description="正常成本", gt=0)
     crash_duration: Optional[int] = Field(None, description="趕工工期（天）", gt=0)
     crash_cost: Optional[Decimal] = Field(None, description="趕工成本", gt=0)
+    actual_start: Optional[int] = Field(None, description="實際開始（開工後第幾天）", ge=0)
+    actual_finish: Optional[int] = Field(None, description="實際完成（開工後第幾天）", ge=0)
+    percent_complete: Optional[float] = Field(None, description="完成百分比", ge=0, le=100)
+    wbs_code: Optional[str] = Field(None, description="WBS 編碼", max_length=100, pattern=WBS_CODE_PATTERN)
     predecessor_ids: Optional[List[UUID]] = Field(None, description="前置作業ID列表")
+    resource_demands: Optional[List[ResourceDemand]] = Field(None, description="資源需求列表（提供時取代原有需求）")
+
+    @field_validator('resource_demands')
+    @classmethod
+    def validate_resource_demands(cls, v):
+        """驗證同一資源只列一次"""
+        return _unique_resource_demands(v)
+
+    @field_validator('actual_finish')
+    @classmethod
+    def validate_actual_finish(cls, v, info):
+        """同時提供實際開始與完成時，完成不得早於開始"""
+        actual_start = info.data.get('actual_start')
+        if v is not None and actual_start is not None and v < actual_start:
+            raise ValueError('實際完成不得早於實際開始')
+        return v
 
 
 class ActivityResponse(ActivityBase):
@@ -61,3 +118,28 @@ class ActivityResponse(ActivityBase):
     class Config:
         from_attributes = True
 
+
+
+class ActivityListItem(BaseModel):
+    """作業列表項目（可依 fields 參數只回傳部分欄位）"""
+    id: UUID
+    created_at: datetime
+    project_id: Optional[UUID] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    normal_duration: Optional[int] = None
+    normal_cost: Optional[Decimal] = None
+    crash_duration: Optional[int] = None
+    crash_cost: Optional[Decimal] = None
+    actual_start: Optional[int] = None
+    actual_finish: Optional[int] = None
+    percent_complete: Optional[float] = None
+    wbs_code: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+class ResourceDemandResponse(BaseModel):
+    """作業資源需求回應模型"""
+    activity_id: UUID
+    resource_id: UUID
+    quantity: int
@@ -2,26 +2,90 @@
 優化計算相關的 Pydantic 資料驗證模型
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 
+# 參數敏感度分析單次的格點數上限
+MAX_SENSITIVITY_CELLS = 5000
+
+
+class RobustOptions(BaseModel):
+    """穩健模式參數：抽樣工期情境，以期望值或 CVaR 評估違約金風險"""
+    risk_measure: str = Field('expected', description="風險衡量：'expected' 期望值 或 'cvar' 最差情境的平均（條件風險值）")
+    scenario_count: int = Field(100, description="抽樣情境數", ge=10, le=2000)
+    cvar_alpha: float = Field(0.9, description="CVaR 信心水準（只計入損失最高的 1 - alpha 比例情境）", gt=0, lt=1)
+    optimistic: float = Field(0.1, description="工期最多縮短的比例（三角分配下限）", ge=0, lt=1)
+    pessimistic: float = Field(0.3, description="工期最多延長的比例（三角分配上限）", ge=0, le=3)
+    seed: int = Field(0, description="抽樣亂數種子（相同種子結果可重現）", ge=0)
+    time_limit: float = Field(30, description="求解時間上限（秒），逾時回傳目前最佳解", gt=0, le=600)
+
+    @field_validator('risk_measure')
+    @classmethod
+    def validate_risk_measure(cls, v):
+        """驗證風險衡量方式"""
+        if v not in ['expected', 'cvar']:
+            raise ValueError('風險衡量方式必須是 expected（期望值）或 cvar（條件風險值）')
+        return v
+
+
+class AlternativeOptions(BaseModel):
+    """替代趕工方案參數：在最佳解附近列出趕工組合不同的其他方案"""
+    count: int = Field(3, description="最多列出的替代方案數", ge=1, le=10)
+    cost_tolerance: float = Field(0.05, description="工期 → 成本：總成本最多高於最佳解的比例", ge=0, le=1)
+    duration_tolerance: int = Field(0, description="預算 → 工期：工期最多長於最佳解的天數", ge=0)
+
+
+class RobustSummary(BaseModel):
+    """穩健模式結果：所選趕工組合在各抽樣情境下的工期分布與獎懲統計"""
+    risk_measure: str
+    scenario_count: int
+    cvar_alpha: Optional[float] = None
+    optimistic: float
+    pessimistic: float
+    seed: int
+    expected_duration: float
+    duration_p50: int
+    duration_p90: int
+    duration_max: int
+    on_time_probability: Optional[float] = None
+    expected_penalty: float
+    cvar_penalty: float
+    expected_bonus: float
+    objective_value: float
+    lower_bound: Optional[float] = None
+    gap: Optional[float] = None
+    iterations: int
+    cut_count: int
+    time_limit_reached: bool
+
 
 class OptimizationRequest(BaseModel):
     """優化計算請求模型"""
     project_id: UUID = Field(..., description="專案ID")
     mode: str = Field(..., description="決策模式：budget_to_duration 或 duration_to_cost")
-    budget_constraint: Optional[Decimal] = Field(None, description="預算約束（模式一）", gt=0)
-    duration_constraint: Optional[int] = Field(None, description="工期約束（模式二）", gt=0)
-    indirect_cost: Optional[Decimal] = Field(0.0, description="間接成本（每日）", ge=0)
+    # 未提供時也驗證（validate_default），缺少模式所需的約束在進入求解排隊前即回 422
+    budget_constraint: Optional[Decimal] = Field(None, description="預算約束（模式一）", gt=0, validate_default=True)
+    duration_constraint: Optional[int] = Field(None, description="工期約束（模式二）", gt=0, validate_default=True)
+    indirect_cost: Optional[Decimal] = Field(Decimal('0.0'), description="間接成本（每日）", ge=0)
     # 違約金計算方式
     penalty_type: str = Field('rate', description="違約金計算方式：'fixed' 定額 或 'rate' 比率")
     penalty_amount: Optional[Decimal] = Field(None, description="定額違約金（每日，當 penalty_type='fixed' 時使用）", ge=0)
     penalty_rate: Optional[Decimal] = Field(None, description="比率違約金（每日，契約金額比率，當 penalty_type='rate' 時使用）", ge=0)
-    contract_amount: Optional[Decimal] = Field(0.0, description="契約決標總價（用於計算違約金上限和趕工費用）", ge=0)
+    contract_amount: Optional[Decimal] = Field(Decimal('0.0'), description="契約決標總價（用於計算違約金上限和趕工費用）", ge=0)
     contract_duration: Optional[int] = Field(None, description="契約工期（天，用於計算趕工費用）", gt=0)
     target_duration: Optional[int] = Field(None, description="目標工期（用於計算獎懲）", gt=0)
+    # 模型建構方式
+    formulation: str = Field('standard', description="模型建構方式：'standard' 原始模型 或 'tight' 強化模型")
+    # 求解策略
+    solve_strategy: str = Field('auto', description="求解策略：'auto' 強化模型可分解時自動分解、'monolithic' 單一模型、'decomposition' 強制分解")
+    # 滾動式重新優化
+    status_date: Optional[int] = Field(None, description="資料日期（開工後第幾天）；提供時依實際進度凍結已完成與進行中作業，只重新優化剩餘作業", ge=0)
+    # 穩健模式
+    robust: Optional[RobustOptions] = Field(None, description="穩健模式參數；提供時依抽樣工期情境求解趕工決策")
+    # 替代趕工方案
+    alternatives: Optional[AlternativeOptions] = Field(None, description="替代方案參數；提供時另列出趕工組合不同的近似最佳方案（以單一模型求解）")
 
     @field_validator('mode')
     @classmethod
@@ -38,6 +102,22 @@ class OptimizationRequest(BaseModel):
         if v not in ['fixed', 'rate']:
             raise ValueError('違約金計算方式必須是 fixed（定額）或 rate（比率）')
         return v
+
+    @field_validator('formulation')
+    @classmethod
+    def validate_formulation(cls, v):
+        """驗證模型建構方式"""
+        if v not in ['standard', 'tight']:
+            raise ValueError('模型建構方式必須是 standard（原始）或 tight（強化）')
+        return v
+
+    @field_validator('solve_strategy')
+    @classmethod
+    def validate_solve_strategy(cls, v):
+        """驗證求解策略"""
+        if v not in ['auto', 'monolithic', 'decomposition']:
+            raise ValueError('求解策略必須是 auto、monolithic 或 decomposition')
+        return v
     
     @field_validator('penalty_amount', 'penalty_rate')
     @classmethod
@@ -52,17 +132,35 @@ class OptimizationRequest(BaseModel):
                 raise ValueError('比率計算方式必須提供 penalty_rate（違約金率）')
         return v
 
+    @field_validator('robust')
+    @classmethod
+    def validate_robust(cls, v, info):
+        """穩健模式不支援滾動式重新優化，也不使用 formulation（以 Benders 切平面求解）"""
+        if v is not None and info.data.get('status_date') is not None:
+            raise ValueError('穩健模式不支援滾動式重新優化（status_date）')
+        if v is not None and info.data.get('formulation', 'standard') != 'standard':
+            raise ValueError('穩健模式以切平面法求解，不支援 formulation 設定（請使用 standard）')
+        return v
+
+    @field_validator('alternatives')
+    @classmethod
+    def validate_alternatives(cls, v, info):
+        """替代方案只支援單一模型的一般求解"""
+        if v is not None and info.data.get('status_date') is not None:
+            raise ValueError('替代方案不支援滾動式重新優化（status_date）')
+        if v is not None and info.data.get('robust') is not None:
+            raise ValueError('替代方案不支援穩健模式')
+        return v
+
     @field_validator('budget_constraint', 'duration_constraint')
     @classmethod
     def validate_constraints(cls, v, info):
-        """驗證約束條件"""
+        """驗證約束條件：決策模式所需的約束必須提供"""
         mode = info.data.get('mode')
-        if mode == 'budget_to_duration' and 'budget_constraint' in info.data:
-            if info.data['budget_constraint'] is None:
-                raise ValueError('模式一（預算→工期）必須提供預算約束')
-        elif mode == 'duration_to_cost' and 'duration_constraint' in info.data:
-            if info.data['duration_constraint'] is None:
-                raise ValueError('模式二（工期→成本）必須提供工期約束')
+        if v is None and mode == 'budget_to_duration' and info.field_name == 'budget_constraint':
+            raise ValueError('模式一（預算→工期）必須提供預算約束')
+        if v is None and mode == 'duration_to_cost' and info.field_name == 'duration_constraint':
+            raise ValueError('模式二（工期→成本）必須提供工期約束')
         return v
 
 
@@ -105,6 +203,39 @@ class OptimizationData(BaseModel):
     contract_amount: Decimal
     contract_duration: Optional[int]
     target_duration: Optional[int]
+    formulation: str = 'standard'
+    status_date: Optional[int] = None
+    robust: Optional[RobustOptions] = None
+    alternatives: Optional[AlternativeOptions] = None
+
+
+class PrecomputedInfo(BaseModel):
+    """由背景預先計算的權衡曲線回答時的資料新鮮度"""
+    network_version: str = Field(..., description="曲線對應的網路內容雜湊（與本次讀取的網路相同）")
+    computed_at: datetime = Field(..., description="曲線計算完成的時間")
+    age_seconds: float = Field(..., description="回答時曲線已存在的秒數")
+
+
+class CrashedActivity(BaseModel):
+    """替代方案與情境比較中的趕工作業"""
+    activity_id: UUID
+    activity_name: str
+
+
+class AlternativePlan(BaseModel):
+    """替代趕工方案（與最佳解比較）"""
+    rank: int = Field(..., description="排序（1 為最接近最佳解的替代方案）")
+    optimal_duration: int
+    optimal_cost: Decimal
+    penalty_amount: Decimal
+    bonus_amount: Decimal
+    total_cost: Decimal
+    duration_delta: int = Field(..., description="工期與最佳解的差（天）")
+    cost_delta: Decimal = Field(..., description="總成本與最佳解的差")
+    crashed_count: int
+    crashed_added: List[CrashedActivity] = Field(..., description="最佳解未趕工、此方案趕工的作業")
+    crashed_removed: List[CrashedActivity] = Field(..., description="最佳解趕工、此方案未趕工的作業")
+    calculation_time: float
 
 
 class OptimizationResult(BaseModel):
@@ -126,4 +257,267 @@ class OptimizationResult(BaseModel):
     optimization_data: Optional[OptimizationData] = None
     activities: Optional[List[ActivityInfo]] = None
     precedences: Optional[List[PrecedenceInfo]] = None
+    # 穩健模式的情境統計
+    robust: Optional[RobustSummary] = None
+    # 由預先計算的權衡曲線回答時的新鮮度（求解器即時求解時為 None）
+    precomputed: Optional[PrecomputedInfo] = None
+    # 替代趕工方案（請求未指定 alternatives 時為 None）
+    alternatives: Optional[List[AlternativePlan]] = None
+
+
+class GanttBar(BaseModel):
+    """甘特圖長條（單一作業或 WBS 彙總群組）"""
+    activity_id: Optional[UUID] = Field(None, description="作業 ID（WBS 彙總長條為 None）")
+    activity_name: str
+    wbs_code: Optional[str] = None
+    start_time: int
+    end_time: int
+    duration: int
+    is_crashed: bool = Field(..., description="是否趕工（群組內任一作業趕工即為 True）")
+    is_critical: bool = Field(..., description="是否位於要徑（群組內任一作業位於要徑即為 True）")
+    total_float: int = Field(..., description="總浮時（天，群組取最小值）")
+    cost: Decimal
+    activity_count: int = 1
+    crashed_count: Optional[int] = None
+
+
+class GanttResponse(BaseModel):
+    """甘特圖查詢結果"""
+    result_id: UUID
+    view: str
+    level: Optional[int] = Field(None, description="WBS 彙總層數（view=wbs 時）")
+    project_duration: int
+    window_start: Optional[int] = None
+    window_end: Optional[int] = None
+    total: int = Field(..., description="符合條件的長條總數")
+    truncated: bool = Field(..., description="是否因 limit 只回傳開始時間最早的部分長條")
+    bars: List[GanttBar]
 
+
+class ScenarioSummary(BaseModel):
+    """情境摘要（情境參數、結果摘要與趕工作業；可依 fields 參數只回傳部分欄位）"""
+    scenario_id: UUID
+    created_at: datetime
+    project_id: Optional[UUID] = None
+    result_id: Optional[UUID] = None
+    mode: Optional[str] = None
+    formulation: Optional[str] = None
+    budget_constraint: Optional[Decimal] = None
+    duration_constraint: Optional[int] = None
+    indirect_cost: Optional[Decimal] = None
+    penalty_type: Optional[str] = None
+    penalty_rate: Optional[Decimal] = None
+    penalty_fixed_amount: Optional[Decimal] = Field(None, description="情境的固定違約金參數")
+    contract_amount: Optional[Decimal] = None
+    contract_duration: Optional[int] = None
+    target_duration: Optional[int] = None
+    status_date: Optional[int] = None
+    is_robust: Optional[bool] = None
+    is_pinned: Optional[bool] = None
+    optimal_duration: Optional[int] = None
+    optimal_cost: Optional[Decimal] = None
+    penalty_amount: Optional[Decimal] = None
+    bonus_amount: Optional[Decimal] = None
+    total_cost: Optional[Decimal] = None
+    calculation_time: Optional[float] = None
+    status: Optional[str] = None
+    crashed_activity_ids: Optional[List[UUID]] = None
+
+
+class ScenarioComparison(BaseModel):
+    """兩個情境的比較（other 相對於 base）"""
+    base: ScenarioSummary
+    other: ScenarioSummary
+    deltas: Dict[str, Optional[Decimal]] = Field(..., description="結果欄位的差值（other - base），任一方沒有結果時為 None")
+    crashed_only_in_base: List[CrashedActivity]
+    crashed_only_in_other: List[CrashedActivity]
+    crashed_in_both_count: int
+
+
+class ScenarioPinUpdate(BaseModel):
+    """情境釘選請求模型"""
+    is_pinned: bool = Field(..., description="是否釘選（釘選的情境不受保留政策影響）")
+
+
+class RetentionPolicy(BaseModel):
+    """情境保留政策模型"""
+    compact_after_days: int = Field(7, description="未釘選情境超過幾天後刪除回應快照", ge=0)
+    drop_after_days: int = Field(90, description="未釘選情境超過幾天後整個刪除", ge=1)
+    keep_latest: int = Field(20, description="每個專案永遠保留的最新情境數", ge=0)
+
+
+class RetentionResult(BaseModel):
+    """保留政策執行結果模型"""
+    compacted_count: int
+    dropped_count: int
+
+
+class PortfolioProject(BaseModel):
+    """投資組合中的單一專案"""
+    project_id: UUID = Field(..., description="專案ID")
+    weight: Decimal = Field(Decimal('1'), description="目標權重", gt=0)
+    indirect_cost: Optional[Decimal] = Field(Decimal('0.0'), description="每日間接成本", ge=0)
+    target_duration: Optional[int] = Field(None, description="目標工期（用於計算違約金）", gt=0)
+    penalty_type: str = Field('rate', description="違約金計算方式：'fixed' 定額 或 'rate' 比率")
+    penalty_amount: Optional[Decimal] = Field(None, description="定額違約金（每日）", ge=0)
+    penalty_rate: Optional[Decimal] = Field(None, description="違約金比率（每日）", ge=0)
+    contract_amount: Optional[Decimal] = Field(Decimal('0.0'), description="契約價金", ge=0)
+
+    @field_validator('penalty_type')
+    @classmethod
+    def validate_penalty_type(cls, v):
+        """驗證違約金計算方式"""
+        if v not in ['fixed', 'rate']:
+            raise ValueError('違約金計算方式必須是 fixed（定額）或 rate（比率）')
+        return v
+
+
+class PortfolioRequest(BaseModel):
+    """多專案投資組合優化請求模型"""
+    projects: List[PortfolioProject] = Field(..., description="參與分配的專案", min_length=1)
+    budget: Decimal = Field(..., description="共同預算（各專案直接 + 間接成本總和上限）", gt=0)
+    objective: str = Field('weighted_duration', description="目標：'weighted_duration' 加權總工期 或 'penalty' 加權違約金曝險")
+    formulation: str = Field('standard', description="計算各專案權衡曲線的模型建構方式")
+
+    @field_validator('objective')
+    @classmethod
+    def validate_objective(cls, v):
+        """驗證投資組合目標"""
+        if v not in ['weighted_duration', 'penalty']:
+            raise ValueError('投資組合目標必須是 weighted_duration 或 penalty')
+        return v
+
+    @field_validator('formulation')
+    @classmethod
+    def validate_formulation(cls, v):
+        """驗證模型建構方式"""
+        if v not in ['standard', 'tight']:
+            raise ValueError('模型建構方式必須是 standard（原始）或 tight（強化）')
+        return v
+
+    @field_validator('projects')
+    @classmethod
+    def validate_unique_projects(cls, v):
+        """驗證專案不重複"""
+        if len({p.project_id for p in v}) != len(v):
+            raise ValueError('投資組合中的專案不可重複')
+        return v
+
+
+class PortfolioAllocation(BaseModel):
+    """單一專案的分配結果"""
+    project_id: UUID
+    weight: Decimal
+    duration: int
+    direct_cost: Decimal
+    indirect_cost: Decimal
+    penalty_amount: Decimal
+    total_cost: Decimal
+    crashed_activity_ids: List[str]
+    curve_points: int
+
+
+class PortfolioResult(BaseModel):
+    """多專案投資組合優化結果模型"""
+    objective: str
+    objective_value: Decimal
+    budget: Decimal
+    total_cost: Decimal
+    curve_time: float
+    calculation_time: float
+    allocations: List[PortfolioAllocation]
+
+
+class SensitivityRequest(BaseModel):
+    """參數敏感度分析請求模型（違約金率 × 每日間接成本 × 目標工期）"""
+    project_id: UUID = Field(..., description="專案ID")
+    mode: str = Field(..., description="決策模式：budget_to_duration 或 duration_to_cost")
+    budget_constraint: Optional[Decimal] = Field(None, description="預算約束（模式一）", gt=0)
+    duration_constraint: Optional[int] = Field(None, description="工期約束（模式二）", gt=0)
+    penalty_rates: List[Decimal] = Field(..., description="違約金比率（每日，契約金額比率）", min_length=1)
+    indirect_costs: List[Decimal] = Field([Decimal('0.0')], description="每日間接成本", min_length=1)
+    target_durations: List[int] = Field(..., description="目標工期（用於計算獎懲）", min_length=1)
+    contract_amount: Optional[Decimal] = Field(Decimal('0.0'), description="契約決標總價", ge=0)
+    contract_duration: Optional[int] = Field(None, description="契約工期（天，用於計算趕工獎金）", gt=0)
+    formulation: str = Field('standard', description="補齊權衡曲線時的模型建構方式")
+
+    @field_validator('mode')
+    @classmethod
+    def validate_mode(cls, v):
+        """驗證決策模式"""
+        if v not in ['budget_to_duration', 'duration_to_cost']:
+            raise ValueError('決策模式必須是 budget_to_duration 或 duration_to_cost')
+        return v
+
+    @field_validator('formulation')
+    @classmethod
+    def validate_formulation(cls, v):
+        """驗證模型建構方式"""
+        if v not in ['standard', 'tight']:
+            raise ValueError('模型建構方式必須是 standard（原始）或 tight（強化）')
+        return v
+
+    @field_validator('penalty_rates', 'indirect_costs')
+    @classmethod
+    def validate_non_negative(cls, v):
+        """驗證違約金率與間接成本不為負"""
+        if any(value < 0 for value in v):
+            raise ValueError('違約金率與間接成本不可為負')
+        return v
+
+    @field_validator('target_durations')
+    @classmethod
+    def validate_targets(cls, v, info):
+        """驗證目標工期與格點數"""
+        if any(value <= 0 for value in v):
+            raise ValueError('目標工期必須大於 0')
+        cells = len(v) * len(info.data.get('penalty_rates') or []) * len(info.data.get('indirect_costs') or [])
+        if cells > MAX_SENSITIVITY_CELLS:
+            raise ValueError(f'格點數 {cells} 超過上限 {MAX_SENSITIVITY_CELLS}')
+        return v
+
+    @field_validator('budget_constraint', 'duration_constraint')
+    @classmethod
+    def validate_constraints(cls, v, info):
+        """驗證約束條件"""
+        mode = info.data.get('mode')
+        if mode == 'budget_to_duration' and 'budget_constraint' in info.data:
+            if info.data['budget_constraint'] is None:
+                raise ValueError('模式一（預算→工期）必須提供預算約束')
+        elif mode == 'duration_to_cost' and 'duration_constraint' in info.data:
+            if info.data['duration_constraint'] is None:
+                raise ValueError('模式二（工期→成本）必須提供工期約束')
+        return v
+
+
+class SensitivityPlan(BaseModel):
+    """敏感度分析中出現的趕工組合"""
+    duration: int
+    direct_cost: Decimal
+    crashed_activity_ids: List[str]
+
+
+class SensitivityCell(BaseModel):
+    """敏感度分析的單一格點"""
+    penalty_rate: Decimal
+    indirect_cost: Decimal
+    target_duration: int
+    status: str
+    plan: Optional[int] = None
+    optimal_duration: Optional[int] = None
+    optimal_cost: Optional[Decimal] = None
+    penalty_amount: Optional[Decimal] = None
+    bonus_amount: Optional[Decimal] = None
+    total_cost: Optional[Decimal] = None
+
+
+class SensitivityResult(BaseModel):
+    """參數敏感度分析結果模型"""
+    mode: str
+    cells: List[SensitivityCell]
+    plans: List[SensitivityPlan]
+    cell_count: int
+    solve_count: int
+    skipped_solves: int
+    precomputed: bool
+    calculation_time: float
@@ -35,3 +35,13 @@ class ProjectResponse(ProjectBase):
     class Config:
         from_attributes = True
 
+
+
+class ProjectListItem(BaseModel):
+    """專案列表項目（可依 fields 參數只回傳部分欄位）"""
+    id: UUID
+    created_at: datetime
+    name: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    updated_at: Optional[datetime] = None
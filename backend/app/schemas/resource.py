@@ -0,0 +1,105 @@
+"""
+資源與資源平準化相關的 Pydantic 資料驗證模型
+"""
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+
+# 單次資源平準化的起點數上限
+MAX_LEVELING_STARTS = 1000
+
+
+class ResourceBase(BaseModel):
+    """專案資源基礎模型（人力班組、機具等）"""
+    name: str = Field(..., description="資源名稱", min_length=1, max_length=255)
+    capacity: int = Field(..., description="每日可用數量", gt=0)
+    unit: Optional[str] = Field(None, description="單位（例如 班、台）", max_length=50)
+
+
+class ResourceCreate(ResourceBase):
+    """建立資源請求模型"""
+    pass
+
+
+class ResourceUpdate(BaseModel):
+    """更新資源請求模型"""
+    name: Optional[str] = Field(None, description="資源名稱", min_length=1, max_length=255)
+    capacity: Optional[int] = Field(None, description="每日可用數量", gt=0)
+    unit: Optional[str] = Field(None, description="單位", max_length=50)
+
+
+class ResourceResponse(ResourceBase):
+    """資源回應模型"""
+    id: UUID
+    project_id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LevelingRequest(BaseModel):
+    """資源平準化請求模型"""
+    scenario_id: Optional[UUID] = Field(None, description="沿用此情境優化結果的趕工決策與工期；未提供時使用正常工期")
+    methods: List[str] = Field(['serial', 'parallel'], description="排程產生法：'serial' 序列式、'parallel' 平行式", min_length=1)
+    priority_rule: str = Field('lft', description="優先規則：'lft'、'slack'、'successors' 或 'grpw'")
+    starts: int = Field(32, description="每種排程產生法的起點數（第一個起點不加隨機擾動）", ge=1, le=MAX_LEVELING_STARTS)
+    seed: int = Field(0, description="隨機起點的亂數種子", ge=0)
+
+    @field_validator('methods')
+    @classmethod
+    def validate_methods(cls, v):
+        """驗證排程產生法"""
+        if any(method not in ['serial', 'parallel'] for method in v):
+            raise ValueError('排程產生法必須是 serial（序列式）或 parallel（平行式）')
+        return list(dict.fromkeys(v))
+
+    @field_validator('priority_rule')
+    @classmethod
+    def validate_priority_rule(cls, v):
+        """驗證優先規則"""
+        if v not in ['lft', 'slack', 'successors', 'grpw']:
+            raise ValueError('優先規則必須是 lft、slack、successors 或 grpw')
+        return v
+
+
+class LeveledActivity(BaseModel):
+    """平準化後的作業排程"""
+    activity_id: str
+    activity_name: str
+    start_time: int
+    end_time: int
+    duration: int
+    shift: int = Field(..., description="相對於原排程開始時間的延後天數")
+    fixed: bool = Field(False, description="已完成或進行中（固定於實際開始時間）")
+
+
+class ResourceUsage(BaseModel):
+    """單一資源的使用量"""
+    resource_id: str
+    name: str
+    capacity: int
+    peak: int
+    average_usage: float
+    baseline_peak: int = Field(..., description="原排程（不考慮資源）的尖峰使用量")
+    baseline_overloaded_days: int = Field(..., description="原排程超過容量的天數")
+    profile: List[int] = Field(..., description="平準化後每日使用量")
+
+
+class LevelingResult(BaseModel):
+    """資源平準化結果模型"""
+    project_id: UUID
+    scenario_id: Optional[UUID] = None
+    makespan: int
+    baseline_duration: int
+    delay: int
+    method: str
+    priority_rule: str
+    seed: int
+    runs: int
+    workers: int
+    calculation_time: float
+    schedules: List[LeveledActivity]
+    resources: List[ResourceUsage]
@@ -0,0 +1,381 @@
+"""
+跨 worker 共用的網路衍生資料快取
+將與求解參數無關、計算成本高的衍生資料（精簡網路陣列、拓撲排序、CPM 界限、
+時間—成本權衡曲線）寫成檔案，以網路內容雜湊為鍵，同一台主機的所有 worker
+以 mmap 唯讀對應、零複製讀取陣列；檔案在重新啟動後仍可沿用（第一次使用時才對應）。
+
+- 產物檔：內容定址（雜湊相同即內容相同），寫入後不再變動；以暫存檔加
+  os.replace 原子寫入，讀取端不會看到寫到一半的檔案
+- 專案指標檔：projects/<專案ID> 記錄專案目前的網路雜湊，作業異動時刪除，
+  所有 worker 的可行性預檢都會同時失效；另以修改時間設有效時限作為保險
+- 檔案格式：MAGIC、標頭長度（uint32）、JSON 標頭（ID 清單、陣列位置、
+  界限等小型資料），其後為以 8 位元組對齊的原生位元組序陣列
+
+ARTIFACT_CACHE_DIR 設為空字串時停用；讀寫失敗只計入 artifact_cache_errors，
+不影響請求（呼叫端改為重新計算）。
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.models.network import build_adjacency, topological_order
+from app.utils.metrics import increment
+
+ARTIFACT_CACHE_DIR = os.getenv(
+    "ARTIFACT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "bidding-artifacts")
+)
+# 產物檔數量上限，超過時刪除最舊的檔案
+ARTIFACT_CACHE_MAX_FILES = int(os.getenv("ARTIFACT_CACHE_MAX_FILES", "1000"))
+# 每個 worker 同時保持對應的產物數
+ARTIFACT_MAPPED_LIMIT = int(os.getenv("ARTIFACT_MAPPED_LIMIT", "64"))
+
+MAGIC = b"BIDART01"
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+_PROJECTS_DIR = "projects"
+
+
+def enabled() -> bool:
+    return bool(ARTIFACT_CACHE_DIR)
+
+
+def network_digest(activities: Sequence, precedences: Iterable[Tuple[str, str]]) -> str:
+    """網路內容雜湊（作業 ID、工期、成本與前置關係，依原始順序）
+
+    作業名稱等不影響衍生資料的欄位不列入；順序列入雜湊，對應到的拓撲排序與
+    權衡曲線才會與直接計算的結果完全相同。
+    """
+    digest = hashlib.sha256()
+    for act in activities:
+        digest.update(
+            f"{act.id}\t{act.normal_duration}\t{act.crash_duration}\t"
+            f"{act.normal_cost}\t{act.crash_cost}\n".encode()
+        )
+    digest.update(b"--\n")
+    for successor_id, predecessor_id in precedences:
+        digest.update(f"{successor_id}\t{predecessor_id}\n".encode())
+    return digest.hexdigest()[:32]
+
+
+class Artifact:
+    """以 mmap 唯讀對應的產物檔，陣列以 memoryview 零複製讀取"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("產物檔格式錯誤")
+        (length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        start = len(MAGIC) + _HEADER_LENGTH.size
+        self.header: Dict = json.loads(bytes(view[start:start + length]))
+        if self.header.get("byteorder") != sys.byteorder:
+            raise ValueError("產物檔位元組序不符")
+        self._data_offset = _align(start + length)
+        self._view = view
+
+    @property
+    def ids(self) -> List[str]:
+        return self.header["ids"]
+
+    @property
+    def meta(self) -> Dict:
+        return self.header["meta"]
+
+    def array(self, name: str) -> memoryview:
+        """取得陣列的唯讀 memoryview（直接指向對應的檔案內容）"""
+        typecode, offset, count = self.header["arrays"][name]
+        start = self._data_offset + offset
+        return self._view[start:start + count * array(typecode).itemsize].cast(typecode)
+
+
+def _align(offset: int) -> int:
+    return offset + (-offset % _ALIGNMENT)
+
+
+def _path(name: str) -> str:
+    return os.path.join(ARTIFACT_CACHE_DIR, f"{name}.bin")
+
+
+def _atomic_write(path: str, chunks: Iterable[bytes]) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+_mapped: "OrderedDict[str, Artifact]" = OrderedDict()
+_mapped_lock = threading.Lock()
+
+
+def read_artifact(name: str) -> Optional[Artifact]:
+    """對應產物檔，不存在或無法讀取時回傳 None"""
+    if not enabled():
+        return None
+    with _mapped_lock:
+        artifact = _mapped.get(name)
+        if artifact is not None:
+            _mapped.move_to_end(name)
+            return artifact
+    try:
+        artifact = Artifact(_path(name))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        increment("artifact_cache_errors")
+        return None
+    with _mapped_lock:
+        # 移出的對應在沒有 memoryview 引用後由 GC 關閉
+        _mapped[name] = artifact
+        while len(_mapped) > ARTIFACT_MAPPED_LIMIT:
+            _mapped.popitem(last=False)
+    return artifact
+
+
+def write_artifact(name: str, ids: List[str], meta: Dict, arrays: Dict[str, array]) -> None:
+    """寫入產物檔（已存在時略過：內容由名稱中的雜湊決定）"""
+    if not enabled():
+        return
+    path = _path(name)
+    if os.path.exists(path):
+        return
+    layout = {}
+    offset = 0
+    for key, values in arrays.items():
+        layout[key] = [values.typecode, offset, len(values)]
+        offset = _align(offset + len(values) * values.itemsize)
+    header = json.dumps(
+        {"byteorder": sys.byteorder, "ids": ids, "meta": meta, "arrays": layout},
+        separators=(",", ":"),
+    ).encode()
+
+    def chunks():
+        prefix = MAGIC + _HEADER_LENGTH.pack(len(header)) + header
+        yield prefix + b"\0" * (_align(len(prefix)) - len(prefix))
+        for values in arrays.values():
+            data = values.tobytes()
+            yield data + b"\0" * (_align(len(data)) - len(data))
+
+    try:
+        _atomic_write(path, chunks())
+        increment("artifact_cache_writes")
+        _prune()
+    except OSError:
+        increment("artifact_cache_errors")
+
+
+def _prune() -> None:
+    """產物檔超過上限時刪除最舊的檔案（已對應的 worker 仍可讀取原內容）"""
+    entries = [
+        entry for entry in os.scandir(ARTIFACT_CACHE_DIR)
+        if entry.is_file() and entry.name.endswith(".bin")
+    ]
+    excess = len(entries) - ARTIFACT_CACHE_MAX_FILES
+    if excess <= 0:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:excess]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+# ----------------------------------------------------------------------
+# 專案指標：專案 → 目前的網路雜湊
+# ----------------------------------------------------------------------
+
+def _project_path(project_id: str) -> str:
+    return os.path.join(ARTIFACT_CACHE_DIR, _PROJECTS_DIR, str(project_id))
+
+
+def publish_project(project_id: str, digest: str) -> None:
+    """記錄專案目前的網路雜湊，供其他 worker 在讀取資料前取得界限"""
+    if not enabled():
+        return
+    try:
+        _atomic_write(_project_path(project_id), [digest.encode()])
+    except OSError:
+        increment("artifact_cache_errors")
+
+
+def project_digest(project_id: str, max_age: float) -> Optional[Tuple[str, float]]:
+    """取得專案的網路雜湊與指標已存在的秒數，指標不存在或超過 max_age 時回傳 None"""
+    if not enabled():
+        return None
+    path = _project_path(project_id)
+    try:
+        age = time.time() - os.stat(path).st_mtime
+        if age > max_age:
+            return None
+        with open(path) as handle:
+            return handle.read().strip(), age
+    except FileNotFoundError:
+        return None
+    except OSError:
+        increment("artifact_cache_errors")
+        return None
+
+
+def drop_project(project_id: str) -> None:
+    """刪除專案指標（作業或前置關係異動時，所有 worker 一併失效）"""
+    if not enabled():
+        return
+    try:
+        os.unlink(_project_path(project_id))
+    except FileNotFoundError:
+        pass
+    except OSError:
+        increment("artifact_cache_errors")
+
+
+# ----------------------------------------------------------------------
+# 網路產物：精簡陣列、拓撲排序與 CPM 界限
+# ----------------------------------------------------------------------
+
+def load_network(digest: str) -> Optional[Artifact]:
+    return read_artifact(f"network-{digest}")
+
+
+def save_network(digest: str, activities: Sequence, precedences: Iterable[Tuple[str, str]], bounds: Dict) -> None:
+    """寫入網路產物
+
+    陣列依作業順序排列：工期、成本（以分為單位的整數）、拓撲排序（作業索引），
+    以及 CSR 格式的前置關係（pred_offsets / pred_index）。
+    """
+    ids = [act.id for act in activities]
+    position = {aid: index for index, aid in enumerate(ids)}
+    predecessors, successors = build_adjacency(ids, precedences)
+    order, _ = topological_order(predecessors, successors)
+
+    pred_offsets = array("i", [0])
+    pred_index = array("i")
+    for aid in ids:
+        pred_index.extend(position[pred] for pred in predecessors[aid])
+        pred_offsets.append(len(pred_index))
+
+    write_artifact(
+        f"network-{digest}",
+        ids,
+        {"bounds": bounds},
+        {
+            "normal_duration": array("i", (act.normal_duration for act in activities)),
+            "crash_duration": array("i", (act.crash_duration for act in activities)),
+            "normal_cost_cents": array("q", (act.normal_cost for act in activities)),
+            "crash_cost_cents": array("q", (act.crash_cost for act in activities)),
+            "order": array("i", (position[aid] for aid in order)),
+            "pred_offsets": pred_offsets,
+            "pred_index": pred_index,
+        },
+    )
+
+
+def network_bounds(artifact: Artifact) -> Dict:
+    """網路產物中的界限（與 BiddingOptimizer.calculate_network_bounds 相同格式，成本以分計）"""
+    return dict(artifact.meta["bounds"])
+
+
+def network_adjacency(artifact: Artifact) -> Tuple[Dict[str, List[str]], List[str]]:
+    """由網路產物還原前置鄰接表與拓撲排序（與 BiddingOptimizer._network 相同格式）"""
+    ids = artifact.ids
+    offsets = artifact.array("pred_offsets")
+    index = artifact.array("pred_index")
+    predecessors = {
+        aid: [ids[pred] for pred in index[offsets[position]:offsets[position + 1]]]
+        for position, aid in enumerate(ids)
+    }
+    return predecessors, [ids[position] for position in artifact.array("order")]
+
+
+# ----------------------------------------------------------------------
+# 權衡曲線產物
+# ----------------------------------------------------------------------
+
+def load_curve(digest: str, formulation: str) -> Optional[List[Dict]]:
+    """讀取網路的時間—成本權衡曲線，未快取時回傳 None"""
+    artifact = read_artifact(f"curve-{digest}-{formulation}")
+    if artifact is None:
+        return None
+    increment("artifact_curve_hits")
+    ids = artifact.ids
+    durations = artifact.array("duration")
+    costs = artifact.array("direct_cost")
+    crashed_offsets = artifact.array("crashed_offsets")
+    crashed_index = artifact.array("crashed_index")
+    starts = artifact.array("start_times")
+    width = len(ids)
+
+    curve = []
+    for point in range(len(durations)):
+        row = starts[point * width:(point + 1) * width]
+        curve.append({
+            "duration": durations[point],
+            "direct_cost": costs[point],
+            "crashed": [
+                ids[position]
+                for position in crashed_index[crashed_offsets[point]:crashed_offsets[point + 1]]
+            ],
+            "start_times": {aid: start for aid, start in zip(ids, row) if start >= 0},
+        })
+    return curve
+
+
+def curve_computed_at(digest: str, formulation: str) -> Optional[float]:
+    """權衡曲線的計算時間（Unix 時間），未快取時回傳 None"""
+    artifact = read_artifact(f"curve-{digest}-{formulation}")
+    return artifact.meta.get("computed_at") if artifact is not None else None
+
+
+def save_curve(digest: str, formulation: str, curve: List[Dict]) -> None:
+    """寫入權衡曲線
+
+    各點的開始時間依第一點的作業順序存成 (點數 × 作業數) 的陣列，缺少的作業記為 -1；
+    趕工作業以 CSR 格式存成作業索引。
+    """
+    ids: List[str] = list(curve[0]["start_times"]) if curve else []
+    position = {aid: index for index, aid in enumerate(ids)}
+    for point in curve:
+        for aid in list(point["start_times"]) + list(point["crashed"]):
+            if aid not in position:
+                position[aid] = len(ids)
+                ids.append(aid)
+
+    crashed_offsets = array("i", [0])
+    crashed_index = array("i")
+    starts = array("i")
+    for point in curve:
+        crashed_index.extend(position[aid] for aid in point["crashed"])
+        crashed_offsets.append(len(crashed_index))
+        starts.extend(point["start_times"].get(aid, -1) for aid in ids)
+
+    write_artifact(
+        f"curve-{digest}-{formulation}",
+        ids,
+        {"computed_at": time.time()},
+        {
+            "duration": array("i", (point["duration"] for point in curve)),
+            "direct_cost": array("q", (point["direct_cost"] for point in curve)),
+            "crashed_offsets": crashed_offsets,
+            "crashed_index": crashed_index,
+            "start_times": starts,
+        },
+    )
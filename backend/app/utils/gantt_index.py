@@ -0,0 +1,218 @@
+"""
+甘特圖查詢索引
+由儲存的作業排程建立區間索引，供甘特圖 API 只回傳需要顯示的長條：
+
+- 時間窗查詢：只回傳與 [start, end] 相交的作業（區間樹，O(log n + k)）
+- WBS 彙總：依 WBS 編碼前 level 段彙總為群組長條（群組本身也建立區間索引）
+- 要徑：依排程反推最晚完成時間，總浮時為 0 的作業
+
+結果寫入後不再變動，索引以結果 ID 與專案網路版本號為鍵快取於各 worker，
+作業名稱或 WBS 編碼異動時由網路版本號失效，其他 worker 則依 TTL 失效。
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.models.network import build_adjacency, topological_order
+from app.utils.money import to_minor
+
+# 未設定 WBS 編碼的作業彙總到此群組
+UNCLASSIFIED_WBS = "未分類"
+
+GANTT_INDEX_CACHE_SIZE = int(os.getenv("GANTT_INDEX_CACHE_SIZE", "32"))
+GANTT_INDEX_TTL = float(os.getenv("GANTT_INDEX_TTL", "300"))
+
+
+class IntervalIndex:
+    """靜態區間樹（依開始時間排序的陣列加上隱式平衡二元樹的子樹最大結束時間）
+
+    以陣列中點為根遞迴切分，每個節點記錄其子樹內最大的結束時間；查詢時略過
+    最大結束時間早於時間窗的子樹，以及開始時間晚於時間窗的右半部。
+    """
+
+    def __init__(self, items: Iterable[Dict]):
+        self.items: List[Dict] = sorted(items, key=lambda item: (item["start_time"], item["end_time"]))
+        self._starts = [item["start_time"] for item in self.items]
+        self._max_end = [item["end_time"] for item in self.items]
+        self._build(0, len(self.items))
+
+    def _build(self, lo: int, hi: int) -> int:
+        """計算 [lo, hi) 子樹的最大結束時間（存於子樹根，即中點）"""
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        best = max(self._max_end[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        self._max_end[mid] = best
+        return best
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def query(self, start: Optional[int], end: Optional[int], limit: int) -> Tuple[List[Dict], int]:
+        """依開始時間順序回傳與時間窗相交的前 limit 筆，以及相交的總筆數
+
+        時間窗為閉區間，未指定的一端不設限。
+        """
+        if start is None and end is None:
+            return self.items[:limit], len(self.items)
+        low = float("-inf") if start is None else start
+        high = float("inf") if end is None else end
+
+        matched: List[Dict] = []
+        total = 0
+        # 中序走訪以維持開始時間順序：(lo, hi, 是否已處理左子樹)
+        stack = [(0, len(self.items), False)]
+        while stack:
+            lo, hi, left_done = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] < low:
+                continue
+            if not left_done:
+                stack.append((lo, hi, True))
+                stack.append((lo, mid, False))
+                continue
+            if self._starts[mid] > high:
+                continue
+            item = self.items[mid]
+            if item["end_time"] >= low:
+                total += 1
+                if len(matched) < limit:
+                    matched.append(item)
+            stack.append((mid + 1, hi, False))
+        return matched, total
+
+
+def wbs_prefix(wbs_code: Optional[str], level: int) -> str:
+    """WBS 編碼的前 level 段（例如 1.2.3 在第 2 層為 1.2）"""
+    if not wbs_code:
+        return UNCLASSIFIED_WBS
+    return ".".join(wbs_code.split(".")[:level])
+
+
+def total_floats(
+    schedules: Sequence[Dict], precedences: Iterable[Tuple[str, str]]
+) -> Dict[str, int]:
+    """依排程反推各作業的總浮時（最晚完成時間 - 排定完成時間）
+
+    以排定的開始 / 完成時間為準，從專案完成時間沿後續作業倒推最晚完成時間；
+    總浮時為 0 的作業延後即會延後專案完工，構成要徑。
+    """
+    by_id = {s["activity_id"]: s for s in schedules}
+    predecessors, successors = build_adjacency(by_id, precedences)
+    order, _ = topological_order(predecessors, successors)
+    project_end = max((s["end_time"] for s in schedules), default=0)
+
+    late_finish: Dict[str, int] = {}
+    for aid in reversed(order):
+        finish = project_end
+        for succ in successors[aid]:
+            if succ in late_finish:
+                finish = min(finish, late_finish[succ] - by_id[succ]["duration"])
+        late_finish[aid] = finish
+    return {aid: late_finish[aid] - by_id[aid]["end_time"] for aid in order}
+
+
+class GanttIndex:
+    """單一優化結果的甘特圖索引（作業長條、要徑與各層 WBS 彙總）"""
+
+    def __init__(
+        self,
+        schedules: Sequence[Dict],
+        activities: Dict[str, Dict],
+        precedences: Iterable[Tuple[str, str]],
+    ):
+        floats = total_floats(schedules, precedences)
+        bars = []
+        for s in schedules:
+            activity = activities.get(s["activity_id"], {})
+            bars.append({
+                "activity_id": s["activity_id"],
+                "activity_name": activity.get("name", "（已刪除）"),
+                "wbs_code": activity.get("wbs_code"),
+                "start_time": s["start_time"],
+                "end_time": s["end_time"],
+                "duration": s["duration"],
+                "is_crashed": bool(s["is_crashed"]),
+                "is_critical": floats.get(s["activity_id"], 0) <= 0,
+                "total_float": floats.get(s["activity_id"], 0),
+                "cost": to_minor(s["cost"]),
+                "activity_count": 1,
+            })
+        self.project_duration = max((bar["end_time"] for bar in bars), default=0)
+        self.activities = IntervalIndex(bars)
+        self.critical = IntervalIndex(bar for bar in bars if bar["is_critical"])
+        self._rollups: Dict[int, IntervalIndex] = {}
+        self._lock = threading.Lock()
+
+    def rollup(self, level: int) -> IntervalIndex:
+        """第 level 層 WBS 彙總長條的索引（第一次查詢該層時建立）"""
+        with self._lock:
+            index = self._rollups.get(level)
+            if index is None:
+                index = self._rollups[level] = IntervalIndex(self._group(level))
+            return index
+
+    def _group(self, level: int) -> List[Dict]:
+        groups: Dict[str, Dict] = {}
+        for bar in self.activities.items:
+            key = wbs_prefix(bar["wbs_code"], level)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = {
+                    "activity_id": None,
+                    "activity_name": key,
+                    "wbs_code": None if key == UNCLASSIFIED_WBS else key,
+                    "start_time": bar["start_time"],
+                    "end_time": bar["end_time"],
+                    "duration": 0,
+                    "is_crashed": bar["is_crashed"],
+                    "is_critical": bar["is_critical"],
+                    "total_float": bar["total_float"],
+                    "cost": bar["cost"],
+                    "activity_count": 1,
+                    "crashed_count": int(bar["is_crashed"]),
+                }
+                continue
+            group["start_time"] = min(group["start_time"], bar["start_time"])
+            group["end_time"] = max(group["end_time"], bar["end_time"])
+            group["is_crashed"] = group["is_crashed"] or bar["is_crashed"]
+            group["is_critical"] = group["is_critical"] or bar["is_critical"]
+            group["total_float"] = min(group["total_float"], bar["total_float"])
+            group["cost"] += bar["cost"]
+            group["activity_count"] += 1
+            group["crashed_count"] += int(bar["is_crashed"])
+        for group in groups.values():
+            group["duration"] = group["end_time"] - group["start_time"]
+        return list(groups.values())
+
+
+_cache: "OrderedDict[Tuple[str, int], Tuple[float, GanttIndex]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_gantt_index(result_id: str, generation: int) -> Optional[GanttIndex]:
+    """取得快取的甘特圖索引，不存在或已過期時回傳 None"""
+    key = (str(result_id), generation)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        cached_at, index = entry
+        if time.monotonic() - cached_at > GANTT_INDEX_TTL:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return index
+
+
+def set_gantt_index(result_id: str, generation: int, index: GanttIndex) -> None:
+    """寫入甘特圖索引（超過容量時移除最久未使用者）"""
+    with _cache_lock:
+        _cache[(str(result_id), generation)] = (time.monotonic(), index)
+        _cache.move_to_end((str(result_id), generation))
+        while len(_cache) > GANTT_INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
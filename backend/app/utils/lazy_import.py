@@ -0,0 +1,46 @@
+"""
+延遲載入模組
+重量級相依（如 PuLP）改在第一次使用時才匯入，縮短 worker 冷啟動時間
+"""
+import importlib
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """第一次存取屬性時才匯入的模組代理
+
+    載入後把實際模組的屬性複製到代理本身，之後的存取不再經過 __getattr__，
+    沒有額外負擔。載入過程以鎖保護，多個執行緒同時第一次使用也只匯入一次。
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_loaded = False
+
+    def _load(self) -> None:
+        with self._lazy_lock:
+            if not self._lazy_loaded:
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self._lazy_loaded = True
+
+    def __getattr__(self, name: str):
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+        self._load()
+        return self.__dict__[name] if name in self.__dict__ else getattr(
+            importlib.import_module(self.__name__), name
+        )
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """回傳模組本身（已匯入時）或延遲載入的代理"""
+    module = importlib.sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """模組是否已實際匯入"""
+    return not isinstance(module, LazyModule) or module._lazy_loaded
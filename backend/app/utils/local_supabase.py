@@ -0,0 +1,729 @@
+"""
+本機 Supabase 替身
+以 SQLite 模擬後端使用的 PostgREST 資料表與 RPC，不需連線 Supabase 即可
+執行 API 與負載測試。設定 SUPABASE_BACKEND=local 時由 supabase_client 使用；
+SUPABASE_LOCAL_PATH 為 SQLite 檔案路徑（預設 :memory:，只存在於該行程）。
+
+每列以 JSON 文件存放，篩選與排序使用 json_extract，外鍵欄位建立運算式索引；
+外鍵檢查、ON DELETE CASCADE、欄位預設值、updated_at 與情境摘要觸發器比照 migrations。
+"""
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from postgrest.exceptions import APIError
+
+# 欄位預設值（比照 supabase/migrations）
+TABLE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "projects": {"description": None, "status": "draft"},
+    "project_activities": {
+        "description": None,
+        "actual_start": None,
+        "actual_finish": None,
+        "percent_complete": 0,
+        "wbs_code": None,
+    },
+    "bidding_scenarios": {
+        "indirect_cost": 0.0,
+        "penalty_type": "rate",
+        "penalty_amount": 0.0,
+        "penalty_rate": 0.0,
+        "bonus_rate": 0.0,
+        "contract_amount": 0.0,
+        "formulation": "standard",
+        "is_pinned": False,
+        "status_date": None,
+        "robust_options": None,
+    },
+    "optimization_results": {
+        "indirect_cost": 0.0,
+        "penalty_amount": 0.0,
+        "bonus_amount": 0.0,
+        "status": "success",
+        "error_message": None,
+        "result_snapshot": None,
+        "compacted_at": None,
+        "model_features": None,
+        "robust_summary": None,
+    },
+    "activity_schedules": {"is_crashed": False},
+    "project_resources": {"unit": None},
+}
+
+# 具有 updated_at 觸發器的資料表
+UPDATED_AT_TABLES = {"projects", "project_activities", "bidding_scenarios", "project_resources"}
+
+# 主鍵不是 id 的資料表
+PRIMARY_KEYS = {"activity_schedule_packs": "result_id", "scenario_summaries": "scenario_id"}
+
+# 外鍵 (子表, 欄位, 父表)，全部為 ON DELETE CASCADE
+FOREIGN_KEYS: List[Tuple[str, str, str]] = [
+    ("project_activities", "project_id", "projects"),
+    ("activity_precedences", "activity_id", "project_activities"),
+    ("activity_precedences", "predecessor_id", "project_activities"),
+    ("bidding_scenarios", "project_id", "projects"),
+    ("optimization_results", "scenario_id", "bidding_scenarios"),
+    ("activity_schedules", "result_id", "optimization_results"),
+    ("activity_schedules", "activity_id", "project_activities"),
+    ("activity_schedule_packs", "result_id", "optimization_results"),
+    ("scenario_summaries", "scenario_id", "bidding_scenarios"),
+    ("scenario_summaries", "project_id", "projects"),
+    ("project_resources", "project_id", "projects"),
+    ("activity_resource_demands", "activity_id", "project_activities"),
+    ("activity_resource_demands", "resource_id", "project_resources"),
+]
+
+# 唯一鍵（主鍵以外）
+UNIQUE_KEYS = {
+    "activity_precedences": [("activity_id", "predecessor_id")],
+    "project_resources": [("project_id", "name")],
+    "activity_resource_demands": [("activity_id", "resource_id")],
+}
+
+_COLUMN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _column(name: str) -> str:
+    if not _COLUMN.match(name):
+        raise APIError({"message": f"invalid column: {name}", "code": "42703"})
+    return name
+
+
+def _path(name: str) -> str:
+    return f"json_extract(doc, '$.{_column(name)}')"
+
+
+def _param(value: Any) -> Any:
+    """篩選值轉為 SQLite 參數"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (UUID, datetime)):
+        return str(value) if isinstance(value, UUID) else value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _split_columns(columns: str) -> List[str]:
+    """以最外層的逗號切分 select 欄位（保留嵌入關聯的括號內容）"""
+    items, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+_LOGIC_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE"}
+
+
+def _split_logic(expression: str) -> List[str]:
+    """以最外層的逗號切分邏輯樹條件（略過括號與雙引號內的逗號）"""
+    items, depth, quoted, current = [], 0, False, ""
+    for char in expression:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "," and depth == 0:
+            items.append(current)
+            current = ""
+            continue
+        elif not quoted:
+            depth += char == "("
+            depth -= char == ")"
+        current += char
+    if current:
+        items.append(current)
+    return items
+
+
+def _logic_sql(joiner: str, expression: str) -> Tuple[str, List[Any]]:
+    """將 PostgREST 的 and(...) / or(...) 條件轉為 SQL（只支援比較運算子與 like）"""
+    clauses, params = [], []
+    for item in _split_logic(expression):
+        item = item.strip()
+        nested = re.match(r"^(and|or)\((.*)\)$", item)
+        if nested:
+            clause, values = _logic_sql(nested.group(1), nested.group(2))
+        else:
+            column, operator, value = item.split(".", 2)
+            if operator not in _LOGIC_OPERATORS:
+                raise APIError({"message": f"unsupported operator: {operator}", "code": "PGRST100"})
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            clause, values = f"{_path(column)} {_LOGIC_OPERATORS[operator]} ?", [value]
+            if operator == "like":
+                clause, values = f"{clause} ESCAPE '\\'", [value.replace("*", "%")]
+        clauses.append(f"({clause})")
+        params.extend(values)
+    return f" {joiner.upper()} ".join(clauses), params
+
+
+class LocalResponse:
+    """與 postgrest APIResponse 相同的 data / count 屬性"""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class LocalQuery:
+    """PostgREST 查詢建構器的本機實作（只支援後端使用到的操作）"""
+
+    def __init__(self, client: "LocalSupabase", table: str):
+        self.client = client
+        self.table = table
+        self._op = "select"
+        self._columns = "*"
+        self._count: Optional[str] = None
+        self._payload: Any = None
+        self._upsert = False
+        self._filters: List[Tuple[str, List[Any]]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # 操作
+    # ------------------------------------------------------------------
+
+    def select(self, *columns: str, count: Optional[str] = None) -> "LocalQuery":
+        self._columns = ",".join(columns) if columns else "*"
+        self._count = count
+        return self
+
+    def insert(self, payload, count: Optional[str] = None, upsert: bool = False, **_) -> "LocalQuery":
+        self._op, self._payload, self._upsert, self._count = "insert", payload, upsert, count
+        return self
+
+    def upsert(self, payload, count: Optional[str] = None, **_) -> "LocalQuery":
+        return self.insert(payload, count=count, upsert=True)
+
+    def update(self, payload: Dict, count: Optional[str] = None) -> "LocalQuery":
+        self._op, self._payload, self._count = "update", payload, count
+        return self
+
+    def delete(self, count: Optional[str] = None) -> "LocalQuery":
+        self._op, self._count = "delete", count
+        return self
+
+    # ------------------------------------------------------------------
+    # 篩選與修飾
+    # ------------------------------------------------------------------
+
+    def _where(self, column: str, operator: str, value: Any) -> "LocalQuery":
+        self._filters.append((f"{_path(column)} {operator} ?", [_param(value)]))
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "=", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "<>", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, ">", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, ">=", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "<", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._where(column, "<=", value)
+
+    # PostgreSQL 的 LIKE 預設以反斜線跳脫萬用字元，SQLite 須明確指定 ESCAPE
+    def like(self, column: str, pattern: str) -> "LocalQuery":
+        self._filters.append((f"{_path(column)} LIKE ? ESCAPE '\\'", [pattern.replace("*", "%")]))
+        return self
+
+    def ilike(self, column: str, pattern: str) -> "LocalQuery":
+        self._filters.append((f"lower({_path(column)}) LIKE lower(?) ESCAPE '\\'", [pattern.replace("*", "%")]))
+        return self
+
+    def in_(self, column: str, values) -> "LocalQuery":
+        values = [_param(v) for v in values]
+        if not values:
+            self._filters.append(("0", []))
+        else:
+            self._filters.append((f"{_path(column)} IN ({','.join('?' * len(values))})", values))
+        return self
+
+    def or_(self, filters: str, **_) -> "LocalQuery":
+        """PostgREST 邏輯樹篩選，例如 a.lt.1,and(a.eq.1,b.lt."x")（值可加雙引號）"""
+        clause, params = _logic_sql("or", filters)
+        self._filters.append((clause, params))
+        return self
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        if value is None or value == "null":
+            self._filters.append((f"{_path(column)} IS NULL", []))
+        else:
+            self._filters.append((f"{_path(column)} = ?", [1 if value in (True, "true") else 0]))
+        return self
+
+    def order(self, column: str, desc: bool = False, **_) -> "LocalQuery":
+        self._order.append((_column(column), desc))
+        return self
+
+    def limit(self, size: int, **_) -> "LocalQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **_) -> "LocalQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "LocalQuery":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "LocalQuery":
+        self._single = "maybe"
+        return self
+
+    # ------------------------------------------------------------------
+    # 執行
+    # ------------------------------------------------------------------
+
+    def execute(self) -> LocalResponse:
+        with self.client._lock:
+            self.client._ensure_table(self.table)
+            if self._op == "insert":
+                rows = self.client._insert(self.table, self._payload, self._upsert)
+            elif self._op == "update":
+                rows = self.client._update(self.table, self._where_sql(), self._payload)
+            elif self._op == "delete":
+                rows = self.client._delete(self.table, self._where_sql())
+            else:
+                return self._select()
+        return LocalResponse(rows, len(rows) if self._count else None)
+
+    def _where_sql(self) -> Tuple[str, List[Any]]:
+        if not self._filters:
+            return "1", []
+        clauses, params = [], []
+        for clause, values in self._filters:
+            clauses.append(clause)
+            params.extend(values)
+        return " AND ".join(clauses), params
+
+    def _select(self) -> LocalResponse:
+        where, params = self._where_sql()
+        sql = f'SELECT doc FROM "{self.table}" WHERE {where}'
+        if self._order:
+            # 比照 PostgreSQL：遞增時 NULL 排最後、遞減時 NULL 排最前
+            sql += " ORDER BY " + ", ".join(
+                f"{_path(column)} IS NULL {'DESC' if desc else 'ASC'}, {_path(column)} {'DESC' if desc else 'ASC'}"
+                for column, desc in self._order
+            ) + ", rowid"
+        else:
+            sql += " ORDER BY rowid"
+        if self._limit is not None or self._offset:
+            sql += f" LIMIT {int(self._limit if self._limit is not None else -1)} OFFSET {int(self._offset)}"
+        rows = [json.loads(doc) for (doc,) in self.client._conn.execute(sql, params)]
+
+        count = None
+        if self._count:
+            (count,) = self.client._conn.execute(
+                f'SELECT COUNT(*) FROM "{self.table}" WHERE {where}', params
+            ).fetchone()
+
+        data: Any = [self.client._project(self.table, row, self._columns) for row in rows]
+        if self._single:
+            if len(data) > 1 or (self._single == "single" and not data):
+                raise APIError({
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                    "code": "PGRST116",
+                })
+            data = data[0] if data else None
+        return LocalResponse(data, count)
+
+
+class LocalRpc:
+    def __init__(self, client: "LocalSupabase", name: str, params: Optional[Dict]):
+        self.client = client
+        self.name = name
+        self.params = params or {}
+
+    def execute(self) -> LocalResponse:
+        function = RPC_FUNCTIONS.get(self.name)
+        if function is None:
+            raise APIError({"message": f"function {self.name} does not exist", "code": "PGRST202"})
+        with self.client._lock:
+            return LocalResponse(function(self.client, **self.params))
+
+
+class LocalSupabase:
+    """以 SQLite 儲存的 Supabase 客戶端替身（跨執行緒共用，以鎖序列化存取）"""
+
+    def __init__(self, path: str = ":memory:"):
+        # 多個 uvicorn worker 共用同一個檔案時，寫入鎖定最多等待 30 秒
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.RLock()
+        self._tables: set = set()
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, _column(name))
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[Dict] = None) -> LocalRpc:
+        return LocalRpc(self, name, params)
+
+    # ------------------------------------------------------------------
+    # 內部：資料表與資料列
+    # ------------------------------------------------------------------
+
+    def _ensure_table(self, table: str) -> None:
+        if table in self._tables:
+            return
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (pk TEXT PRIMARY KEY, doc TEXT NOT NULL)')
+        for child, column, _ in FOREIGN_KEYS:
+            if child == table:
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" ON "{table}" ({_path(column)})'
+                )
+        self._tables.add(table)
+
+    def _rows(self, table: str, where: str, params: List[Any]) -> List[Dict]:
+        self._ensure_table(table)
+        return [
+            json.loads(doc)
+            for (doc,) in self._conn.execute(f'SELECT doc FROM "{table}" WHERE {where} ORDER BY rowid', params)
+        ]
+
+    def _exists(self, table: str, column: str, value: Any) -> bool:
+        self._ensure_table(table)
+        if column == PRIMARY_KEYS.get(table, "id"):
+            sql = f'SELECT 1 FROM "{table}" WHERE pk = ?'
+        else:
+            sql = f'SELECT 1 FROM "{table}" WHERE {_path(column)} = ? LIMIT 1'
+        return self._conn.execute(sql, [_param(value)]).fetchone() is not None
+
+    def _check_row(self, table: str, row: Dict) -> None:
+        for child, column, parent in FOREIGN_KEYS:
+            if child == table and row.get(column) is not None and not self._exists(parent, "id", row[column]):
+                raise APIError({
+                    "message": f'insert or update on table "{table}" violates foreign key constraint',
+                    "code": "23503",
+                    "details": f"Key ({column})=({row[column]}) is not present in table \"{parent}\".",
+                })
+
+    def _check_unique(self, table: str, row: Dict) -> None:
+        for columns in UNIQUE_KEYS.get(table, []):
+            where = " AND ".join(f"{_path(column)} = ?" for column in columns)
+            params = [_param(row.get(column)) for column in columns]
+            duplicate = self._conn.execute(
+                f'SELECT 1 FROM "{table}" WHERE {where} AND pk <> ? LIMIT 1',
+                params + [str(row.get(PRIMARY_KEYS.get(table, "id")))],
+            ).fetchone()
+            if duplicate:
+                raise APIError({
+                    "message": "duplicate key value violates unique constraint",
+                    "code": "23505",
+                })
+
+    def _insert(self, table: str, payload, upsert: bool) -> List[Dict]:
+        key = PRIMARY_KEYS.get(table, "id")
+        inserted = []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for values in payload if isinstance(payload, list) else [payload]:
+                row = dict(TABLE_DEFAULTS.get(table, {}))
+                now = _now()
+                row["created_at"] = now
+                if table in UPDATED_AT_TABLES:
+                    row["updated_at"] = now
+                if key == "id":
+                    row["id"] = str(uuid.uuid4())
+                row.update(values)
+                existing = self._rows(table, "pk = ?", [str(row[key])])
+                if existing:
+                    if not upsert:
+                        raise APIError({
+                            "message": "duplicate key value violates unique constraint",
+                            "code": "23505",
+                        })
+                    row = {**existing[0], **values}
+                self._check_row(table, row)
+                self._check_unique(table, row)
+                self._conn.execute(
+                    f'INSERT OR REPLACE INTO "{table}" (pk, doc) VALUES (?, ?)',
+                    [str(row[key]), json.dumps(row, ensure_ascii=False)],
+                )
+                self._fire_trigger(table, row)
+                inserted.append(row)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return inserted
+
+    def _update(self, table: str, where: Tuple[str, List[Any]], values: Dict) -> List[Dict]:
+        key = PRIMARY_KEYS.get(table, "id")
+        updated = []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row in self._rows(table, *where):
+                row.update(values)
+                if table in UPDATED_AT_TABLES:
+                    row["updated_at"] = _now()
+                self._check_row(table, row)
+                self._check_unique(table, row)
+                self._conn.execute(
+                    f'UPDATE "{table}" SET doc = ? WHERE pk = ?',
+                    [json.dumps(row, ensure_ascii=False), str(row[key])],
+                )
+                self._fire_trigger(table, row)
+                updated.append(row)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return updated
+
+    def _fire_trigger(self, table: str, row: Dict) -> None:
+        """比照 migrations 的 AFTER INSERT / UPDATE 觸發器（在同一交易內執行）"""
+        trigger = TRIGGERS.get(table)
+        if trigger is not None:
+            trigger(self, row)
+
+    def _put_row(self, table: str, row: Dict) -> None:
+        """不經交易與檢查直接寫入一列（供觸發器使用）"""
+        self._ensure_table(table)
+        self._conn.execute(
+            f'INSERT OR REPLACE INTO "{table}" (pk, doc) VALUES (?, ?)',
+            [str(row[PRIMARY_KEYS.get(table, "id")]), json.dumps(row, ensure_ascii=False)],
+        )
+
+    def _delete(self, table: str, where: Tuple[str, List[Any]]) -> List[Dict]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            deleted = self._delete_rows(table, self._rows(table, *where))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return deleted
+
+    def _delete_rows(self, table: str, rows: List[Dict]) -> List[Dict]:
+        """刪除資料列並依外鍵連帶刪除子表資料（ON DELETE CASCADE）"""
+        if not rows:
+            return rows
+        key = PRIMARY_KEYS.get(table, "id")
+        ids = [str(row[key]) for row in rows]
+        for child, column, parent in FOREIGN_KEYS:
+            if parent != table:
+                continue
+            placeholders = ",".join("?" * len(ids))
+            self._delete_rows(child, self._rows(child, f"{_path(column)} IN ({placeholders})", ids))
+        placeholders = ",".join("?" * len(ids))
+        self._conn.execute(f'DELETE FROM "{table}" WHERE pk IN ({placeholders})', ids)
+        return rows
+
+    def _project(self, table: str, row: Dict, columns: str) -> Dict:
+        """依 select 欄位挑選欄位，並展開嵌入關聯（多對一為物件、一對多為陣列）"""
+        if columns.strip() == "*":
+            return row
+        result: Dict = {}
+        for item in _split_columns(columns):
+            if item == "*":
+                result.update(row)
+                continue
+            if "(" not in item:
+                result[item] = row.get(item)
+                continue
+            relation, inner = item.split("(", 1)
+            relation, inner = relation.strip(), inner.rsplit(")", 1)[0]
+            result[relation] = self._embed(table, row, relation, inner)
+        return result
+
+    def _embed(self, table: str, row: Dict, relation: str, columns: str) -> Any:
+        for child, column, parent in FOREIGN_KEYS:
+            if child == table and parent == relation:
+                parents = self._rows(parent, "pk = ?", [str(row.get(column))])
+                return self._project(parent, parents[0], columns) if parents else None
+        for child, column, parent in FOREIGN_KEYS:
+            if child == relation and parent == table:
+                key = PRIMARY_KEYS.get(table, "id")
+                children = self._rows(child, f"{_path(column)} = ?", [str(row[key])])
+                return [self._project(child, item, columns) for item in children]
+        raise APIError({
+            "message": f"Could not find a relationship between '{table}' and '{relation}'",
+            "code": "PGRST200",
+        })
+
+
+# ----------------------------------------------------------------------
+# RPC（比照 migrations 中的 SQL 函式）
+# ----------------------------------------------------------------------
+
+
+def _pack_activity_schedules(client: LocalSupabase) -> int:
+    rows = client._rows("activity_schedules", "1", [])
+    grouped: Dict[str, List[Dict]] = {}
+    for row in rows:
+        grouped.setdefault(str(row["result_id"]), []).append(row)
+    packed = 0
+    for result_id, schedules in grouped.items():
+        if not client._exists("activity_schedule_packs", "result_id", result_id):
+            schedules.sort(key=lambda s: (s["start_time"], str(s["id"])))
+            client._insert("activity_schedule_packs", {
+                "result_id": result_id,
+                "activity_ids": [s["activity_id"] for s in schedules],
+                "start_times": [s["start_time"] for s in schedules],
+                "end_times": [s["end_time"] for s in schedules],
+                "durations": [s["duration"] for s in schedules],
+                "is_crashed": [bool(s.get("is_crashed")) for s in schedules],
+                "costs": [s["cost"] for s in schedules],
+            }, upsert=False)
+            packed += 1
+        client._conn.execute(
+            f'DELETE FROM "activity_schedules" WHERE {_path("result_id")} = ?', [result_id]
+        )
+    return packed
+
+
+def _expired_scenarios(client: LocalSupabase, keep_latest: int, days: int) -> List[Dict]:
+    """未釘選、不在各專案最新 keep_latest 筆內且超過 days 天的情境"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    by_project: Dict[str, List[Dict]] = {}
+    for scenario in client._rows("bidding_scenarios", "1", []):
+        by_project.setdefault(str(scenario["project_id"]), []).append(scenario)
+    expired = []
+    for scenarios in by_project.values():
+        scenarios.sort(key=lambda s: s["created_at"], reverse=True)
+        expired.extend(
+            s for s in scenarios[keep_latest:]
+            if not s.get("is_pinned") and s["created_at"] < cutoff
+        )
+    return expired
+
+
+def _apply_scenario_retention(
+    client: LocalSupabase,
+    compact_after_days: int = 7,
+    drop_after_days: int = 90,
+    keep_latest: int = 20,
+) -> List[Dict]:
+    dropped = client._delete_rows(
+        "bidding_scenarios", _expired_scenarios(client, keep_latest, drop_after_days)
+    )
+    _pack_activity_schedules(client)
+
+    compacted = 0
+    scenario_ids = [str(s["id"]) for s in _expired_scenarios(client, keep_latest, compact_after_days)]
+    if scenario_ids:
+        placeholders = ",".join("?" * len(scenario_ids))
+        for result in client._rows(
+            "optimization_results", f"{_path('scenario_id')} IN ({placeholders})", scenario_ids
+        ):
+            if result.get("compacted_at") is None:
+                client._update(
+                    "optimization_results",
+                    ("pk = ?", [str(result["id"])]),
+                    {"result_snapshot": None, "compacted_at": _now()},
+                )
+                compacted += 1
+    return [{"compacted_count": compacted, "dropped_count": len(dropped)}]
+
+
+# ----------------------------------------------------------------------
+# 觸發器（比照 013_add_scenario_summaries.sql）
+# ----------------------------------------------------------------------
+
+
+def _summarize_scenario(client: LocalSupabase, scenario: Dict) -> None:
+    existing = client._rows("scenario_summaries", "pk = ?", [str(scenario["id"])])
+    summary = existing[0] if existing else {
+        "scenario_id": str(scenario["id"]),
+        "result_id": None,
+        "optimal_duration": None,
+        "optimal_cost": None,
+        "penalty_amount": None,
+        "bonus_amount": None,
+        "total_cost": None,
+        "calculation_time": None,
+        "status": None,
+        "crashed_activity_ids": [],
+        "created_at": scenario["created_at"],
+    }
+    summary.update({
+        "project_id": scenario["project_id"],
+        "mode": scenario["mode"],
+        "formulation": scenario.get("formulation"),
+        "budget_constraint": scenario.get("budget_constraint"),
+        "duration_constraint": scenario.get("duration_constraint"),
+        "indirect_cost": scenario.get("indirect_cost"),
+        "penalty_type": scenario.get("penalty_type"),
+        "penalty_rate": scenario.get("penalty_rate"),
+        "penalty_fixed_amount": scenario.get("penalty_amount"),
+        "contract_amount": scenario.get("contract_amount"),
+        "contract_duration": scenario.get("contract_duration"),
+        "target_duration": scenario.get("target_duration"),
+        "status_date": scenario.get("status_date"),
+        "is_robust": scenario.get("robust_options") is not None,
+        "is_pinned": bool(scenario.get("is_pinned")),
+    })
+    client._put_row("scenario_summaries", summary)
+
+
+def _summarize_result(client: LocalSupabase, result: Dict) -> None:
+    for summary in client._rows("scenario_summaries", "pk = ?", [str(result["scenario_id"])]):
+        summary.update({
+            "result_id": str(result["id"]),
+            **{
+                column: result.get(column)
+                for column in (
+                    "optimal_duration", "optimal_cost", "penalty_amount", "bonus_amount",
+                    "total_cost", "calculation_time", "status",
+                )
+            },
+        })
+        client._put_row("scenario_summaries", summary)
+
+
+def _summarize_schedule_pack(client: LocalSupabase, pack: Dict) -> None:
+    crashed = sorted(
+        str(activity_id)
+        for activity_id, is_crashed in zip(pack["activity_ids"], pack["is_crashed"])
+        if is_crashed
+    )
+    for summary in client._rows("scenario_summaries", f"{_path('result_id')} = ?", [str(pack["result_id"])]):
+        summary["crashed_activity_ids"] = crashed
+        client._put_row("scenario_summaries", summary)
+
+
+TRIGGERS = {
+    "bidding_scenarios": _summarize_scenario,
+    "optimization_results": _summarize_result,
+    "activity_schedule_packs": _summarize_schedule_pack,
+}
+
+
+RPC_FUNCTIONS = {
+    "pack_activity_schedules": _pack_activity_schedules,
+    "apply_scenario_retention": _apply_scenario_retention,
+}
@@ -0,0 +1,21 @@
+"""
+簡易計數器
+記錄本 worker 的請求統計（例如合併的優化請求數），由 /metrics 端點輸出
+"""
+import threading
+from typing import Dict
+
+_counters: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def increment(name: str, value: int = 1) -> None:
+    """累加計數器"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot() -> Dict[str, int]:
+    """取得所有計數器目前的值"""
+    with _lock:
+        return dict(_counters)
@@ -0,0 +1,69 @@
+"""
+金額的最小貨幣單位換算
+模型係數、權衡曲線、網路界限與求解結果一律以「分」為單位的整數計算
+（資料庫金額欄位為 DECIMAL(15, 2)），加總不會有浮點誤差；只在 API 邊界
+（請求參數、回應內容、寫入資料庫）與新臺幣金額互相換算。
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, Optional
+
+# 每一元的最小貨幣單位數（分）
+MINOR_UNITS = 100
+
+# 求解結果與網路界限中以最小貨幣單位表示的欄位
+RESULT_MONEY_FIELDS = ("optimal_cost", "indirect_cost", "penalty_amount", "bonus_amount", "total_cost")
+BOUNDS_MONEY_FIELDS = ("min_direct_cost", "max_crash_cost")
+
+_MINOR_UNITS_DECIMAL = Decimal(MINOR_UNITS)
+
+
+def round_minor(value) -> int:
+    """最小貨幣單位的數值四捨五入為整數（例如比率計算出的違約金）"""
+    if isinstance(value, int):
+        return value
+    return int(Decimal(value).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def to_minor(amount) -> int:
+    """新臺幣金額（Decimal / int / float / 字串）換算為分，不足一分四捨五入"""
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS
+    return round_minor(Decimal(str(amount)) * _MINOR_UNITS_DECIMAL)
+
+
+def optional_minor(amount) -> Optional[int]:
+    return None if amount is None else to_minor(amount)
+
+
+def from_minor(units: int) -> Decimal:
+    """分換算為新臺幣金額（兩位小數的 Decimal，例如 12345 → 123.45）"""
+    return Decimal(units).scaleb(-2)
+
+
+def minor_text(units: int) -> str:
+    """分換算為金額字串，與 Pydantic 將 from_minor 的結果序列化為 JSON 的字串相同"""
+    sign = "-" if units < 0 else ""
+    whole, cents = divmod(abs(units), MINOR_UNITS)
+    return f"{sign}{whole}.{cents:02d}"
+
+
+def minor_to_float(units: int) -> float:
+    """分換算為寫入資料庫用的浮點數（兩位小數的金額皆可精確還原）"""
+    return units / MINOR_UNITS
+
+
+def amounts(values: Dict, fields: Iterable[str]) -> Dict:
+    """字典中指定的金額欄位由分換算為新臺幣金額，其餘欄位不變"""
+    fields = set(fields)
+    return {
+        key: from_minor(value) if key in fields and value is not None else value
+        for key, value in values.items()
+    }
+
+
+def result_amounts(result: Dict) -> Dict:
+    """求解結果的金額欄位（含各作業排程成本）換算為新臺幣金額，其餘欄位不變"""
+    converted = amounts(result, RESULT_MONEY_FIELDS)
+    if "schedules" in result:
+        converted["schedules"] = [{**s, "cost": from_minor(s["cost"])} for s in result["schedules"]]
+    return converted
@@ -0,0 +1,70 @@
+"""
+專案網路界限快取
+快取每個專案與求解參數無關的網路界限（正常 / 趕工工期、最小直接成本等），
+讓不可行的優化請求能在讀取資料與建模之前就直接回應
+
+本 worker 未快取時改查共用產物快取（artifact_store）的專案指標與網路產物，
+其他 worker 或重新啟動前算出的界限也能直接使用；作業異動時刪除專案指標，
+所有 worker 同時失效。
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.utils import artifact_store
+
+# 快取有效秒數：作業異動會清除處理該請求之 worker 的快取與共用的專案指標，
+# 此時限作為保險（例如未經 API 直接修改資料庫時），避免長時間使用過期界限
+NETWORK_BOUNDS_TTL = float(os.getenv("NETWORK_BOUNDS_TTL", "300"))
+
+_bounds_cache: Dict[str, Tuple[float, Dict]] = {}
+# 每個專案的網路版本號，作業異動時遞增，供常駐模型（如 what-if 工作階段）判斷是否過期
+_generations: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def get_network_bounds(project_id: str) -> Optional[Dict]:
+    """取得專案的快取界限，不存在或已過期時回傳 None"""
+    with _lock:
+        entry = _bounds_cache.get(str(project_id))
+        if entry is not None:
+            cached_at, bounds = entry
+            if time.monotonic() - cached_at <= NETWORK_BOUNDS_TTL:
+                return bounds
+            del _bounds_cache[str(project_id)]
+
+    pointer = artifact_store.project_digest(str(project_id), NETWORK_BOUNDS_TTL)
+    if pointer is None:
+        return None
+    digest, age = pointer
+    artifact = artifact_store.load_network(digest)
+    if artifact is None:
+        return None
+    bounds = artifact_store.network_bounds(artifact)
+    with _lock:
+        # 有效時限從指標寫入時起算
+        _bounds_cache[str(project_id)] = (time.monotonic() - age, bounds)
+    return bounds
+
+
+def set_network_bounds(project_id: str, bounds: Dict, digest: Optional[str] = None) -> None:
+    """寫入專案的網路界限；指定網路雜湊時一併更新共用的專案指標"""
+    with _lock:
+        _bounds_cache[str(project_id)] = (time.monotonic(), bounds)
+    if digest is not None:
+        artifact_store.publish_project(str(project_id), digest)
+
+
+def network_generation(project_id: str) -> int:
+    """取得專案在本 worker 的網路版本號"""
+    with _lock:
+        return _generations.get(str(project_id), 0)
+
+
+def invalidate_network(project_id: str) -> None:
+    """作業或前置關係異動時清除專案快取並遞增網路版本號"""
+    with _lock:
+        _bounds_cache.pop(str(project_id), None)
+        _generations[str(project_id)] = _generations.get(str(project_id), 0) + 1
+    artifact_store.drop_project(str(project_id))
@@ -0,0 +1,82 @@
+"""
+列表分頁工具
+以 (created_at, 主鍵) 作為鍵集（keyset）游標分頁：每頁以上一頁最後一筆的鍵值篩選，
+查詢成本與頁數無關（不使用 OFFSET），且資料新增時不會跳過或重複列出。
+下一頁游標放在 X-Next-Cursor 回應標頭，最後一頁不帶此標頭。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(row: Dict, key: str = "id") -> str:
+    """以列的 (created_at, 主鍵) 產生不透明的游標字串"""
+    raw = json.dumps([row["created_at"], str(row[key])], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """解析游標，格式錯誤時回應 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        # 游標值會放進篩選式，先確認是合法的時間與 UUID
+        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        UUID(row_id)
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="分頁游標格式錯誤")
+    return created_at, row_id
+
+
+def select_columns(fields: Optional[str], allowed: Iterable[str], key: str = "id") -> str:
+    """將 fields 參數（以逗號分隔）轉為 select 欄位，未指定時回傳 *
+
+    只接受回應模型中的欄位；游標所需的主鍵與 created_at 一律保留。
+    """
+    if not fields:
+        return "*"
+    allowed = set(allowed)
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"不支援的欄位：{', '.join(unknown)}")
+    return ", ".join(dict.fromkeys([key, "created_at", *requested]))
+
+
+def search_pattern(text: str) -> str:
+    """名稱搜尋的 ilike 樣式：使用者輸入一律視為字面文字
+
+    PostgREST 會把所有 * 轉為 %，無法跳脫，因此移除；LIKE 的萬用字元 %、_
+    與跳脫字元本身以反斜線跳脫（PostgreSQL 的 LIKE 預設跳脫字元）。
+    """
+    escaped = text.replace("*", "").replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"*{escaped}*"
+
+
+def keyset_page(query, cursor: Optional[str], limit: int, desc: bool, key: str = "id"):
+    """套用游標篩選、排序與筆數（多取一筆以判斷是否還有下一頁）"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        operator = "lt" if desc else "gt"
+        query = query.or_(
+            f'created_at.{operator}."{created_at}",'
+            f'and(created_at.eq."{created_at}",{key}.{operator}."{row_id}")'
+        )
+    return query.order("created_at", desc=desc).order(key, desc=desc).limit(limit + 1)
+
+
+def split_page(rows: List[Dict], limit: int, key: str = "id") -> Tuple[List[Dict], Optional[str]]:
+    """切出本頁資料並產生下一頁游標（沒有下一頁時為 None）"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], key)
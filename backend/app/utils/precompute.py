@@ -0,0 +1,152 @@
+"""
+網路異動後的背景預先計算
+作業或前置關係異動時排入去抖動（debounce）的背景工作：連續編輯只在最後一次
+異動 PRECOMPUTE_DEBOUNCE 秒後執行一次，重新計算 CPM 界限與整個專案的時間—成本
+權衡曲線並寫入共用產物快取（artifact_store）。之後強化模型的優化請求直接由曲線
+回答，不在請求路徑上求解；回應的 precomputed 欄位標示曲線的網路版本與計算時間。
+
+曲線以網路內容雜湊為鍵，只會用於內容完全相同的網路，不會回答過期的網路。
+
+PRECOMPUTE 環境變數：
+    background（預設）：異動後於背景執行緒預先計算
+    off：不預先計算（曲線仍可由投資組合或其他 worker 寫入後使用）
+"""
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer
+from app.models.decomposition import DecomposedOptimizer
+from app.models.portfolio import project_curve
+from app.utils.artifact_store import (
+    curve_computed_at,
+    load_curve,
+    load_network,
+    network_bounds,
+    network_digest,
+    save_curve,
+    save_network,
+)
+from app.utils.metrics import increment
+from app.utils.network_cache import network_generation, set_network_bounds
+from app.utils.project_network import load_project_network
+from app.utils.solver_scheduler import solver_scheduler
+
+PRECOMPUTE_MODE = os.getenv("PRECOMPUTE", "background")
+# 最後一次異動後等待的秒數
+PRECOMPUTE_DEBOUNCE = float(os.getenv("PRECOMPUTE_DEBOUNCE", "2"))
+# 超過此作業數只預先計算界限（大型網路的曲線求解次數多，留給請求時的分解求解）
+PRECOMPUTE_MAX_ACTIVITIES = int(os.getenv("PRECOMPUTE_MAX_ACTIVITIES", "1000"))
+# 背景工作向求解排程器申報的預測秒數：排在使用者的短求解之後，老化後仍會執行
+PRECOMPUTE_PRIORITY_SECONDS = float(os.getenv("PRECOMPUTE_PRIORITY_SECONDS", "60"))
+# 曲線與求解參數無關，以強化模型計算；只用來回答強化模型的請求
+PRECOMPUTE_FORMULATION = "tight"
+
+_timers: Dict[str, threading.Timer] = {}
+_lock = threading.Lock()
+
+
+def schedule_precompute(project_id: str) -> None:
+    """排入專案的預先計算；已排入者重新計時（只計算最後一次異動後的網路）"""
+    if PRECOMPUTE_MODE != "background":
+        return
+    project_id = str(project_id)
+    timer = threading.Timer(PRECOMPUTE_DEBOUNCE, _run, args=(project_id,))
+    timer.daemon = True
+    with _lock:
+        previous = _timers.get(project_id)
+        if previous is not None:
+            previous.cancel()
+        _timers[project_id] = timer
+    timer.start()
+
+
+def _run(project_id: str) -> None:
+    with _lock:
+        if _timers.get(project_id) is threading.current_thread():
+            del _timers[project_id]
+    try:
+        precompute_network(project_id)
+    except _Superseded:
+        increment("precompute_superseded")
+    except Exception:
+        # 專案已刪除或資料庫暫時無法連線：下次請求時仍會即時求解
+        increment("precompute_failed")
+
+
+def precompute_network(project_id: str) -> Optional[str]:
+    """計算並寫入專案網路的界限與權衡曲線，回傳網路雜湊"""
+    generation = network_generation(project_id)
+    _, activities, precedences = load_project_network(project_id)
+    digest = network_digest(activities, precedences)
+
+    artifact = load_network(digest)
+    if artifact is not None:
+        bounds = network_bounds(artifact)
+    else:
+        bounds = BiddingOptimizer(activities, precedences).calculate_network_bounds()
+        save_network(digest, activities, precedences, bounds)
+    # 計算期間網路又有異動時不發布，避免專案指標指向舊網路
+    if network_generation(project_id) == generation:
+        set_network_bounds(project_id, bounds, digest)
+
+    if len(activities) <= PRECOMPUTE_MAX_ACTIVITIES and load_curve(digest, PRECOMPUTE_FORMULATION) is None:
+        curve = project_curve(
+            activities, precedences, PRECOMPUTE_FORMULATION,
+            solver=_background_solver(project_id, generation),
+        )
+        save_curve(digest, PRECOMPUTE_FORMULATION, curve)
+    increment("precompute_runs")
+    return digest
+
+
+class _Superseded(Exception):
+    """計算期間網路又有異動，放棄本次預先計算（由下一次排入的工作重新計算）"""
+
+
+def _background_solver(project_id: str, generation: int):
+    """每次 MILP 求解都向求解排程器取得名額的 CBC 求解器
+
+    曲線由多次求解組成，逐次取得名額可讓使用者的請求插入兩次求解之間，
+    不會被整條曲線的計算阻擋。
+    """
+    import pulp
+
+    class BackgroundSolver(pulp.PULP_CBC_CMD):
+        def actualSolve(self, lp, **kwargs):
+            with solver_scheduler.slot(project_id, PRECOMPUTE_PRIORITY_SECONDS):
+                if network_generation(project_id) != generation:
+                    raise _Superseded()
+                return super().actualSolve(lp, **kwargs)
+
+    return BackgroundSolver(msg=0)
+
+
+def answers_from_curve(formulation: str, solve_strategy: str) -> bool:
+    """請求是否可由預先計算的權衡曲線回答
+
+    曲線以強化模型（PRECOMPUTE_FORMULATION）計算，只回答同一模型的請求；
+    標準模型的請求一律即時求解，回應的排程與次要取捨才會與標準模型一致。
+    指定單一模型（monolithic）時同樣即時求解。
+    """
+    return solve_strategy != "monolithic" and formulation == PRECOMPUTE_FORMULATION
+
+
+def precomputed_optimizer(
+    activities: List[Activity], precedences: List[Tuple[str, str]], digest: str
+) -> Optional[Tuple[DecomposedOptimizer, Dict]]:
+    """以預先計算的曲線建立優化器，並回傳新鮮度資訊；曲線尚未計算時回傳 None"""
+    curve = load_curve(digest, PRECOMPUTE_FORMULATION)
+    if curve is None:
+        return None
+    computed_at = curve_computed_at(digest, PRECOMPUTE_FORMULATION)
+    now = datetime.now(timezone.utc)
+    computed = datetime.fromtimestamp(computed_at, timezone.utc) if computed_at is not None else now
+    increment("precompute_hits")
+    optimizer = DecomposedOptimizer.from_curve(activities, precedences, curve, formulation=PRECOMPUTE_FORMULATION)
+    return optimizer, {
+        "network_version": digest,
+        "computed_at": computed,
+        "age_seconds": round((now - computed).total_seconds(), 3),
+    }
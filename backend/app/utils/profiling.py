@@ -0,0 +1,273 @@
+"""
+請求剖析（選用）
+設定 PROFILING_TOKEN 後，帶有 X-Profile 標頭或 ?profile= 查詢參數（值為該權杖）的
+優化與情境結果請求會以取樣方式記錄呼叫堆疊，輸出 speedscope 格式的火焰圖，
+可由 /api/debug/profiles 取得。未設定權杖時不註冊中介層，一般請求沒有任何額外負擔。
+
+取樣執行緒以 sys._current_frames() 定期讀取已登記執行緒（事件迴圈與執行緒池中
+處理該請求的執行緒）的堆疊；CBC 在子行程中執行，火焰圖中顯示為 PuLP 等待求解器的時間。
+"""
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN") or None
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# 每個 worker 在記憶體中保留的剖析結果數
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "20"))
+# 另存 speedscope 檔案的目錄（未設定時只保存在記憶體），多個 worker 可共用
+PROFILE_DIR = os.getenv("PROFILE_DIR") or None
+
+# 可剖析的路徑前綴
+PROFILED_PATHS = ("/api/optimize", "/api/scenarios/")
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+_current: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "request_profile", default=None
+)
+_stored: "OrderedDict[str, Dict]" = OrderedDict()
+_stored_lock = threading.Lock()
+
+StackKey = Tuple[Tuple[str, str, int], ...]
+
+
+class RequestProfile:
+    """單一請求的取樣剖析"""
+
+    def __init__(self, name: str, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.interval = interval_ms / 1000
+        self.tags: Dict = {}
+        self.samples: Counter = Counter()
+        self.started_at = time.time()
+        self.duration = 0.0
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.id[:8]}", daemon=True)
+
+    # ------------------------------------------------------------------
+    # 執行緒登記
+    # ------------------------------------------------------------------
+
+    def add_thread(self, label: str) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = label
+        return ident
+
+    def remove_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def bind(self, func: Callable) -> Callable:
+        """包裝要在執行緒池中執行的函式，執行期間登記該執行緒"""
+
+        def wrapper(*args, **kwargs):
+            ident = self.add_thread("worker")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.remove_thread(ident)
+
+        return wrapper
+
+    # ------------------------------------------------------------------
+    # 取樣
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed_ms = (now - last) * 1000
+            last = now
+            with self._lock:
+                threads = dict(self._threads)
+            frames = sys._current_frames()
+            for ident, label in threads.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[(label, _stack(frame))] += elapsed_ms
+
+    # ------------------------------------------------------------------
+    # 輸出
+    # ------------------------------------------------------------------
+
+    def speedscope(self) -> Dict:
+        """輸出 speedscope 檔案格式（每個執行緒一個 sampled profile）"""
+        frame_index: Dict[Tuple[str, str, int], int] = {}
+        frames: List[Dict] = []
+        profiles: Dict[str, Dict] = {}
+        for (label, stack), weight in self.samples.items():
+            indexes = []
+            for entry in stack:
+                if entry not in frame_index:
+                    frame_index[entry] = len(frames)
+                    frames.append({"name": entry[0], "file": entry[1], "line": entry[2]})
+                indexes.append(frame_index[entry])
+            profile = profiles.setdefault(label, {"samples": [], "weights": []})
+            profile["samples"].append(indexes)
+            profile["weights"].append(round(weight, 3))
+
+        total_ms = round(self.duration * 1000, 3)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "bidding-optimizer-profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{self.name} [{label}]",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": total_ms,
+                    "samples": data["samples"],
+                    "weights": data["weights"],
+                }
+                for label, data in profiles.items()
+            ],
+            "metadata": self.summary(),
+        }
+
+    def summary(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "sample_count": len(self.samples),
+            "tags": self.tags,
+        }
+
+
+def _stack(frame) -> StackKey:
+    """由最內層 frame 往外走，回傳由根到葉的堆疊"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, frame.f_lineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """目前請求的剖析（未剖析時為 None）"""
+    return _current.get()
+
+
+def tag_profile(**tags) -> None:
+    """為目前請求的剖析加上標籤（例如模型大小）；未剖析時不做任何事"""
+    profile = _current.get()
+    if profile is not None:
+        profile.tags.update(tags)
+
+
+# ----------------------------------------------------------------------
+# 儲存與讀取
+# ----------------------------------------------------------------------
+
+
+def _store(profile: RequestProfile) -> None:
+    document = profile.speedscope()
+    with _stored_lock:
+        _stored[profile.id] = document
+        while len(_stored) > PROFILE_MAX_STORED:
+            _stored.popitem(last=False)
+    if PROFILE_DIR:
+        directory = Path(PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{profile.id}.speedscope.json").write_text(
+            json.dumps(document, ensure_ascii=False), encoding="utf-8"
+        )
+
+
+def list_profiles() -> List[Dict]:
+    """本 worker 保存的剖析摘要（新到舊）"""
+    with _stored_lock:
+        return [document["metadata"] for document in reversed(_stored.values())]
+
+
+def get_profile(profile_id: str) -> Optional[Dict]:
+    """取得 speedscope 檔案內容；記憶體中沒有時讀取 PROFILE_DIR"""
+    with _stored_lock:
+        document = _stored.get(profile_id)
+    if document is not None:
+        return document
+    if PROFILE_DIR and profile_id.isalnum():
+        path = Path(PROFILE_DIR) / f"{profile_id}.speedscope.json"
+        if path.is_file():
+            return json.loads(path.read_text(encoding="utf-8"))
+    return None
+
+
+def token_valid(token: Optional[str]) -> bool:
+    return PROFILING_TOKEN is not None and token == PROFILING_TOKEN
+
+
+# ----------------------------------------------------------------------
+# ASGI 中介層
+# ----------------------------------------------------------------------
+
+
+class ProfilingMiddleware:
+    """對帶有剖析權杖的請求啟動取樣剖析，回應送出完畢後儲存結果
+
+    回應標頭 X-Profile-Id 為剖析結果 ID。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(PROFILED_PATHS):
+            return await self.app(scope, receive, send)
+
+        token = dict(scope["headers"]).get(b"x-profile", b"").decode("latin-1") or None
+        if token is None and scope.get("query_string"):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get("profile")
+            token = values[0] if values else None
+        if not token_valid(token):
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}")
+        context_token = _current.set(profile)
+        loop_ident = profile.add_thread("event-loop")
+        profile.start()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.remove_thread(loop_ident)
+            profile.stop()
+            _current.reset(context_token)
+            _store(profile)
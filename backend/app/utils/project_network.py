@@ -0,0 +1,38 @@
+"""
+專案網路讀取
+讀取專案的作業資料列與前置關係並建立 Activity 物件，供優化 API 與背景預先計算共用
+"""
+from fastapi import HTTPException
+
+from app.models.bidding_optimizer import Activity
+from app.utils.money import to_minor
+from app.utils.supabase_client import supabase
+
+
+def load_project_network(project_id):
+    """取得專案的作業資料列、Activity 物件與前置關係 [(後續作業ID, 前置作業ID), ...]"""
+    # 1. 取得專案的所有作業活動
+    activities_response = supabase.table("project_activities").select("*").eq("project_id", str(project_id)).execute()
+    if not activities_response.data:
+        raise HTTPException(status_code=404, detail="專案沒有作業活動")
+    
+    activities_data = activities_response.data
+    
+    # 2. 取得前置關係
+    activity_ids = [act['id'] for act in activities_data]
+    precedences_response = supabase.table("activity_precedences").select("*").in_("activity_id", activity_ids).execute()
+    precedences = [(p['activity_id'], p['predecessor_id']) for p in precedences_response.data]
+    
+    # 3. 建立 Activity 物件（成本換算為分）
+    activities = [
+        Activity(
+            activity_id=act['id'],
+            name=act['name'],
+            normal_duration=act['normal_duration'],
+            normal_cost=to_minor(act['normal_cost']),
+            crash_duration=act['crash_duration'],
+            crash_cost=to_minor(act['crash_cost'])
+        )
+        for act in activities_data
+    ]
+    return activities_data, activities, precedences
@@ -0,0 +1,294 @@
+"""
+優化結果報告匯出（Excel / PDF）
+由儲存的結果與打包排程直接產生報告檔，內容與前端原本的報告相同（結果摘要、作業排程）。
+
+- Excel：openpyxl 唯寫模式，每列寫出後即寫入暫存檔，不在記憶體中保留整個工作表
+- PDF：reportlab canvas 逐頁繪製（頁面內容保留至存檔時才壓縮寫出，記憶體約隨頁數成長，
+  無法串流寫出），因此作業排程最多列出 REPORT_PDF_MAX_ROWS 筆，超過時於表末註明
+  並請使用者改匯出 Excel；中文使用內建的 CID 字型 MSung-Light（不需內嵌字型檔，
+  檔案小且不需安裝字型）
+
+兩者皆寫入暫存檔，由呼叫端以串流方式回傳後刪除。openpyxl 與 reportlab 在第一次
+匯出時才匯入，不影響啟動時間。
+"""
+import itertools
+import os
+import tempfile
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+REPORT_TITLE = "進度成本最佳化決策報告"
+SCHEDULE_HEADERS = ("作業名稱", "開始時間（天）", "結束時間（天）", "工期（天）", "是否趕工", "成本")
+# PDF 欄寬有限，表頭使用簡稱
+PDF_HEADERS = ("作業名稱", "開始", "結束", "工期", "趕工", "成本")
+
+# 報告格式 → (媒體類型, 副檔名)
+REPORT_FORMATS = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "pdf": ("application/pdf", "pdf"),
+}
+
+# 排程列：(作業名稱, 開始, 結束, 工期, 是否趕工, 成本)
+ScheduleRow = Tuple[str, int, int, int, bool, float]
+
+# PDF 版面（單位：point，A4 直式）
+PDF_FONT = "MSung-Light"
+PDF_FONT_ENCODING = "UniCNS-UCS2-H"
+PDF_MARGIN = 50
+PDF_ROW_HEIGHT = 16
+PDF_COLUMN_WIDTHS = (190, 55, 55, 50, 45, 100)
+# PDF 排程表的列數上限（約 400 頁）；Excel 以唯寫模式逐列寫出，不受此限制
+REPORT_PDF_MAX_ROWS = int(os.getenv("REPORT_PDF_MAX_ROWS", "20000"))
+
+
+def summary_items(result: Dict) -> List[Tuple[str, object]]:
+    """結果摘要的 (標籤, 值) 列表；穩健模式另列情境統計"""
+    items: List[Tuple[str, object]] = [
+        ("最優工期（天）", result["optimal_duration"]),
+        ("最優成本", _money(result["optimal_cost"])),
+        ("間接成本", _money(result.get("indirect_cost"))),
+        ("違約金", _money(result["penalty_amount"])),
+        ("獎金", _money(result["bonus_amount"])),
+        ("總成本（含獎懲）", _money(result["total_cost"])),
+    ]
+    robust = result.get("robust_summary")
+    if robust:
+        items += [
+            ("抽樣情境數", robust["scenario_count"]),
+            ("期望工期（天）", robust["expected_duration"]),
+            ("P90 工期（天）", robust["duration_p90"]),
+            (
+                "準時完工機率",
+                None if robust.get("on_time_probability") is None
+                else f"{robust['on_time_probability']:.1%}",
+            ),
+            ("期望違約金", _money(robust["expected_penalty"])),
+        ]
+    calculation_time = result.get("calculation_time")
+    items += [
+        ("計算時間（秒）", f"{calculation_time:.3f}" if calculation_time is not None else "N/A"),
+        ("建立時間", _format_time(result.get("created_at"))),
+    ]
+    return items
+
+
+def schedule_rows(schedules: Iterable[Dict], activity_names: Dict[str, str]) -> List[ScheduleRow]:
+    """依開始時間排列的排程列（已刪除的作業以「（已刪除）」標示，金額仍計入）
+
+    排序須讀完所有排程；逐筆轉為精簡的 tuple 後才排序，不保留排程字典。
+    """
+    rows = [
+        (
+            activity_names.get(s["activity_id"], "（已刪除）"),
+            s["start_time"],
+            s["end_time"],
+            s["duration"],
+            bool(s["is_crashed"]),
+            float(s["cost"]),
+        )
+        for s in schedules
+    ]
+    rows.sort(key=lambda row: (row[1], row[2]))
+    return rows
+
+
+def _money(value) -> Optional[Decimal]:
+    """金額以 Decimal 表示，Excel 寫為數值、PDF 格式化為新臺幣"""
+    return None if value is None else Decimal(str(value))
+
+
+def _format_time(value) -> str:
+    """ISO 時間字串轉為「YYYY-MM-DD HH:MM:SS UTC」"""
+    if not value:
+        return ""
+    try:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return str(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def _format_money(value) -> str:
+    return "N/A" if value is None else f"NT${value:,.0f}"
+
+
+def write_report(
+    report_format: str,
+    summary: Sequence[Tuple[str, object]],
+    rows: Iterable[ScheduleRow],
+) -> str:
+    """產生報告暫存檔並回傳路徑（由呼叫端負責刪除）"""
+    _, extension = REPORT_FORMATS[report_format]
+    fd, path = tempfile.mkstemp(prefix="report-", suffix=f".{extension}")
+    os.close(fd)
+    try:
+        if report_format == "xlsx":
+            write_xlsx(path, summary, rows)
+        else:
+            write_pdf(path, summary, rows)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+# ----------------------------------------------------------------------
+# Excel
+# ----------------------------------------------------------------------
+
+
+def write_xlsx(path: str, summary: Sequence[Tuple[str, object]], rows: Iterable[ScheduleRow]) -> None:
+    """以唯寫模式寫出 Excel 報告（結果摘要、作業排程兩個工作表）"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    summary_sheet = workbook.create_sheet("結果摘要")
+    summary_sheet.column_dimensions["A"].width = 20
+    summary_sheet.column_dimensions["B"].width = 24
+    title = WriteOnlyCell(summary_sheet, value=REPORT_TITLE)
+    title.font = Font(bold=True, size=14)
+    summary_sheet.append([title])
+    summary_sheet.append([])
+    for label, value in summary:
+        summary_sheet.append([label, value])
+
+    schedule_sheet = workbook.create_sheet("作業排程")
+    for column, width in zip("ABCDEF", (30, 15, 15, 12, 12, 15)):
+        schedule_sheet.column_dimensions[column].width = width
+    header = []
+    for text in SCHEDULE_HEADERS:
+        cell = WriteOnlyCell(schedule_sheet, value=text)
+        cell.font = bold
+        cell.alignment = Alignment(horizontal="center")
+        header.append(cell)
+    schedule_sheet.append(header)
+    for name, start, end, duration, is_crashed, cost in rows:
+        schedule_sheet.append([name, start, end, duration, "是" if is_crashed else "否", cost])
+
+    workbook.save(path)
+
+
+# ----------------------------------------------------------------------
+# PDF
+# ----------------------------------------------------------------------
+
+
+def write_pdf(path: str, summary: Sequence[Tuple[str, object]], rows: Iterable[ScheduleRow]) -> None:
+    """逐頁寫出 PDF 報告：結果摘要之後接作業排程表（換頁時重複表頭並標示頁碼）"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfgen import canvas
+
+    if PDF_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(_traditional_chinese_font())
+
+    width, height = A4
+    pdf = canvas.Canvas(path, pagesize=A4, pageCompression=1)
+    pdf.setTitle(REPORT_TITLE)
+    page = 1
+
+    def footer() -> None:
+        pdf.setFont(PDF_FONT, 9)
+        pdf.drawCentredString(width / 2, PDF_MARGIN / 2, f"第 {page} 頁")
+
+    def table_header(y: float) -> float:
+        pdf.setFont(PDF_FONT, 10)
+        x = PDF_MARGIN
+        for text, column_width in zip(PDF_HEADERS, PDF_COLUMN_WIDTHS):
+            pdf.drawString(x, y, text)
+            x += column_width
+        pdf.line(PDF_MARGIN, y - 4, width - PDF_MARGIN, y - 4)
+        pdf.setFont(PDF_FONT, 9)
+        return y - PDF_ROW_HEIGHT
+
+    y = height - PDF_MARGIN
+    pdf.setFont(PDF_FONT, 18)
+    pdf.drawCentredString(width / 2, y, REPORT_TITLE)
+    y -= 36
+    pdf.setFont(PDF_FONT, 14)
+    pdf.drawString(PDF_MARGIN, y, "結果摘要")
+    y -= 22
+    pdf.setFont(PDF_FONT, 11)
+    for label, value in summary:
+        if isinstance(value, Decimal):
+            value = _format_money(value)
+        pdf.drawString(PDF_MARGIN, y, f"{label}：{'N/A' if value is None else value}")
+        y -= 18
+
+    y -= 14
+    pdf.setFont(PDF_FONT, 14)
+    pdf.drawString(PDF_MARGIN, y, "作業排程明細")
+    y = table_header(y - 24)
+
+    # 同一頁的表格列共用一個文字物件（逐格 drawString 會為每格產生 BT/ET 與字型設定）
+    text = pdf.beginText()
+    text.setFont(PDF_FONT, 9)
+    rows = iter(rows)
+    for name, start, end, duration, is_crashed, cost in itertools.islice(rows, REPORT_PDF_MAX_ROWS):
+        if y < PDF_MARGIN:
+            pdf.drawText(text)
+            footer()
+            pdf.showPage()
+            page += 1
+            y = table_header(height - PDF_MARGIN)
+            text = pdf.beginText()
+            text.setFont(PDF_FONT, 9)
+        values = (
+            _truncate(pdf, name, PDF_COLUMN_WIDTHS[0] - 8),
+            str(start),
+            str(end),
+            str(duration),
+            "是" if is_crashed else "否",
+            _format_money(cost),
+        )
+        x = PDF_MARGIN
+        for value, column_width in zip(values, PDF_COLUMN_WIDTHS):
+            text.setTextOrigin(x, y)
+            text.textOut(value)
+            x += column_width
+        y -= PDF_ROW_HEIGHT
+
+    remaining = sum(1 for _ in rows)
+    if remaining:
+        if y < PDF_MARGIN:
+            y = PDF_MARGIN
+        text.setTextOrigin(PDF_MARGIN, y - 4)
+        text.textOut(f"另有 {remaining} 筆作業未列出（PDF 最多 {REPORT_PDF_MAX_ROWS} 筆），完整明細請匯出 Excel 報告")
+    pdf.drawText(text)
+    footer()
+    pdf.showPage()
+    pdf.save()
+
+
+def _traditional_chinese_font():
+    """MSung-Light 搭配繁體中文的 UniCNS-UCS2-H 編碼
+
+    reportlab 內建對照表將 MSung-Light 配上簡體的 UniGB-UCS2-H 編碼，與字型的 CNS1 字集不符，
+    嚴格遵循規格的檢視器會顯示錯誤的字；文字本身仍以 UTF-16 寫出，只需更正編碼名稱。
+    """
+    from reportlab.pdfbase.cidfonts import CIDFont, UnicodeCIDFont, widthsByUnichar
+
+    font = UnicodeCIDFont.__new__(UnicodeCIDFont)
+    CIDFont.__init__(font, PDF_FONT, PDF_FONT_ENCODING)
+    font.language = "cht"
+    font.name = font.fontName = PDF_FONT
+    font.vertical = False
+    font.isHalfWidth = False
+    font.unicodeWidths = widthsByUnichar[PDF_FONT]
+    return font
+
+
+def _truncate(pdf, text: str, max_width: float) -> str:
+    """超過欄寬的作業名稱截斷並加上省略號"""
+    if pdf.stringWidth(text, PDF_FONT, 9) <= max_width:
+        return text
+    while text and pdf.stringWidth(text + "…", PDF_FONT, 9) > max_width:
+        text = text[:-1]
+    return text + "…"
@@ -0,0 +1,270 @@
+"""
+優化結果輸出格式工具
+- build_result_payload：直接組出與 OptimizationResult 相同 JSON 結構的字典，
+  不經 Pydantic 逐列驗證（大型專案的排程動輒數千列）
+- 依 Accept 標頭協商 JSON / NDJSON / Arrow IPC，後兩者以串流方式分批輸出
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json, to_jsonable_python
+
+from app.utils.money import minor_text
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# 媒體類型 → 格式名稱
+_MEDIA_FORMATS = {
+    JSON_MEDIA_TYPE: "json",
+    NDJSON_MEDIA_TYPE: "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonlines": "ndjson",
+    ARROW_MEDIA_TYPE: "arrow",
+}
+
+# 串流時每批輸出的列數
+STREAM_BATCH_SIZE = 1000
+
+# 優化輸入參數中屬於金額 / 比率的欄位
+_DECIMAL_PARAMS = ("budget_constraint", "indirect_cost", "penalty_amount", "penalty_rate", "contract_amount")
+
+
+def _decimal(value) -> Optional[Decimal]:
+    """轉為 Decimal（與 Pydantic 驗證 Decimal 欄位的結果一致）"""
+    return None if value is None else Decimal(str(value))
+
+
+def build_result_payload(
+    scenario_id,
+    result_id,
+    result: Dict,
+    optimization_data: Dict,
+    activities: List,
+    precedences: List[Tuple[str, str]],
+    created_at,
+) -> Dict:
+    """組出 OptimizationResult 的 JSON 內容
+
+    欄位順序與序列化方式（Decimal 轉字串、UUID / datetime 轉 ISO 字串）
+    皆與 OptimizationResult.model_dump(mode="json") 相同；以分計的金額
+    直接格式化為兩位小數的字串，不經 Decimal。排程、作業與前置關係三個
+    大型清單只含字串與整數（作業 ID 為字串），不再交給 to_jsonable_python 逐列走訪。
+
+    Args:
+        result: BiddingOptimizer 的求解結果（金額以分計；穩健模式另含 robust
+            情境統計，由預先計算的曲線回答時另含 precomputed 新鮮度）
+        optimization_data: 優化輸入參數（OptimizationData 的欄位）
+        activities: 專案的 Activity 物件
+        precedences: 前置關係 [(後續作業ID, 前置作業ID), ...]
+    """
+    params = dict(optimization_data)
+    for key in _DECIMAL_PARAMS:
+        if key in params:
+            params[key] = _decimal(params[key])
+
+    payload = {
+        "scenario_id": scenario_id,
+        "result_id": result_id,
+        "optimal_duration": result['optimal_duration'],
+        "optimal_cost": minor_text(result['optimal_cost']),
+        "indirect_cost": minor_text(result['indirect_cost']),
+        "penalty_amount": minor_text(result['penalty_amount']),
+        "bonus_amount": minor_text(result['bonus_amount']),
+        "total_cost": minor_text(result['total_cost']),
+        "calculation_time": result['calculation_time'],
+        "status": result['status'],
+        "error_message": None,
+        "schedules": None,
+        "created_at": created_at,
+        "optimization_data": params,
+        "activities": None,
+        "precedences": None,
+        "robust": result.get('robust'),
+        "precomputed": result.get('precomputed'),
+        "alternatives": result.get('alternatives'),
+    }
+    payload = to_jsonable_python(payload)
+    payload["schedules"] = [
+        {
+            "activity_id": s['activity_id'],
+            "activity_name": s['activity_name'],
+            "start_time": s['start_time'],
+            "end_time": s['end_time'],
+            "duration": s['duration'],
+            "is_crashed": s['is_crashed'],
+            "cost": minor_text(s['cost']),
+        }
+        for s in result['schedules']
+    ]
+    payload["activities"] = [
+        {
+            "id": act.id,
+            "name": act.name,
+            "normal_duration": act.normal_duration,
+            "normal_cost": minor_text(act.normal_cost),
+            "crash_duration": act.crash_duration,
+            "crash_cost": minor_text(act.crash_cost),
+        }
+        for act in activities
+    ]
+    payload["precedences"] = [
+        {"successor": successor, "predecessor": predecessor}
+        for successor, predecessor in precedences
+    ]
+    return payload
+
+
+# ----------------------------------------------------------------------
+# 格式協商
+# ----------------------------------------------------------------------
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """依 Accept 標頭選擇輸出格式（json / ndjson / arrow），無法判斷時使用 json"""
+    if not accept:
+        return "json"
+
+    best_format, best_quality = "json", -1.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        fmt = _MEDIA_FORMATS.get(media_type.strip().lower())
+        if fmt and quality > best_quality:
+            best_format, best_quality = fmt, quality
+    return best_format
+
+
+def arrow_available() -> bool:
+    """是否安裝了選用套件 pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def render_result(payload: Dict, fmt: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """依格式輸出優化結果"""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept"
+    if fmt == "ndjson":
+        return StreamingResponse(ndjson_stream(payload), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    if fmt == "arrow":
+        if not arrow_available():
+            raise HTTPException(status_code=406, detail="伺服器未安裝 pyarrow，無法輸出 Arrow 格式")
+        return StreamingResponse(arrow_stream(payload), media_type=ARROW_MEDIA_TYPE, headers=headers)
+    # 以 pydantic-core 的 Rust 編碼器輸出，比標準庫 json 快數倍
+    return Response(content=to_json(payload), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+# ----------------------------------------------------------------------
+# 串流輸出
+# ----------------------------------------------------------------------
+
+def _summary(payload: Dict) -> Dict:
+    """結果摘要：排除三個大型清單，改附上各自筆數"""
+    summary = {
+        key: value
+        for key, value in payload.items()
+        if key not in ("schedules", "activities", "precedences")
+    }
+    summary["schedule_count"] = len(payload.get("schedules") or [])
+    return summary
+
+
+def _batches(rows: List[Dict]) -> Iterable[List[Dict]]:
+    for start in range(0, len(rows), STREAM_BATCH_SIZE):
+        yield rows[start:start + STREAM_BATCH_SIZE]
+
+
+def ndjson_stream(payload: Dict) -> Iterator[bytes]:
+    """NDJSON 串流：第一行為結果摘要，之後逐行輸出排程、作業與前置關係
+
+    每行皆帶有 type 欄位（result / schedule / activity / precedence）。
+    """
+    def encode(row: Dict) -> bytes:
+        return to_json(row) + b"\n"
+
+    yield encode({"type": "result", **_summary(payload)})
+    for row_type, key in (("schedule", "schedules"), ("activity", "activities"), ("precedence", "precedences")):
+        for batch in _batches(payload.get(key) or []):
+            yield b"".join(encode({"type": row_type, **row}) for row in batch)
+
+
+class _ChunkSink:
+    """收集 Arrow 寫出的位元組，供產生器分批送出"""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def arrow_stream(payload: Dict) -> Iterator[bytes]:
+    """Arrow IPC 串流：排程為 record batch，其餘內容以 JSON 放在 schema metadata
+
+    metadata 的 result 鍵包含結果摘要、作業資訊與前置關係。
+    cost 以 float64 輸出，需要精確金額時請使用 JSON / NDJSON。
+    """
+    import pyarrow as pa
+
+    metadata = dict(_summary(payload))
+    metadata["activities"] = payload.get("activities")
+    metadata["precedences"] = payload.get("precedences")
+    schema = pa.schema(
+        [
+            ("activity_id", pa.string()),
+            ("activity_name", pa.string()),
+            ("start_time", pa.int32()),
+            ("end_time", pa.int32()),
+            ("duration", pa.int32()),
+            ("is_crashed", pa.bool_()),
+            ("cost", pa.float64()),
+        ],
+        metadata={"result": to_json(metadata).decode("utf-8")},
+    )
+
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+    for batch in _batches(payload.get("schedules") or []):
+        writer.write_batch(
+            pa.record_batch(
+                [
+                    pa.array([row["activity_id"] for row in batch], pa.string()),
+                    pa.array([row["activity_name"] for row in batch], pa.string()),
+                    pa.array([row["start_time"] for row in batch], pa.int32()),
+                    pa.array([row["end_time"] for row in batch], pa.int32()),
+                    pa.array([row["duration"] for row in batch], pa.int32()),
+                    pa.array([row["is_crashed"] for row in batch], pa.bool_()),
+                    pa.array([float(row["cost"]) for row in batch], pa.float64()),
+                ],
+                schema=schema,
+            )
+        )
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,115 @@
+"""
+作業排程儲存工具
+新結果的排程以每個結果一列的平行陣列（activity_schedule_packs）儲存，
+讀取時仍相容舊版逐列的 activity_schedules
+"""
+from typing import Dict, Iterator, List, Optional
+
+from app.utils.money import minor_to_float
+from app.utils.supabase_client import supabase
+
+# 逐列舊資料每次讀取的筆數（報告匯出以分段讀取，不一次載入所有排程列）
+SCHEDULE_CHUNK_SIZE = 1000
+
+
+def save_schedule_pack(result_id: str, schedules: List[Dict]) -> None:
+    """將一個優化結果的所有作業排程打包成一列寫入（排程成本以分計，寫入時換算為元）"""
+    supabase.table("activity_schedule_packs").insert({
+        "result_id": str(result_id),
+        "activity_ids": [str(s['activity_id']) for s in schedules],
+        "start_times": [s['start_time'] for s in schedules],
+        "end_times": [s['end_time'] for s in schedules],
+        "durations": [s['duration'] for s in schedules],
+        "is_crashed": [bool(s['is_crashed']) for s in schedules],
+        "costs": [minor_to_float(s['cost']) for s in schedules],
+    }).execute()
+
+
+def load_schedules(result_id: str) -> Optional[List[Dict]]:
+    """讀取一個優化結果的作業排程
+
+    先查打包表，沒有時退回舊版逐列資料表。
+
+    Returns:
+        排程字典列表（activity_id、start_time、end_time、duration、is_crashed、cost），
+        兩種來源都沒有資料時回傳 None
+    """
+    pack_response = supabase.table("activity_schedule_packs").select("*").eq("result_id", str(result_id)).execute()
+    if pack_response.data:
+        return unpack_schedules(pack_response.data[0])
+
+    rows_response = supabase.table("activity_schedules").select("*").eq("result_id", str(result_id)).execute()
+    if not rows_response.data:
+        return None
+    return [
+        {
+            "activity_id": row['activity_id'],
+            "start_time": row['start_time'],
+            "end_time": row['end_time'],
+            "duration": row['duration'],
+            "is_crashed": bool(row['is_crashed']),
+            "cost": row['cost'],
+        }
+        for row in rows_response.data
+    ]
+
+
+def iter_schedules(result_id: str, chunk_size: int = SCHEDULE_CHUNK_SIZE) -> Iterator[Dict]:
+    """逐筆產生一個優化結果的作業排程（格式同 load_schedules，沒有資料時不產生任何項目）
+
+    打包列只有一列，展開時逐筆產生而不建立整個字典列表；
+    舊版逐列資料依 id 以鍵集分頁，每次讀取 chunk_size 筆。
+    """
+    pack_response = supabase.table("activity_schedule_packs").select("*").eq("result_id", str(result_id)).execute()
+    if pack_response.data:
+        yield from _iter_pack(pack_response.data[0])
+        return
+
+    last_id = None
+    while True:
+        query = (
+            supabase.table("activity_schedules")
+            .select("id, activity_id, start_time, end_time, duration, is_crashed, cost")
+            .eq("result_id", str(result_id))
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(chunk_size).execute().data
+        for row in rows:
+            yield {
+                "activity_id": row['activity_id'],
+                "start_time": row['start_time'],
+                "end_time": row['end_time'],
+                "duration": row['duration'],
+                "is_crashed": bool(row['is_crashed']),
+                "cost": row['cost'],
+            }
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]['id']
+
+
+def unpack_schedules(pack: Dict) -> List[Dict]:
+    """將打包列展開為逐筆排程字典"""
+    return list(_iter_pack(pack))
+
+
+def _iter_pack(pack: Dict) -> Iterator[Dict]:
+    return (
+        {
+            "activity_id": activity_id,
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": duration,
+            "is_crashed": is_crashed,
+            "cost": cost,
+        }
+        for activity_id, start_time, end_time, duration, is_crashed, cost in zip(
+            pack['activity_ids'],
+            pack['start_times'],
+            pack['end_times'],
+            pack['durations'],
+            pack['is_crashed'],
+            pack['costs'],
+        )
+    )
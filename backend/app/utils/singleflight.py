@@ -0,0 +1,79 @@
+"""
+相同請求合併（singleflight）
+同一個鍵在計算中時，後到的請求直接等待第一個請求（leader）的結果，
+不重複執行；計算本身在執行緒池中進行，不阻塞事件迴圈
+"""
+import asyncio
+import hashlib
+from decimal import Decimal
+from typing import Any, Callable, Dict, Tuple
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.metrics import increment
+
+
+class SingleFlight:
+    """以鍵合併進行中的呼叫（只在同一個事件迴圈內使用）
+
+    計數器 {name}_solved 與 {name}_coalesced 分別記錄實際執行與合併等待的次數
+    （不論成功或失敗）。
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, func: Callable, *args) -> Tuple[Any, bool]:
+        """執行 func(*args)，或等待同鍵進行中的呼叫
+
+        Returns:
+            (結果, shared)：shared 為 True 表示結果來自其他請求的計算
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            increment(f"{self.name}_coalesced")
+            # shield：某個等待者被取消時不影響 leader 與其他等待者
+            return await asyncio.shield(future), True
+
+        increment(f"{self.name}_solved")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await run_in_threadpool(func, *args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # 標記例外已取得，沒有等待者時不會出現 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def inflight_count(self) -> int:
+        return len(self._inflight)
+
+
+def _normalize(value: Any) -> Any:
+    """Decimal 去除尾端 0，使 1000 與 1000.00 視為相同參數"""
+    if isinstance(value, Decimal):
+        return format(value.normalize(), "f")
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def request_key(model: BaseModel, *scope: Any) -> str:
+    """以正規化後的請求內容與額外範圍（如網路版本號）產生合併鍵"""
+    data = _normalize(model.model_dump())
+    digest = hashlib.sha256(to_json({"scope": [str(item) for item in scope], "request": data})).hexdigest()
+    return digest
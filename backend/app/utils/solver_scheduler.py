@@ -0,0 +1,130 @@
+"""
+求解排程器
+限制同時執行的 MILP 求解數（SOLVER_CONCURRENCY），其餘求解依預測時間
+以最短工作優先（SJF）排隊，避免小型專案排在數千個作業的大型求解之後。
+等待時間會降低優先分數（老化），已有求解在執行的專案則提高分數（公平性），
+確保大型求解與同一專案的連續請求都不會無限期等待。
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from app.models.solve_time import SolveTimePredictor
+from app.utils.metrics import increment
+from app.utils.supabase_client import supabase
+
+SOLVER_CONCURRENCY = int(os.getenv("SOLVER_CONCURRENCY", "0")) or (os.cpu_count() or 1)
+# 每等待 1 秒，優先分數減少的預測秒數
+SOLVER_AGING_RATE = float(os.getenv("SOLVER_AGING_RATE", "0.5"))
+# 由歷史結果重新訓練預測器的間隔秒數
+PREDICTOR_REFRESH_SECONDS = float(os.getenv("PREDICTOR_REFRESH_SECONDS", "600"))
+# 訓練時讀取的歷史結果筆數上限
+PREDICTOR_HISTORY_LIMIT = 1000
+
+
+class _Ticket:
+    __slots__ = ("project_id", "predicted", "enqueued_at")
+
+    def __init__(self, project_id: str, predicted: float):
+        self.project_id = project_id
+        self.predicted = predicted
+        self.enqueued_at = time.monotonic()
+
+
+class SolverScheduler:
+    """以最短預測時間優先分配求解名額（跨執行緒使用）"""
+
+    def __init__(self, concurrency: int = SOLVER_CONCURRENCY, aging_rate: float = SOLVER_AGING_RATE):
+        self.concurrency = max(1, concurrency)
+        self.aging_rate = aging_rate
+        self._cond = threading.Condition()
+        self._waiting: List[_Ticket] = []
+        self._running: Dict[str, int] = {}
+        self._running_total = 0
+
+    def _priority(self, ticket: _Ticket, now: float) -> float:
+        """優先分數（越小越先執行）：預測時間 ×（1 + 該專案執行中求解數）− 老化"""
+        fairness = 1 + self._running.get(ticket.project_id, 0)
+        return ticket.predicted * fairness - self.aging_rate * (now - ticket.enqueued_at)
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        if not self._waiting or self._running_total >= self.concurrency:
+            return None
+        now = time.monotonic()
+        return min(self._waiting, key=lambda t: (self._priority(t, now), t.enqueued_at))
+
+    @contextmanager
+    def slot(self, project_id: str, predicted_seconds: float):
+        """取得求解名額；名額已滿時依優先分數排隊等待"""
+        ticket = _Ticket(str(project_id), predicted_seconds)
+        with self._cond:
+            self._waiting.append(ticket)
+            if self._next_ticket() is not ticket:
+                increment("solver_queued")
+                while self._next_ticket() is not ticket:
+                    self._cond.wait()
+            self._waiting.remove(ticket)
+            self._running[ticket.project_id] = self._running.get(ticket.project_id, 0) + 1
+            self._running_total += 1
+            # 同時釋出多個名額時，先醒來的求解可能看到輪到別人而再次等待；
+            # 仍有空名額就喚醒其餘排隊者，避免名額閒置
+            if self._waiting and self._running_total < self.concurrency:
+                self._cond.notify_all()
+        increment("solver_wait_ms", int((time.monotonic() - ticket.enqueued_at) * 1000))
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running_total -= 1
+                self._running[ticket.project_id] -= 1
+                if not self._running[ticket.project_id]:
+                    del self._running[ticket.project_id]
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """目前執行中與排隊中的求解數"""
+        with self._cond:
+            return {
+                "concurrency": self.concurrency,
+                "running": self._running_total,
+                "queued": len(self._waiting),
+                "queued_predicted_seconds": round(sum(t.predicted for t in self._waiting), 3),
+            }
+
+
+solver_scheduler = SolverScheduler()
+predictor = SolveTimePredictor()
+_trained_at: Optional[float] = None
+_train_lock = threading.Lock()
+
+
+def predict_solve_time(features: Dict) -> float:
+    """預測求解秒數；預測器過期時先以歷史結果重新訓練（讀取失敗時沿用原係數）"""
+    global _trained_at
+    now = time.monotonic()
+    if (_trained_at is None or now - _trained_at > PREDICTOR_REFRESH_SECONDS) and _train_lock.acquire(blocking=False):
+        try:
+            _trained_at = now
+            predictor.fit(_load_history())
+        except Exception:
+            increment("predictor_train_failed")
+        finally:
+            _train_lock.release()
+    return predictor.predict(features)
+
+
+def _load_history() -> List:
+    response = (
+        supabase.table("optimization_results")
+        .select("calculation_time, model_features")
+        .order("created_at", desc=True)
+        .limit(PREDICTOR_HISTORY_LIMIT)
+        .execute()
+    )
+    return [
+        (row["model_features"], float(row["calculation_time"]))
+        for row in response.data
+        if row.get("model_features") and row.get("calculation_time") is not None
+    ]
@@ -1,19 +1,64 @@
 """
 Supabase 客戶端工具
+客戶端在第一次查詢時才建立（匯入 supabase 套件約需數百毫秒），
+未設定環境變數時也要到第一次使用才會報錯，不影響應用程式啟動
 """
-from supabase import create_client, Client
 import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 load_dotenv()
 
-# 從環境變數讀取 Supabase 設定
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # 使用 service role key 以獲得完整權限
+# 資料後端：remote（Supabase 專案，預設）或 local（本機 SQLite 替身，供開發與負載測試）
+SUPABASE_BACKEND = os.getenv("SUPABASE_BACKEND", "remote")
+
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
+
+
+def get_supabase() -> "Client":
+    """取得（必要時建立）Supabase 客戶端"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
+def _create_client() -> "Client":
+    if SUPABASE_BACKEND == "local":
+        from app.utils.local_supabase import LocalSupabase
+
+        return LocalSupabase(os.getenv("SUPABASE_LOCAL_PATH", ":memory:"))
+
+    from supabase import create_client
+
+    # 從環境變數讀取 Supabase 設定
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # 使用 service role key 以獲得完整權限
+
+    if not supabase_url or not supabase_key:
+        raise ValueError("請設定 SUPABASE_URL 和 SUPABASE_SERVICE_ROLE_KEY 環境變數")
+
+    return create_client(supabase_url, supabase_key)
+
+
+def is_initialized() -> bool:
+    """客戶端是否已建立"""
+    return _client is not None
+
+
+class _LazyClient:
+    """延遲建立的客戶端代理，用法與 Supabase Client 相同（supabase.table(...)）"""
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("請設定 SUPABASE_URL 和 SUPABASE_SERVICE_ROLE_KEY 環境變數")
+    def __getattr__(self, name: str):
+        return getattr(get_supabase(), name)
 
-# 建立 Supabase 客戶端
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+supabase: "Client" = _LazyClient()
@@ -0,0 +1,90 @@
+"""
+What-if 工作階段登錄表
+每個 worker 最多常駐 WHATIF_MAX_SESSIONS 個工作階段；閒置超過
+WHATIF_IDLE_SECONDS 的工作階段會被移除，額滿時優先移除最久未使用且
+沒有連線中的工作階段
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.models.whatif import WhatIfSession
+
+WHATIF_MAX_SESSIONS = int(os.getenv("WHATIF_MAX_SESSIONS", "8"))
+WHATIF_IDLE_SECONDS = float(os.getenv("WHATIF_IDLE_SECONDS", "600"))
+
+# session_id → [工作階段, 最後使用時間, 連線數]
+_sessions: "OrderedDict[str, list]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _evict_idle(now: float) -> None:
+    for session_id in [
+        sid for sid, (_, last_used, connections) in _sessions.items()
+        if connections == 0 and now - last_used > WHATIF_IDLE_SECONDS
+    ]:
+        del _sessions[session_id]
+
+
+def acquire_session(session_id: str) -> Optional[WhatIfSession]:
+    """取得既有工作階段並標記為連線中；不存在（或已被移除）時回傳 None"""
+    with _lock:
+        now = time.monotonic()
+        _evict_idle(now)
+        entry = _sessions.get(session_id)
+        if entry is None:
+            return None
+        entry[1] = now
+        entry[2] += 1
+        _sessions.move_to_end(session_id)
+        return entry[0]
+
+
+def register_session(session_id: str, session: WhatIfSession) -> bool:
+    """登錄新工作階段並標記為連線中
+
+    Returns:
+        額滿且所有工作階段都在連線中而無法登錄時回傳 False
+    """
+    with _lock:
+        now = time.monotonic()
+        _evict_idle(now)
+        while len(_sessions) >= WHATIF_MAX_SESSIONS:
+            victim = next((sid for sid, entry in _sessions.items() if entry[2] == 0), None)
+            if victim is None:
+                return False
+            del _sessions[victim]
+        _sessions[session_id] = [session, now, 1]
+        return True
+
+
+def touch_session(session_id: str) -> None:
+    """更新最後使用時間"""
+    with _lock:
+        entry = _sessions.get(session_id)
+        if entry is not None:
+            entry[1] = time.monotonic()
+            _sessions.move_to_end(session_id)
+
+
+def release_session(session_id: str) -> None:
+    """連線結束：工作階段保留到閒置逾時，期間可用同一 session_id 重新連線"""
+    with _lock:
+        entry = _sessions.get(session_id)
+        if entry is not None:
+            entry[1] = time.monotonic()
+            entry[2] = max(entry[2] - 1, 0)
+
+
+def drop_session(session_id: str) -> None:
+    """立即移除工作階段"""
+    with _lock:
+        _sessions.pop(session_id, None)
+
+
+def session_count() -> int:
+    """目前常駐的工作階段數（/metrics 使用）"""
+    with _lock:
+        return len(_sessions)
@@ -0,0 +1 @@
+# 效能基準測試腳本（於 backend/ 目錄執行：python -m benchmarks.<腳本名稱>）
@@ -0,0 +1,73 @@
+"""
+替代方案基準測試：沿用同一模型以 no-good cut 依序求解，與每個方案各自重新建模求解比較
+
+冷啟動每次都重新建立優化器與模型（等同使用者手動調整參數後重新送出請求），
+k 個替代方案需要 k + 1 次冷啟動；沿用模型時每個替代方案只多一條約束與一次求解。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_alternatives [作業數 ...]
+"""
+import sys
+import time
+from decimal import Decimal
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.utils.money import minor_to_float, to_minor
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = [30, 100, 300]
+ALTERNATIVE_COUNT = 5
+
+
+def _params(activities, optimizer):
+    normal = optimizer._calculate_normal_duration()
+    crash = optimizer._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    return (normal + crash) // 2, dict(
+        indirect_cost=to_minor(20000),
+        penalty_type="rate",
+        penalty_rate=Decimal("0.001"),
+        contract_amount=normal_cost * 13 // 10,
+        contract_duration=normal,
+        target_duration=(normal + crash) // 2,
+    )
+
+
+def cold_solve(activities, precedences, formulation):
+    started = time.perf_counter()
+    optimizer = BiddingOptimizer(activities, precedences, formulation=formulation)
+    duration, params = _params(activities, optimizer)
+    optimizer.solve_duration_to_cost(duration=duration, **params)
+    return time.perf_counter() - started
+
+
+def session_solve(activities, precedences, formulation):
+    started = time.perf_counter()
+    optimizer = BiddingOptimizer(activities, precedences, formulation=formulation)
+    duration, params = _params(activities, optimizer)
+    best = optimizer.solve_duration_to_cost(duration=duration, **params)
+    base_time = time.perf_counter() - started
+    best, alternatives = optimizer.solve_alternatives(best, ALTERNATIVE_COUNT, cost_tolerance=0.05)
+    return base_time, time.perf_counter() - started, best, alternatives
+
+
+def main(sizes):
+    print(
+        f"{'作業數':>6} {'模型':<9} {'冷啟動(秒)':>10} {f'{ALTERNATIVE_COUNT + 1}次冷啟動':>11} "
+        f"{'沿用模型(秒)':>12} {'每方案(秒)':>10} {'方案數':>6} {'最大成本差':>12}"
+    )
+    for size in sizes:
+        activities, precedences = random_network(size, seed=size)
+        for formulation in ("standard", "tight"):
+            cold = cold_solve(activities, precedences, formulation)
+            base_time, total, best, alternatives = session_solve(activities, precedences, formulation)
+            per_plan = (total - base_time) / len(alternatives) if alternatives else 0.0
+            max_delta = max((minor_to_float(a["total_cost"] - best["total_cost"]) for a in alternatives), default=0.0)
+            print(
+                f"{size:>6} {formulation:<9} {cold:>10.3f} {cold * (ALTERNATIVE_COUNT + 1):>11.3f} "
+                f"{total:>12.3f} {per_plan:>10.3f} {len(alternatives):>6} {max_delta:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,82 @@
+"""
+共用產物快取基準測試：新 worker（或重新啟動後）取得網路衍生資料的耗時
+
+比較直接計算與讀取共用產物檔：
+- 網路：CPM 界限、前置鄰接表與拓撲排序（作業數增加時）
+- 權衡曲線：投資組合使用的單一專案曲線
+
+讀取時先清除本行程的對應快取，模擬另一個 worker 第一次對應產物檔；
+另列網路雜湊（每次請求都需計算）的耗時與產物檔大小。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_artifact_cache [作業數 ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+# 使用暫存目錄，不影響實際的產物快取（須在匯入 app 模組前設定）
+os.environ["ARTIFACT_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-artifacts-")
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.models.portfolio import project_curve
+from app.utils import artifact_store
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+CURVE_SIZE = 40
+REPEAT = 5
+
+
+def timed(func):
+    best = float("inf")
+    for _ in range(REPEAT):
+        artifact_store._mapped.clear()
+        started = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, value
+
+
+def computed_network(activities, precedences):
+    optimizer = BiddingOptimizer(activities, precedences)
+    return optimizer.calculate_network_bounds(), optimizer._network()
+
+
+def cached_network(digest):
+    artifact = artifact_store.load_network(digest)
+    return artifact_store.network_bounds(artifact), artifact_store.network_adjacency(artifact)
+
+
+def main(sizes):
+    print(f"{'作業數':>8} {'雜湊(ms)':>9} {'計算(ms)':>9} {'讀取(ms)':>9} {'只讀界限(ms)':>12} {'檔案(KB)':>9}")
+    for size in sizes:
+        activities, precedences = random_network(size, seed=size)
+        hash_ms, digest = timed(lambda: artifact_store.network_digest(activities, precedences))
+        compute_ms, (bounds, network) = timed(lambda: computed_network(activities, precedences))
+        artifact_store.save_network(digest, activities, precedences, bounds)
+        load_ms, (cached_bounds, cached) = timed(lambda: cached_network(digest))
+        bounds_ms, _ = timed(lambda: artifact_store.network_bounds(artifact_store.load_network(digest)))
+        assert cached_bounds == bounds and cached == network
+        size_kb = os.path.getsize(artifact_store._path(f"network-{digest}")) / 1024
+        print(
+            f"{size:>8} {hash_ms:>9.1f} {compute_ms:>9.1f} {load_ms:>9.1f} {bounds_ms:>12.3f} {size_kb:>9.1f}"
+        )
+
+    activities, precedences = random_network(CURVE_SIZE, seed=CURVE_SIZE)
+    digest = artifact_store.network_digest(activities, precedences)
+    started = time.perf_counter()
+    curve = project_curve(activities, precedences, "standard")
+    compute_ms = (time.perf_counter() - started) * 1000
+    artifact_store.save_curve(digest, "standard", curve)
+    load_ms, cached = timed(lambda: artifact_store.load_curve(digest, "standard"))
+    assert cached == curve
+    print(
+        f"\n權衡曲線（{CURVE_SIZE} 個作業，{len(curve)} 個轉折點）："
+        f"計算 {compute_ms:.1f} ms，讀取 {load_ms:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main([int(value) for value in sys.argv[1:]] or DEFAULT_SIZES)
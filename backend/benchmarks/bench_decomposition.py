@@ -0,0 +1,83 @@
+"""
+網路分解基準測試：比較多階段網路以單一 MILP 與串聯分解求解的時間與結果
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_decomposition [階段數 每階段作業數]
+"""
+import os
+import sys
+import time
+from decimal import Decimal
+
+# 量測實際計算時間，停用共用產物快取（須在匯入 app 模組前設定）
+os.environ["ARTIFACT_CACHE_DIR"] = ""
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.models.decomposition import DecomposedOptimizer
+from app.utils.money import minor_to_float, to_minor
+from benchmarks.common import phased_network
+
+DEFAULT_PHASES = 6
+DEFAULT_PHASE_SIZE = 40
+
+
+def main(phase_count, phase_size):
+    activities, precedences = phased_network(phase_count, phase_size, seed=phase_count)
+    monolithic = BiddingOptimizer(activities, precedences, formulation="tight")
+    normal = monolithic._calculate_normal_duration()
+    crash = monolithic._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    params = dict(
+        indirect_cost=to_minor(20000),
+        penalty_type="rate",
+        penalty_rate=Decimal("0.001"),
+        contract_amount=normal_cost * 13 // 10,
+        contract_duration=normal,
+        target_duration=(normal + crash) // 2,
+    )
+    budget = normal_cost * 104 // 100 + params["indirect_cost"] * normal
+    durations = [crash + (normal - crash) * step // 4 for step in range(5)]
+
+    print(f"作業數 {len(activities)}，工期範圍 {crash} ~ {normal} 天")
+
+    decomposed = DecomposedOptimizer.from_network(
+        activities, precedences, formulation="tight", strategy="decomposition"
+    )
+    started = time.perf_counter()
+    decomposed.tradeoff_frontier()
+    curve_time = time.perf_counter() - started
+    print(
+        f"分解：{len(decomposed.blocks)} 個區塊，前緣 {len(decomposed.tradeoff_frontier())} 點，"
+        f"建立曲線 {curve_time:.2f} 秒（之後每次查詢免再求解）"
+    )
+
+    print(f"{'查詢':<16} {'單一模型(秒)':>12} {'分解(秒)':>9} {'單一總成本':>14} {'分解總成本':>14}")
+    queries = [("budget", budget)] + [("duration", d) for d in durations]
+    total_monolithic = 0.0
+    for kind, value in queries:
+        started = time.perf_counter()
+        if kind == "budget":
+            expected = monolithic.solve_budget_to_duration(budget=value, **params)
+        else:
+            expected = monolithic.solve_duration_to_cost(duration=value, **params)
+        mono_time = time.perf_counter() - started
+        total_monolithic += mono_time
+
+        started = time.perf_counter()
+        if kind == "budget":
+            actual = decomposed.solve_budget_to_duration(budget=value, **params)
+        else:
+            actual = decomposed.solve_duration_to_cost(duration=value, **params)
+        dec_time = time.perf_counter() - started
+
+        label = "budget" if kind == "budget" else f"duration={value}"
+        print(
+            f"{label:<16} {mono_time:>12.3f} {dec_time:>9.4f} "
+            f"{minor_to_float(expected['total_cost']):>14,.0f} {minor_to_float(actual['total_cost']):>14,.0f}"
+        )
+    print(f"單一模型合計 {total_monolithic:.2f} 秒；分解含建立曲線合計 {curve_time:.2f} 秒")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args or [DEFAULT_PHASES, DEFAULT_PHASE_SIZE]))
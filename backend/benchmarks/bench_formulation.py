@@ -0,0 +1,80 @@
+"""
+模型建構方式基準測試：比較 standard 與 tight 兩種 MILP 的分支節點數與求解時間
+
+預算 → 工期模式的目標函數只含工期與獎懲，同一最優工期下兩種模型的總成本可能不同。
+最後一列彙總各模型的節點數與時間，用於判斷 tight 是否真的減少分支。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_formulation [作業數 ...]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+import pulp
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.utils.money import minor_to_float, to_minor
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = [30, 100, 300]
+
+
+def _solve(activities, precedences, formulation, mode, log_path):
+    """以指定模型求解一次，回傳 (結果, 分支節點數, 耗時秒數)"""
+    solver = pulp.PULP_CBC_CMD(msg=0, logPath=log_path)
+    optimizer = BiddingOptimizer(activities, precedences, formulation=formulation, solver=solver)
+    normal = optimizer._calculate_normal_duration()
+    crash = optimizer._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    contract_amount = normal_cost * 13 // 10
+    params = dict(
+        indirect_cost=to_minor(20000),
+        penalty_type="rate",
+        penalty_rate=Decimal("0.001"),
+        contract_amount=contract_amount,
+        contract_duration=normal,
+        target_duration=(normal + crash) // 2,
+    )
+
+    started = time.perf_counter()
+    if mode == "budget_to_duration":
+        result = optimizer.solve_budget_to_duration(
+            budget=normal_cost * 104 // 100 + params["indirect_cost"] * normal, **params
+        )
+    else:
+        result = optimizer.solve_duration_to_cost(duration=(normal + crash) // 2, **params)
+    elapsed = time.perf_counter() - started
+
+    with open(log_path, encoding="utf-8", errors="ignore") as log_file:
+        match = re.search(r"Enumerated nodes:\s+(\d+)", log_file.read())
+    return result, int(match.group(1)) if match else 0, elapsed
+
+
+def main(sizes):
+    log_path = os.path.join(tempfile.gettempdir(), "bench_formulation_cbc.log")
+    print(f"{'作業數':>6} {'模式':<20} {'模型':<9} {'節點數':>7} {'時間(秒)':>9} {'工期':>5} {'總成本':>14}")
+    totals = {formulation: [0, 0.0] for formulation in ("standard", "tight")}
+    for size in sizes:
+        activities, precedences = random_network(size, seed=size)
+        for mode in ("budget_to_duration", "duration_to_cost"):
+            for formulation in ("standard", "tight"):
+                result, nodes, elapsed = _solve(activities, precedences, formulation, mode, log_path)
+                totals[formulation][0] += nodes
+                totals[formulation][1] += elapsed
+                if result["status"] != "success":
+                    print(f"{size:>6} {mode:<20} {formulation:<9} {result['status']}")
+                    continue
+                print(
+                    f"{size:>6} {mode:<20} {formulation:<9} {nodes:>7} {elapsed:>9.3f} "
+                    f"{result['optimal_duration']:>5} {minor_to_float(result['total_cost']):>14,.0f}"
+                )
+    for formulation, (nodes, elapsed) in totals.items():
+        print(f"{'合計':>6} {'':<20} {formulation:<9} {nodes:>7} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
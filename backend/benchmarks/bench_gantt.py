@@ -0,0 +1,97 @@
+"""
+甘特圖查詢基準測試：建立索引的時間，以及各種查詢的耗時與回應大小
+
+排程以 CPM 最早開始時間產生，WBS 編碼依作業順序分為三層（每層 10 個群組）。
+時間窗查詢取專案中段 5% 的期間，與線性掃描所有作業比較；
+各層 WBS 彙總於第一次查詢時建立，另列其建立時間。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_gantt [作業數 ...]
+"""
+import json
+import sys
+import time
+
+from app.models.network import build_adjacency, critical_path_length, topological_order
+from app.utils.gantt_index import GanttIndex
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+QUERY_REPEAT = 50
+LIMIT = 500
+
+
+def build_schedules(size):
+    activities, precedences = random_network(size, seed=size)
+    ids = [act.id for act in activities]
+    durations = {act.id: act.normal_duration for act in activities}
+    predecessors, successors = build_adjacency(ids, precedences)
+    order, _ = topological_order(predecessors, successors)
+    _, earliest = critical_path_length(durations, predecessors, order)
+    schedules = [
+        {
+            "activity_id": aid,
+            "start_time": earliest[aid],
+            "end_time": earliest[aid] + durations[aid],
+            "duration": durations[aid],
+            "is_crashed": False,
+            "cost": 1000.0,
+        }
+        for aid in ids
+    ]
+    rows = {
+        act.id: {
+            "name": act.name,
+            "wbs_code": f"{index * 10 // size + 1}.{index * 100 // size % 10 + 1}.{index}",
+        }
+        for index, act in enumerate(activities)
+    }
+    return schedules, rows, precedences
+
+
+def timed(func):
+    started = time.perf_counter()
+    for _ in range(QUERY_REPEAT):
+        value = func()
+    return (time.perf_counter() - started) / QUERY_REPEAT * 1000, value
+
+
+def main(sizes):
+    print(
+        f"{'作業數':>8} {'建索引(ms)':>10} {'WBS彙總(ms)':>11} {'查詢':<16} {'索引(ms)':>9} {'線性(ms)':>9} "
+        f"{'總數':>7} {'回傳':>5} {'回應(KB)':>9}"
+    )
+    for size in sizes:
+        schedules, rows, precedences = build_schedules(size)
+        started = time.perf_counter()
+        index = GanttIndex(schedules, rows, precedences)
+        build_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        index.rollup(2)
+        rollup_ms = (time.perf_counter() - started) * 1000
+        middle = index.project_duration // 2
+        window = (middle, middle + max(1, index.project_duration // 20))
+
+        queries = {
+            "WBS 第 2 層": (lambda: index.rollup(2).query(None, None, LIMIT), None),
+            "要徑": (lambda: index.critical.query(None, None, LIMIT), None),
+            "時間窗 5%": (
+                lambda: index.activities.query(window[0], window[1], LIMIT),
+                lambda: [
+                    bar for bar in index.activities.items
+                    if bar["start_time"] <= window[1] and bar["end_time"] >= window[0]
+                ][:LIMIT],
+            ),
+        }
+        for label, (query, linear) in queries.items():
+            query_ms, (bars, total) = timed(query)
+            linear_ms = timed(linear)[0] if linear else None
+            payload_kb = len(json.dumps(bars)) / 1024
+            print(
+                f"{size:>8} {build_ms:>10.1f} {rollup_ms:>11.1f} {label:<16} {query_ms:>9.3f} "
+                f"{'-' if linear_ms is None else f'{linear_ms:.3f}':>9} {total:>7} {len(bars):>5} {payload_kb:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(value) for value in sys.argv[1:]] or DEFAULT_SIZES)
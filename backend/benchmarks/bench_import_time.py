@@ -0,0 +1,92 @@
+"""
+冷啟動匯入時間預算檢查：在全新的 Python 行程中匯入 main，量測耗時並確認
+重量級相依（PuLP、Supabase 客戶端與其 HTTP 堆疊、pyarrow）沒有在匯入時載入。
+超過預算或載入了延遲模組時以非零狀態碼結束，可放在部署前檢查中執行。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_import_time [預算毫秒數]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 1000
+RUNS = 5
+
+# 應延遲到第一次使用才載入的模組
+DEFERRED_MODULES = ("pulp", "numpy", "supabase", "postgrest", "gotrue", "httpx", "pyarrow")
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - started) * 1000
+print(elapsed)
+print(",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+
+def _measure(env):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(modules=DEFERRED_MODULES)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+
+def _slowest_imports(env, count=10):
+    """以 -X importtime 列出 main 直接匯入的模組中累計耗時最長者"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    totals = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 每層縮排兩格：只看 main 直接匯入的模組
+        if name.startswith("   ") and not name.startswith("    "):
+            totals.append((int(cumulative) / 1000, name.strip()))
+    return sorted(totals, reverse=True)[:count]
+
+
+def main(budget_ms):
+    # 不提供 Supabase 設定：延遲建立客戶端後，匯入 main 不應需要任何環境變數
+    env = {key: value for key, value in os.environ.items() if not key.startswith("SUPABASE_")}
+    env["WARMUP"] = "off"
+
+    timings = []
+    loaded = set()
+    for _ in range(RUNS):
+        elapsed, modules = _measure(env)
+        timings.append(elapsed)
+        loaded.update(modules)
+
+    median = statistics.median(timings)
+    print(f"匯入 main：中位數 {median:.0f} ms（{RUNS} 次：{', '.join(f'{t:.0f}' for t in timings)}），預算 {budget_ms} ms")
+    print("main 直接匯入的模組（累計耗時）：")
+    for cumulative, name in _slowest_imports(env):
+        print(f"  {cumulative:>8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"失敗：匯入時載入了應延遲的模組：{', '.join(sorted(loaded))}")
+        failed = True
+    if median > budget_ms:
+        print(f"失敗：匯入時間超過預算 {median - budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("通過")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS)
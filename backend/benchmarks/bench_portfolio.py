@@ -0,0 +1,60 @@
+"""
+投資組合優化基準測試：專案數增加時，權衡曲線與多選背包主問題各自的耗時
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_portfolio [每專案作業數 專案數 ...]
+"""
+import os
+import sys
+import time
+from decimal import Decimal
+
+# 量測實際計算時間，停用共用產物快取（須在匯入 app 模組前設定）
+os.environ["ARTIFACT_CACHE_DIR"] = ""
+
+from app.models.portfolio import PortfolioOptimizer
+from app.utils.money import minor_to_float, to_minor
+from benchmarks.common import random_network
+
+DEFAULT_SIZE = 40
+DEFAULT_COUNTS = [2, 4, 8]
+
+
+def main(size, counts):
+    print(f"{'專案數':>6} {'曲線(秒)':>9} {'主問題(秒)':>10} {'加權工期':>8} {'總成本':>14}")
+    for count in counts:
+        projects = []
+        for index in range(count):
+            activities, precedences = random_network(size, seed=index)
+            projects.append({
+                "project_id": f"P{index}",
+                "activities": activities,
+                "precedences": precedences,
+                "weight": Decimal(1 + index % 3),
+                "indirect_cost": to_minor(20000),
+            })
+        optimizer = PortfolioOptimizer(projects, formulation="tight")
+        started = time.perf_counter()
+        optimizer.curves()
+        curve_time = time.perf_counter() - started
+
+        # 預算取全部正常施工總成本的 102%，留一些空間給趕工
+        normal_total = sum(
+            curve[-1]["direct_cost"] + project["indirect_cost"] * curve[-1]["duration"]
+            for project, curve in zip(projects, optimizer.curves())
+        )
+        started = time.perf_counter()
+        result = optimizer.solve(normal_total * 102 // 100)
+        master_time = time.perf_counter() - started
+        if result["status"] != "success":
+            print(f"{count:>6} {result['status']}")
+            continue
+        print(
+            f"{count:>6} {curve_time:>9.2f} {master_time:>10.3f} "
+            f"{float(result['objective_value']):>8.0f} {minor_to_float(result['total_cost']):>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else DEFAULT_SIZE, args[1:] or DEFAULT_COUNTS)
@@ -0,0 +1,71 @@
+"""
+報告匯出基準測試：大型排程產生 Excel / PDF 的時間、檔案大小與記憶體峰值
+
+記憶體峰值以 tracemalloc 量測（只計 Python 配置），排程列本身在量測前即已建立。
+Excel 以唯寫模式寫出，記憶體不隨列數成長；PDF 的頁面內容在存檔前保留於記憶體，
+約隨頁數線性成長（每頁約 45 列）。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_report_export [作業數 ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from app.utils.report_export import schedule_rows, summary_items, write_report
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+
+def fake_result(size):
+    schedules = [
+        {
+            "activity_id": f"a{index}",
+            "start_time": index // 10,
+            "end_time": index // 10 + 5,
+            "duration": 5,
+            "is_crashed": index % 3 == 0,
+            "cost": 12345.0 + index,
+        }
+        for index in range(size)
+    ]
+    names = {f"a{index}": f"第 {index} 項作業（結構體工程）" for index in range(size)}
+    result = {
+        "optimal_duration": size // 10 + 5,
+        "optimal_cost": Decimal("123456789"),
+        "indirect_cost": Decimal("1000"),
+        "penalty_amount": Decimal("0"),
+        "bonus_amount": Decimal("0"),
+        "total_cost": Decimal("123457789"),
+        "calculation_time": 1.0,
+        "created_at": "2024-01-01T00:00:00+00:00",
+    }
+    return result, schedules, names
+
+
+def main(sizes):
+    print(f"{'作業數':>8} {'格式':>5} {'耗時(秒)':>9} {'檔案(KB)':>9} {'記憶體峰值(MB)':>14}")
+    for size in sizes:
+        result, schedules, names = fake_result(size)
+        for report_format in ("xlsx", "pdf"):
+            started = time.perf_counter()
+            path = write_report(report_format, summary_items(result), schedule_rows(schedules, names))
+            elapsed = time.perf_counter() - started
+            file_size = os.path.getsize(path)
+            os.remove(path)
+
+            # tracemalloc 會使執行變慢數倍，記憶體另外量測一次
+            tracemalloc.start()
+            os.remove(write_report(report_format, summary_items(result), schedule_rows(schedules, names)))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{size:>8} {report_format:>5} {elapsed:>9.2f} {file_size / 1024:>9.0f} "
+                f"{peak / 1024 / 1024:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(value) for value in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,75 @@
+"""
+資源平準化基準測試：序列式 / 平行式排程產生法與多起點
+
+對隨機網路指派班組與機具需求（容量約為不考慮資源時尖峰用量的一半），量測：
+- 各優先規則單次排程的耗時與工期
+- 多起點（每種方法 STARTS 次）單一行程與行程池的總耗時，以及相對單一規則的工期改善
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_resource_leveling [作業數 ...]
+"""
+import os
+import random
+import sys
+import time
+
+from app.models.resource_leveling import LEVELING_WORKERS, PRIORITY_RULES, ResourceLeveler
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = [500, 2000, 5000]
+STARTS = 32
+
+
+def leveling_problem(size: int):
+    activities, precedences = random_network(size, seed=size)
+    rng = random.Random(size)
+    demands = {}
+    for act in activities:
+        needs = {"crew": rng.randint(1, 4)}
+        if rng.random() < 0.2:
+            needs["crane"] = 1
+        if rng.random() < 0.3:
+            needs["excavator"] = rng.randint(1, 2)
+        demands[act.id] = needs
+    durations = {act.id: act.normal_duration for act in activities}
+    ids = [act.id for act in activities]
+
+    # 容量取不考慮資源時尖峰用量的一半（至少為單一作業的最大需求）
+    unconstrained = ResourceLeveler(ids, durations, precedences, {"crew": 10**6, "crane": 10**6, "excavator": 10**6}, demands)
+    peaks = unconstrained.profile(unconstrained.earliest_start).max(axis=0).tolist()
+    capacities = {rid: max(4 if rid == "crew" else 2, peak // 2) for rid, peak in zip(unconstrained.resource_ids, peaks)}
+    return ResourceLeveler(ids, durations, precedences, capacities, demands), capacities
+
+
+def main(sizes):
+    for size in sizes:
+        started = time.perf_counter()
+        leveler, capacities = leveling_problem(size)
+        build = time.perf_counter() - started
+        print(f"\n{size} 個作業：CPM 工期 {leveler.baseline_duration}，容量 {capacities}，建立 {build * 1000:.0f} ms")
+
+        print(f"{'方法':<9} {'規則':<11} {'工期':>6} {'單次(ms)':>9}")
+        single_best = None
+        for method in ("serial", "parallel"):
+            for rule in PRIORITY_RULES:
+                started = time.perf_counter()
+                start = leveler.run(method, rule, 0)
+                elapsed = time.perf_counter() - started
+                makespan = leveler.evaluate(start)[0]
+                if rule == "lft":
+                    single_best = makespan if single_best is None else min(single_best, makespan)
+                print(f"{method:<9} {rule:<11} {makespan:>6} {elapsed * 1000:>9.1f}")
+
+        for workers in sorted({1, LEVELING_WORKERS}):
+            started = time.perf_counter()
+            result = leveler.level(rule="lft", starts=STARTS, seed=1, max_workers=workers)
+            elapsed = time.perf_counter() - started
+            print(
+                f"多起點 {result['runs']} 次（{result['workers']} 行程）：{elapsed:.2f} 秒，工期 {result['makespan']}"
+                f"（LFT 單次 {single_best}，改善 {single_best - result['makespan']} 天，最佳為 {result['method']}）"
+            )
+    print(f"\n可用 CPU：{os.cpu_count()}，LEVELING_WORKERS={LEVELING_WORKERS}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,250 @@
+"""
+結果建構基準測試：以分為單位的整數金額 vs. 舊版 Decimal / float 往返
+
+每個規模只求解一次（tight 模型、工期 → 成本），之後重複量測：
+- 結果建構：由求解後的變數值整理結果（_build_success_result）
+- 回應內容：build_result_payload
+- 寫入準備：optimization_results 金額欄位與排程打包的浮點數
+舊版作法（Decimal 成本、金額逐項 Decimal(str()) / float() 往返、違約金與獎金不捨入）
+於本檔重新實作以供對照。作業成本刻意帶有角、分，並以多組違約金率與目標工期統計：
+- 回應≠資料庫：回應的金額與寫入 DECIMAL(15, 2) 欄位後的值不同
+- 總額不符：資料庫中的總成本 ≠ 直接 + 間接 + 違約金 − 獎金
+- 排程合計不符：資料庫中各作業排程成本合計 ≠ 直接成本
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_result_construction [作業數 ...]
+"""
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+# 量測實際計算時間，停用共用產物快取（須在匯入 app 模組前設定）
+os.environ["ARTIFACT_CACHE_DIR"] = ""
+
+from pydantic_core import to_jsonable_python
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer
+from app.utils.money import RESULT_MONEY_FIELDS, from_minor, minor_to_float, to_minor
+from app.utils.result_format import build_result_payload
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = [1000, 5000]
+REPEAT = 20
+PENALTY_RATES = [Decimal(value) for value in ("0.0005", "0.00137", "0.002", "0.0031", "0.0047")]
+INDIRECT_COST = Decimal("12345.67")
+
+# 舊版的作業物件：成本為由資料庫浮點數轉成的 Decimal
+LegacyActivity = namedtuple("LegacyActivity", "name normal_duration normal_cost crash_duration crash_cost")
+
+
+def _network(size):
+    """隨機網路，成本另加 1 ~ 99 分"""
+    activities, precedences = random_network(size, seed=size)
+    rng = random.Random(size)
+    priced = []
+    for act in activities:
+        normal_cost = act.normal_cost + rng.randint(1, 99)
+        crash_cost = normal_cost if act.crash_cost == act.normal_cost else act.crash_cost + rng.randint(1, 99)
+        priced.append(Activity(act.id, act.name, act.normal_duration, normal_cost, act.crash_duration, crash_cost))
+    return priced, precedences
+
+
+# ----------------------------------------------------------------------
+# 舊版作法
+# ----------------------------------------------------------------------
+
+def _legacy_rewards(duration, penalty_rate, contract_amount, contract_duration, target_duration):
+    penalty, bonus = Decimal("0.0"), Decimal("0.0")
+    if duration > target_duration:
+        penalty = min(penalty_rate * contract_amount * (duration - target_duration), contract_amount * Decimal("0.2"))
+    elif duration < target_duration:
+        bonus = (
+            contract_amount
+            * Decimal(str(target_duration - duration))
+            / Decimal(str(contract_duration))
+            * Decimal("0.05")
+        )
+        bonus = min(bonus, contract_amount * Decimal("0.01"))
+    return penalty, bonus
+
+
+def legacy_result(legacy, x, y, T, params):
+    """舊版 _build_success_result：Decimal 成本加總、逐項 Decimal(str()) 包裝"""
+    indirect_cost, penalty_rate, contract_amount, contract_duration, target_duration = params
+    optimal_duration = int(round(T.varValue))
+    crashed = {act_id: y[act_id].varValue > 0.5 for act_id in legacy}
+    direct = sum(act.crash_cost if crashed[act_id] else act.normal_cost for act_id, act in legacy.items())
+    indirect_amount = indirect_cost * optimal_duration
+    penalty, bonus = _legacy_rewards(optimal_duration, penalty_rate, contract_amount, contract_duration, target_duration)
+    total = Decimal(str(direct)) + indirect_amount + penalty - bonus
+    schedules = []
+    for act_id, act in legacy.items():
+        start = int(round(x[act_id].varValue))
+        duration = act.crash_duration if crashed[act_id] else act.normal_duration
+        schedules.append({
+            "activity_id": act_id,
+            "activity_name": act.name,
+            "start_time": start,
+            "end_time": start + duration,
+            "duration": duration,
+            "is_crashed": crashed[act_id],
+            "cost": Decimal(str(act.crash_cost if crashed[act_id] else act.normal_cost)),
+        })
+    return {
+        "status": "success",
+        "optimal_duration": optimal_duration,
+        "optimal_cost": Decimal(str(direct)),
+        "indirect_cost": indirect_amount,
+        "penalty_amount": penalty,
+        "bonus_amount": bonus,
+        "total_cost": total,
+        "calculation_time": 0.0,
+        "schedules": schedules,
+    }
+
+
+def legacy_payload(result, rows, precedences):
+    """舊版 build_result_payload：金額與作業資料列的浮點數逐項轉 Decimal 後序列化"""
+    def decimal(value):
+        return None if value is None else Decimal(str(value))
+
+    payload = {
+        "optimal_duration": result["optimal_duration"],
+        **{key: decimal(result[key]) for key in RESULT_MONEY_FIELDS},
+        "calculation_time": result["calculation_time"],
+        "status": result["status"],
+        "schedules": [{**s, "cost": decimal(s["cost"])} for s in result["schedules"]],
+        "activities": [
+            {**row, "normal_cost": decimal(row["normal_cost"]), "crash_cost": decimal(row["crash_cost"])}
+            for row in rows
+        ],
+        "precedences": [{"successor": s, "predecessor": p} for s, p in precedences],
+    }
+    return to_jsonable_python(payload)
+
+
+def legacy_persist(result):
+    return {key: float(result[key]) for key in RESULT_MONEY_FIELDS}, [float(s["cost"]) for s in result["schedules"]]
+
+
+def new_persist(result):
+    return {key: minor_to_float(result[key]) for key in RESULT_MONEY_FIELDS}, [minor_to_float(s["cost"]) for s in result["schedules"]]
+
+
+# ----------------------------------------------------------------------
+# 一致性檢查
+# ----------------------------------------------------------------------
+
+def _stored(value: float) -> Decimal:
+    """寫入 DECIMAL(15, 2) 欄位後的值"""
+    return Decimal(repr(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def mismatches(payload, persisted):
+    """回傳 (回應≠資料庫, 總額不符, 排程合計不符) 的 0 / 1 計數"""
+    amounts, costs = persisted
+    stored = {key: _stored(value) for key, value in amounts.items()}
+    response_differs = any(Decimal(payload[key]) != stored[key] for key in RESULT_MONEY_FIELDS)
+    total_differs = stored["total_cost"] != (
+        stored["optimal_cost"] + stored["indirect_cost"] + stored["penalty_amount"] - stored["bonus_amount"]
+    )
+    schedule_differs = sum(_stored(cost) for cost in costs) != stored["optimal_cost"]
+    return int(response_differs), int(total_differs), int(schedule_differs)
+
+
+def _timed(func):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - started) / REPEAT
+
+
+def main(sizes):
+    print(
+        f"{'作業數':>6} {'作法':<8} {'結果建構(ms)':>12} {'回應內容(ms)':>12} {'寫入準備(ms)':>12} "
+        f"{'回應≠資料庫':>10} {'總額不符':>8} {'排程合計不符':>12}"
+    )
+    for size in sizes:
+        activities, precedences = _network(size)
+        optimizer = BiddingOptimizer(activities, precedences, formulation="tight")
+        normal = optimizer._calculate_normal_duration()
+        contract_amount = sum(act.normal_cost for act in activities) * 13 // 10 + 17
+        duration = normal - 3
+        optimizer.solve_duration_to_cost(duration)
+        solved = optimizer._solved
+        x, y, T = solved["x"], solved["y"], solved["T"]
+
+        legacy = {
+            act.id: LegacyActivity(
+                act.name,
+                act.normal_duration,
+                Decimal(str(minor_to_float(act.normal_cost))),
+                act.crash_duration,
+                Decimal(str(minor_to_float(act.crash_cost))),
+            )
+            for act in activities
+        }
+        rows = [
+            {
+                "id": act.id,
+                "name": act.name,
+                "normal_duration": act.normal_duration,
+                "normal_cost": minor_to_float(act.normal_cost),
+                "crash_duration": act.crash_duration,
+                "crash_cost": minor_to_float(act.crash_cost),
+            }
+            for act in activities
+        ]
+
+        # 違約金率 × （逾期 / 提前）目標工期
+        variants = [(rate, target) for rate in PENALTY_RATES for target in (duration - 2, duration + 4)]
+
+        def new_params(rate, target):
+            return (to_minor(INDIRECT_COST), "rate", None, rate, contract_amount, normal, target)
+
+        def old_params(rate, target):
+            return (INDIRECT_COST, rate, from_minor(contract_amount), normal, target)
+
+        def new_result(rate, target):
+            return optimizer._build_success_result(x, y, T, *new_params(rate, target), 0.0)
+
+        def new_payload(result):
+            return build_result_payload("s", "r", result, {}, activities, precedences, None)
+
+        rate, target = variants[0]
+        cases = {
+            "整數分": (
+                lambda: new_result(rate, target),
+                new_payload,
+                new_persist,
+                lambda rate, target: new_result(rate, target),
+            ),
+            "舊版": (
+                lambda: legacy_result(legacy, x, y, T, old_params(rate, target)),
+                lambda result: legacy_payload(result, rows, precedences),
+                legacy_persist,
+                lambda rate, target: legacy_result(legacy, x, y, T, old_params(rate, target)),
+            ),
+        }
+        for label, (build, payload_of, persist, build_variant) in cases.items():
+            result = build()
+            build_time = _timed(build)
+            payload_time = _timed(lambda: payload_of(result))
+            persist_time = _timed(lambda: persist(result))
+            counts = [0, 0, 0]
+            for variant in variants:
+                variant_result = build_variant(*variant)
+                for index, flag in enumerate(mismatches(payload_of(variant_result), persist(variant_result))):
+                    counts[index] += flag
+            print(
+                f"{size:>6} {label:<8} {build_time * 1000:>12.1f} {payload_time * 1000:>12.1f} "
+                f"{persist_time * 1000:>12.2f} {counts[0]:>7}/{len(variants)} {counts[1]:>5}/{len(variants)} "
+                f"{counts[2]:>9}/{len(variants)}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,156 @@
+"""
+結果輸出格式基準測試：比較 Pydantic 模型、直接組字典 JSON、NDJSON 與 Arrow IPC
+的序列化時間與輸出大小
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_result_formats [作業數 ...]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.models.bidding_optimizer import Activity
+from app.schemas.optimization import (
+    ActivityInfo,
+    ActivitySchedule,
+    OptimizationData,
+    OptimizationResult,
+    PrecedenceInfo,
+)
+from app.utils.money import from_minor, result_amounts, to_minor
+from app.utils.result_format import (
+    arrow_available,
+    arrow_stream,
+    build_result_payload,
+    ndjson_stream,
+    render_result,
+)
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = [1000, 5000, 20000]
+REPEAT = 3
+
+
+def _fake_result(size):
+    """產生不經求解的假結果（排程取正常工期的 CPM 時間，金額以分計）"""
+    activities, precedences = random_network(size, seed=size)
+    ids = {act.id: str(uuid.UUID(int=index + 1)) for index, act in enumerate(activities)}
+    activities = [
+        Activity(ids[act.id], act.name, act.normal_duration, act.normal_cost, act.crash_duration, act.crash_cost)
+        for act in activities
+    ]
+    schedules = []
+    start = 0
+    for index, act in enumerate(activities):
+        crashed = index % 3 == 0
+        duration = act.crash_duration if crashed else act.normal_duration
+        schedules.append(
+            {
+                "activity_id": act.id,
+                "activity_name": act.name,
+                "start_time": start,
+                "end_time": start + duration,
+                "duration": duration,
+                "is_crashed": crashed,
+                "cost": act.crash_cost if crashed else act.normal_cost,
+            }
+        )
+        start += index % 2
+    result = {
+        "status": "success",
+        "optimal_duration": start + 20,
+        "optimal_cost": to_minor(123456789),
+        "indirect_cost": 0,
+        "penalty_amount": 0,
+        "bonus_amount": 0,
+        "total_cost": to_minor(123456789),
+        "calculation_time": 1.0,
+        "schedules": schedules,
+    }
+    precedence_pairs = [(ids[succ], ids[pred]) for succ, pred in precedences]
+    params = {
+        "mode": "duration_to_cost",
+        "budget_constraint": None,
+        "duration_constraint": start + 20,
+        "indirect_cost": Decimal("0"),
+        "penalty_type": "rate",
+        "penalty_amount": None,
+        "penalty_rate": Decimal("0.001"),
+        "contract_amount": Decimal("0"),
+        "contract_duration": None,
+        "target_duration": None,
+        "formulation": "standard",
+    }
+    return result, params, activities, precedence_pairs
+
+
+def _pydantic(result, params, activities, precedences):
+    """原本的作法：逐列建立 Pydantic 模型後序列化"""
+    result = result_amounts(result)
+    model = OptimizationResult(
+        scenario_id=uuid.uuid4(),
+        result_id=uuid.uuid4(),
+        optimal_duration=result["optimal_duration"],
+        optimal_cost=result["optimal_cost"],
+        indirect_cost=result["indirect_cost"],
+        penalty_amount=result["penalty_amount"],
+        bonus_amount=result["bonus_amount"],
+        total_cost=result["total_cost"],
+        calculation_time=result["calculation_time"],
+        status=result["status"],
+        error_message=None,
+        schedules=[ActivitySchedule(**s) for s in result["schedules"]],
+        created_at=datetime.now(timezone.utc),
+        optimization_data=OptimizationData(**params),
+        activities=[
+            ActivityInfo(
+                id=act.id,
+                name=act.name,
+                normal_duration=act.normal_duration,
+                normal_cost=from_minor(act.normal_cost),
+                crash_duration=act.crash_duration,
+                crash_cost=from_minor(act.crash_cost),
+            )
+            for act in activities
+        ],
+        precedences=[PrecedenceInfo(successor=s, predecessor=p) for s, p in precedences],
+    )
+    return model.model_dump_json().encode("utf-8")
+
+
+def _payload(result, params, activities, precedences):
+    return build_result_payload(
+        uuid.uuid4(), uuid.uuid4(), result, params, activities, precedences, datetime.now(timezone.utc)
+    )
+
+
+def _timed(func):
+    best, output = None, None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        output = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(output)
+
+
+def main(sizes):
+    print(f"{'作業數':>7} {'格式':<16} {'時間(毫秒)':>11} {'大小(KB)':>10}")
+    for size in sizes:
+        args = _fake_result(size)
+        cases = [
+            ("pydantic+json", lambda: _pydantic(*args)),
+            ("dict+json", lambda: render_result(_payload(*args), "json").body),
+            ("ndjson", lambda: b"".join(ndjson_stream(_payload(*args)))),
+        ]
+        if arrow_available():
+            cases.append(("arrow", lambda: b"".join(arrow_stream(_payload(*args)))))
+        for name, func in cases:
+            elapsed, length = _timed(func)
+            print(f"{size:>7} {name:<16} {elapsed * 1000:>11.1f} {length / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,62 @@
+"""
+滾動式重新優化基準測試：比較完整模型與只對剩餘網路建模的求解時間
+
+以完整模型的最優排程模擬實際進度，在不同資料日期重新優化同一個工期目標。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_rolling_horizon [作業數]
+"""
+import sys
+import time
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.models.rolling_horizon import RollingHorizonOptimizer
+from app.utils.money import minor_to_float
+from benchmarks.common import random_network
+
+DEFAULT_SIZE = 300
+
+
+def _progress_at(schedules, status_date):
+    """以排程模擬資料日期當時的實際進度"""
+    progress = {}
+    for schedule in schedules:
+        if schedule["end_time"] <= status_date:
+            progress[schedule["activity_id"]] = {
+                "actual_start": schedule["start_time"],
+                "actual_finish": schedule["end_time"],
+            }
+        elif schedule["start_time"] <= status_date:
+            progress[schedule["activity_id"]] = {
+                "actual_start": schedule["start_time"],
+                "percent_complete": 100.0 * (status_date - schedule["start_time"]) / schedule["duration"],
+            }
+    return progress
+
+
+def main(size):
+    activities, precedences = random_network(size, seed=size)
+    full = BiddingOptimizer(activities, precedences, formulation="tight")
+    duration = (full._calculate_min_duration() + full._calculate_normal_duration()) // 2
+
+    started = time.perf_counter()
+    baseline = full.solve_duration_to_cost(duration)
+    full_time = time.perf_counter() - started
+    print(f"作業數 {size}，工期目標 {duration} 天，完整模型 {full_time:.3f} 秒")
+
+    print(f"{'資料日期':>8} {'剩餘作業':>8} {'重新優化(秒)':>12} {'總成本':>14}")
+    for fraction in (0.25, 0.5, 0.75):
+        status_date = int(duration * fraction)
+        progress = _progress_at(baseline["schedules"], status_date)
+        started = time.perf_counter()
+        optimizer = RollingHorizonOptimizer(
+            activities, precedences, progress, status_date, formulation="tight"
+        )
+        result = optimizer.solve_duration_to_cost(duration)
+        elapsed = time.perf_counter() - started
+        cost = f"{minor_to_float(result['total_cost']):>14,.0f}" if result["status"] == "success" else result["status"]
+        print(f"{status_date:>8} {len(optimizer.activities):>8} {elapsed:>12.3f} {cost}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
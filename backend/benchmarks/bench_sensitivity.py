@@ -0,0 +1,90 @@
+"""
+參數敏感度分析基準測試：違約金率 × 間接成本 × 目標工期格點
+
+比較三種做法的求解次數與耗時：
+- 逐格求解：每個格點各建一次模型求解（預算 → 工期）
+- 完整曲線：先算出整條權衡曲線（求解次數等於轉折點數），格點由曲線查表
+- 敏感度分析：SensitivitySweep 只在需要時以二分法補齊曲線的局部
+
+逐格求解的耗時以前 SAMPLE_CELLS 格的平均推估整個格點，並確認敏感度分析
+的最優工期與逐格求解相同。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_sensitivity [作業數 ...]
+"""
+import os
+import sys
+import time
+from decimal import Decimal
+
+# 不使用共用產物快取，各做法都從頭計算（須在匯入 app 模組前設定）
+os.environ["ARTIFACT_CACHE_DIR"] = ""
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.models.sensitivity import SensitivitySweep
+from app.utils.money import to_minor
+from benchmarks.common import random_network
+
+DEFAULT_SIZES = [30, 100, 300]
+PENALTY_RATES = [Decimal(value) for value in ("0", "0.0005", "0.001", "0.002", "0.005")]
+INDIRECT_COSTS = [to_minor(value) for value in (0, 5000, 10000, 20000, 40000, 80000)]
+TARGET_OFFSETS = (-0.2, -0.1, 0.0, 0.1, 0.2)
+SAMPLE_CELLS = 6
+FORMULATION = "tight"
+
+
+def _grid(optimizer, activities):
+    normal = optimizer._calculate_normal_duration()
+    crash = optimizer._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    middle = (normal + crash) // 2
+    targets = sorted({max(1, int(middle * (1 + offset))) for offset in TARGET_OFFSETS})
+    # 預算約可負擔一半的趕工追加成本與中間工期的間接成本
+    crash_extra = sum(act.crash_cost - act.normal_cost for act in activities)
+    budget = normal_cost + crash_extra // 2 + INDIRECT_COSTS[2] * middle
+    return budget, targets, dict(contract_amount=normal_cost * 13 // 10, contract_duration=normal)
+
+
+def main(sizes):
+    cells = len(PENALTY_RATES) * len(INDIRECT_COSTS) * len(TARGET_OFFSETS)
+    print(f"格點：{len(PENALTY_RATES)} 違約金率 × {len(INDIRECT_COSTS)} 間接成本 × {len(TARGET_OFFSETS)} 目標工期 = {cells}")
+    print(
+        f"{'作業數':>6} {'逐格(秒,推估)':>13} {'曲線轉折點':>10} {'完整曲線(秒)':>12} "
+        f"{'分析求解數':>10} {'分析(秒)':>9} {'省下求解':>8}"
+    )
+    for size in sizes:
+        activities, precedences = random_network(size, seed=size)
+        optimizer = BiddingOptimizer(activities, precedences, formulation=FORMULATION)
+        budget, targets, contract = _grid(optimizer, activities)
+
+        started = time.perf_counter()
+        sweep = SensitivitySweep(optimizer)
+        result = sweep.sweep(
+            "budget_to_duration", PENALTY_RATES, INDIRECT_COSTS, targets, budget=budget, **contract
+        )
+        sweep_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        curve = BiddingOptimizer(activities, precedences, formulation=FORMULATION).compute_tradeoff_curve()
+        curve_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for cell in result["cells"][:SAMPLE_CELLS]:
+            reference = BiddingOptimizer(activities, precedences, formulation=FORMULATION).solve_budget_to_duration(
+                budget,
+                indirect_cost=cell["indirect_cost"],
+                penalty_rate=cell["penalty_rate"],
+                target_duration=cell["target_duration"],
+                **contract,
+            )
+            assert reference.get("optimal_duration") == cell.get("optimal_duration"), (cell, reference)
+        per_cell = (time.perf_counter() - started) / SAMPLE_CELLS
+
+        print(
+            f"{size:>6} {per_cell * result['cell_count']:>13.2f} {len(curve):>10} {curve_time:>12.2f} "
+            f"{result['solve_count']:>10} {sweep_time:>9.2f} {result['skipped_solves']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
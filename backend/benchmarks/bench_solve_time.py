@@ -0,0 +1,98 @@
+"""
+求解時間預測基準測試：訓練預測器並比較先到先服務（FIFO）與最短預測時間優先（SJF）
+
+以不同大小與參數的隨機網路求解取得歷史資料，前 2/3 訓練、後 1/3 驗證，
+再以驗證集的實際求解時間模擬單一求解名額下所有請求同時到達時的平均完成時間。
+
+執行方式（於 backend/ 目錄）：
+    python -m benchmarks.bench_solve_time [求解次數]
+"""
+import math
+import random
+import sys
+import time
+from decimal import Decimal
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.models.solve_time import SolveTimePredictor, model_features
+from app.utils.money import to_minor
+from benchmarks.common import random_network
+
+DEFAULT_RUNS = 60
+
+
+def _sample(rng, index):
+    """以隨機參數求解一次，回傳 (特徵, 實際秒數)"""
+    size = rng.choice((20, 40, 80, 150, 250, 400))
+    formulation = rng.choice(("standard", "tight"))
+    mode = rng.choice(("budget_to_duration", "duration_to_cost"))
+    activities, precedences = random_network(size, seed=index)
+    optimizer = BiddingOptimizer(activities, precedences, formulation=formulation)
+    min_duration = optimizer._calculate_min_duration()
+    normal_duration = optimizer._calculate_normal_duration()
+    target = (min_duration + normal_duration) // 2
+    penalty = rng.random() < 0.5
+    options = dict(
+        indirect_cost=to_minor(20000),
+        penalty_type="rate",
+        penalty_rate=Decimal("0.001") if penalty else None,
+        contract_amount=to_minor(10000000),
+        target_duration=target if penalty else None,
+    )
+
+    started = time.perf_counter()
+    if mode == "budget_to_duration":
+        # 正常成本加上一半的趕工增額，讓預算約束實際發揮作用
+        direct = sum(act.normal_cost + (act.crash_cost - act.normal_cost) // 2 for act in activities)
+        budget = direct + to_minor(20000) * normal_duration
+        optimizer.solve_budget_to_duration(budget, **options)
+    else:
+        optimizer.solve_duration_to_cost(target, **options)
+    elapsed = time.perf_counter() - started
+
+    features = model_features(
+        activity_count=size,
+        precedence_count=len(precedences),
+        crashable_count=sum(1 for act in activities if act.crash_duration < act.normal_duration),
+        mode=mode,
+        penalty_active=penalty,
+        formulation=formulation,
+    )
+    return features, elapsed
+
+
+def _mean_completion(times):
+    clock = total = 0.0
+    for seconds in times:
+        clock += seconds
+        total += clock
+    return total / len(times)
+
+
+def main(runs):
+    rng = random.Random(runs)
+    samples = [_sample(rng, index) for index in range(runs)]
+    split = runs * 2 // 3
+    train, holdout = samples[:split], samples[split:]
+
+    default = SolveTimePredictor()
+    trained = SolveTimePredictor()
+    trained.fit(train)
+
+    def median_error(predictor):
+        errors = sorted(abs(math.log(predictor.predict(f)) - math.log(max(s, 1e-3))) for f, s in holdout)
+        return math.exp(errors[len(errors) // 2])
+
+    print(f"求解 {runs} 次（訓練 {len(train)}、驗證 {len(holdout)}）")
+    print(f"預測誤差中位數（倍數）：預設係數 {median_error(default):.2f}x，訓練後 {median_error(trained):.2f}x")
+
+    actual = [seconds for _, seconds in holdout]
+    by_prediction = [seconds for _, seconds in sorted(holdout, key=lambda item: trained.predict(item[0]))]
+    print(f"{'排程方式':<12} {'平均完成時間(秒)':>16}")
+    print(f"{'FIFO':<12} {_mean_completion(actual):>16.3f}")
+    print(f"{'SJF（預測）':<12} {_mean_completion(by_prediction):>16.3f}")
+    print(f"{'SJF（理想）':<12} {_mean_completion(sorted(actual)):>16.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS)
@@ -0,0 +1,93 @@
+"""
+基準測試共用工具：產生可重現的隨機作業網路
+"""
+import random
+from typing import List, Tuple
+
+from app.models.bidding_optimizer import Activity
+from app.utils.money import to_minor
+
+
+def random_network(
+    activity_count: int, seed: int = 0, layer_width: int = 8, max_predecessors: int = 3
+) -> Tuple[List[Activity], List[Tuple[str, str]]]:
+    """產生分層的隨機作業網路
+
+    作業依序分成寬度約 layer_width 的層，每個作業隨機連到前幾層的
+    1 ~ max_predecessors 個作業，並刻意加入部分跨層的遞移邊，
+    貼近實際投標網路中重複登錄前置關係的情況。
+
+    Returns:
+        (activities, precedences)
+    """
+    rng = random.Random(seed)
+    activities: List[Activity] = []
+    precedences: List[Tuple[str, str]] = []
+    layers: List[List[str]] = []
+
+    for index in range(activity_count):
+        if index % layer_width == 0:
+            layers.append([])
+        act_id = f"A{index:05d}"
+        normal_duration = rng.randint(3, 20)
+        crash_duration = max(1, normal_duration - rng.randint(0, normal_duration // 2))
+        normal_cost = to_minor(rng.randint(50, 500) * 1000)
+        crash_cost = normal_cost + to_minor(
+            (normal_duration - crash_duration) * rng.randint(5, 40) * 1000
+        )
+        activities.append(
+            Activity(act_id, f"作業 {index}", normal_duration, normal_cost, crash_duration, crash_cost)
+        )
+
+        if len(layers) > 1:
+            candidates = [aid for layer in layers[-4:-1] for aid in layer]
+            for pred_id in rng.sample(candidates, min(len(candidates), rng.randint(1, max_predecessors))):
+                precedences.append((act_id, pred_id))
+        layers[-1].append(act_id)
+
+    return activities, precedences
+
+
+def phased_network(
+    phase_count: int, phase_size: int, seed: int = 0
+) -> Tuple[List[Activity], List[Tuple[str, str]]]:
+    """產生以里程碑串接的多階段網路（可被串聯分解）
+
+    每個階段為一個 random_network，階段之間以一個里程碑作業相接：
+    里程碑在前一階段全部作業之後、下一階段全部作業之前。
+
+    Returns:
+        (activities, precedences)
+    """
+    activities: List[Activity] = []
+    precedences: List[Tuple[str, str]] = []
+    milestone_id = None
+
+    for phase in range(phase_count):
+        phase_activities, phase_precedences = random_network(phase_size, seed=seed * 1000 + phase)
+        prefix = f"P{phase:03d}-"
+        for act in phase_activities:
+            act.id = prefix + act.id
+        precedences.extend((prefix + succ, prefix + pred) for succ, pred in phase_precedences)
+        activities.extend(phase_activities)
+
+        has_successor = {pred for _, pred in phase_precedences}
+        has_predecessor = {succ for succ, _ in phase_precedences}
+        if milestone_id is not None:
+            precedences.extend(
+                (prefix + act_id, milestone_id)
+                for act_id in (act.id[len(prefix):] for act in phase_activities)
+                if act_id not in has_predecessor
+            )
+        if phase < phase_count - 1:
+            milestone_id = f"M{phase:03d}"
+            activities.append(
+                Activity(milestone_id, f"里程碑 {phase}", 1, to_minor(10000), 1, to_minor(10000))
+            )
+            precedences.extend(
+                (milestone_id, prefix + act_id)
+                for act_id in (act.id[len(prefix):] for act in phase_activities)
+                if act_id not in has_successor
+            )
+
+    return activities, precedences
@@ -0,0 +1 @@
+# 端對端負載測試（於 backend/ 目錄執行：python -m loadtest.run）
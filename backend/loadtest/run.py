@@ -0,0 +1,270 @@
+"""
+API 端對端負載測試
+對 uvicorn 執行中的後端送出混合的 CRUD 與優化流量，輸出各端點的
+p50 / p95 / p99 延遲與每秒請求數。
+
+未指定 --base-url 時，自動以 SUPABASE_BACKEND=local（本機 SQLite 替身）啟動
+uvicorn，不需要 Supabase 專案；指定時則對既有服務（例如 staging）施壓。
+
+執行方式（於 backend/ 目錄）：
+    python -m loadtest.run [--duration 30] [--concurrency 16] [--projects 5] [--activities 40]
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+# 流量組成：(端點名稱, 權重)
+TRAFFIC_MIX = (
+    ("GET /projects", 20),
+    ("GET /projects/{id}", 15),
+    ("GET /projects/{id}/activities", 25),
+    ("GET /activities/{id}", 10),
+    ("GET /activities/{id}/predecessors", 5),
+    ("POST /projects/{id}/activities", 4),
+    ("PUT /activities/{id}", 4),
+    ("POST /optimize", 10),
+    ("GET /scenarios/{id}/results", 7),
+)
+
+# 單一作業的正常成本上限
+MAX_NORMAL_COST = 500_000
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_server(workers: int) -> Tuple[subprocess.Popen, str, Optional[str]]:
+    """以本機資料後端啟動 uvicorn，回傳 (行程, base_url, 測試後要刪除的 SQLite 檔案)"""
+    port = _free_port()
+    env = dict(os.environ, SUPABASE_BACKEND="local")
+    temporary_database = None
+    # 多個 worker 需共用同一個 SQLite 檔案
+    if workers > 1 and env.get("SUPABASE_LOCAL_PATH", ":memory:") == ":memory:":
+        temporary_database = os.path.join(os.getcwd(), f".loadtest-{port}.sqlite3")
+        env["SUPABASE_LOCAL_PATH"] = temporary_database
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url, temporary_database
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn 未能在 30 秒內啟動")
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random, concurrency: int):
+        self.client = client
+        self.rng = rng
+        self.concurrency = concurrency
+        self.projects: List[str] = []
+        self.activities: Dict[str, List[str]] = {}
+        self.budgets: Dict[str, Tuple[float, float]] = {}
+        self.scenarios: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # 測試資料
+    # ------------------------------------------------------------------
+
+    def _activity_body(self, index: int, candidates: List[str]) -> Dict:
+        normal_duration = self.rng.randint(3, 20)
+        crash_duration = max(1, normal_duration - self.rng.randint(0, normal_duration // 2))
+        normal_cost = self.rng.randint(50, MAX_NORMAL_COST // 1000) * 1000
+        crash_cost = normal_cost + (normal_duration - crash_duration) * self.rng.randint(5, 40) * 1000
+        return {
+            "name": f"作業 {index}",
+            "normal_duration": normal_duration,
+            "normal_cost": normal_cost,
+            "crash_duration": crash_duration,
+            "crash_cost": crash_cost,
+            "predecessor_ids": self.rng.sample(candidates, min(len(candidates), self.rng.randint(1, 3))),
+        }
+
+    async def seed(self, project_count: int, activity_count: int) -> None:
+        """建立測試專案與分層的作業網路"""
+        for p in range(project_count):
+            response = await self.client.post("/api/projects", json={"name": f"負載測試專案 {p}"})
+            response.raise_for_status()
+            project_id = response.json()["id"]
+            ids: List[str] = []
+            normal_total = crash_total = 0.0
+            for index in range(activity_count):
+                body = self._activity_body(index, ids[-16:-4])
+                response = await self.client.post(f"/api/projects/{project_id}/activities", json=body)
+                response.raise_for_status()
+                ids.append(response.json()["id"])
+                normal_total += body["normal_cost"]
+                crash_total += body["crash_cost"]
+            self.projects.append(project_id)
+            self.activities[project_id] = ids
+            self.budgets[project_id] = (normal_total, crash_total)
+
+    # ------------------------------------------------------------------
+    # 請求
+    # ------------------------------------------------------------------
+
+    async def _request(self, name: str) -> None:
+        rng = self.rng
+        project_id = rng.choice(self.projects)
+        activity_id = rng.choice(self.activities[project_id])
+        if name == "GET /projects":
+            call = self.client.get("/api/projects")
+        elif name == "GET /projects/{id}":
+            call = self.client.get(f"/api/projects/{project_id}")
+        elif name == "GET /projects/{id}/activities":
+            call = self.client.get(f"/api/projects/{project_id}/activities")
+        elif name == "GET /activities/{id}":
+            call = self.client.get(f"/api/activities/{activity_id}")
+        elif name == "GET /activities/{id}/predecessors":
+            call = self.client.get(f"/api/activities/{activity_id}/predecessors")
+        elif name == "POST /projects/{id}/activities":
+            # 新作業接在現有網路之後，不影響其他作業
+            body = self._activity_body(len(self.activities[project_id]), self.activities[project_id][-8:])
+            call = self.client.post(f"/api/projects/{project_id}/activities", json=body)
+            # 送出前就提高預算區間，與此作業並行的優化請求才不會因預算不足而失敗
+            normal_total, crash_total = self.budgets[project_id]
+            self.budgets[project_id] = (normal_total + body["normal_cost"], crash_total + body["crash_cost"])
+        elif name == "PUT /activities/{id}":
+            call = self.client.put(f"/api/activities/{activity_id}", json={"description": f"更新 {time.time():.3f}"})
+        elif name == "POST /optimize":
+            normal_total, crash_total = self.budgets[project_id]
+            # 預留並行新增作業的成本：伺服器可能先處理其他連線新增的作業才讀取網路
+            headroom = MAX_NORMAL_COST * self.concurrency
+            budget = math.ceil((rng.uniform(normal_total, crash_total) + headroom) / 1000) * 1000
+            call = self.client.post("/api/optimize", json={
+                "project_id": project_id,
+                "mode": "budget_to_duration",
+                "budget_constraint": budget,
+            })
+        else:  # GET /scenarios/{id}/results
+            if not self.scenarios:
+                return
+            call = self.client.get(f"/api/scenarios/{rng.choice(self.scenarios)}/results")
+
+        started = time.perf_counter()
+        try:
+            response = await call
+            elapsed = time.perf_counter() - started
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return
+        self.latencies[name].append(elapsed)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            self.error_samples.setdefault(name, f"{response.status_code} {response.text[:200]}")
+        elif name == "POST /projects/{id}/activities":
+            self.activities[project_id].append(response.json()["id"])
+        elif name == "POST /optimize":
+            self.scenarios.append(response.json()["scenario_id"])
+
+    async def worker(self, deadline: float) -> None:
+        names = [name for name, _ in TRAFFIC_MIX]
+        weights = [weight for _, weight in TRAFFIC_MIX]
+        while time.perf_counter() < deadline:
+            await self._request(self.rng.choices(names, weights)[0])
+
+    async def run(self, duration: float, concurrency: int) -> float:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """最近序位法百分位數"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(percent / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def report(test: LoadTest, elapsed: float) -> None:
+    print(f"{'端點':<36} {'請求數':>7} {'錯誤':>5} {'req/s':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+    all_latencies: List[float] = []
+    for name, _ in TRAFFIC_MIX:
+        values = sorted(test.latencies.get(name, []))
+        all_latencies.extend(values)
+        print(
+            f"{name:<36} {len(values):>7} {test.errors.get(name, 0):>5} {len(values) / elapsed:>8.1f} "
+            f"{_percentile(values, 50) * 1000:>9.1f} {_percentile(values, 95) * 1000:>9.1f} "
+            f"{_percentile(values, 99) * 1000:>9.1f}"
+        )
+    all_latencies.sort()
+    print(
+        f"{'合計':<36} {len(all_latencies):>7} {sum(test.errors.values()):>5} "
+        f"{len(all_latencies) / elapsed:>8.1f} {_percentile(all_latencies, 50) * 1000:>9.1f} "
+        f"{_percentile(all_latencies, 95) * 1000:>9.1f} {_percentile(all_latencies, 99) * 1000:>9.1f}"
+    )
+
+
+async def main_async(args, base_url: str) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        test = LoadTest(client, random.Random(args.seed), args.concurrency)
+        seed_started = time.perf_counter()
+        await test.seed(args.projects, args.activities)
+        print(
+            f"建立 {args.projects} 個專案、每個 {args.activities} 個作業"
+            f"（{time.perf_counter() - seed_started:.1f} 秒），開始 {args.duration:.0f} 秒、"
+            f"{args.concurrency} 個並行連線的負載測試"
+        )
+        elapsed = await test.run(args.duration, args.concurrency)
+        report(test, elapsed)
+        for name, sample in test.error_samples.items():
+            print(f"{name} 錯誤範例：{sample}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="API 端對端負載測試")
+    parser.add_argument("--base-url", help="既有服務的網址；未指定時以本機資料後端啟動 uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="自動啟動時的 uvicorn worker 數")
+    parser.add_argument("--duration", type=float, default=30, help="測試秒數")
+    parser.add_argument("--concurrency", type=int, default=16, help="並行連線數")
+    parser.add_argument("--projects", type=int, default=5, help="測試專案數")
+    parser.add_argument("--activities", type=int, default=40, help="每個專案的作業數")
+    parser.add_argument("--timeout", type=float, default=60, help="單一請求逾時秒數")
+    parser.add_argument("--seed", type=int, default=0, help="亂數種子")
+    args = parser.parse_args(argv)
+
+    process = temporary_database = None
+    base_url = args.base_url
+    if base_url is None:
+        process, base_url, temporary_database = start_local_server(args.workers)
+    try:
+        asyncio.run(main_async(args, base_url.rstrip("/")))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if temporary_database is not None:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(temporary_database + suffix):
+                    os.remove(temporary_database + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,36 @@
 FastAPI 主應用程式
 營造廠決策分析平台 - 後端 API
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import projects, activities, optimization
+from starlette.concurrency import run_in_threadpool
+from app.api import projects, activities, optimization, scenarios, reports, gantt, resources, debug
+from app.models import decomposition
+from app.utils import metrics, profiling, warmup
+from app.utils.solver_scheduler import solver_scheduler
+from app.utils.whatif_sessions import session_count
 import os
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """啟動時預熱求解器與資料庫連線（PuLP 與 Supabase 客戶端皆延遲載入），並建立平行求解的常駐行程池"""
+    decomposition.start_pool()
+    if warmup.WARMUP_MODE == "blocking":
+        await run_in_threadpool(warmup.warm_up)
+    else:
+        warmup.start_warm_up()
+    yield
+    decomposition.shutdown_pool()
+
+
 # 建立 FastAPI 應用程式實例
 app = FastAPI(
     title="營造廠決策分析平台 API",
     description="投標最佳化決策系統後端 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # 從環境變數讀取允許的前端來源
@@ -34,12 +54,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 列表分頁的下一頁游標
 )
 
 # 註冊路由
 app.include_router(projects.router, prefix="/api", tags=["專案管理"])
 app.include_router(activities.router, prefix="/api", tags=["作業管理"])
 app.include_router(optimization.router, prefix="/api", tags=["優化計算"])
+app.include_router(scenarios.router, prefix="/api", tags=["情境歷史"])
+app.include_router(reports.router, prefix="/api", tags=["報告匯出"])
+app.include_router(gantt.router, prefix="/api", tags=["甘特圖"])
+app.include_router(resources.router, prefix="/api", tags=["資源管理"])
+
+# 請求剖析：設定 PROFILING_TOKEN 時才註冊中介層與除錯路由，未啟用時沒有額外負擔
+if profiling.PROFILING_TOKEN:
+    app.add_middleware(profiling.ProfilingMiddleware)
+    app.include_router(debug.router, prefix="/api", tags=["除錯"])
 
 
 @app.get("/")
@@ -53,3 +83,20 @@ async def health_check():
     """健康檢查端點"""
     return {"status": "healthy"}
 
+
+@app.get("/warmup")
+async def run_warm_up():
+    """預熱求解器與資料庫連線，回傳各步驟耗時（可作為平台的啟動探針）"""
+    return await run_in_threadpool(warmup.warm_up)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """本 worker 的請求統計（例如 optimize_coalesced：合併到其他請求結果的優化請求數）、求解排程器狀態與常駐 what-if 工作階段數"""
+    return {
+        "counters": metrics.snapshot(),
+        "optimize_inflight": optimization.optimize_flight.inflight_count(),
+        "solver": solver_scheduler.stats(),
+        "whatif_sessions": session_count(),
+        "warmup": warmup.last_warm_up()
+    }
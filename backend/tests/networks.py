@@ -0,0 +1,114 @@
+"""測試共用：可窮舉的小型隨機網路與窮舉最優解"""
+import itertools
+import random
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from app.models.bidding_optimizer import Activity, BiddingOptimizer
+from app.models.network import build_adjacency, critical_path_length, topological_order
+from app.utils.money import MINOR_UNITS
+
+
+def small_network(seed: int, size: int = 7) -> Tuple[List[Activity], List[Tuple[str, str]]]:
+    """作業數少到可窮舉所有趕工組合的隨機網路（含重複登錄的遞移前置關係）"""
+    rng = random.Random(seed)
+    activities = []
+    precedences = []
+    for index in range(size):
+        normal_duration = rng.randint(2, 9)
+        crash_duration = max(1, normal_duration - rng.randint(0, 4))
+        normal_cost = rng.randint(10, 90) * 1000
+        crash_cost = normal_cost + (normal_duration - crash_duration) * rng.randint(1, 30) * 100
+        activities.append(Activity(f"a{index}", f"作業 {index}", normal_duration, normal_cost, crash_duration, crash_cost))
+        for pred in rng.sample(range(index), min(index, rng.randint(0, 3))):
+            precedences.append((f"a{index}", f"a{pred}"))
+    return activities, precedences
+
+
+def random_params(seed: int, normal: int, crash: int, normal_cost: int) -> Dict:
+    """獎懲參數：刻意讓違約金上限（20%）與獎金上限（1%）都可能觸及"""
+    rng = random.Random(seed)
+    contract_amount = normal_cost * rng.randint(11, 16) // 10
+    return dict(
+        indirect_cost=rng.choice([0, 500, 3000]),
+        penalty_type="rate",
+        penalty_rate=Decimal(rng.choice(["0.001", "0.02", "0.08"])),
+        contract_amount=contract_amount,
+        contract_duration=rng.randint(max(normal // 2, 1), normal + 5),
+        target_duration=rng.randint(crash, normal + 2),
+    )
+
+
+def plans(activities: List[Activity], precedences: List[Tuple[str, str]]):
+    """所有趕工組合的 (趕工作業, 工期, 直接成本)"""
+    predecessors, successors = build_adjacency([act.id for act in activities], precedences)
+    order, _ = topological_order(predecessors, successors)
+    crashable = [act for act in activities if act.crash_duration < act.normal_duration]
+    for count in range(len(crashable) + 1):
+        for chosen in itertools.combinations(crashable, count):
+            crashed = {act.id for act in chosen}
+            durations = {
+                act.id: act.crash_duration if act.id in crashed else act.normal_duration for act in activities
+            }
+            makespan, _ = critical_path_length(durations, predecessors, order)
+            direct = sum(act.crash_cost if act.id in crashed else act.normal_cost for act in activities)
+            yield crashed, makespan, direct
+
+
+def _rewards(duration: int, params: Dict) -> Tuple[int, int]:
+    return BiddingOptimizer._calculate_rewards(
+        duration,
+        params["penalty_type"],
+        params.get("penalty_amount"),
+        params["penalty_rate"],
+        params["contract_amount"],
+        params["contract_duration"],
+        params["target_duration"],
+    )
+
+
+def brute_budget_to_duration(activities, precedences, budget: int, params: Dict) -> Optional[Tuple[int, int]]:
+    """預算 → 工期的窮舉最優解：(工期, 目標值)，無可行解時為 None"""
+    best = None
+    for _, makespan, direct in plans(activities, precedences):
+        if direct + params["indirect_cost"] * makespan > budget:
+            continue
+        penalty, bonus = _rewards(makespan, params)
+        value = MINOR_UNITS * makespan + penalty - bonus
+        if best is None or value < best[1]:
+            best = (makespan, value)
+    return best
+
+
+def brute_duration_to_cost(activities, precedences, duration: int, params: Dict) -> Optional[int]:
+    """工期 → 成本的窮舉最低總成本，無可行解時為 None"""
+    directs = [direct for _, makespan, direct in plans(activities, precedences) if makespan <= duration]
+    if not directs:
+        return None
+    penalty, bonus = _rewards(duration, params)
+    return min(directs) + params["indirect_cost"] * duration + penalty - bonus
+
+
+def phased_small_network(
+    seed: int, phase_count: int = 3, phase_size: int = 4
+) -> Tuple[List[Activity], List[Tuple[str, str]]]:
+    """以可趕工的里程碑作業串接數個小型網路（可被串聯分解）"""
+    rng = random.Random(seed)
+    activities: List[Activity] = []
+    precedences: List[Tuple[str, str]] = []
+    milestone_id = None
+    for phase in range(phase_count):
+        phase_activities, phase_precedences = small_network(seed * 100 + phase, phase_size)
+        prefix = f"p{phase}-"
+        for act in phase_activities:
+            act.id = prefix + act.id
+        precedences.extend((prefix + succ, prefix + pred) for succ, pred in phase_precedences)
+        activities.extend(phase_activities)
+        if milestone_id is not None:
+            precedences.extend((act.id, milestone_id) for act in phase_activities)
+        if phase < phase_count - 1:
+            milestone_id = f"m{phase}"
+            duration = rng.randint(2, 4)
+            activities.append(Activity(milestone_id, f"里程碑 {phase}", duration, 5000, duration - 1, 9000))
+            precedences.extend((milestone_id, act.id) for act in phase_activities)
+    return activities, precedences
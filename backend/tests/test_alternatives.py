@@ -0,0 +1,49 @@
+"""替代趕工方案：預算 → 工期的字典序最佳解與 no-good cut"""
+import pytest
+
+from app.models.bidding_optimizer import FORMULATIONS, BiddingOptimizer
+from networks import plans, random_params, small_network
+
+
+def _budget_case(seed, formulation):
+    activities, precedences = small_network(seed)
+    optimizer = BiddingOptimizer(activities, precedences, formulation=formulation)
+    normal = optimizer._calculate_normal_duration()
+    crash = optimizer._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    params = random_params(seed, normal, crash, normal_cost)
+    budget = normal_cost + params["indirect_cost"] * normal + 20000
+    return activities, precedences, optimizer, budget, params
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+@pytest.mark.parametrize("seed", range(15))
+def test_budget_base_is_cheapest_at_optimal_duration(formulation, seed):
+    activities, precedences, optimizer, budget, params = _budget_case(seed, formulation)
+    first = optimizer.solve_budget_to_duration(budget, **params)
+    assert first["status"] == "success"
+    base, alternatives = optimizer.solve_alternatives(first, 3)
+
+    duration = first["optimal_duration"]
+    assert base["optimal_duration"] == duration
+    cheapest = min(
+        direct
+        for _, makespan, direct in plans(activities, precedences)
+        if makespan <= duration and direct + params["indirect_cost"] * duration <= budget
+    )
+    assert base["optimal_cost"] == cheapest
+    for alternative in alternatives:
+        assert alternative["optimal_duration"] == duration
+        assert alternative["total_cost"] >= base["total_cost"]
+
+
+def test_alternatives_have_distinct_crash_sets():
+    activities, precedences, optimizer, budget, params = _budget_case(4, "standard")
+    base, alternatives = optimizer.solve_alternatives(optimizer.solve_budget_to_duration(budget, **params), 4)
+
+    def crashed(result):
+        return frozenset(s["activity_id"] for s in result["schedules"] if s["is_crashed"])
+
+    sets = [crashed(base)] + [crashed(alternative) for alternative in alternatives]
+    assert len(set(sets)) == len(sets)
+    assert [a["total_cost"] for a in alternatives] == sorted(a["total_cost"] for a in alternatives)
@@ -0,0 +1,93 @@
+"""網路分解：串聯區塊切分，以及分解求解與單一模型的結果比對"""
+import pytest
+
+from app.models.bidding_optimizer import FORMULATIONS, BiddingOptimizer
+from app.models.decomposition import DECOMPOSITION_MIN_ACTIVITIES, DecomposedOptimizer
+from app.models.network import series_blocks
+from app.utils.money import MINOR_UNITS
+from networks import phased_small_network, random_params
+
+
+def test_series_blocks_split_at_milestones():
+    ids = ["a", "b", "c", "m", "d", "e", "f"]
+    precedences = [("b", "a"), ("c", "a"), ("m", "b"), ("m", "c"), ("d", "m"), ("e", "m"), ("f", "d"), ("f", "e")]
+    assert series_blocks(ids, precedences) == [["a"], ["b", "c"], ["m"], ["d", "e"], ["f"]]
+
+
+def test_series_blocks_without_cut_is_single_block():
+    ids = ["a", "b", "c", "d"]
+    assert series_blocks(ids, [("c", "a"), ("d", "b")]) == [["a", "b", "c", "d"]]
+
+
+def test_series_blocks_with_cycle_is_single_block():
+    blocks = series_blocks(["a", "b", "c"], [("b", "a"), ("a", "b"), ("c", "b")])
+    assert len(blocks) == 1 and sorted(blocks[0]) == ["a", "b", "c"]
+
+
+def test_series_blocks_cover_phased_network():
+    activities, precedences = phased_small_network(0)
+    blocks = series_blocks((act.id for act in activities), precedences)
+    assert sorted(aid for block in blocks for aid in block) == sorted(act.id for act in activities)
+    assert ["m0"] in blocks and ["m1"] in blocks
+
+
+def test_auto_strategy_only_decomposes_tight_requests():
+    activities, precedences = phased_small_network(0, phase_count=2, phase_size=DECOMPOSITION_MIN_ACTIVITIES)
+    assert DecomposedOptimizer.from_network(activities, precedences, formulation="tight") is not None
+    assert DecomposedOptimizer.from_network(activities, precedences, formulation="standard") is None
+    assert (
+        DecomposedOptimizer.from_network(activities, precedences, formulation="standard", strategy="decomposition")
+        is not None
+    )
+
+
+def _case(seed, formulation):
+    activities, precedences = phased_small_network(seed)
+    monolithic = BiddingOptimizer(activities, precedences, formulation=formulation)
+    normal = monolithic._calculate_normal_duration()
+    crash = monolithic._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    params = random_params(seed, normal, crash, normal_cost)
+
+    def decomposed():
+        optimizer = DecomposedOptimizer.from_network(
+            activities, precedences, formulation=formulation, strategy="decomposition"
+        )
+        assert optimizer is not None
+        optimizer.max_workers = 1
+        return optimizer
+
+    return activities, precedences, normal, crash, normal_cost, params, decomposed
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+@pytest.mark.parametrize("seed", range(10))
+def test_decomposed_duration_to_cost_matches_monolithic(formulation, seed):
+    activities, precedences, normal, crash, _, params, decomposed = _case(seed, formulation)
+    duration = (normal + crash) // 2
+    expected = BiddingOptimizer(activities, precedences, formulation=formulation).solve_duration_to_cost(
+        duration, **params
+    )
+    result = decomposed().solve_duration_to_cost(duration, **params)
+    assert result["status"] == expected["status"]
+    assert result.get("total_cost") == expected.get("total_cost")
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+@pytest.mark.parametrize("seed", range(10))
+def test_decomposed_budget_to_duration_matches_monolithic(formulation, seed):
+    activities, precedences, normal, _, normal_cost, params, decomposed = _case(seed, formulation)
+    budget = normal_cost + params["indirect_cost"] * normal + (seed % 5) * 3000
+    expected = BiddingOptimizer(activities, precedences, formulation=formulation).solve_budget_to_duration(
+        budget, **params
+    )
+    result = decomposed().solve_budget_to_duration(budget, **params)
+    assert result["status"] == expected["status"]
+    if expected["status"] != "success":
+        return
+
+    def objective(res):
+        return MINOR_UNITS * res["optimal_duration"] + res["penalty_amount"] - res["bonus_amount"]
+
+    assert result["optimal_duration"] == expected["optimal_duration"]
+    assert objective(result) == objective(expected)
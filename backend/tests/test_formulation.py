@@ -0,0 +1,121 @@
+"""模型建構方式：standard / tight 與窮舉最優解比對，以及遞移化簡"""
+import random
+
+import pytest
+
+from app.models.bidding_optimizer import FORMULATIONS, BiddingOptimizer
+from app.models.network import build_adjacency, transitive_reduction
+from app.utils.money import MINOR_UNITS
+from networks import brute_budget_to_duration, brute_duration_to_cost, random_params, small_network
+
+SEEDS = range(30)
+
+
+def _case(seed):
+    activities, precedences = small_network(seed)
+    optimizer = BiddingOptimizer(activities, precedences)
+    normal = optimizer._calculate_normal_duration()
+    crash = optimizer._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    return activities, precedences, normal, crash, normal_cost, random_params(seed, normal, crash, normal_cost)
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_budget_to_duration_matches_brute_force(formulation, seed):
+    activities, precedences, normal, _, normal_cost, params = _case(seed)
+    budget = normal_cost + params["indirect_cost"] * normal + (seed % 5) * 3000
+    expected = brute_budget_to_duration(activities, precedences, budget, params)
+
+    result = BiddingOptimizer(activities, precedences, formulation=formulation).solve_budget_to_duration(
+        budget, **params
+    )
+    if expected is None:
+        assert result["status"] != "success"
+        return
+    assert result["status"] == "success"
+    duration, objective = expected
+    # 預算模式的最優工期可能有多組趕工組合，比對工期與目標值（工期與獎懲）
+    assert result["optimal_duration"] == duration
+    assert MINOR_UNITS * duration + result["penalty_amount"] - result["bonus_amount"] == objective
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_duration_to_cost_matches_brute_force(formulation, seed):
+    activities, precedences, normal, crash, _, params = _case(seed)
+    duration = (normal + crash) // 2
+    expected = brute_duration_to_cost(activities, precedences, duration, params)
+
+    result = BiddingOptimizer(activities, precedences, formulation=formulation).solve_duration_to_cost(
+        duration, **params
+    )
+    if expected is None:
+        assert result["status"] != "success"
+        return
+    assert result["status"] == "success"
+    assert result["total_cost"] == expected
+
+
+def test_early_finish_is_feasible_when_bonus_capped():
+    # 提前天數遠超過獎金上限時仍應可行，且獎金以上限（契約價金 1%）計
+    activities, precedences = small_network(3)
+    optimizer = BiddingOptimizer(activities, precedences)
+    crash = optimizer._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    for formulation in FORMULATIONS:
+        result = BiddingOptimizer(activities, precedences, formulation=formulation).solve_duration_to_cost(
+            crash,
+            indirect_cost=0,
+            penalty_type="fixed",
+            penalty_amount=1000,
+            penalty_rate=None,
+            contract_amount=normal_cost,
+            contract_duration=1,
+            target_duration=crash + 30,
+        )
+        assert result["status"] == "success"
+        assert result["bonus_amount"] == normal_cost // 100
+
+
+def _reachable(activity_ids, precedences):
+    predecessors, _ = build_adjacency(activity_ids, precedences)
+    closure = {}
+
+    def ancestors(aid):
+        if aid not in closure:
+            found = set()
+            for pred in predecessors[aid]:
+                found |= {pred} | ancestors(pred)
+            closure[aid] = found
+        return closure[aid]
+
+    return {aid: ancestors(aid) for aid in activity_ids}
+
+
+def test_transitive_reduction_removes_implied_edge():
+    ids = ["a", "b", "c", "d"]
+    precedences = [("b", "a"), ("c", "b"), ("c", "a"), ("d", "c"), ("d", "a"), ("d", "c")]
+    assert sorted(transitive_reduction(ids, precedences)) == [("b", "a"), ("c", "b"), ("d", "c")]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_transitive_reduction_is_minimal_and_preserves_order(seed):
+    rng = random.Random(seed)
+    ids = [f"a{index}" for index in range(25)]
+    precedences = [
+        (ids[succ], ids[pred]) for succ in range(len(ids)) for pred in range(succ) if rng.random() < 0.2
+    ]
+    reduced = transitive_reduction(ids, precedences)
+
+    assert set(reduced) <= set(precedences)
+    assert _reachable(ids, reduced) == _reachable(ids, precedences)
+    # 化簡後每條前置關係都不可再移除
+    for edge in reduced:
+        others = [other for other in reduced if other != edge]
+        assert edge[1] not in _reachable(ids, others)[edge[0]]
+
+
+def test_transitive_reduction_keeps_cycles():
+    ids = ["a", "b"]
+    assert sorted(transitive_reduction(ids, [("a", "b"), ("b", "a"), ("a", "b")])) == [("a", "b"), ("b", "a")]
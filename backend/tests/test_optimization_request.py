@@ -0,0 +1,41 @@
+"""優化請求驗證：決策模式所需的約束在進入求解排程前即被拒絕"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.api import optimization
+from app.schemas.optimization import OptimizationRequest
+
+PROJECT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"mode": "budget_to_duration"},
+        {"mode": "budget_to_duration", "duration_constraint": 30},
+        {"mode": "duration_to_cost"},
+        {"mode": "duration_to_cost", "budget_constraint": 1000},
+    ],
+)
+def test_missing_constraint_is_rejected(payload):
+    with pytest.raises(ValidationError):
+        OptimizationRequest(project_id=PROJECT_ID, **payload)
+
+
+def test_constraint_for_mode_is_accepted():
+    OptimizationRequest(project_id=PROJECT_ID, mode="budget_to_duration", budget_constraint=1000)
+    OptimizationRequest(project_id=PROJECT_ID, mode="duration_to_cost", duration_constraint=30)
+
+
+def test_optimize_rejects_before_loading_network(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("不應讀取網路或進入求解排程")
+
+    monkeypatch.setattr(optimization, "load_project_network", fail)
+    monkeypatch.setattr(optimization, "_run_optimization", fail)
+    app = FastAPI()
+    app.include_router(optimization.router, prefix="/api")
+    response = TestClient(app).post("/api/optimize", json={"project_id": PROJECT_ID, "mode": "duration_to_cost"})
+    assert response.status_code == 422
@@ -0,0 +1,82 @@
+"""列表分頁：鍵集分頁、游標往返與名稱搜尋的跳脫"""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.local_supabase import LocalSupabase
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page, search_pattern, split_page
+
+
+@pytest.fixture
+def client():
+    client = LocalSupabase(":memory:")
+    names = ["a_b", "axb", "100%", "1000", "back\\slash", "backslash", "Star*", "一般作業"]
+    rows = [
+        {
+            "id": str(uuid.UUID(int=index * 7919 % 97 + 1)),
+            # 每三筆共用同一個建立時間，驗證同時間的資料以主鍵排序不會跳過或重複
+            "created_at": f"2026-01-01T00:00:{index // 3:02d}+00:00",
+            "name": name,
+        }
+        for index, name in enumerate(names * 3)
+    ]
+    client.table("projects").insert(rows).execute()
+    client.rows = rows
+    return client
+
+
+def _pages(client, limit, desc):
+    seen, cursor = [], None
+    while True:
+        query = client.table("projects").select("*")
+        page, cursor = split_page(keyset_page(query, cursor, limit, desc=desc).execute().data, limit)
+        assert len(page) <= limit
+        seen.extend(page)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("limit", [1, 4, 5, 24, 100])
+def test_keyset_pages_cover_all_rows_once(client, limit, desc):
+    seen = _pages(client, limit, desc)
+    expected = sorted(client.rows, key=lambda row: (row["created_at"], row["id"]), reverse=desc)
+    assert [row["id"] for row in seen] == [row["id"] for row in expected]
+
+
+def test_last_page_has_no_cursor():
+    rows = [{"id": str(uuid.uuid4()), "created_at": "2026-01-01T00:00:00+00:00"}]
+    assert split_page(rows, 1) == (rows, None)
+
+
+def test_cursor_round_trip():
+    row = {"id": uuid.uuid4(), "created_at": "2026-01-01T00:00:00.123456+00:00"}
+    assert decode_cursor(encode_cursor(row)) == (row["created_at"], str(row["id"]))
+    other = {"scenario_id": str(uuid.uuid4()), "created_at": "2026-01-02T00:00:00Z"}
+    assert decode_cursor(encode_cursor(other, key="scenario_id")) == (other["created_at"], other["scenario_id"])
+
+
+# 依序為：非 base64、主鍵不是 UUID、內容為 {}
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor({"id": "x", "created_at": "2026-01-01"}), "e30"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "text, pattern",
+    [("a_b", "*a\\_b*"), ("100%", "*100\\%*"), ("back\\slash", "*back\\\\slash*"), ("Star*", "*Star*")],
+)
+def test_search_pattern_escapes_like_metacharacters(text, pattern):
+    assert search_pattern(text) == pattern
+
+
+@pytest.mark.parametrize(
+    "text, names",
+    [("a_b", {"a_b"}), ("100%", {"100%"}), ("back\\", {"back\\slash"}), ("star*", {"Star*"}), ("作業", {"一般作業"})],
+)
+def test_search_matches_literal_text(client, text, names):
+    rows = client.table("projects").select("name").ilike("name", search_pattern(text)).execute().data
+    assert {row["name"] for row in rows} == names
@@ -0,0 +1,42 @@
+"""預先計算：可由權衡曲線回答的請求，以及曲線與即時求解的結果比對"""
+import pytest
+
+from app.models.bidding_optimizer import BiddingOptimizer
+from app.models.decomposition import DecomposedOptimizer
+from app.utils.precompute import PRECOMPUTE_FORMULATION, answers_from_curve
+from networks import random_params, small_network
+
+
+def test_only_tight_requests_use_curve():
+    assert answers_from_curve("tight", "auto")
+    assert not answers_from_curve("standard", "auto")
+    assert not answers_from_curve("tight", "monolithic")
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_curve_answers_match_tight_solve(seed):
+    activities, precedences = small_network(seed)
+    solver = BiddingOptimizer(activities, precedences, formulation=PRECOMPUTE_FORMULATION)
+    normal = solver._calculate_normal_duration()
+    crash = solver._calculate_min_duration()
+    normal_cost = sum(act.normal_cost for act in activities)
+    params = random_params(seed, normal, crash, normal_cost)
+    curve = solver.compute_tradeoff_curve()
+
+    def from_curve():
+        return DecomposedOptimizer.from_curve(activities, precedences, curve, formulation=PRECOMPUTE_FORMULATION)
+
+    def live():
+        return BiddingOptimizer(activities, precedences, formulation=PRECOMPUTE_FORMULATION)
+
+    duration = (normal + crash) // 2
+    expected = live().solve_duration_to_cost(duration, **params)
+    answered = from_curve().solve_duration_to_cost(duration, **params)
+    assert answered["status"] == expected["status"]
+    assert answered.get("total_cost") == expected.get("total_cost")
+
+    budget = normal_cost + params["indirect_cost"] * normal + (seed % 5) * 3000
+    expected = live().solve_budget_to_duration(budget, **params)
+    answered = from_curve().solve_budget_to_duration(budget, **params)
+    assert answered["status"] == expected["status"]
+    assert answered.get("optimal_duration") == expected.get("optimal_duration")
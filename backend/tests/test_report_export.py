@@ -0,0 +1,75 @@
+"""報告匯出：排程分段讀取與 PDF 列數上限"""
+from app.utils import report_export, schedule_store
+from app.utils.local_supabase import LocalSupabase
+from app.utils.report_export import schedule_rows, summary_items, write_report
+
+
+def _schedules(count):
+    return [
+        {"activity_id": f"a{index}", "start_time": count - index, "end_time": count - index + 2,
+         "duration": 2, "is_crashed": index % 3 == 0, "cost": 1000 + index}
+        for index in range(count)
+    ]
+
+
+def _client(monkeypatch, activity_count):
+    """本機資料庫替身：專案、作業、情境與兩個優化結果（排程表的外鍵需要）"""
+    client = LocalSupabase(":memory:")
+    monkeypatch.setattr(schedule_store, "supabase", client)
+    client.table("projects").insert({"id": "p1", "name": "專案"}).execute()
+    client.table("project_activities").insert(
+        [{"id": f"a{index}", "project_id": "p1", "name": f"作業{index}"} for index in range(activity_count)]
+    ).execute()
+    client.table("bidding_scenarios").insert(
+        {"id": "s1", "project_id": "p1", "name": "情境", "mode": "duration_to_cost"}
+    ).execute()
+    client.table("optimization_results").insert(
+        [{"id": "r1", "scenario_id": "s1"}, {"id": "r2", "scenario_id": "s1"}]
+    ).execute()
+    return client
+
+
+def test_iter_schedules_reads_legacy_rows_in_chunks(monkeypatch):
+    client = _client(monkeypatch, 25)
+    rows = _schedules(25)
+    client.table("activity_schedules").insert(
+        [{"id": f"{index:04d}", "result_id": "r1", **row} for index, row in enumerate(rows)]
+    ).execute()
+    client.table("activity_schedules").insert({"id": "9999", "result_id": "r2", **rows[0]}).execute()
+
+    assert list(schedule_store.iter_schedules("r1", chunk_size=10)) == rows
+    assert list(schedule_store.iter_schedules("missing", chunk_size=10)) == []
+
+
+def test_iter_schedules_prefers_pack(monkeypatch):
+    client = _client(monkeypatch, 3)
+    client.table("activity_schedules").insert({"id": "0001", "result_id": "r1", **_schedules(1)[0]}).execute()
+    schedule_store.save_schedule_pack("r1", _schedules(3))
+    # 打包列的成本以元儲存
+    expected = [{**row, "cost": row["cost"] / 100} for row in _schedules(3)]
+    assert list(schedule_store.iter_schedules("r1")) == expected
+    assert schedule_store.load_schedules("r1") == expected
+
+
+def test_schedule_rows_sorted_by_start():
+    rows = schedule_rows(_schedules(5), {"a1": "作業一"})
+    assert [row[1] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[3][0] == "作業一" and rows[0][0] == "（已刪除）"
+
+
+def test_pdf_lists_at_most_max_rows(monkeypatch):
+    monkeypatch.setattr(report_export, "REPORT_PDF_MAX_ROWS", 30)
+    summary = summary_items({
+        "optimal_duration": 10, "optimal_cost": 1000, "indirect_cost": 0, "penalty_amount": 0,
+        "bonus_amount": 0, "total_cost": 1000, "calculation_time": 0.1,
+    })
+    capped = write_report("pdf", summary, schedule_rows(_schedules(500), {}))
+    full = write_report("pdf", summary, schedule_rows(_schedules(30), {}))
+    try:
+        with open(capped, "rb") as capped_file, open(full, "rb") as full_file:
+            capped_pages = capped_file.read().count(b"/Type /Page\n")
+            full_pages = full_file.read().count(b"/Type /Page\n")
+        assert capped_pages == full_pages
+    finally:
+        for path in (capped, full):
+            report_export.os.remove(path)
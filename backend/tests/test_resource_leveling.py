@@ -0,0 +1,39 @@
+"""資源平準化：零工期作業與固定開始時間的作業"""
+import pytest
+
+from app.models.resource_leveling import SGS_METHODS, ResourceLeveler
+
+
+@pytest.mark.parametrize("method", SGS_METHODS)
+def test_zero_duration_activity(method):
+    leveler = ResourceLeveler(
+        ["a", "b", "c"],
+        {"a": 3, "b": 0, "c": 2},
+        [("c", "b")],
+        {"r": 2},
+        {"a": {"r": 2}, "b": {"r": 1}, "c": {"r": 1}},
+    )
+    result = leveler.level(methods=(method,))
+    assert result["start_times"] == {"a": 0, "b": 0, "c": 3}
+    assert result["makespan"] == 5
+    assert result["usage"][:, 0].tolist() == [2, 2, 2, 1, 1]
+
+
+@pytest.mark.parametrize("method", SGS_METHODS)
+def test_fixed_activities_keep_actual_start(method):
+    # a、b 已開工（b 為已完成的零工期作業），其餘作業不早於資料日期 4 開始
+    leveler = ResourceLeveler(
+        ["a", "b", "c", "d"],
+        {"a": 5, "b": 0, "c": 2, "d": 4},
+        [("c", "a"), ("d", "b")],
+        {"r": 2},
+        {"a": {"r": 2}, "b": {"r": 1}, "c": {"r": 1}, "d": {"r": 2}},
+        fixed_starts={"a": 1, "b": 0},
+        release=4,
+    )
+    assert leveler.baseline_duration == 8
+    result = leveler.level(methods=(method,), starts=4)
+    start_times = result["start_times"]
+    assert start_times["a"] == 1 and start_times["b"] == 0
+    assert start_times["d"] >= 6 and start_times["c"] >= 6
+    assert (result["usage"][:, 0] <= 2).all()
@@ -0,0 +1,67 @@
+"""穩健模式：情境分段以共用行程池計算，以及請求驗證"""
+import pytest
+from pydantic import ValidationError
+
+from app.models import decomposition, robust
+from app.models.robust import RobustOptimizer, ScenarioEvaluator, evaluate_paths, sample_durations
+from app.schemas.optimization import OptimizationRequest
+from networks import small_network
+
+
+@pytest.fixture
+def shared_pool(monkeypatch):
+    """強制啟用共用行程池（單核心環境預設不建立）與情境分段"""
+    monkeypatch.setattr(decomposition, "DECOMPOSITION_WORKERS", 2)
+    monkeypatch.setattr(robust, "ROBUST_PARALLEL_MIN_WORK", 0)
+    decomposition.shutdown_pool()
+    yield
+    decomposition.shutdown_pool()
+
+
+def _network(seed):
+    activities, precedences = small_network(seed, size=8)
+    optimizer = RobustOptimizer(activities, precedences, scenario_count=40, seed=seed)
+    order, predecessors = optimizer._index_network()
+    return activities, precedences, order, predecessors, optimizer.samples
+
+
+def test_chunked_evaluation_matches_serial(shared_pool):
+    _, _, order, predecessors, samples = _network(1)
+    crashed = [index % 2 == 0 for index in range(len(order))]
+    evaluator = ScenarioEvaluator(order, predecessors, samples, max_workers=3)
+    assert evaluator.workers == 3
+    assert evaluator.evaluate(crashed) == evaluate_paths(order, predecessors, samples, crashed, 0, len(samples))
+    # 使用共用行程池，不另外建立行程池
+    assert decomposition._pool is not None
+
+
+def test_parallel_solve_matches_serial(shared_pool):
+    activities, precedences, _, _, _ = _network(2)
+    normal_cost = sum(act.normal_cost for act in activities)
+    params = dict(
+        indirect_cost=1000,
+        penalty_type="rate",
+        penalty_rate=None,
+        penalty_amount=None,
+        contract_amount=normal_cost,
+        contract_duration=None,
+        target_duration=None,
+    )
+    results = []
+    for workers in (1, 3):
+        optimizer = RobustOptimizer(activities, precedences, scenario_count=40, seed=2, max_workers=workers)
+        result = optimizer.solve_budget_to_duration(normal_cost * 11 // 10 + 1000 * 60, **params)
+        results.append((result["status"], result.get("optimal_duration"), result.get("total_cost")))
+    assert results[0] == results[1]
+
+
+def test_sample_durations_are_reproducible():
+    activities, _ = small_network(3)
+    assert sample_durations(activities, 5, 0.1, 0.3, seed=7) == sample_durations(activities, 5, 0.1, 0.3, seed=7)
+
+
+def test_robust_request_rejects_formulation():
+    base = dict(project_id="00000000-0000-0000-0000-000000000001", mode="duration_to_cost", duration_constraint=30)
+    OptimizationRequest(**base, robust={})
+    with pytest.raises(ValidationError):
+        OptimizationRequest(**base, formulation="tight", robust={})
@@ -0,0 +1,51 @@
+"""滾動式重新優化：已凍結作業的排程與成本"""
+import pytest
+
+from app.models.bidding_optimizer import Activity
+from app.models.rolling_horizon import RollingHorizonOptimizer, completed_cost, frozen_schedule
+
+# 正常 10 天 / 100 元，趕工 6 天 / 180 元（每縮短一天 20 元，以分計）
+ACT = Activity("a", "作業", 10, 10000, 6, 18000)
+
+
+@pytest.mark.parametrize(
+    "duration, cost",
+    [(12, 10000), (10, 10000), (9, 12000), (8, 14000), (7, 16000), (6, 18000), (4, 18000)],
+)
+def test_completed_cost_is_prorated(duration, cost):
+    assert completed_cost(ACT, duration) == cost
+
+
+def test_completed_cost_rounds_to_minor_unit():
+    act = Activity("b", "作業", 5, 10000, 2, 10100)
+    assert completed_cost(act, 4) == 10033
+
+
+def test_completed_activity_one_day_early():
+    schedule = frozen_schedule(ACT, {"actual_start": 0, "actual_finish": 9}, status_date=12)
+    assert schedule["is_crashed"]
+    assert schedule["duration"] == 9
+    assert schedule["cost"] == 12000
+
+
+def test_in_progress_activity_keeps_normal_cost():
+    schedule = frozen_schedule(ACT, {"actual_start": 2, "percent_complete": 50}, status_date=4)
+    assert schedule == {
+        "activity_id": "a", "activity_name": "作業", "start_time": 2, "end_time": 9,
+        "duration": 7, "is_crashed": False, "cost": 10000,
+    }
+    assert frozen_schedule(ACT, {}, status_date=4) is None
+
+
+def test_fixed_cost_includes_prorated_completed_activity():
+    other = Activity("c", "後續", 4, 5000, 2, 9000)
+    optimizer = RollingHorizonOptimizer(
+        [ACT, other], [("c", "a")], {"a": {"actual_start": 0, "actual_finish": 8}}, status_date=8
+    )
+    assert optimizer.fixed_cost == 14000
+    result = optimizer.solve_duration_to_cost(
+        duration=12, indirect_cost=0, penalty_type="rate", penalty_amount=None, penalty_rate=None,
+        contract_amount=0, contract_duration=None, target_duration=None,
+    )
+    assert result["status"] == "success"
+    assert result["optimal_cost"] == 14000 + 5000
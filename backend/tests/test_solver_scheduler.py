@@ -0,0 +1,76 @@
+"""求解排程器：名額分配與排隊喚醒"""
+import threading
+import time
+
+from app.utils.solver_scheduler import SolverScheduler
+
+TIMEOUT = 5.0
+
+
+def _wait_until(predicate, timeout: float = TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.001)
+    return predicate()
+
+
+def _queue(scheduler: SolverScheduler, project_id: str, predicted: float, release: threading.Event):
+    def run():
+        with scheduler.slot(project_id, predicted):
+            release.wait(TIMEOUT)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_shortest_predicted_solve_runs_first():
+    scheduler = SolverScheduler(concurrency=1, aging_rate=0.0)
+    release = threading.Event()
+    order = []
+    holder = _queue(scheduler, "busy", 1.0, release)
+    assert _wait_until(lambda: scheduler.stats()["running"] == 1)
+
+    def record(project_id, predicted):
+        def run():
+            with scheduler.slot(project_id, predicted):
+                order.append(project_id)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    threads = [record("long", 10.0)]
+    assert _wait_until(lambda: scheduler.stats()["queued"] == 1)
+    threads.append(record("short", 1.0))
+    assert _wait_until(lambda: scheduler.stats()["queued"] == 2)
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join(TIMEOUT)
+    assert order == ["short", "long"]
+
+
+def test_slots_freed_together_wake_every_queued_solve():
+    """兩個名額同時釋出：預測較長的求解先醒來看到輪到較短者而再次等待時，
+    較短者取得名額後仍須喚醒它，不可讓空名額閒置"""
+    for _ in range(30):
+        scheduler = SolverScheduler(concurrency=2, aging_rate=0.0)
+        busy = threading.Event()
+        queued = threading.Event()
+        holders = [_queue(scheduler, f"busy-{i}", 1.0, busy) for i in range(2)]
+        assert _wait_until(lambda: scheduler.stats()["running"] == 2)
+        waiters = [_queue(scheduler, "a", 10.0, queued)]
+        assert _wait_until(lambda: scheduler.stats()["queued"] == 1)
+        waiters.append(_queue(scheduler, "b", 1.0, queued))
+        assert _wait_until(lambda: scheduler.stats()["queued"] == 2)
+
+        busy.set()
+        try:
+            assert _wait_until(lambda: scheduler.stats()["running"] == 2 and scheduler.stats()["queued"] == 0), \
+                scheduler.stats()
+        finally:
+            queued.set()
+            for thread in holders + waiters:
+                thread.join(TIMEOUT)
@@ -27,7 +27,8 @@ api.interceptors.request.use(
 // 回應攔截器
 api.interceptors.response.use(
   (response) => {
-    return response.data
+    // rawResponse：需要讀取回應標頭時（例如分頁游標）回傳完整回應
+    return response.config.rawResponse ? response : response.data
   },
   (error) => {
     // 統一錯誤處理
@@ -37,10 +38,25 @@ api.interceptors.response.use(
   }
 )
 
+// 依 X-Next-Cursor 標頭逐頁取得列表的所有資料
+const fetchAllPages = async (url, params = {}) => {
+  const rows = []
+  let cursor = null
+  do {
+    const response = await api.get(url, {
+      params: { limit: 500, ...params, ...(cursor ? { cursor } : {}) },
+      rawResponse: true
+    })
+    rows.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return rows
+}
+
 // 專案管理 API
 export const projectAPI = {
-  // 取得所有專案
-  getProjects: () => api.get('/api/projects'),
+  // 取得所有專案（params：status、q 名稱搜尋、fields 欄位投影）
+  getProjects: (params) => fetchAllPages('/api/projects', params),
   
   // 取得單一專案
   getProject: (id) => api.get(`/api/projects/${id}`),
@@ -57,8 +73,8 @@ export const projectAPI = {
 
 // 作業活動 API
 export const activityAPI = {
-  // 取得專案的所有作業
-  getActivities: (projectId) => api.get(`/api/projects/${projectId}/activities`),
+  // 取得專案的所有作業（params：q 名稱搜尋、wbs 編碼前綴、fields 欄位投影）
+  getActivities: (projectId, params) => fetchAllPages(`/api/projects/${projectId}/activities`, params),
   
   // 取得單一作業
   getActivity: (id) => api.get(`/api/activities/${id}`),
@@ -73,7 +89,28 @@ export const activityAPI = {
   deleteActivity: (id) => api.delete(`/api/activities/${id}`),
   
   // 取得作業的前置作業
-  getPredecessors: (id) => api.get(`/api/activities/${id}/predecessors`)
+  getPredecessors: (id) => api.get(`/api/activities/${id}/predecessors`),
+  
+  // 取得作業的資源需求（建立 / 更新作業時以 resource_demands 整批設定）
+  getResourceDemands: (id) => api.get(`/api/activities/${id}/resource-demands`)
+}
+
+// 資源管理 API
+export const resourceAPI = {
+  // 取得專案的資源
+  getResources: (projectId) => api.get(`/api/projects/${projectId}/resources`),
+  
+  // 建立資源
+  createResource: (projectId, data) => api.post(`/api/projects/${projectId}/resources`, data),
+  
+  // 更新資源
+  updateResource: (id, data) => api.put(`/api/resources/${id}`, data),
+  
+  // 刪除資源
+  deleteResource: (id) => api.delete(`/api/resources/${id}`),
+  
+  // 資源平準化（data：scenario_id、methods、priority_rule、starts、seed）
+  levelResources: (projectId, data) => api.post(`/api/projects/${projectId}/resource-leveling`, data)
 }
 
 // 優化計算 API
@@ -82,7 +119,40 @@ export const optimizationAPI = {
   optimize: (data) => api.post('/api/optimize', data),
   
   // 取得優化結果
-  getResult: (scenarioId) => api.get(`/api/scenarios/${scenarioId}/results`)
+  getResult: (scenarioId) => api.get(`/api/scenarios/${scenarioId}/results`),
+  
+  // 取得甘特圖長條（params：view 為 activities / wbs / critical，level、start、end、limit）
+  getGantt: (scenarioId, params) => api.get(`/api/scenarios/${scenarioId}/gantt`, { params }),
+  
+  // 下載伺服器端產生的報告（format 為 'pdf' 或 'xlsx'），回應為檔案 Blob
+  exportReport: (scenarioId, format) => api.get(`/api/scenarios/${scenarioId}/export/${format}`, {
+    responseType: 'blob',
+    timeout: 300000
+  }),
+  
+  // 專案的情境歷史摘要（params：mode、pinned、status、fields、limit、cursor；只取一頁）
+  getScenarios: (projectId, params) => api.get(`/api/projects/${projectId}/scenarios`, { params, rawResponse: true }),
+  
+  // 比較兩個情境的結果差值與趕工決策
+  compareScenarios: (baseId, otherId) => api.get('/api/scenarios/compare', { params: { base: baseId, other: otherId } }),
+  
+  // 釘選 / 取消釘選情境（釘選的情境不受保留政策壓縮或刪除）
+  pinScenario: (scenarioId, isPinned) => api.put(`/api/scenarios/${scenarioId}/pin`, { is_pinned: isPinned }),
+  
+  // 多專案投資組合優化（共同預算分配）
+  optimizePortfolio: (data) => api.post('/api/portfolio/optimize', data),
+  
+  // 參數敏感度分析（違約金率 × 間接成本 × 目標工期格點）
+  analyzeSensitivity: (data) => api.post('/api/sensitivity', data),
+  
+  // 開啟 what-if 工作階段（WebSocket），之後以 send({ type: 'update', params, overrides }) 送出差異
+  openWhatIfSession: (projectId, { sessionId, formulation } = {}) => {
+    const url = new URL(`/api/ws/whatif/${projectId}`, api.defaults.baseURL)
+    url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:'
+    if (sessionId) url.searchParams.set('session_id', sessionId)
+    if (formulation) url.searchParams.set('formulation', formulation)
+    return new WebSocket(url.toString())
+  }
 }
 
 export default api
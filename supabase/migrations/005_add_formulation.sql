@@ -0,0 +1,10 @@
+-- 新增模型建構方式欄位
+
+-- 在投標情境表中記錄求解時使用的模型建構方式
+ALTER TABLE bidding_scenarios 
+ADD COLUMN IF NOT EXISTS formulation VARCHAR(20) DEFAULT 'standard';  -- 'standard' 原始模型 或 'tight' 強化模型
+
+-- 注意：
+-- standard：開始時間、總工期、獎懲天數皆為整數變數
+-- tight：時間變數為連續變數（給定趕工決策後前置約束為全單模），
+--        獎懲偏差拆解並加上上限，並移除遞移多餘的前置約束
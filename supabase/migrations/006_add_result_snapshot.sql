@@ -0,0 +1,14 @@
+-- 新增優化結果快照欄位
+
+-- 寫入優化結果時一併儲存完整的回應內容（OptimizationResult），
+-- 取得結果時只需讀取 optimization_results 一次，不必再查詢情境、排程、作業與前置關係
+ALTER TABLE optimization_results 
+ADD COLUMN IF NOT EXISTS result_snapshot JSONB;
+
+-- 大型快照會存放於 TOAST，改用 lz4 壓縮以加快讀寫（PostgreSQL 14 以上）
+ALTER TABLE optimization_results 
+ALTER COLUMN result_snapshot SET COMPRESSION lz4;
+
+-- 注意：
+-- 舊資料的 result_snapshot 為 NULL，API 會退回由關聯資料表重組結果
+-- 情境與結果的 ID 改由後端產生，以便快照與資料列在同一次寫入中完成
@@ -0,0 +1,127 @@
+-- 作業排程改為每個優化結果一列的陣列儲存，並加入情境保留政策
+
+-- ------------------------------------------------------------------
+-- 1. 打包排程表：同一結果的所有作業排程以平行陣列存放於同一列
+-- ------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS activity_schedule_packs (
+    result_id UUID PRIMARY KEY REFERENCES optimization_results(id) ON DELETE CASCADE,
+    activity_ids UUID[] NOT NULL,  -- 作業 ID
+    start_times INTEGER[] NOT NULL,  -- 開始時間（天）
+    end_times INTEGER[] NOT NULL,  -- 結束時間（天）
+    durations INTEGER[] NOT NULL,  -- 實際工期
+    is_crashed BOOLEAN[] NOT NULL,  -- 是否趕工
+    costs DECIMAL(15, 2)[] NOT NULL,  -- 實際成本
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT pack_lengths CHECK (
+        cardinality(activity_ids) = cardinality(start_times)
+        AND cardinality(activity_ids) = cardinality(end_times)
+        AND cardinality(activity_ids) = cardinality(durations)
+        AND cardinality(activity_ids) = cardinality(is_crashed)
+        AND cardinality(activity_ids) = cardinality(costs)
+    )
+);
+
+-- ------------------------------------------------------------------
+-- 2. 保留政策所需欄位
+-- ------------------------------------------------------------------
+-- 釘選的情境永遠保留完整資料
+ALTER TABLE bidding_scenarios 
+ADD COLUMN IF NOT EXISTS is_pinned BOOLEAN DEFAULT FALSE;
+
+-- 壓縮時間：已壓縮的結果不再保留回應快照，改由打包排程重組
+ALTER TABLE optimization_results 
+ADD COLUMN IF NOT EXISTS compacted_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_scenarios_project_created ON bidding_scenarios(project_id, created_at DESC);
+
+-- ------------------------------------------------------------------
+-- 3. 將逐列排程打包（遷移既有資料，之後也供保留政策重複使用）
+-- ------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION pack_activity_schedules()
+RETURNS INTEGER AS $$
+DECLARE
+    packed_count INTEGER;
+BEGIN
+    INSERT INTO activity_schedule_packs (
+        result_id, activity_ids, start_times, end_times, durations, is_crashed, costs
+    )
+    SELECT
+        result_id,
+        array_agg(activity_id ORDER BY start_time, id),
+        array_agg(start_time ORDER BY start_time, id),
+        array_agg(end_time ORDER BY start_time, id),
+        array_agg(duration ORDER BY start_time, id),
+        array_agg(COALESCE(is_crashed, FALSE) ORDER BY start_time, id),
+        array_agg(cost ORDER BY start_time, id)
+    FROM activity_schedules
+    GROUP BY result_id
+    ON CONFLICT (result_id) DO NOTHING;
+    GET DIAGNOSTICS packed_count = ROW_COUNT;
+
+    -- 已打包的結果刪除逐列資料
+    DELETE FROM activity_schedules s
+    USING activity_schedule_packs p
+    WHERE s.result_id = p.result_id;
+
+    RETURN packed_count;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT pack_activity_schedules();
+
+-- ------------------------------------------------------------------
+-- 4. 情境保留政策
+--    未釘選、且不在各專案最新 keep_latest 筆內的探索性情境：
+--    - 超過 compact_after_days 天：刪除回應快照（保留摘要與打包排程）
+--    - 超過 drop_after_days 天：整個情境刪除（連帶刪除結果與排程）
+-- ------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION apply_scenario_retention(
+    compact_after_days INTEGER DEFAULT 7,
+    drop_after_days INTEGER DEFAULT 90,
+    keep_latest INTEGER DEFAULT 20
+)
+RETURNS TABLE (compacted_count INTEGER, dropped_count INTEGER) AS $$
+DECLARE
+    v_compacted INTEGER := 0;
+    v_dropped INTEGER := 0;
+BEGIN
+    WITH ranked AS (
+        SELECT id, created_at, is_pinned,
+               ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY created_at DESC) AS recency
+        FROM bidding_scenarios
+    )
+    DELETE FROM bidding_scenarios
+    WHERE id IN (
+        SELECT id FROM ranked
+        WHERE NOT COALESCE(is_pinned, FALSE)
+          AND recency > keep_latest
+          AND created_at < NOW() - make_interval(days => drop_after_days)
+    );
+    GET DIAGNOSTICS v_dropped = ROW_COUNT;
+
+    PERFORM pack_activity_schedules();
+
+    WITH ranked AS (
+        SELECT id, created_at, is_pinned,
+               ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY created_at DESC) AS recency
+        FROM bidding_scenarios
+    )
+    UPDATE optimization_results
+    SET result_snapshot = NULL, compacted_at = NOW()
+    WHERE compacted_at IS NULL
+      AND scenario_id IN (
+        SELECT id FROM ranked
+        WHERE NOT COALESCE(is_pinned, FALSE)
+          AND recency > keep_latest
+          AND created_at < NOW() - make_interval(days => compact_after_days)
+    );
+    GET DIAGNOSTICS v_compacted = ROW_COUNT;
+
+    RETURN QUERY SELECT v_compacted, v_dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 注意：
+-- 可透過 API（POST /api/maintenance/retention）或 pg_cron 定期執行，例如：
+--   SELECT cron.schedule('scenario-retention', '0 3 * * *', 'SELECT * FROM apply_scenario_retention()');
+-- activity_schedules 資料表保留以相容舊版，新結果一律寫入 activity_schedule_packs
@@ -0,0 +1,21 @@
+-- 新增作業實際進度欄位，供施工中專案滾動式重新優化
+
+-- 實際開始 / 完成以開工後第幾天表示，與優化模型的時間刻度一致
+ALTER TABLE project_activities
+ADD COLUMN IF NOT EXISTS actual_start INTEGER CHECK (actual_start >= 0),
+ADD COLUMN IF NOT EXISTS actual_finish INTEGER CHECK (actual_finish >= 0),
+ADD COLUMN IF NOT EXISTS percent_complete DECIMAL(5, 2) DEFAULT 0
+    CHECK (percent_complete >= 0 AND percent_complete <= 100);
+
+ALTER TABLE project_activities
+ADD CONSTRAINT check_actual_finish_after_start
+    CHECK (actual_finish IS NULL OR actual_start IS NULL OR actual_finish >= actual_start);
+
+-- 在投標情境表中記錄重新優化時的資料日期（NULL 表示自開工起完整優化）
+ALTER TABLE bidding_scenarios
+ADD COLUMN IF NOT EXISTS status_date INTEGER;
+
+-- 注意：
+-- 已完成（actual_finish <= 資料日期）：凍結實際時間，成本視為已發生
+-- 進行中（actual_start <= 資料日期且未完成）：固定開始時間，剩餘工期依 percent_complete 估算，不可再趕工
+-- 其他作業：最早於資料日期開始，只對這些作業建立 MILP 變數
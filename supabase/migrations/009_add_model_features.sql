@@ -0,0 +1,13 @@
+-- 新增優化結果的模型特徵欄位，供求解時間預測器訓練
+
+-- 內容：activity_count、precedence_count、crashable_count、mode、penalty_active、
+-- formulation、decomposed，以及寫入時的預測秒數 predicted_time
+ALTER TABLE optimization_results
+ADD COLUMN IF NOT EXISTS model_features JSONB;
+
+-- 預測器只讀取最近的結果
+CREATE INDEX IF NOT EXISTS idx_results_created_at ON optimization_results(created_at DESC);
+
+-- 注意：
+-- 舊資料的 model_features 為 NULL，不納入訓練
+-- calculation_time 只包含求解本身，不含在求解排程器中排隊等待的時間
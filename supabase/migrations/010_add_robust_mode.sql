@@ -0,0 +1,14 @@
+-- 新增穩健模式（依抽樣工期情境求解趕工決策）的參數與情境統計欄位
+
+-- 穩健模式參數：risk_measure、scenario_count、cvar_alpha、optimistic、pessimistic、seed、time_limit
+-- NULL 表示確定性模式
+ALTER TABLE bidding_scenarios
+ADD COLUMN IF NOT EXISTS robust_options JSONB;
+
+-- 所選趕工組合在各抽樣情境下的工期分布、違約金期望值 / CVaR 與求解上下界
+ALTER TABLE optimization_results
+ADD COLUMN IF NOT EXISTS robust_summary JSONB;
+
+-- 注意：
+-- optimal_duration、total_cost 等欄位仍為標稱工期（未抽樣）下的值，可與確定性模式直接比較
+-- 相同 seed 與 scenario_count 會抽出相同情境，結果可重現
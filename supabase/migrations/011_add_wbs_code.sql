@@ -0,0 +1,14 @@
+-- 新增作業的工作分解結構（WBS）編碼，供甘特圖依 WBS 層級彙總
+
+-- 以點分隔的層級編碼（例如 1.2.3），NULL 表示未分類
+ALTER TABLE project_activities
+ADD COLUMN IF NOT EXISTS wbs_code TEXT
+    CHECK (wbs_code ~ '^[0-9A-Za-z]+(\.[0-9A-Za-z]+)*$');
+
+-- 依專案與 WBS 編碼排序讀取（text_pattern_ops 支援以前綴查詢某一層的所有作業）
+CREATE INDEX IF NOT EXISTS idx_project_activities_wbs
+    ON project_activities (project_id, wbs_code text_pattern_ops);
+
+-- 注意：
+-- 甘特圖的時間窗查詢使用後端記憶體中的區間索引（排程以打包列儲存，無法由資料庫索引個別作業）
+-- 彙總長條的開始 / 結束為群組內作業的最早開始與最晚完成，成本為加總
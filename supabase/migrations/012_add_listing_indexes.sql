@@ -0,0 +1,23 @@
+-- 專案與作業列表的游標分頁、篩選與名稱搜尋索引
+
+-- 專案列表依 (created_at, id) 由新到舊分頁；依狀態篩選時使用第二個索引
+CREATE INDEX IF NOT EXISTS idx_projects_created_id
+    ON projects (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_status_created_id
+    ON projects (status, created_at DESC, id DESC);
+
+-- 專案內的作業依 (created_at, id) 由舊到新分頁
+CREATE INDEX IF NOT EXISTS idx_activities_project_created_id
+    ON project_activities (project_id, created_at, id);
+
+-- 名稱部分符合搜尋（ILIKE '%...%'）使用三連字索引
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_projects_name_trgm
+    ON projects USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_activities_name_trgm
+    ON project_activities USING GIN (name gin_trgm_ops);
+
+-- 注意：
+-- 下一頁的條件為 created_at < 游標時間 OR (created_at = 游標時間 AND id < 游標 ID)，
+-- PostgreSQL 可將其轉為上述複合索引的範圍掃描，查詢成本與頁數無關
+-- 001 的 idx_projects_status 與 idx_activities_project 為本檔索引的前綴，保留供其他查詢使用
@@ -0,0 +1,160 @@
+-- 新增情境摘要表：每個投標情境一列，包含求解參數、結果摘要與趕工作業清單
+-- 由觸發器維護（情境、結果、打包排程寫入時更新），列出與比較情境時不需讀取快照或排程
+
+-- ------------------------------------------------------------------
+-- 1. 摘要表
+-- ------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS scenario_summaries (
+    scenario_id UUID PRIMARY KEY REFERENCES bidding_scenarios(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    result_id UUID REFERENCES optimization_results(id) ON DELETE SET NULL,
+    -- 情境參數
+    mode VARCHAR(50) NOT NULL,
+    formulation VARCHAR(20),
+    budget_constraint DECIMAL(15, 2),
+    duration_constraint INTEGER,
+    indirect_cost DECIMAL(15, 2),
+    penalty_type VARCHAR(20),
+    penalty_rate DECIMAL(5, 4),
+    penalty_fixed_amount DECIMAL(15, 2),  -- 情境的固定違約金參數（bidding_scenarios.penalty_amount）
+    contract_amount DECIMAL(15, 2),
+    contract_duration INTEGER,
+    target_duration INTEGER,
+    status_date INTEGER,
+    is_robust BOOLEAN NOT NULL DEFAULT FALSE,
+    is_pinned BOOLEAN NOT NULL DEFAULT FALSE,
+    -- 結果摘要（尚未寫入結果時為 NULL）
+    optimal_duration INTEGER,
+    optimal_cost DECIMAL(15, 2),
+    penalty_amount DECIMAL(15, 2),
+    bonus_amount DECIMAL(15, 2),
+    total_cost DECIMAL(15, 2),
+    calculation_time DECIMAL(10, 3),
+    status VARCHAR(20),
+    crashed_activity_ids UUID[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL  -- 情境建立時間
+);
+
+-- 情境列表依 (created_at, scenario_id) 由新到舊分頁
+CREATE INDEX IF NOT EXISTS idx_scenario_summaries_project_created
+    ON scenario_summaries (project_id, created_at DESC, scenario_id DESC);
+
+-- ------------------------------------------------------------------
+-- 2. 觸發器函式
+-- ------------------------------------------------------------------
+CREATE OR REPLACE FUNCTION summarize_scenario()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO scenario_summaries (
+        scenario_id, project_id, mode, formulation, budget_constraint, duration_constraint,
+        indirect_cost, penalty_type, penalty_rate, penalty_fixed_amount, contract_amount,
+        contract_duration, target_duration, status_date, is_robust, is_pinned, created_at
+    )
+    VALUES (
+        NEW.id, NEW.project_id, NEW.mode, NEW.formulation, NEW.budget_constraint, NEW.duration_constraint,
+        NEW.indirect_cost, NEW.penalty_type, NEW.penalty_rate, NEW.penalty_amount, NEW.contract_amount,
+        NEW.contract_duration, NEW.target_duration, NEW.status_date, NEW.robust_options IS NOT NULL,
+        COALESCE(NEW.is_pinned, FALSE), NEW.created_at
+    )
+    ON CONFLICT (scenario_id) DO UPDATE SET
+        mode = EXCLUDED.mode,
+        formulation = EXCLUDED.formulation,
+        budget_constraint = EXCLUDED.budget_constraint,
+        duration_constraint = EXCLUDED.duration_constraint,
+        indirect_cost = EXCLUDED.indirect_cost,
+        penalty_type = EXCLUDED.penalty_type,
+        penalty_rate = EXCLUDED.penalty_rate,
+        penalty_fixed_amount = EXCLUDED.penalty_fixed_amount,
+        contract_amount = EXCLUDED.contract_amount,
+        contract_duration = EXCLUDED.contract_duration,
+        target_duration = EXCLUDED.target_duration,
+        status_date = EXCLUDED.status_date,
+        is_robust = EXCLUDED.is_robust,
+        is_pinned = EXCLUDED.is_pinned;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION summarize_result()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE scenario_summaries SET
+        result_id = NEW.id,
+        optimal_duration = NEW.optimal_duration,
+        optimal_cost = NEW.optimal_cost,
+        penalty_amount = NEW.penalty_amount,
+        bonus_amount = NEW.bonus_amount,
+        total_cost = NEW.total_cost,
+        calculation_time = NEW.calculation_time,
+        status = NEW.status
+    WHERE scenario_id = NEW.scenario_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION summarize_schedule_pack()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE scenario_summaries SET
+        crashed_activity_ids = ARRAY(
+            SELECT activity_id
+            FROM unnest(NEW.activity_ids, NEW.is_crashed) AS s(activity_id, crashed)
+            WHERE crashed
+            ORDER BY activity_id
+        )
+    WHERE result_id = NEW.result_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 壓縮（刪除快照）只更新 result_snapshot / compacted_at，不觸發摘要更新
+CREATE TRIGGER summarize_scenarios AFTER INSERT OR UPDATE OF
+    mode, formulation, budget_constraint, duration_constraint, indirect_cost, penalty_type,
+    penalty_rate, penalty_amount, contract_amount, contract_duration, target_duration,
+    status_date, robust_options, is_pinned
+    ON bidding_scenarios
+    FOR EACH ROW EXECUTE FUNCTION summarize_scenario();
+
+CREATE TRIGGER summarize_results AFTER INSERT OR UPDATE OF
+    optimal_duration, optimal_cost, penalty_amount, bonus_amount, total_cost, calculation_time, status
+    ON optimization_results
+    FOR EACH ROW EXECUTE FUNCTION summarize_result();
+
+CREATE TRIGGER summarize_schedule_packs AFTER INSERT OR UPDATE ON activity_schedule_packs
+    FOR EACH ROW EXECUTE FUNCTION summarize_schedule_pack();
+
+-- ------------------------------------------------------------------
+-- 3. 既有資料回填
+-- ------------------------------------------------------------------
+INSERT INTO scenario_summaries (
+    scenario_id, project_id, result_id, mode, formulation, budget_constraint, duration_constraint,
+    indirect_cost, penalty_type, penalty_rate, penalty_fixed_amount, contract_amount,
+    contract_duration, target_duration, status_date, is_robust, is_pinned,
+    optimal_duration, optimal_cost, penalty_amount, bonus_amount, total_cost,
+    calculation_time, status, crashed_activity_ids, created_at
+)
+SELECT
+    s.id, s.project_id, r.id, s.mode, s.formulation, s.budget_constraint, s.duration_constraint,
+    s.indirect_cost, s.penalty_type, s.penalty_rate, s.penalty_amount, s.contract_amount,
+    s.contract_duration, s.target_duration, s.status_date, s.robust_options IS NOT NULL,
+    COALESCE(s.is_pinned, FALSE),
+    r.optimal_duration, r.optimal_cost, r.penalty_amount, r.bonus_amount, r.total_cost,
+    r.calculation_time, r.status,
+    COALESCE(
+        ARRAY(
+            SELECT activity_id
+            FROM unnest(p.activity_ids, p.is_crashed) AS c(activity_id, crashed)
+            WHERE crashed
+            ORDER BY activity_id
+        ),
+        '{}'
+    ),
+    s.created_at
+FROM bidding_scenarios s
+LEFT JOIN optimization_results r ON r.scenario_id = s.id
+LEFT JOIN activity_schedule_packs p ON p.result_id = r.id
+ON CONFLICT (scenario_id) DO NOTHING;
+
+-- 注意：
+-- 逐列的 activity_schedules 已於 007 打包；之後打包產生的 activity_schedule_packs 也會更新趕工清單
+-- 比較情境時只讀取兩列摘要與差異作業的名稱，不讀取回應快照或排程
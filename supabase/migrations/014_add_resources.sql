@@ -0,0 +1,35 @@
+-- 新增專案資源（人力班組、機具）與作業資源需求，供資源平準化排程
+
+-- 專案資源：capacity 為每日可用數量（例如班組數、機具台數）
+CREATE TABLE IF NOT EXISTS project_resources (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name VARCHAR(255) NOT NULL,
+    capacity INTEGER NOT NULL CHECK (capacity > 0),
+    unit VARCHAR(50),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT unique_project_resource_name UNIQUE (project_id, name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_project_resources_project_id ON project_resources(project_id);
+
+CREATE TRIGGER update_project_resources_updated_at BEFORE UPDATE ON project_resources
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- 作業資源需求：作業進行期間每日占用的數量（多對多）
+CREATE TABLE IF NOT EXISTS activity_resource_demands (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    activity_id UUID NOT NULL REFERENCES project_activities(id) ON DELETE CASCADE,
+    resource_id UUID NOT NULL REFERENCES project_resources(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT unique_activity_resource UNIQUE (activity_id, resource_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_activity_resource_demands_activity_id ON activity_resource_demands(activity_id);
+CREATE INDEX IF NOT EXISTS idx_activity_resource_demands_resource_id ON activity_resource_demands(resource_id);
+
+-- 注意：
+-- 資源需求不影響作業網路的內容雜湊，異動時不需清除網路界限與權衡曲線快取
+-- 單一作業的需求量不得超過資源容量（由資源平準化 API 檢查，資料庫不限制）